@@ -38,20 +38,65 @@ def main():
         print("  python main.py bot      - Run Discord bot")
         print("  python main.py cli      - Run CLI interface")
         print("  python main.py test     - Run test conversation")
+        print("  python main.py bench    - Run offline load test (see bench --help)")
+        print("  python main.py inference - Run the local inference worker (HTTP)")
+        print("  python main.py export-onnx - Export the encoder models to int8 ONNX")
+        print("  python main.py ingest   - Load documents into the RAG context library (see ingest --help)")
+        print("")
+        print("Add --import-profile to any command to report its startup import cost.")
         return
 
     command = sys.argv[1].lower()
 
+    if "--import-profile" in sys.argv[2:]:
+        run_import_profile(command)
+        return
+
     if command == "bot":
         run_discord_bot()
     elif command == "cli":
         run_cli()
     elif command == "test":
         run_test()
+    elif command == "bench":
+        run_bench(sys.argv[2:])
+    elif command == "inference":
+        run_inference()
+    elif command == "export-onnx":
+        run_export_onnx(sys.argv[2:])
+    elif command == "ingest":
+        run_ingest(sys.argv[2:])
     else:
         print(f"Unknown command: {command}")
 
 
+# Modules each command imports on its startup path
+STARTUP_IMPORTS = {
+    "bot": ["src.bot.discord_bot"],
+    "cli": ["src.core.aurora", "src.core.config"],
+    "test": ["src.core.aurora", "src.core.config", "src.core.llm"],
+    "bench": ["src.bench.harness", "src.bench.mock_ollama"],
+    "inference": ["src.integrations.inference"],
+    "export-onnx": ["src.integrations.onnx_backend"],
+    "ingest": ["src.learning.ingest", "src.db.connection", "src.integrations.huggingface"],
+}
+
+
+def run_import_profile(command: str):
+    """Report per-module import time for a command's startup path."""
+    from pathlib import Path
+    from src.utils.import_profile import profile_imports, format_import_profile
+
+    modules = STARTUP_IMPORTS.get(command)
+    if modules is None:
+        print(f"Unknown command: {command}")
+        return
+
+    timings, wall = profile_imports(["main"] + modules, cwd=Path(__file__).parent)
+    print(f"Import profile for '{command}':\n")
+    print(format_import_profile(timings, wall))
+
+
 def run_discord_bot():
     """Run the Discord bot."""
     logger.info("aurora.starting", mode="discord_bot")
@@ -59,6 +104,119 @@ def run_discord_bot():
     run_bot()
 
 
+def run_inference():
+    """Serve zero-shot, sentiment, summarization and QA models over HTTP."""
+    from src.core.config import settings
+    from src.integrations.inference import run_inference_server
+
+    logger.info("aurora.starting", mode="inference", port=settings.inference_port)
+    run_inference_server(port=settings.inference_port)
+
+
+def run_export_onnx(args):
+    """Export the embedding, sentiment and zero-shot models to ONNX for INFERENCE_RUNTIME=onnx."""
+    import argparse
+    from pathlib import Path
+    from src.core.config import settings
+    from src.integrations.inference import LocalInferenceWorker
+    from src.integrations.onnx_backend import ONNX_TASKS, export_onnx
+
+    parser = argparse.ArgumentParser(prog="main.py export-onnx", description="Export models to ONNX")
+    parser.add_argument("--task", choices=sorted(ONNX_TASKS), action="append",
+                        help="Task to export (repeatable; default all)")
+    parser.add_argument("--no-quantize", action="store_true", help="Keep fp32 weights")
+    parser.add_argument("--output", type=Path, default=settings.onnx_model_path)
+    opts = parser.parse_args(args)
+
+    logger.info("aurora.starting", mode="export_onnx", output=str(opts.output))
+    models = LocalInferenceWorker.default_models()
+    for task in opts.task or sorted(ONNX_TASKS):
+        path = export_onnx(models[task], task, opts.output, quantize=not opts.no_quantize)
+        print(f"{task}: {models[task]} -> {path}")
+
+
+def run_ingest(args):
+    """Bring aurora_context.documents up to date: chunk, embed and bulk-load what changed."""
+    import argparse
+    import json
+    from pathlib import Path
+
+    parser = argparse.ArgumentParser(prog="main.py ingest", description="Load documents into the context library")
+    parser.add_argument("paths", nargs="*", type=Path,
+                        help="Files or directories (default: context-library/ and CONTEXT_PATH)")
+    parser.add_argument("--doc-type", default="context_library")
+    parser.add_argument("--public", action="store_true", help="Store as not private")
+    parser.add_argument("--tag", action="append", default=[], help="Tag every chunk (repeatable)")
+    parser.add_argument("--max-chars", type=int, default=1500, help="Largest chunk")
+    parser.add_argument("--batch-size", type=int, default=32, help="Chunks per embedding call")
+    parser.add_argument("--embed-concurrency", type=int, default=2, help="Embedding calls in flight")
+    parser.add_argument("--copy-rows", type=int, default=512, help="Rows per COPY")
+    parser.add_argument("--force", action="store_true",
+                        help="Re-read files even if their mtime and size are unchanged")
+    parser.add_argument("--no-prune", action="store_true",
+                        help="Don't tombstone sources that disappeared from the given directories")
+    parser.add_argument("--purge-days", type=int, default=None,
+                        help="Also delete chunks tombstoned more than this many days ago")
+    parser.add_argument("--json", action="store_true", help="Print the summary as JSON")
+    opts = parser.parse_args(args)
+    if not opts.paths:
+        from src.core.config import settings
+        opts.paths = [p for p in (Path(__file__).parent / "context-library", settings.context_path) if p.is_dir()]
+
+    logger.info("aurora.starting", mode="ingest", paths=[str(p) for p in opts.paths])
+    try:
+        stats = asyncio.run(ingest_documents(opts))
+    except RuntimeError as e:
+        print(f"Ingest failed: {e}")
+        sys.exit(1)
+    if opts.json:
+        print(json.dumps(stats.to_dict(), indent=2))
+    else:
+        print(f"{stats.files} files read ({stats.unchanged_files} unchanged since last ingest), "
+              f"{stats.chunks} chunks: {stats.skipped} unchanged, {stats.embedded} embedded, "
+              f"{stats.written} written, {stats.removed} removed; "
+              f"{stats.tombstoned} sources tombstoned in {stats.seconds:.1f}s"
+              + (f" ({stats.failed_files} files unreadable)" if stats.failed_files else ""))
+
+
+async def ingest_documents(opts):
+    from src.db.connection import close_database, get_context_repo, init_database
+    from src.integrations.huggingface import get_embedding_service
+    from src.learning.ingest import ingest
+
+    embedder = get_embedding_service()
+    if embedder.placeholder:
+        # Zero vectors would be stored as if embedded and never redone
+        raise RuntimeError(
+            "no embedding model is configured; set INFERENCE_URL or LOCAL_INFERENCE=true"
+        )
+
+    await init_database()
+    try:
+        repo = get_context_repo()
+        await repo.ensure_schema(embedder.dimension)
+        stats = await ingest(
+            opts.paths,
+            repo,
+            embedder.embed_batch,
+            doc_type=opts.doc_type,
+            is_private=not opts.public,
+            tags=opts.tag,
+            max_chars=opts.max_chars,
+            batch_size=opts.batch_size,
+            embed_concurrency=opts.embed_concurrency,
+            copy_rows=opts.copy_rows,
+            force=opts.force,
+            prune=not opts.no_prune,
+            embedding_model=embedder.model_key,
+        )
+        if opts.purge_days is not None:
+            await repo.purge_tombstones(opts.purge_days)
+        return stats
+    finally:
+        await close_database()
+
+
 def run_cli():
     """Run CLI interface for testing."""
     logger.info("aurora.starting", mode="cli")
@@ -69,10 +227,20 @@ async def cli_loop():
     """Interactive CLI loop."""
     from src.core.aurora import get_aurora
     from src.core.config import load_secrets
+    from src.db.connection import close_database, init_persistence
 
     load_secrets()
+    await init_persistence()
     aurora = get_aurora()
+    try:
+        await _cli_session(aurora)
+    finally:
+        await aurora.shutdown()
+        await close_database()
+
 
+async def _cli_session(aurora):
+    """Read and answer messages until the user leaves."""
     print("\n" + "="*60)
     print("Aurora Forester - CLI Interface")
     print("="*60)
@@ -152,5 +320,102 @@ async def test_conversation():
     print("="*60 + "\n")
 
 
+def run_bench(args):
+    """Run the offline load test against a mock Ollama."""
+    import argparse
+    import json
+    from pathlib import Path
+    from src.bench.harness import BENCH_TARGETS, load_corpus, run_benchmarks, format_report
+    from src.bench.mock_ollama import MockOllamaConfig, LATENCY_DISTRIBUTIONS
+
+    parser = argparse.ArgumentParser(prog="main.py bench", description="Aurora offline load test")
+    parser.add_argument("--target", choices=BENCH_TARGETS + ("all",), default="all")
+    parser.add_argument("--requests", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--warmup", type=int, default=0)
+    parser.add_argument("--corpus", type=Path, default=None, help="One message per line")
+    parser.add_argument("--token-rate", type=float, default=40.0, help="Mock tokens per second")
+    parser.add_argument("--tokens", type=int, default=120, help="Mock tokens per response")
+    parser.add_argument("--latency-ms", type=float, default=150.0, help="Mean time to first token")
+    parser.add_argument("--latency-jitter-ms", type=float, default=50.0)
+    parser.add_argument("--latency-dist", choices=LATENCY_DISTRIBUTIONS, default="normal")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    parser.add_argument("--memory", action="store_true",
+                        help="Measure bytes per retained record instead of load testing")
+    parser.add_argument("--records", type=int, default=2000, help="Records per --memory measurement")
+    parser.add_argument("--embedding-dim", type=int, default=384)
+    parser.add_argument("--intent", action="store_true",
+                        help="Score intent routing accuracy and cost instead of load testing")
+    parser.add_argument("--iterations", type=int, default=200, help="Passes over the set per --intent timing")
+    parser.add_argument("--inference", action="store_true",
+                        help="Compare torch and ONNX model latency, throughput and RSS instead of load testing")
+    parser.add_argument("--runtime", choices=("torch", "onnx"), action="append",
+                        help="Runtime for --inference (repeatable; default both)")
+    parser.add_argument("--task", dest="inference_task", choices=("embed", "zero_shot", "sentiment"),
+                        action="append", help="Task for --inference (repeatable; default all)")
+    opts = parser.parse_args(args)
+
+    logger.info("aurora.starting", mode="bench")
+
+    if opts.memory:
+        from src.bench.memory import run_memory_benchmark, format_memory_report
+        memory_results = run_memory_benchmark(opts.records, opts.embedding_dim)
+        if opts.json:
+            print(json.dumps([r.to_dict() for r in memory_results], indent=2))
+        else:
+            print(format_memory_report(memory_results))
+        return
+
+    if opts.intent:
+        from src.bench.intent import INTENT_CASES, UNSEEN_CASES, run_intent_benchmark, format_intent_report
+        intent_results = run_intent_benchmark(INTENT_CASES + UNSEEN_CASES, opts.iterations)
+        if opts.json:
+            print(json.dumps([r.to_dict() for r in intent_results], indent=2))
+        else:
+            print(format_intent_report(intent_results))
+        return
+
+    if opts.inference:
+        from src.bench.inference import (
+            BENCH_TASKS, RUNTIMES, run_inference_benchmark, format_inference_report,
+        )
+        inference_results = run_inference_benchmark(
+            opts.runtime or RUNTIMES,
+            opts.inference_task or BENCH_TASKS,
+            requests=opts.requests,
+            concurrency=opts.concurrency,
+        )
+        if opts.json:
+            print(json.dumps([r.to_dict() for r in inference_results], indent=2))
+        else:
+            print(format_inference_report(inference_results))
+        return
+
+    mock_config = MockOllamaConfig(
+        latency_ms=opts.latency_ms,
+        latency_jitter_ms=opts.latency_jitter_ms,
+        latency_distribution=opts.latency_dist,
+        token_rate=opts.token_rate,
+        tokens_per_response=opts.tokens,
+        seed=opts.seed,
+    )
+    targets = list(BENCH_TARGETS) if opts.target == "all" else [opts.target]
+
+    results = asyncio.run(run_benchmarks(
+        targets,
+        load_corpus(opts.corpus),
+        requests=opts.requests,
+        concurrency=opts.concurrency,
+        mock_config=mock_config,
+        warmup=opts.warmup,
+    ))
+
+    if opts.json:
+        print(json.dumps([r.to_dict() for r in results], indent=2))
+    else:
+        print(format_report(results))
+
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,545 @@
+"""
+Aurora Forester - Monitor Scheduler
+One timer heap for every MONITOR agent, instead of a sleeping task each.
+
+A single loop sleeps until the earliest monitor is due, then evaluates all
+due conditions together (up to `batch_size` concurrently) and reschedules
+them. Each run is pushed by a random jitter of up to `jitter` x interval,
+so monitors created together drift apart instead of firing in lockstep.
+The delay between when a check was due and when it actually started is
+recorded as lag, so an overloaded loop shows up in the logs.
+
+Monitors whose check is registered by name (see `register_check`) are
+saved to disk with their next run time and re-created on start, so they
+survive restarts. Monitors built from ad-hoc callables live only in memory.
+The built-in checks (disk usage, HTTP service health, load average) are
+registered at the bottom of this module, and match_check() maps a plain
+request like "monitor disk usage on /data above 85%" onto one of them.
+"""
+
+import asyncio
+import heapq
+import itertools
+import json
+import os
+import random
+import re
+import shutil
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Tuple
+
+import structlog
+
+
+logger = structlog.get_logger()
+
+
+Condition = Callable[[], Awaitable[bool]]
+Action = Callable[[], Awaitable[Optional[str]]]  # May return a description for the agent's output
+
+# Named checks: factory(params) -> (condition, action). Only monitors built
+# from a named check can be persisted, since callables can't be saved.
+MONITOR_CHECKS: Dict[str, Callable[[Dict[str, Any]], Tuple[Condition, Action]]] = {}
+
+
+def register_check(name: str):
+    """Decorator registering a persistable monitor check factory."""
+    def decorator(factory):
+        MONITOR_CHECKS[name] = factory
+        return factory
+    return decorator
+
+
+@dataclass(slots=True)
+class _Watch:
+    """A scheduled monitor."""
+    agent: Any  # SpawnedAgent
+    condition: Condition
+    action: Action
+    interval: float  # Seconds
+    due: float  # time.monotonic() of the next check
+    deadline: Optional[float]  # time.monotonic() to stop at, if any
+    done: asyncio.Future
+    check: Optional[str] = None
+    params: Dict[str, Any] = field(default_factory=dict)
+    seq: int = 0  # Heap entry currently valid for this watch
+    failures: int = 0  # Consecutive condition/action errors
+
+
+class MonitorScheduler:
+    """Heap-scheduled, batched evaluation of monitor conditions."""
+
+    def __init__(
+        self,
+        state_path: Optional[Path] = None,
+        batch_size: int = 32,
+        jitter: float = 0.1,
+        check_timeout: float = 30.0,
+        max_failures: int = 5,
+        persist_interval: float = 30.0
+    ):
+        self.state_path = Path(state_path) if state_path else None
+        self.batch_size = max(1, batch_size)
+        self.jitter = jitter
+        self.check_timeout = check_timeout
+        self.max_failures = max_failures
+        self.persist_interval = persist_interval
+        self._watches: Dict[str, _Watch] = {}
+        self._heap: List[Tuple[float, int, str]] = []
+        self._seq = itertools.count()
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._dirty = False
+        self._last_persist = 0.0
+        self._lags: Deque[float] = deque(maxlen=512)
+        self._rng = random.Random()
+        self.stats = {"checks": 0, "triggered": 0, "errors": 0, "batches": 0}
+
+    # ============================================
+    # REGISTRATION
+    # ============================================
+
+    def add(
+        self,
+        agent: Any,
+        condition: Condition,
+        action: Action,
+        interval: float,
+        timeout: Optional[float] = None,
+        check: Optional[str] = None,
+        params: Optional[Dict[str, Any]] = None,
+        first_due: Optional[float] = None
+    ) -> asyncio.Future:
+        """
+        Start watching for `agent`. Returns a future that resolves when the
+        monitor stops (removed, timed out or failed).
+        """
+        if agent.id in self._watches:
+            raise ValueError(f"Monitor {agent.id} is already scheduled")
+
+        now = time.monotonic()
+        interval = max(0.001, interval)
+        watch = _Watch(
+            agent=agent,
+            condition=condition,
+            action=action,
+            interval=interval,
+            due=first_due if first_due is not None else now + self._jittered(interval),
+            deadline=now + timeout if timeout else None,
+            done=asyncio.get_running_loop().create_future(),
+            check=check,
+            params=dict(params or {}),
+        )
+        if watch.deadline is not None:
+            watch.due = min(watch.due, watch.deadline)
+        self._watches[agent.id] = watch
+        self._push(watch)
+        self._mark_dirty(watch)
+        self._ensure_running()
+        return watch.done
+
+    def add_check(
+        self,
+        agent: Any,
+        check: str,
+        params: Dict[str, Any],
+        interval: float,
+        timeout: Optional[float] = None
+    ) -> asyncio.Future:
+        """Watch using a registered, persistable check."""
+        factory = MONITOR_CHECKS.get(check)
+        if factory is None:
+            raise ValueError(f"Unknown monitor check: {check}")
+        condition, action = factory(params)
+        return self.add(agent, condition, action, interval, timeout, check=check, params=params)
+
+    def remove(self, agent_id: str, result: Any = None) -> bool:
+        """Stop a monitor. Returns False if it was not scheduled."""
+        watch = self._watches.pop(agent_id, None)
+        if watch is None:
+            return False
+        if not watch.done.done():
+            watch.done.set_result(result)
+        self._mark_dirty(watch)
+        return True
+
+    def __contains__(self, agent_id: str) -> bool:
+        return agent_id in self._watches
+
+    def __len__(self) -> int:
+        return len(self._watches)
+
+    def _jittered(self, interval: float) -> float:
+        return interval * (1.0 + self._rng.uniform(0.0, self.jitter))
+
+    def _push(self, watch: _Watch):
+        watch.seq = next(self._seq)
+        heapq.heappush(self._heap, (watch.due, watch.seq, watch.agent.id))
+        if self._heap[0][1] == watch.seq:
+            self._wakeup.set()  # New earliest deadline
+
+    # ============================================
+    # LOOP
+    # ============================================
+
+    def _ensure_running(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._loop())
+
+    async def _loop(self):
+        while True:
+            self._wakeup.clear()
+            delay = self._next_delay()
+            if self._dirty and self.state_path is not None:
+                delay = min(delay, self._last_persist + self.persist_interval - time.monotonic())
+            if delay > 0:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), None if delay == float("inf") else delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            batch = self._pop_due()
+            if batch:
+                self.stats["batches"] += 1
+                await asyncio.gather(*(self._run_check(watch) for watch in batch))
+                for watch in batch:
+                    self._reschedule(watch)
+            self._maybe_persist()
+
+    def _next_delay(self) -> float:
+        """Seconds until the next valid heap entry is due (inf if none)."""
+        while self._heap:
+            due, seq, agent_id = self._heap[0]
+            watch = self._watches.get(agent_id)
+            if watch is None or watch.seq != seq:
+                heapq.heappop(self._heap)  # Removed or rescheduled
+                continue
+            return due - time.monotonic()
+        return float("inf")
+
+    def _pop_due(self) -> List[_Watch]:
+        now = time.monotonic()
+        batch = []
+        while self._heap and len(batch) < self.batch_size:
+            due, seq, agent_id = self._heap[0]
+            if due > now:
+                break
+            heapq.heappop(self._heap)
+            watch = self._watches.get(agent_id)
+            if watch is None or watch.seq != seq:
+                continue
+            if watch.deadline is not None and now >= watch.deadline:
+                self._expire(watch)
+                continue
+            self._lags.append(now - due)
+            batch.append(watch)
+        return batch
+
+    async def _run_check(self, watch: _Watch):
+        agent = watch.agent
+        self.stats["checks"] += 1
+        try:
+            triggered = await asyncio.wait_for(watch.condition(), self.check_timeout)
+            if triggered:
+                detail = await asyncio.wait_for(watch.action(), self.check_timeout)
+                self.stats["triggered"] += 1
+                output = {
+                    "type": "condition_triggered",
+                    "timestamp": datetime.now().isoformat(),
+                }
+                if isinstance(detail, str):
+                    output["detail"] = detail
+                agent.outputs.append(output)
+            watch.failures = 0
+        except Exception as e:
+            self.stats["errors"] += 1
+            watch.failures += 1
+            agent.errors.append(str(e) or type(e).__name__)
+            logger.warning("monitor_scheduler.check_failed", agent_id=agent.id,
+                           failures=watch.failures, error=str(e))
+
+    def _reschedule(self, watch: _Watch):
+        if self._watches.get(watch.agent.id) is not watch:
+            return  # Removed while its check ran
+        if watch.failures >= self.max_failures:
+            self._fail(watch)
+            return
+        now = time.monotonic()
+        # Fixed rate, but never try to catch up on runs missed while overloaded
+        watch.due = max(watch.due + watch.interval, now) + watch.interval * self._rng.uniform(0.0, self.jitter)
+        if watch.deadline is not None:
+            watch.due = min(watch.due, watch.deadline)  # Wake up in time to expire it
+        self._push(watch)
+        self._dirty = self._dirty or watch.check is not None
+
+    def _expire(self, watch: _Watch):
+        from .spawner import AgentStatus
+        watch.agent.errors.append("Monitor timed out")
+        watch.agent.status = AgentStatus.TERMINATED
+        watch.agent.completed_at = datetime.now()
+        self.remove(watch.agent.id)
+
+    def _fail(self, watch: _Watch):
+        from .spawner import AgentStatus
+        watch.agent.status = AgentStatus.FAILED
+        watch.agent.completed_at = datetime.now()
+        self.remove(watch.agent.id)
+
+    # ============================================
+    # LAG REPORTING
+    # ============================================
+
+    def lag_report(self) -> Dict[str, Any]:
+        """Monitor count and check start lag (ms) over recent checks."""
+        lags = sorted(self._lags)
+
+        def pct(p: float) -> float:
+            if not lags:
+                return 0.0
+            return round(lags[min(len(lags) - 1, int(p * len(lags)))] * 1000.0, 2)
+
+        return {
+            "monitors": len(self._watches),
+            "lag_p50_ms": pct(0.50),
+            "lag_p95_ms": pct(0.95),
+            "lag_max_ms": round(lags[-1] * 1000.0, 2) if lags else 0.0,
+            **self.stats,
+        }
+
+    # ============================================
+    # PERSISTENCE
+    # ============================================
+
+    def _mark_dirty(self, watch: _Watch):
+        if watch.check is not None:
+            self._dirty = True
+            self._wakeup.set()
+
+    def _maybe_persist(self):
+        if not self._dirty or self.state_path is None:
+            return
+        if time.monotonic() - self._last_persist < self.persist_interval:
+            return
+        self.persist()
+        logger.info("monitor_scheduler.lag", **self.lag_report())
+
+    def persist(self):
+        """Write persistable monitors and their next run times to disk."""
+        if self.state_path is None:
+            return
+        now_mono, now_wall = time.monotonic(), time.time()
+        self._last_persist = now_mono  # Also after a failure, so a full disk can't spin the loop
+        entries = []
+        for watch in self._watches.values():
+            if watch.check is None:
+                continue
+            agent = watch.agent
+            entries.append({
+                "agent_id": agent.id,
+                "name": agent.config.name,
+                "purpose": agent.config.purpose,
+                "parameters": _jsonable(agent.config.parameters),
+                "check": watch.check,
+                "params": watch.params,
+                "interval": watch.interval,
+                "next_run_at": now_wall + (watch.due - now_mono),
+                "deadline_at": now_wall + (watch.deadline - now_mono) if watch.deadline else None,
+            })
+        try:
+            self.state_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.state_path.with_name(self.state_path.name + ".tmp")
+            tmp.write_text(json.dumps(entries, indent=2), encoding="utf-8")
+            os.replace(tmp, self.state_path)
+            self._dirty = False
+        except OSError as e:
+            logger.error("monitor_scheduler.persist_failed", path=str(self.state_path), error=str(e))
+
+    def saved_monitors(self) -> List[Dict[str, Any]]:
+        """Persisted monitor entries, for restoring after a restart."""
+        if self.state_path is None or not self.state_path.exists():
+            return []
+        try:
+            return json.loads(self.state_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError) as e:
+            logger.error("monitor_scheduler.load_failed", path=str(self.state_path), error=str(e))
+            return []
+
+    def restore(self, agent: Any, entry: Dict[str, Any]) -> Optional[asyncio.Future]:
+        """Re-create a saved monitor for `agent`; None if it has expired or its check is gone."""
+        factory = MONITOR_CHECKS.get(entry.get("check"))
+        if factory is None:
+            logger.warning("monitor_scheduler.unknown_check", agent_id=agent.id, check=entry.get("check"))
+            return None
+
+        now_mono, now_wall = time.monotonic(), time.time()
+        deadline_at = entry.get("deadline_at")
+        if deadline_at is not None and deadline_at <= now_wall:
+            return None
+        interval = float(entry["interval"])
+        # Runs missed while we were down are not replayed; overdue ones start jittered
+        due = now_mono + max(0.0, entry["next_run_at"] - now_wall)
+        if entry["next_run_at"] <= now_wall:
+            due += interval * self._rng.uniform(0.0, self.jitter)
+
+        condition, action = factory(entry.get("params", {}))
+        return self.add(
+            agent, condition, action, interval,
+            timeout=deadline_at - now_wall if deadline_at is not None else None,
+            check=entry["check"], params=entry.get("params", {}), first_due=due,
+        )
+
+    async def stop(self):
+        """Stop the loop and save state; monitors stay scheduled on disk."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._dirty:
+            self.persist()
+        for watch in self._watches.values():
+            if not watch.done.done():
+                watch.done.cancel()
+        self._watches.clear()
+        self._heap.clear()
+
+
+def _jsonable(values: Dict[str, Any]) -> Dict[str, Any]:
+    """Drop values (like callables) that can't be written to JSON."""
+    return {k: v for k, v in values.items() if isinstance(v, (str, int, float, bool, list, dict, type(None)))}
+
+
+# ============================================
+# BUILT-IN CHECKS
+# ============================================
+# Each alerts once when its condition starts to hold, and again only after
+# it has cleared, so a full disk is reported once rather than every interval.
+
+def _edge_triggered(probe: Callable[[], Awaitable[Optional[str]]], check: str) -> Tuple[Condition, Action]:
+    """Turn probe() -> problem description or None into a condition and action."""
+    state = {"problem": None, "alerting": False}
+
+    async def condition() -> bool:
+        state["problem"] = await probe()
+        if state["problem"] is None:
+            state["alerting"] = False
+            return False
+        if state["alerting"]:
+            return False
+        state["alerting"] = True
+        return True
+
+    async def action() -> str:
+        logger.warning("monitor.alert", check=check, problem=state["problem"])
+        return state["problem"]
+
+    return condition, action
+
+
+@register_check("disk_usage")
+def disk_usage_check(params: Dict[str, Any]) -> Tuple[Condition, Action]:
+    """The filesystem holding `path` is at least `threshold_percent` full."""
+    path = params.get("path", "/")
+    threshold = float(params.get("threshold_percent", 90))
+
+    async def probe() -> Optional[str]:
+        usage = await asyncio.to_thread(shutil.disk_usage, path)
+        percent = usage.used / usage.total * 100 if usage.total else 0.0
+        if percent < threshold:
+            return None
+        return f"{path} is {percent:.1f}% full (threshold {threshold:g}%)"
+
+    return _edge_triggered(probe, "disk_usage")
+
+
+@register_check("http_health")
+def http_health_check(params: Dict[str, Any]) -> Tuple[Condition, Action]:
+    """A service's health URL is unreachable or answers with an unexpected status."""
+    url = params.get("url")
+    if not url:
+        raise ValueError("The http_health check needs a url")
+    expect = int(params.get("expect_status", 200))
+    timeout = float(params.get("timeout_seconds", 10))
+
+    async def probe() -> Optional[str]:
+        import httpx
+        try:
+            async with httpx.AsyncClient(timeout=timeout) as client:
+                response = await client.get(url)
+        except httpx.HTTPError as e:
+            return f"{url} is unreachable ({type(e).__name__})"
+        if response.status_code != expect:
+            return f"{url} returned {response.status_code}, expected {expect}"
+        return None
+
+    return _edge_triggered(probe, "http_health")
+
+
+@register_check("load_average")
+def load_average_check(params: Dict[str, Any]) -> Tuple[Condition, Action]:
+    """The 1-minute load average is at least `threshold` (default: the CPU count)."""
+    threshold = float(params.get("threshold", os.cpu_count() or 1))
+
+    async def probe() -> Optional[str]:
+        load = os.getloadavg()[0]
+        if load < threshold:
+            return None
+        return f"1-minute load average is {load:.2f} (threshold {threshold:g})"
+
+    return _edge_triggered(probe, "load_average")
+
+
+_URL = re.compile(r"https?://[^\s,;)]+")
+_PATH = re.compile(r"(?<![\w/])(/[\w./-]*)")
+_PERCENT = re.compile(r"(\d+(?:\.\d+)?)\s*%")
+_NUMBER = re.compile(r"\b(\d+(?:\.\d+)?)\b")
+
+
+def _known_services() -> Dict[str, str]:
+    """Health URLs for the services Aurora already knows the address of."""
+    from ..core.config import settings
+
+    services = {"ollama": settings.ollama_host.rstrip("/") + "/api/tags"}
+    if settings.inference_url:
+        services["inference"] = settings.inference_url.rstrip("/") + "/healthz"
+    return services
+
+
+def match_check(description: str) -> Optional[Tuple[str, Dict[str, Any]]]:
+    """
+    Map a plain-language monitor request onto a built-in check.
+
+    Returns (check name, params), or None when nothing fits.
+    """
+    text = description.lower()
+
+    url = _URL.search(description)
+    if url:
+        return "http_health", {"url": url.group(0).rstrip(".")}
+
+    if any(word in text for word in ("disk", "storage", "space", "volume")):
+        params: Dict[str, Any] = {}
+        path = _PATH.search(description)
+        if path:
+            params["path"] = path.group(1).rstrip(".") or "/"
+        percent = _PERCENT.search(text)
+        if percent:
+            params["threshold_percent"] = float(percent.group(1))
+        return "disk_usage", params
+
+    if any(word in text for word in ("load", "cpu")):
+        number = _NUMBER.search(text)
+        return "load_average", {"threshold": float(number.group(1))} if number else {}
+
+    for service, health_url in _known_services().items():
+        if service in text:
+            return "http_health", {"url": health_url}
+
+    return None
@@ -0,0 +1,245 @@
+"""
+Aurora Forester - Agent Output Log
+Bounded in-memory tails for agent outputs and errors, with older entries
+streamed to Postgres.
+
+An agent keeps only its last `capacity` outputs (and errors) in memory.
+Each entry that falls off the tail is handed to the OutputSpiller, which
+batches entries from every agent and writes them to
+aurora_core.agent_outputs in the background. Entries are numbered per agent
+(`seq`), so a tail plus the spilled rows always reassemble in order.
+
+If Postgres is not available, entries are spilled to the local SQLite
+file the agent registry also uses (learning_path/agents.db) instead. Only
+if that fails too, or the buffer outgrows `max_buffer` while a store is
+falling behind, are entries dropped - memory stays bounded either way.
+Drops are logged and shown in `/agents`.
+"""
+
+import asyncio
+import json
+from collections import deque
+from typing import Any, Callable, Deque, Iterator, List, Optional, Tuple
+
+import structlog
+
+
+logger = structlog.get_logger()
+
+
+class OutputTail:
+    """
+    The most recent `capacity` entries of an append-only log.
+
+    Behaves like a list for appending, iterating and indexing the resident
+    entries; `total` counts every entry ever appended.
+    """
+
+    __slots__ = ("_items", "total", "spill")
+
+    def __init__(self, capacity: int = 100, spill: Optional[Callable[[int, Any], None]] = None):
+        self._items: Deque[Any] = deque(maxlen=max(1, capacity))
+        self.total = 0
+        self.spill = spill  # spill(seq, entry) for each entry leaving the tail
+
+    @property
+    def first_seq(self) -> int:
+        """Sequence number of the oldest resident entry."""
+        return self.total - len(self._items)
+
+    def append(self, entry: Any):
+        if len(self._items) == self._items.maxlen and self.spill is not None:
+            self.spill(self.first_seq, self._items[0])
+        self._items.append(entry)
+        self.total += 1
+
+    def spill_all(self):
+        """Hand every resident entry to the spill sink (e.g. before eviction)."""
+        if self.spill is not None:
+            for offset, entry in enumerate(self._items):
+                self.spill(self.first_seq + offset, entry)
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self._items)
+
+    def __getitem__(self, index: int) -> Any:
+        return self._items[index]
+
+    def __repr__(self) -> str:
+        return f"OutputTail(resident={len(self._items)}, total={self.total})"
+
+
+class OutputSpiller:
+    """
+    Batches spilled entries and writes them to Postgres.
+
+    `repo_provider` returns an AgentOutputRepository; it is resolved on
+    first flush. If the database is not available, `fallback_provider`
+    (the local SQLite store by default) is used instead, and only if that
+    fails too does spilling switch itself off.
+    """
+
+    def __init__(
+        self,
+        repo_provider: Optional[Callable[[], Any]] = None,
+        fallback_provider: Optional[Callable[[], Any]] = None,
+        batch_size: int = 200,
+        flush_interval: float = 5.0,
+        max_buffer: int = 10000
+    ):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._repo_provider = repo_provider
+        self._fallback_provider = fallback_provider
+        self._repo = None
+        self.store: Optional[str] = None  # "postgres" or "local" once resolved
+        self._disabled = False
+        self._buffer: Deque[Tuple[str, str, int, Any]] = deque()
+        self.max_buffer = max_buffer
+        self._task: Optional[asyncio.Task] = None
+        self.stats = {"spilled": 0, "written": 0, "dropped": 0}
+        self._dropped_logged = 0
+
+    def sink(self, agent_id: str, kind: str) -> Callable[[int, Any], None]:
+        """A spill callback for one agent's outputs or errors."""
+        return lambda seq, entry: self.add(agent_id, kind, seq, entry)
+
+    def add(self, agent_id: str, kind: str, seq: int, entry: Any):
+        self.stats["spilled"] += 1
+        if self._disabled:
+            self._drop(1)
+            return
+        if len(self._buffer) >= self.max_buffer:
+            self._buffer.popleft()  # Store is falling behind; keep memory bounded
+            self._drop(1)
+        self._buffer.append((agent_id, kind, seq, entry))
+        self._schedule()
+
+    def _drop(self, count: int):
+        """Count lost entries, logging at most once per 1000 (and the first)."""
+        self.stats["dropped"] += count
+        if self.stats["dropped"] - self._dropped_logged >= 1000 or self._dropped_logged == 0:
+            self._dropped_logged = self.stats["dropped"]
+            logger.warning("agent_outputs.dropped", total=self.stats["dropped"],
+                           store=self.store, buffered=len(self._buffer))
+
+    def _schedule(self):
+        if self._task is not None and not self._task.done():
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return  # No loop yet; the next add() or close() flushes
+        self._task = loop.create_task(self._flush_soon())
+
+    async def _flush_soon(self):
+        if len(self._buffer) < self.batch_size:
+            await asyncio.sleep(self.flush_interval)
+        # Keep going while writes fail (backing off), so output from an agent
+        # that has gone quiet is not held in memory until shutdown
+        delay = self.flush_interval
+        while True:
+            await self.flush()
+            if not self._buffer or self._disabled:
+                return
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 60.0)
+
+    async def _get_repo(self):
+        if self._disabled:
+            return None
+        if self._repo is None:
+            if self._repo_provider is None:
+                from ..db.connection import get_agent_output_repo
+                self._repo_provider = get_agent_output_repo
+            if self._fallback_provider is None:
+                self._fallback_provider = _local_repo
+            try:
+                # Postgres' table is created at startup by init_persistence()
+                self._repo, self.store = self._repo_provider(), "postgres"
+            except RuntimeError as e:
+                try:
+                    repo = self._fallback_provider()
+                    await repo.ensure_schema()
+                except Exception as local_error:
+                    logger.error("agent_outputs.spill_disabled", reason=str(e),
+                                 local_error=str(local_error))
+                    self._disabled = True
+                    return None
+                logger.warning("agent_outputs.local_fallback", reason=str(e),
+                               path=str(getattr(repo, "path", "")))
+                self._repo, self.store = repo, "local"
+        return self._repo
+
+    async def flush(self):
+        """
+        Write everything buffered. A batch that fails to write goes back
+        into the buffer (as far as it has room) for the next flush.
+        """
+        repo = await self._get_repo()
+        if repo is None:
+            if self._buffer:
+                self._drop(len(self._buffer))
+                self._buffer.clear()
+            return
+
+        while self._buffer:
+            entries = [self._buffer.popleft() for _ in range(min(self.batch_size, len(self._buffer)))]
+            batch: List[Tuple[str, str, int, str]] = [
+                (agent_id, kind, seq, json.dumps(entry, default=str))
+                for agent_id, kind, seq, entry in entries
+            ]
+            try:
+                await repo.append_many(batch)
+                self.stats["written"] += len(batch)
+            except Exception as e:
+                logger.error("agent_outputs.spill_failed", rows=len(batch), error=str(e))
+                room = max(0, self.max_buffer - len(self._buffer))
+                if room < len(entries):
+                    self._drop(len(entries) - room)
+                self._buffer.extendleft(reversed(entries[:room]))
+                return
+
+    async def fetch_older(
+        self,
+        agent_id: str,
+        kind: str = "output",
+        before_seq: Optional[int] = None,
+        limit: int = 50
+    ) -> List[Any]:
+        """Spilled entries older than `before_seq`, oldest first."""
+        await self.flush()
+        repo = await self._get_repo()
+        if repo is None:
+            return []
+        rows = await repo.fetch_page(agent_id, kind, before_seq, limit)
+        return [
+            json.loads(row["payload"]) if isinstance(row["payload"], (str, bytes)) else row["payload"]
+            for row in reversed(rows)
+        ]
+
+    async def close(self):
+        """Flush what is left and stop."""
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        await self.flush()
+        if self._buffer:
+            self._drop(len(self._buffer))  # The store is still failing
+            self._buffer.clear()
+        if self._repo is not None and hasattr(self._repo, "close"):
+            self._repo.close()
+
+
+def _local_repo():
+    """The SQLite output store next to the local agent registry."""
+    from ..core.config import settings
+    from ..db.local import SqliteAgentOutputRepository
+
+    return SqliteAgentOutputRepository(settings.learning_path / "agents.db")
@@ -0,0 +1,211 @@
+"""
+Aurora Forester - Agent Worker Pool
+Bounded, kind-aware execution of agent runs on the event loop.
+
+At most `workers` jobs run at once, and each kind of job (agent type) can
+be capped further so one flood of research requests cannot starve
+monitors or workflows. Jobs beyond that wait in a FIFO queue of bounded
+length; a job whose kind is at its cap is skipped over rather than
+blocking the jobs queued behind it. Once the queue is full, submit()
+refuses new work instead of piling up coroutines.
+
+Timeouts and terminate() are cooperative: the job's task is cancelled, so
+CancelledError is raised at its next await and it can clean up on the way
+out.
+"""
+
+import asyncio
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional
+
+import structlog
+
+
+logger = structlog.get_logger()
+
+
+class PoolFull(RuntimeError):
+    """Raised by WorkerPool.submit() when the wait queue is full."""
+
+
+class JobTimeout(asyncio.TimeoutError):
+    """Set on a job's future when it ran past its timeout."""
+
+
+@dataclass(slots=True)
+class _Job:
+    """A submitted unit of work."""
+    key: str
+    kind: str
+    factory: Callable[[], Awaitable[Any]]
+    timeout: Optional[float]
+    future: asyncio.Future
+    task: Optional[asyncio.Task] = None
+
+
+class WorkerPool:
+    """
+    Run coroutines with a global and a per-kind concurrency limit.
+
+    `submit()` returns a future for the job's result. It fails with
+    JobTimeout if the job ran out of time, is cancelled if the job was
+    cancelled, and otherwise carries whatever the job raised.
+    """
+
+    def __init__(
+        self,
+        workers: int = 4,
+        kind_limits: Optional[Dict[str, int]] = None,
+        max_queued: int = 64
+    ):
+        self.workers = max(1, workers)
+        self.kind_limits = dict(kind_limits or {})
+        self.max_queued = max_queued
+        self._queued: Deque[_Job] = deque()
+        self._jobs: Dict[str, _Job] = {}  # Queued and running, by key
+        self._running_by_kind: Dict[str, int] = {}
+        self._running = 0
+        self._closed = False
+        self.stats = {
+            "submitted": 0, "completed": 0, "failed": 0,
+            "timed_out": 0, "cancelled": 0, "rejected": 0,
+        }
+
+    def submit(
+        self,
+        key: str,
+        kind: str,
+        factory: Callable[[], Awaitable[Any]],
+        timeout: Optional[float] = None
+    ) -> asyncio.Future:
+        """
+        Queue `factory()` to run under `key`.
+
+        The coroutine is only created when a worker slot is free, so
+        queued jobs cost nothing but their closure.
+        """
+        if self._closed:
+            raise RuntimeError("Worker pool is shut down")
+        if key in self._jobs:
+            raise ValueError(f"Job {key} is already queued or running")
+        if len(self._queued) >= self.max_queued and not self._has_room(kind):
+            self.stats["rejected"] += 1
+            raise PoolFull(f"{len(self._queued)} jobs already waiting")
+
+        job = _Job(key, kind, factory, timeout, asyncio.get_running_loop().create_future())
+        self._jobs[key] = job
+        self._queued.append(job)
+        self.stats["submitted"] += 1
+        self._pump()
+        return job.future
+
+    def cancel(self, key: str) -> bool:
+        """Cancel a queued or running job. Returns False if there is no such job."""
+        job = self._jobs.get(key)
+        if job is None:
+            return False
+        if job.task is None:
+            self._queued.remove(job)
+            del self._jobs[key]
+            self.stats["cancelled"] += 1
+            job.future.cancel()
+        else:
+            job.task.cancel()
+        return True
+
+    def is_running(self, key: str) -> bool:
+        job = self._jobs.get(key)
+        return job is not None and job.task is not None
+
+    @property
+    def running(self) -> int:
+        return self._running
+
+    @property
+    def queued(self) -> int:
+        return len(self._queued)
+
+    # ============================================
+    # SCHEDULING
+    # ============================================
+
+    def _has_room(self, kind: str) -> bool:
+        if self._running >= self.workers:
+            return False
+        limit = self.kind_limits.get(kind)
+        return limit is None or self._running_by_kind.get(kind, 0) < limit
+
+    def _pump(self):
+        """Start queued jobs, oldest first, while there are free slots."""
+        if self._running >= self.workers or not self._queued:
+            return
+        waiting: Deque[_Job] = deque()
+        while self._queued and self._running < self.workers:
+            job = self._queued.popleft()
+            if self._has_room(job.kind):
+                self._start(job)
+            else:
+                waiting.append(job)  # Kind at its cap - let later jobs go first
+        waiting.extend(self._queued)
+        self._queued = waiting
+
+    def _start(self, job: _Job):
+        self._running += 1
+        self._running_by_kind[job.kind] = self._running_by_kind.get(job.kind, 0) + 1
+        job.task = asyncio.get_running_loop().create_task(self._run(job))
+
+    async def _run(self, job: _Job):
+        deadline = asyncio.timeout(job.timeout)
+        try:
+            async with deadline:
+                result = await job.factory()
+        except TimeoutError as e:
+            # Only the pool's own deadline is a JobTimeout; a socket or HTTP
+            # timeout raised by the job is an ordinary failure
+            if not deadline.expired():
+                self._failed(job, e)
+                return
+            self.stats["timed_out"] += 1
+            logger.warning("agent_pool.timeout", key=job.key, kind=job.kind, timeout=job.timeout)
+            if not job.future.done():
+                job.future.set_exception(JobTimeout(f"{job.key} timed out after {job.timeout}s"))
+        except asyncio.CancelledError:
+            self.stats["cancelled"] += 1
+            job.future.cancel()
+        except Exception as e:
+            self._failed(job, e)
+        else:
+            self.stats["completed"] += 1
+            if not job.future.done():
+                job.future.set_result(result)
+        finally:
+            self._running -= 1
+            self._running_by_kind[job.kind] -= 1
+            self._jobs.pop(job.key, None)
+            if not self._closed:
+                self._pump()
+
+    def _failed(self, job: _Job, error: Exception):
+        self.stats["failed"] += 1
+        logger.error("agent_pool.job_failed", key=job.key, kind=job.kind, error=str(error))
+        if not job.future.done():
+            job.future.set_exception(error)
+
+    # ============================================
+    # LIFECYCLE
+    # ============================================
+
+    async def shutdown(self, timeout: float = 5.0):
+        """Refuse new work, drop the queue, and cancel running jobs."""
+        self._closed = True
+        for job in self._queued:
+            self._jobs.pop(job.key, None)
+            job.future.cancel()
+        self._queued.clear()
+
+        tasks = [job.task for job in self._jobs.values() if job.task is not None]
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.wait(tasks, timeout=timeout)
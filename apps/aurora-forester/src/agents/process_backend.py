@@ -0,0 +1,261 @@
+"""
+Aurora Forester - Process Backend
+Runs CPU-heavy agent steps in worker processes, off the event loop.
+
+Document analysis, summarization and similar steps would otherwise stall
+the Discord gateway heartbeat and every reply while they run. Steps are
+named functions in steps.py. A step gets the agent's AgentConfig in
+serialized form (rebuilt in the worker), and anything it emits is streamed
+back over a queue into the agent's outputs while it runs.
+
+Workers are started with the "spawn" method, so they share no state
+(or threads, or sockets) with the bot. If a worker dies mid-step, the
+executor is replaced and the steps it was running are retried once on
+the new one; the bot process itself is unaffected.
+
+A cancelled step stops being awaited immediately and its late outputs are
+dropped. If it had already started, the executor's workers are terminated
+and a fresh executor takes the next step, so abandoned work never holds a
+worker; steps that were running alongside it are retried on the new one
+without counting as crashes. Shutdown gives running steps a short grace
+period, then terminates them. (With workers=0 steps run in a thread, which
+cannot be stopped; a cancelled one finishes in the background.)
+"""
+
+import asyncio
+import itertools
+import multiprocessing
+import threading
+import time
+import weakref
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+import structlog
+
+
+logger = structlog.get_logger()
+
+
+class StepCrashed(RuntimeError):
+    """Raised when a step's worker process died and retries are used up."""
+
+
+# Marks the end of a step's outputs on the queue
+_STEP_DONE = "__step_done__"
+
+# In a worker: the queue outputs go back on (set by the pool initializer)
+_worker_queue = None
+
+
+def _init_worker(queue):
+    global _worker_queue
+    _worker_queue = queue
+
+
+def _run_step(
+    job_id: int,
+    step: str,
+    config_data: Dict[str, Any],
+    kwargs: Dict[str, Any],
+    emit: Optional[Callable[[int, Any], None]] = None
+) -> Any:
+    """Worker entry point: rebuild the config, run the step, stream outputs."""
+    from .spawner import AgentConfig
+    from .steps import STEPS
+
+    send = emit or (lambda job, output: _worker_queue.put((job, output)))
+    try:
+        func = STEPS[step]
+        config = AgentConfig.from_dict(config_data)
+        return func(config, lambda output: send(job_id, output), **kwargs)
+    finally:
+        send(job_id, _STEP_DONE)
+
+
+class ProcessBackend:
+    """Process pool for CPU-bound agent steps. workers=0 runs steps in a thread instead."""
+
+    def __init__(
+        self,
+        workers: int = 2,
+        crash_retries: int = 1,
+        drain_timeout: float = 1.0,
+        shutdown_grace: float = 2.0
+    ):
+        self.workers = workers
+        self.crash_retries = crash_retries
+        self.drain_timeout = drain_timeout
+        self.shutdown_grace = shutdown_grace
+        self._context = multiprocessing.get_context("spawn")
+        self._executor: Optional[ProcessPoolExecutor] = None
+        # Executors whose workers were stopped on purpose -> whether their steps are retried
+        self._stopped: "weakref.WeakKeyDictionary[ProcessPoolExecutor, bool]" = weakref.WeakKeyDictionary()
+        self._queue = None
+        self._reader: Optional[threading.Thread] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._jobs: Dict[int, Any] = {}  # job id -> agent
+        self._drained: Dict[int, asyncio.Event] = {}
+        self._ids = itertools.count(1)
+        self.stats = {"steps": 0, "outputs": 0, "crashes": 0, "failed": 0, "terminated": 0}
+
+    async def run_step(self, agent: Any, step: str, **kwargs) -> Any:
+        """Run `step` for `agent` and return its result; outputs land in agent.outputs."""
+        from .steps import STEPS
+        if step not in STEPS:
+            raise ValueError(f"Unknown agent step: {step}")
+
+        self._loop = asyncio.get_running_loop()
+        job_id = next(self._ids)
+        config_data = agent.config.to_dict()
+        self._jobs[job_id] = agent
+        self._drained[job_id] = asyncio.Event()
+        self.stats["steps"] += 1
+        try:
+            result = await self._submit(job_id, step, config_data, kwargs)
+            # Outputs travel on a different pipe than the result; let them catch up
+            try:
+                await asyncio.wait_for(self._drained[job_id].wait(), self.drain_timeout)
+            except asyncio.TimeoutError:
+                logger.warning("agent_backend.outputs_late", agent_id=agent.id, step=step)
+            return result
+        except (asyncio.CancelledError, StepCrashed):
+            raise
+        except Exception:
+            self.stats["failed"] += 1
+            raise
+        finally:
+            self._jobs.pop(job_id, None)
+            self._drained.pop(job_id, None)
+
+    async def _submit(self, job_id: int, step: str, config_data: Dict[str, Any], kwargs: Dict[str, Any]) -> Any:
+        if self.workers <= 0:
+            return await asyncio.to_thread(_run_step, job_id, step, config_data, kwargs, self._receive)
+
+        crashes = 0
+        while True:
+            executor = self._get_executor()
+            future = executor.submit(_run_step, job_id, step, config_data, kwargs)
+            try:
+                return await asyncio.wrap_future(future)
+            except asyncio.CancelledError:
+                if not future.cancel() and not future.done():
+                    # Already running: stop it rather than let it hold a worker unobserved
+                    self._terminate(executor, step)
+                raise
+            except BrokenProcessPool as e:
+                if executor in self._stopped:
+                    if self._stopped[executor]:
+                        continue  # Stopped for another step's cancellation; not a crash
+                    raise StepCrashed(f"Backend shut down while running {step}")
+                self.stats["crashes"] += 1
+                self._discard_executor(executor)
+                crashes += 1
+                logger.error("agent_backend.worker_crashed", step=step, attempt=crashes, error=str(e))
+                if crashes > self.crash_retries:
+                    raise StepCrashed(f"Worker crashed running {step}")
+
+    # ============================================
+    # OUTPUT STREAMING
+    # ============================================
+
+    def _receive(self, job_id: int, output: Any):
+        """Called from the reader (or step) thread; hand off to the event loop."""
+        loop = self._loop
+        if loop is not None and not loop.is_closed():
+            loop.call_soon_threadsafe(self._deliver, job_id, output)
+
+    def _deliver(self, job_id: int, output: Any):
+        if output == _STEP_DONE:
+            event = self._drained.get(job_id)
+            if event is not None:
+                event.set()
+            return
+        agent = self._jobs.get(job_id)
+        if agent is None:
+            return  # Step was cancelled or has finished
+        if isinstance(output, dict):
+            output = {**output, "timestamp": output.get("timestamp") or datetime.now().isoformat()}
+        agent.outputs.append(output)
+        self.stats["outputs"] += 1
+
+    def _read_outputs(self, queue):
+        while True:
+            try:
+                item = queue.get()
+            except (EOFError, OSError):
+                return
+            if item is None:
+                return
+            self._receive(*item)
+
+    # ============================================
+    # EXECUTOR LIFECYCLE
+    # ============================================
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            if self._queue is None:
+                self._queue = self._context.Queue()
+                self._reader = threading.Thread(
+                    target=self._read_outputs, args=(self._queue,),
+                    name="agent-backend-outputs", daemon=True,
+                )
+                self._reader.start()
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=self._context,
+                initializer=_init_worker,
+                initargs=(self._queue,),
+            )
+            logger.info("agent_backend.started", workers=self.workers)
+        return self._executor
+
+    def _discard_executor(self, executor: ProcessPoolExecutor):
+        """Drop a broken executor; the next step starts a fresh one."""
+        if self._executor is executor:
+            self._executor = None
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    @staticmethod
+    def _processes(executor: ProcessPoolExecutor) -> List[Any]:
+        # The executor has no public handle on its workers before 3.14
+        return list((getattr(executor, "_processes", None) or {}).values())
+
+    def _terminate(self, executor: ProcessPoolExecutor, step: str):
+        """Replace `executor` and kill its workers, abandoning what they were running."""
+        processes = self._processes(executor)
+        self._stopped[executor] = True
+        self._discard_executor(executor)
+        for process in processes:
+            process.terminate()
+        self.stats["terminated"] += 1
+        logger.info("agent_backend.step_terminated", step=step, workers=len(processes))
+
+    @staticmethod
+    def _stop_processes(processes: List[Any], grace: float):
+        """Give workers `grace` seconds to finish, then terminate the rest."""
+        deadline = time.monotonic() + grace
+        for process in processes:
+            process.join(max(0.0, deadline - time.monotonic()))
+        for process in processes:
+            if process.is_alive():
+                process.terminate()
+                process.join(1.0)
+
+    async def shutdown(self):
+        """Stop the worker processes and the output reader."""
+        if self._executor is not None:
+            executor, self._executor = self._executor, None
+            processes = self._processes(executor)
+            self._stopped[executor] = False
+            executor.shutdown(wait=False, cancel_futures=True)
+            await asyncio.to_thread(self._stop_processes, processes, self.shutdown_grace)
+        if self._queue is not None:
+            self._queue.put(None)
+            if self._reader is not None:
+                await asyncio.to_thread(self._reader.join, 2.0)
+            self._queue = None
+            self._reader = None
@@ -0,0 +1,282 @@
+"""
+Aurora Forester - Agent Registry
+Durable record of spawned agents, so a restart resumes them instead of
+losing them.
+
+For every agent started on the worker pool the registry keeps its config,
+the arguments it was started with, its status, and a checkpoint - a small
+dict the agent's runner fills in as it makes progress (finished workflow
+steps, a research agent's document analysis). Changes are batched and
+written in the background. On startup, agents that had not finished are
+rebuilt from their rows and queued again; their runners pick up from the
+checkpoint rather than starting over.
+
+The store is Postgres (aurora_core.agents, created at startup by
+init_persistence()), or a local SQLite file for development
+(AGENT_REGISTRY=sqlite). If Postgres is not available the local file is
+used instead; with AGENT_REGISTRY=off the registry switches itself off. Monitor
+agents are not recorded here - the monitor scheduler saves its own state.
+"""
+
+import asyncio
+import json
+from typing import Any, Callable, Dict, List, Optional, Set
+
+import structlog
+
+
+logger = structlog.get_logger()
+
+
+class Checkpoint:
+    """
+    An agent's saved progress. Runners read and update `data` (plain JSON
+    values only) and call save() once a piece of work is done.
+    """
+
+    __slots__ = ("data", "_on_save")
+
+    def __init__(self, data: Optional[Dict[str, Any]] = None, on_save: Optional[Callable[[], None]] = None):
+        self.data: Dict[str, Any] = data if data is not None else {}
+        self._on_save = on_save
+
+    def save(self):
+        if self._on_save is not None:
+            self._on_save()
+
+
+class _Entry:
+    __slots__ = ("agent", "run_args", "checkpoint")
+
+    def __init__(self, agent: Any, run_args: Optional[Dict[str, Any]], checkpoint: Checkpoint):
+        self.agent = agent
+        self.run_args = run_args
+        self.checkpoint = checkpoint
+
+
+class AgentRegistry:
+    """
+    Batches agent status and checkpoint writes to the registry store.
+
+    `repo_provider` returns an AgentRegistryRepository (or the SQLite one);
+    it is resolved on first use, and if the database is not available the
+    registry switches itself off.
+    """
+
+    def __init__(
+        self,
+        repo_provider: Optional[Callable[[], Any]] = None,
+        terminal_statuses: Set[str] = frozenset(),
+        flush_interval: float = 1.0
+    ):
+        self.terminal_statuses = sorted(terminal_statuses)
+        self.flush_interval = flush_interval
+        self._repo_provider = repo_provider
+        self._repo = None
+        self._disabled = False
+        self._closed = False
+        self._entries: Dict[str, _Entry] = {}
+        self._dirty: Set[str] = set()
+        self._task: Optional[asyncio.Task] = None
+        self.stats = {"written": 0, "failed_writes": 0}
+
+    # ============================================
+    # RECORDING
+    # ============================================
+
+    def record(
+        self,
+        agent: Any,
+        run_args: Dict[str, Any],
+        checkpoint: Optional[Dict[str, Any]] = None
+    ) -> Checkpoint:
+        """
+        Start tracking an agent (or keep tracking a resumed one) and
+        return its checkpoint.
+        """
+        entry = self._entries.get(agent.id)
+        if entry is None:
+            entry = _Entry(
+                agent,
+                _json_or_none(run_args),
+                Checkpoint(checkpoint, on_save=lambda: self._mark(agent.id)),
+            )
+            self._entries[agent.id] = entry
+        self._mark(agent.id)
+        return entry.checkpoint
+
+    def checkpoint_for(self, agent_id: str) -> Checkpoint:
+        """The checkpoint of a tracked agent; a throwaway one otherwise."""
+        entry = self._entries.get(agent_id)
+        return entry.checkpoint if entry is not None else Checkpoint()
+
+    def status_changed(self, agent: Any):
+        if agent.id in self._entries:
+            self._mark(agent.id)
+
+    def _mark(self, agent_id: str):
+        if self._disabled or self._closed:
+            return
+        self._dirty.add(agent_id)
+        self._schedule()
+
+    def _schedule(self):
+        if self._task is not None and not self._task.done():
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return  # No loop yet; the next change or close() flushes
+        self._task = loop.create_task(self._flush_soon())
+
+    async def _flush_soon(self):
+        # Keep going while writes fail (backing off), so a final status
+        # is not left waiting for the next change
+        delay = self.flush_interval
+        while True:
+            await asyncio.sleep(delay)
+            await self.flush()
+            if not self._dirty or self._disabled:
+                return
+            delay = min(delay * 2, 60.0)
+
+    # ============================================
+    # STORAGE
+    # ============================================
+
+    async def _get_repo(self):
+        if self._disabled:
+            return None
+        if self._repo is None:
+            if self._repo_provider is None:
+                self._repo_provider = default_repo_provider()
+            try:
+                repo = self._repo_provider()
+                if repo is None:
+                    raise RuntimeError("Agent registry is turned off")
+                await repo.ensure_schema()
+            except RuntimeError as e:
+                logger.warning("agent_registry.disabled", reason=str(e))
+                self._disabled = True
+                self._dirty.clear()
+                return None
+            self._repo = repo
+        return self._repo
+
+    async def flush(self):
+        """
+        Write every changed agent. Finished agents are forgotten only once
+        their final status is written; if the write fails they stay dirty
+        and are retried.
+        """
+        repo = await self._get_repo()
+        if repo is None or not self._dirty:
+            return
+
+        # Changes made while the write is in flight land in a fresh set
+        dirty, self._dirty = self._dirty, set()
+        rows = []
+        finished = []
+        for agent_id in dirty:
+            entry = self._entries.get(agent_id)
+            if entry is None:
+                continue
+            agent = entry.agent
+            rows.append((
+                agent.id,
+                agent.config.agent_type.value,
+                agent.status.value,
+                json.dumps(agent.config.to_dict()),
+                json.dumps(entry.run_args) if entry.run_args is not None else None,
+                json.dumps(entry.checkpoint.data, default=str),
+                agent.outputs.total,
+                agent.errors.total,
+                agent.created_at,
+            ))
+            if agent.status.value in self.terminal_statuses:
+                finished.append(agent_id)
+
+        try:
+            await repo.upsert_many(rows)
+        except Exception as e:
+            self._dirty |= dirty
+            self.stats["failed_writes"] += 1
+            logger.error("agent_registry.write_failed", rows=len(rows), error=str(e))
+            return
+
+        self.stats["written"] += len(rows)
+        for agent_id in finished:
+            if agent_id not in self._dirty:
+                del self._entries[agent_id]  # Final status is stored; nothing more to record
+
+    async def load_unfinished(self) -> List[Dict[str, Any]]:
+        """Rows for agents that had not finished when the bot last stopped."""
+        repo = await self._get_repo()
+        if repo is None:
+            return []
+        rows = await repo.load_unfinished(self.terminal_statuses)
+        return [
+            {
+                **row,
+                "config": _loads(row["config"]),
+                "run_args": _loads(row["run_args"]),
+                "checkpoint": _loads(row["checkpoint"]) or {},
+            }
+            for row in rows
+        ]
+
+    async def close(self):
+        """
+        Write what is pending and stop recording, so agents cancelled by
+        shutdown keep their unfinished status and resume on the next start.
+        """
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        await self.flush()
+        self._closed = True
+        if self._repo is not None and hasattr(self._repo, "close"):
+            self._repo.close()
+
+
+def default_repo_provider() -> Callable[[], Any]:
+    """Pick the registry store from settings.agent_registry."""
+    from ..core.config import settings
+
+    backend = settings.agent_registry.lower()
+    if backend == "sqlite":
+        from ..db.local import SqliteAgentRegistryRepository
+        return lambda: SqliteAgentRegistryRepository(settings.learning_path / "agents.db")
+    if backend == "postgres":
+        return _postgres_or_local
+    return lambda: None
+
+
+def _postgres_or_local():
+    """The Postgres registry, or the local SQLite one if the database is down."""
+    from ..core.config import settings
+    from ..db.connection import get_agent_registry_repo
+    from ..db.local import SqliteAgentRegistryRepository
+
+    try:
+        return get_agent_registry_repo()
+    except RuntimeError as e:
+        path = settings.learning_path / "agents.db"
+        logger.warning("agent_registry.local_fallback", reason=str(e), path=str(path))
+        return SqliteAgentRegistryRepository(path)
+
+
+def _json_or_none(value: Any) -> Optional[Any]:
+    """`value` if it survives a JSON round trip (no callables), else None."""
+    try:
+        json.dumps(value)
+    except (TypeError, ValueError):
+        return None
+    return value
+
+
+def _loads(value: Any) -> Any:
+    return json.loads(value) if isinstance(value, (str, bytes)) else value
@@ -1,15 +1,37 @@
 """
 Aurora Forester - Agent Spawning System
 Aurora's ability to create specialized agents for specific tasks.
+
+Agents started with AgentSpawner.start() run on a bounded WorkerPool:
+a fixed number run at once, each agent type has its own cap, and
+`timeout_minutes` is enforced for agents with `auto_terminate` set.
+MONITOR agents take no worker; they are checked by the shared
+MonitorScheduler (see monitors.py).
 """
 
 from typing import Optional, Dict, Any, List, Callable, Awaitable
+from collections import OrderedDict
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
 import uuid
 import json
 import asyncio
+import time
+
+import structlog
+
+from ..core.config import settings
+from ..core.intent import get_intent_classifier
+from .monitors import MONITOR_CHECKS, MonitorScheduler, match_check
+from .output_log import OutputSpiller, OutputTail
+from .pool import JobTimeout, PoolFull, WorkerPool
+from .process_backend import ProcessBackend
+from .registry import AgentRegistry, Checkpoint
+from .workflow import StepCache, run_workflow
+
+
+logger = structlog.get_logger()
 
 
 class AgentType(Enum):
@@ -32,6 +54,9 @@ class AgentStatus(Enum):
     TERMINATED = "terminated"
 
 
+TERMINAL_STATUSES = frozenset({AgentStatus.COMPLETED, AgentStatus.FAILED, AgentStatus.TERMINATED})
+
+
 @dataclass
 class AgentCapability:
     """A capability an agent possesses."""
@@ -50,21 +75,73 @@ class AgentConfig:
     parameters: Dict[str, Any] = field(default_factory=dict)
     timeout_minutes: int = 60
     parent_id: Optional[str] = None
-    auto_terminate: bool = True
+    auto_terminate: bool = True  # Terminate the agent once it has run for timeout_minutes
 
+    def to_dict(self) -> Dict[str, Any]:
+        """Plain-data form, e.g. for worker processes. Non-JSON parameters (callables) are dropped."""
+        return {
+            "name": self.name,
+            "agent_type": self.agent_type.value,
+            "purpose": self.purpose,
+            "capabilities": [
+                {"name": c.name, "description": c.description, "parameters": c.parameters}
+                for c in self.capabilities
+            ],
+            "parameters": {
+                k: v for k, v in self.parameters.items()
+                if isinstance(v, (str, int, float, bool, list, dict, type(None)))
+            },
+            "timeout_minutes": self.timeout_minutes,
+            "parent_id": self.parent_id,
+            "auto_terminate": self.auto_terminate,
+        }
 
-@dataclass
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "AgentConfig":
+        """Rebuild a config from to_dict() output."""
+        return cls(
+            name=data["name"],
+            agent_type=AgentType(data["agent_type"]),
+            purpose=data["purpose"],
+            capabilities=[AgentCapability(**c) for c in data.get("capabilities", [])],
+            parameters=dict(data.get("parameters", {})),
+            timeout_minutes=data.get("timeout_minutes", 60),
+            parent_id=data.get("parent_id"),
+            auto_terminate=data.get("auto_terminate", True),
+        )
+
+
+@dataclass(slots=True)
 class SpawnedAgent:
-    """A spawned agent instance."""
+    """
+    A spawned agent instance. Mutable: status and outputs change as it runs.
+
+    `outputs` and `errors` keep only their most recent entries in memory
+    (see output_log.py). `on_status(agent, old, new)`, if set, is called on
+    every status change.
+    """
     id: str
     config: AgentConfig
     status: AgentStatus = AgentStatus.INITIALIZING
-    outputs: List[Dict[str, Any]] = field(default_factory=list)
-    errors: List[str] = field(default_factory=list)
+    outputs: OutputTail = field(default_factory=lambda: OutputTail(settings.agent_output_tail))
+    errors: OutputTail = field(default_factory=lambda: OutputTail(settings.agent_error_tail))
     created_at: datetime = field(default_factory=datetime.now)
     started_at: Optional[datetime] = None
     completed_at: Optional[datetime] = None
     metadata: Dict[str, Any] = field(default_factory=dict)
+    on_status: Optional[Callable[["SpawnedAgent", AgentStatus, AgentStatus], None]] = field(
+        default=None, repr=False, compare=False
+    )
+
+    def __setattr__(self, name: str, value: Any):
+        if name != "status":
+            object.__setattr__(self, name, value)
+            return
+        old = getattr(self, "status", None)
+        object.__setattr__(self, name, value)
+        observer = getattr(self, "on_status", None)
+        if observer is not None and old is not value:
+            observer(self, old, value)
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for storage."""
@@ -74,8 +151,8 @@ class SpawnedAgent:
             "type": self.config.agent_type.value,
             "purpose": self.config.purpose,
             "status": self.status.value,
-            "outputs": self.outputs,
-            "errors": self.errors,
+            "outputs": list(self.outputs),
+            "errors": list(self.errors),
             "created_at": self.created_at.isoformat(),
             "started_at": self.started_at.isoformat() if self.started_at else None,
             "completed_at": self.completed_at.isoformat() if self.completed_at else None,
@@ -128,7 +205,8 @@ AGENT_TEMPLATES: Dict[str, AgentConfig] = {
         parameters={
             "check_interval_minutes": 5,
             "alert_channels": ["discord"],
-        }
+        },
+        auto_terminate=False,  # Watches until terminated
     ),
     "bmad": AgentConfig(
         name="BMAD Agent",
@@ -150,23 +228,48 @@ AGENT_TEMPLATES: Dict[str, AgentConfig] = {
 # AGENT RUNNERS
 # ============================================
 
-async def run_research_agent(agent: SpawnedAgent, query: str) -> Dict[str, Any]:
+async def run_research_agent(
+    agent: SpawnedAgent,
+    query: str,
+    documents: Optional[List[str]] = None,
+    backend: Optional[ProcessBackend] = None,
+    checkpoint: Optional[Checkpoint] = None
+) -> Dict[str, Any]:
     """
     Run a research agent to investigate a topic.
+
+    Given `documents`, they are analyzed on the process backend so the
+    CPU-heavy work stays off the event loop. The analysis is checkpointed,
+    so a resumed agent does not redo it.
     """
+    checkpoint = checkpoint or Checkpoint()
     agent.status = AgentStatus.ACTIVE
     agent.started_at = datetime.now()
 
     try:
-        # Placeholder for actual research implementation
-        # In production: use LangChain/LangGraph for research chain
-        results = {
-            "query": query,
-            "findings": [],
-            "summary": f"Research on '{query}' - placeholder",
-            "sources": [],
-            "confidence": 0.0
-        }
+        if documents and backend is not None:
+            analysis = checkpoint.data.get("analysis")
+            if analysis is None:
+                analysis = await backend.run_step(agent, "analyze_documents", query=query, documents=documents)
+                checkpoint.data["analysis"] = analysis
+                checkpoint.save()
+            results = {
+                "query": query,
+                "findings": analysis["findings"],
+                "summary": analysis["summary"],
+                "sources": [f"document {i}" for i in range(len(documents))],
+                "confidence": analysis["confidence"]
+            }
+        else:
+            # Placeholder for actual research implementation
+            # In production: use LangChain/LangGraph for research chain
+            results = {
+                "query": query,
+                "findings": [],
+                "summary": f"Research on '{query}' - placeholder",
+                "sources": [],
+                "confidence": 0.0
+            }
 
         agent.outputs.append({
             "type": "research_results",
@@ -185,66 +288,34 @@ async def run_research_agent(agent: SpawnedAgent, query: str) -> Dict[str, Any]:
         raise
 
 
-async def run_workflow_agent(agent: SpawnedAgent, workflow_def: Dict[str, Any]) -> Dict[str, Any]:
+async def run_workflow_agent(
+    agent: SpawnedAgent,
+    workflow_def: Dict[str, Any],
+    cache: Optional[StepCache] = None,
+    checkpoint: Optional[Checkpoint] = None
+) -> Dict[str, Any]:
     """
     Run a workflow agent to execute a multi-step process.
+
+    Steps run as a dependency graph (see workflow.py); the agent fails if
+    any step does. Finished steps are checkpointed and not rerun on resume.
     """
     agent.status = AgentStatus.ACTIVE
     agent.started_at = datetime.now()
 
     try:
-        steps = workflow_def.get("steps", [])
-        results = []
-
-        for i, step in enumerate(steps):
-            # Placeholder for step execution
-            step_result = {
-                "step": i + 1,
-                "name": step.get("name", f"Step {i+1}"),
-                "status": "completed",
-                "output": None
-            }
-            results.append(step_result)
+        result = await run_workflow(agent, workflow_def, cache=cache, max_parallel=settings.workflow_max_parallel,
+                                    checkpoint=checkpoint)
 
-            agent.outputs.append({
-                "type": "step_completed",
-                "data": step_result,
-                "timestamp": datetime.now().isoformat()
-            })
+        for step in result["steps"]:
+            if step["status"] == "failed":
+                agent.errors.append(f"{step['id']}: {step['error']}")
 
-        agent.status = AgentStatus.COMPLETED
+        agent.status = AgentStatus.COMPLETED if result["success"] else AgentStatus.FAILED
         agent.completed_at = datetime.now()
 
-        return {"steps": results, "success": True}
-
-    except Exception as e:
-        agent.errors.append(str(e))
-        agent.status = AgentStatus.FAILED
-        raise
-
-
-async def run_monitor_agent(agent: SpawnedAgent, condition: Callable[[], Awaitable[bool]], action: Callable[[], Awaitable[None]]) -> None:
-    """
-    Run a monitor agent that checks conditions periodically.
-    """
-    agent.status = AgentStatus.ACTIVE
-    agent.started_at = datetime.now()
-
-    interval = agent.config.parameters.get("check_interval_minutes", 5) * 60
-
-    try:
-        while agent.status == AgentStatus.ACTIVE:
-            if await condition():
-                await action()
-                agent.outputs.append({
-                    "type": "condition_triggered",
-                    "timestamp": datetime.now().isoformat()
-                })
-
-            await asyncio.sleep(interval)
+        return result
 
-    except asyncio.CancelledError:
-        agent.status = AgentStatus.TERMINATED
     except Exception as e:
         agent.errors.append(str(e))
         agent.status = AgentStatus.FAILED
@@ -294,9 +365,40 @@ class AgentSpawner:
     Creates and manages specialized agents for specific tasks.
     """
 
-    def __init__(self):
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        type_limits: Optional[Dict[str, int]] = None,
+        max_queued: Optional[int] = None
+    ):
         self.agents: Dict[str, SpawnedAgent] = {}
-        self.running_tasks: Dict[str, asyncio.Task] = {}
+        # Status index, kept up to date by SpawnedAgent.on_status
+        self._by_status: Dict[AgentStatus, Dict[str, SpawnedAgent]] = {status: {} for status in AgentStatus}
+        # Terminal agents in the order they finished, for retention
+        self._finished_at: "OrderedDict[str, float]" = OrderedDict()
+        self.retention_seconds = settings.agent_retention_minutes * 60
+        self.spiller = OutputSpiller()
+        # Futures for agents queued or running on the pool; removed when they finish
+        self.running_tasks: Dict[str, asyncio.Future] = {}
+        self.pool = WorkerPool(
+            workers=workers if workers is not None else settings.agent_workers,
+            kind_limits=type_limits if type_limits is not None else settings.agent_type_limits,
+            max_queued=max_queued if max_queued is not None else settings.agent_queue_limit,
+        )
+        self.backend = ProcessBackend(workers=settings.agent_process_workers)
+        self.monitors = MonitorScheduler(
+            state_path=settings.learning_path / "monitors.json",
+            batch_size=settings.monitor_batch_size,
+            jitter=settings.monitor_jitter,
+            check_timeout=settings.monitor_check_timeout_seconds,
+        )
+        # Workflow step results, shared across runs so a rerun skips finished steps
+        self.step_cache = StepCache(
+            ttl_seconds=settings.workflow_memo_ttl_seconds,
+            max_entries=settings.workflow_memo_entries,
+        )
+        # Durable status and progress of pool agents, for resuming after a restart
+        self.registry = AgentRegistry(terminal_statuses={status.value for status in TERMINAL_STATUSES})
 
     def spawn(self, config: AgentConfig) -> SpawnedAgent:
         """
@@ -313,10 +415,67 @@ class AgentSpawner:
             }
         )
 
-        self.agents[agent_id] = agent
+        self._register(agent)
 
         return agent
 
+    # ============================================
+    # REGISTRY AND RETENTION
+    # ============================================
+
+    def _register(self, agent: SpawnedAgent):
+        """Track an agent: status index, retention, and output spilling."""
+        self._evict_expired()
+        self.agents[agent.id] = agent
+        agent.outputs.spill = self.spiller.sink(agent.id, "output")
+        agent.errors.spill = self.spiller.sink(agent.id, "error")
+        self._by_status[agent.status][agent.id] = agent
+        if agent.status in TERMINAL_STATUSES:
+            self._finished_at[agent.id] = time.monotonic()
+        agent.on_status = self._status_changed
+
+    def _status_changed(self, agent: SpawnedAgent, old: AgentStatus, new: AgentStatus):
+        if self.agents.get(agent.id) is not agent:
+            return
+        self.registry.status_changed(agent)
+        self._by_status[old].pop(agent.id, None)
+        self._by_status[new][agent.id] = agent
+        if new in TERMINAL_STATUSES:
+            self._finished_at[agent.id] = time.monotonic()
+            self._finished_at.move_to_end(agent.id)
+        else:
+            self._finished_at.pop(agent.id, None)
+
+    def _evict_expired(self):
+        """Forget agents that finished more than the retention period ago."""
+        cutoff = time.monotonic() - self.retention_seconds
+        while self._finished_at:
+            agent_id, finished = next(iter(self._finished_at.items()))
+            if finished > cutoff:
+                break
+            self._finished_at.popitem(last=False)
+            agent = self.agents.pop(agent_id, None)
+            if agent is None:
+                continue
+            self._by_status[agent.status].pop(agent_id, None)
+            agent.on_status = None
+            # Keep the full record in Postgres
+            agent.outputs.spill_all()
+            agent.errors.spill_all()
+
+    async def older_outputs(
+        self,
+        agent_id: str,
+        kind: str = "output",
+        before_seq: Optional[int] = None,
+        limit: int = 50
+    ) -> List[Any]:
+        """Outputs (or errors) that have left an agent's in-memory tail, oldest first."""
+        agent = self.agents.get(agent_id)
+        if before_seq is None and agent is not None:
+            before_seq = (agent.outputs if kind == "output" else agent.errors).first_seq
+        return await self.spiller.fetch_older(agent_id, kind, before_seq, limit)
+
     def spawn_from_template(self, template_name: str, purpose: str = None, **kwargs) -> Optional[SpawnedAgent]:
         """
         Spawn an agent from a predefined template.
@@ -332,7 +491,9 @@ class AgentSpawner:
             purpose=purpose or template.purpose,
             capabilities=template.capabilities.copy(),
             parameters={**template.parameters, **kwargs},
-            parent_id=kwargs.get("parent_id")
+            timeout_minutes=template.timeout_minutes,
+            parent_id=kwargs.get("parent_id"),
+            auto_terminate=template.auto_terminate
         )
 
         return self.spawn(config)
@@ -346,28 +507,203 @@ class AgentSpawner:
             raise ValueError(f"Agent {agent_id} not found")
 
         agent_type = agent.config.agent_type
+        checkpoint = self.registry.checkpoint_for(agent_id)
 
         if agent_type == AgentType.RESEARCH:
-            return await run_research_agent(agent, kwargs.get("query", ""))
+            return await run_research_agent(agent, kwargs.get("query", ""), documents=kwargs.get("documents"),
+                                            backend=self.backend, checkpoint=checkpoint)
         elif agent_type == AgentType.WORKFLOW:
-            return await run_workflow_agent(agent, kwargs.get("workflow", {}))
+            return await run_workflow_agent(agent, kwargs.get("workflow", {}), cache=self.step_cache,
+                                            checkpoint=checkpoint)
         elif agent_type == AgentType.BMAD:
             return await run_bmad_agent(agent, kwargs.get("command", ""))
+        elif agent_type == AgentType.MONITOR:
+            return await self._watch(agent, kwargs)
         else:
             raise ValueError(f"Unknown agent type: {agent_type}")
 
-    def spawn_and_run(self, template_name: str, **kwargs) -> asyncio.Task:
+    def start(self, agent_id: str, **kwargs) -> asyncio.Future:
+        """
+        Queue a spawned agent on the worker pool.
+
+        Returns a future for the agent's result. Raises PoolFull if too
+        many agents are already waiting for a worker.
+        """
+        agent = self.agents.get(agent_id)
+        if agent is None:
+            raise ValueError(f"Agent {agent_id} not found")
+
+        if agent.config.agent_type == AgentType.MONITOR:
+            future = self._watch(agent, kwargs)
+        else:
+            self.registry.record(agent, kwargs)
+            future = self.pool.submit(
+                agent_id,
+                agent.config.agent_type.value,
+                lambda: self.run(agent_id, **kwargs),
+                timeout=self._timeout_seconds(agent.config),
+            )
+        self._track(agent, future)
+        return future
+
+    @staticmethod
+    def _timeout_seconds(config: AgentConfig) -> Optional[float]:
+        if config.auto_terminate and config.timeout_minutes > 0:
+            return config.timeout_minutes * 60
+        return None
+
+    def _track(self, agent: SpawnedAgent, future: asyncio.Future):
+        self.running_tasks[agent.id] = future
+        future.add_done_callback(lambda f: self._finished(agent, f))
+
+    def _watch(self, agent: SpawnedAgent, kwargs: Dict[str, Any]) -> asyncio.Future:
+        """
+        Hand a monitor agent to the scheduler.
+
+        Pass either `check` (a registered check name, with `params`), which
+        survives restarts, or ad-hoc `condition` and `action` coroutines.
+        With neither, the agent's purpose is matched onto a built-in check
+        ("monitor disk usage on /data above 85%").
+        """
+        interval = agent.config.parameters.get("check_interval_minutes", 5) * 60
+        timeout = self._timeout_seconds(agent.config)
+
+        check, params = kwargs.get("check"), kwargs.get("params", {})
+        condition, action = kwargs.get("condition"), kwargs.get("action")
+        if not check and (condition is None or action is None):
+            matched = match_check(agent.config.purpose)
+            if matched is None:
+                raise ValueError(
+                    "I don't know how to watch that yet. Monitors can check: "
+                    + ", ".join(sorted(MONITOR_CHECKS))
+                    + " (e.g. 'monitor disk usage on /data above 85%' or "
+                    "'monitor https://example.org/health')"
+                )
+            check, params = matched
+
+        if check:
+            future = self.monitors.add_check(agent, check, params, interval, timeout)
+            agent.config.parameters.update(check=check, check_params=params)
+        else:
+            future = self.monitors.add(agent, condition, action, interval, timeout)
+
+        agent.status = AgentStatus.ACTIVE
+        agent.started_at = datetime.now()
+        return future
+
+    def restore_monitors(self) -> List[str]:
+        """Re-create monitors saved before a restart. Returns the resumed agent IDs."""
+        template = AGENT_TEMPLATES["monitor"]
+        resumed = []
+        for entry in self.monitors.saved_monitors():
+            agent_id = entry["agent_id"]
+            if agent_id in self.agents:
+                continue
+            agent = SpawnedAgent(
+                id=agent_id,
+                config=AgentConfig(
+                    name=entry.get("name", template.name),
+                    agent_type=AgentType.MONITOR,
+                    purpose=entry.get("purpose", template.purpose),
+                    capabilities=template.capabilities.copy(),
+                    parameters=entry.get("parameters", {}),
+                    auto_terminate=entry.get("deadline_at") is not None,
+                ),
+                status=AgentStatus.ACTIVE,
+                started_at=datetime.now(),
+                metadata={"spawned_by": "aurora", "template": template.name, "restored": True},
+            )
+            future = self.monitors.restore(agent, entry)
+            if future is None:
+                continue
+            self._register(agent)
+            self._track(agent, future)
+            resumed.append(agent_id)
+
+        if resumed:
+            logger.info("agent.monitors_restored", count=len(resumed))
+        return resumed
+
+    async def resume_agents(self) -> List[str]:
+        """
+        Re-queue agents from the registry that had not finished before a
+        restart. Returns the resumed agent IDs.
+        """
+        resumed = []
+        for row in await self.registry.load_unfinished():
+            agent_id = row["agent_id"]
+            if agent_id in self.agents:
+                continue
+            try:
+                config = AgentConfig.from_dict(row["config"])
+            except (KeyError, ValueError) as e:
+                logger.warning("agent.resume_skipped", agent_id=agent_id, error=str(e))
+                continue
+
+            agent = SpawnedAgent(
+                id=agent_id,
+                config=config,
+                created_at=row["created_at"],
+                metadata={"spawned_by": "aurora", "template": config.name, "resumed": True},
+            )
+            # Continue the output sequence so spilled rows are not overwritten
+            agent.outputs.total = row["outputs_total"]
+            agent.errors.total = row["errors_total"]
+            self._register(agent)
+            self.registry.record(agent, row["run_args"], checkpoint=row["checkpoint"])
+
+            if row["run_args"] is None:
+                agent.errors.append("Could not resume after restart: run arguments were not saved")
+                agent.status = AgentStatus.FAILED
+                continue
+            try:
+                self.start(agent_id, **row["run_args"])
+            except PoolFull:
+                agent.errors.append("Agent queue is full")
+                agent.status = AgentStatus.FAILED
+                continue
+            resumed.append(agent_id)
+
+        if resumed:
+            logger.info("agent.resumed", count=len(resumed))
+        return resumed
+
+    def _finished(self, agent: SpawnedAgent, future: asyncio.Future):
+        """Reap a finished run and record how it ended."""
+        self.running_tasks.pop(agent.id, None)
+
+        if future.cancelled():
+            if agent.status not in (AgentStatus.COMPLETED, AgentStatus.FAILED):
+                agent.status = AgentStatus.TERMINATED
+                agent.completed_at = agent.completed_at or datetime.now()
+            return
+
+        error = future.exception()  # Retrieved here so fire-and-forget runs don't warn
+        if isinstance(error, JobTimeout):
+            agent.errors.append(f"Timed out after {agent.config.timeout_minutes} minutes")
+            agent.status = AgentStatus.TERMINATED
+            agent.completed_at = datetime.now()
+        elif error is not None and agent.status != AgentStatus.FAILED:
+            agent.errors.append(str(error))
+            agent.status = AgentStatus.FAILED
+            agent.completed_at = datetime.now()
+
+        logger.info("agent.finished", agent_id=agent.id, status=agent.status.value)
+
+    def spawn_and_run(self, template_name: str, **kwargs) -> asyncio.Future:
         """
-        Spawn an agent and immediately start running it.
+        Spawn an agent and immediately queue it to run.
         """
         agent = self.spawn_from_template(template_name, **kwargs)
         if agent is None:
             raise ValueError(f"Unknown template: {template_name}")
 
-        task = asyncio.create_task(self.run(agent.id, **kwargs))
-        self.running_tasks[agent.id] = task
-
-        return task
+        try:
+            return self.start(agent.id, **kwargs)
+        except PoolFull:
+            agent.status = AgentStatus.FAILED
+            agent.errors.append("Agent queue is full")
+            raise
 
     def get_agent(self, agent_id: str) -> Optional[SpawnedAgent]:
         """Get an agent by ID."""
@@ -375,7 +711,19 @@ class AgentSpawner:
 
     def get_active_agents(self) -> List[SpawnedAgent]:
         """Get all currently active agents."""
-        return [a for a in self.agents.values() if a.status == AgentStatus.ACTIVE]
+        self._evict_expired()
+        return list(self._by_status[AgentStatus.ACTIVE].values())
+
+    def discard(self, agent_id: str) -> bool:
+        """Forget an agent that never started, e.g. because its launch failed."""
+        agent = self.agents.pop(agent_id, None)
+        if agent is None:
+            return False
+        self._by_status[agent.status].pop(agent_id, None)
+        self._finished_at.pop(agent_id, None)
+        self.running_tasks.pop(agent_id, None)
+        agent.on_status = None
+        return True
 
     def terminate(self, agent_id: str) -> bool:
         """Terminate a running agent."""
@@ -383,15 +731,22 @@ class AgentSpawner:
         if agent is None:
             return False
 
-        task = self.running_tasks.get(agent_id)
-        if task and not task.done():
-            task.cancel()
+        self.pool.cancel(agent_id)
+        self.monitors.remove(agent_id)
 
         agent.status = AgentStatus.TERMINATED
         agent.completed_at = datetime.now()
 
         return True
 
+    async def shutdown(self):
+        """Cancel every queued and running agent; they and the monitors resume on the next start."""
+        await self.monitors.stop()
+        await self.registry.close()
+        await self.pool.shutdown()
+        await self.backend.shutdown()
+        await self.spiller.close()
+
     def get_agent_summary(self, agent_id: str) -> Optional[Dict[str, Any]]:
         """Get a summary of an agent's work."""
         agent = self.agents.get(agent_id)
@@ -406,19 +761,21 @@ class AgentSpawner:
             "duration_seconds": (
                 (agent.completed_at or datetime.now()) - agent.created_at
             ).total_seconds() if agent.started_at else 0,
-            "outputs_count": len(agent.outputs),
-            "errors_count": len(agent.errors),
+            "outputs_count": agent.outputs.total,
+            "errors_count": agent.errors.total,
         }
 
     def list_agents(self, include_completed: bool = False) -> List[Dict[str, Any]]:
         """List all agents with summaries."""
+        self._evict_expired()
         agents = []
-        for agent in self.agents.values():
-            if not include_completed and agent.status in [AgentStatus.COMPLETED, AgentStatus.TERMINATED]:
+        for status, bucket in self._by_status.items():
+            if not include_completed and status in (AgentStatus.COMPLETED, AgentStatus.TERMINATED):
                 continue
-            summary = self.get_agent_summary(agent.id)
-            if summary:
-                agents.append(summary)
+            for agent_id in bucket:
+                summary = self.get_agent_summary(agent_id)
+                if summary:
+                    agents.append(summary)
         return agents
 
 
@@ -439,19 +796,7 @@ class AuroraAgentInterface:
         """
         Analyze a task and spawn an appropriate agent.
         """
-        # Simple keyword-based selection (will be replaced with LLM)
-        task_lower = task_description.lower()
-
-        if any(word in task_lower for word in ["research", "find", "investigate", "look up"]):
-            template = "research"
-        elif any(word in task_lower for word in ["workflow", "automate", "process"]):
-            template = "workflow"
-        elif any(word in task_lower for word in ["monitor", "watch", "alert", "notify"]):
-            template = "monitor"
-        elif any(word in task_lower for word in ["bmad", "party", "agent"]):
-            template = "bmad"
-        else:
-            template = "research"  # Default
+        template, _ = get_intent_classifier().classify(task_description).top("agent", default="research")
 
         agent = self.spawner.spawn_from_template(
             template,
@@ -465,13 +810,35 @@ class AuroraAgentInterface:
         Delegate a task to an appropriate agent and get results.
         """
         agent = await self.spawn_for_task(task)
+        return await self.spawner.start(agent.id, **self._run_arguments(agent, task, kwargs))
 
+    async def launch(self, task: str, **kwargs) -> SpawnedAgent:
+        """
+        Spawn an agent for a task and queue it in the background.
+
+        Raises PoolFull if the agent queue is full, and ValueError if the
+        task can't be turned into a runnable agent (the agent is discarded).
+        """
+        agent = await self.spawn_for_task(task)
+        try:
+            self.spawner.start(agent.id, **self._run_arguments(agent, task, kwargs))
+        except PoolFull:
+            agent.status = AgentStatus.FAILED
+            agent.errors.append("Agent queue is full")
+            raise
+        except ValueError:
+            self.spawner.discard(agent.id)
+            raise
+        logger.info("agent.launched", agent_id=agent.id, type=agent.config.agent_type.value)
+        return agent
+
+    @staticmethod
+    def _run_arguments(agent: SpawnedAgent, task: str, kwargs: Dict[str, Any]) -> Dict[str, Any]:
         if agent.config.agent_type == AgentType.RESEARCH:
-            return await self.spawner.run(agent.id, query=task)
+            return {"query": task}
         elif agent.config.agent_type == AgentType.BMAD:
-            return await self.spawner.run(agent.id, command=kwargs.get("command", task))
-        else:
-            return await self.spawner.run(agent.id, **kwargs)
+            return {"command": kwargs.get("command", task)}
+        return kwargs
 
     def status_report(self) -> str:
         """Get a human-readable status report of all agents."""
@@ -487,6 +854,14 @@ class AuroraAgentInterface:
 
         return "\n".join(lines)
 
+    async def resume(self) -> List[str]:
+        """Pick up agents that outlive restarts: saved monitors and unfinished pool agents."""
+        return self.spawner.restore_monitors() + await self.spawner.resume_agents()
+
+    async def shutdown(self):
+        """Stop all agents."""
+        await self.spawner.shutdown()
+
 
 # Singleton
 _agent_interface: Optional[AuroraAgentInterface] = None
@@ -498,3 +873,9 @@ def get_agent_interface() -> AuroraAgentInterface:
     if _agent_interface is None:
         _agent_interface = AuroraAgentInterface()
     return _agent_interface
+
+
+async def shutdown_agents():
+    """Stop all agents, if the agent interface was ever created."""
+    if _agent_interface is not None:
+        await _agent_interface.shutdown()
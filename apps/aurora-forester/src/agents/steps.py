@@ -0,0 +1,95 @@
+"""
+Aurora Forester - CPU-bound Agent Steps
+Functions that run inside ProcessBackend worker processes.
+
+A step is called as step(config, emit, **kwargs): `config` is the agent's
+AgentConfig rebuilt from its serialized form, and `emit(output)` streams an
+output dict back into the agent's outputs while the step runs. Arguments
+and the return value cross a process boundary, so they must be picklable
+(plain data). Keep this module's imports light - every worker imports it.
+"""
+
+import heapq
+import re
+from collections import Counter
+from typing import Any, Callable, Dict, List
+
+
+Emit = Callable[[Dict[str, Any]], None]
+
+_WORD = re.compile(r"[a-z0-9']+")
+_SENTENCE = re.compile(r"(?<=[.!?])\s+")
+_STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in is it its of on or that the "
+    "this to was were will with you your i we they he she not but if so".split()
+)
+
+
+def _terms(text: str) -> List[str]:
+    return [w for w in _WORD.findall(text.lower()) if w not in _STOPWORDS and len(w) > 2]
+
+
+def analyze_documents(
+    config: Any,
+    emit: Emit,
+    query: str = "",
+    documents: List[str] = (),
+    max_sentences: int = 5
+) -> Dict[str, Any]:
+    """
+    Extractive analysis: score each document's sentences against the query
+    (or, with no query, the corpus' own top terms) and keep the best.
+    """
+    corpus_terms = Counter()
+    parsed = []
+    for text in documents:
+        sentences = [s.strip() for s in _SENTENCE.split(text) if s.strip()]
+        terms = [_terms(s) for s in sentences]
+        for sentence_terms in terms:
+            corpus_terms.update(set(sentence_terms))
+        parsed.append((sentences, terms))
+
+    focus = set(_terms(query)) or {term for term, _ in corpus_terms.most_common(10)}
+    total = max(1, len(documents))
+
+    best: List[Any] = []
+    for index, (sentences, terms) in enumerate(parsed):
+        scored = []
+        for position, (sentence, sentence_terms) in enumerate(zip(sentences, terms)):
+            if not sentence_terms:
+                continue
+            overlap = sum(1 for t in sentence_terms if t in focus)
+            # Rare matching terms count for more than common ones
+            weight = sum(total / corpus_terms[t] for t in sentence_terms if t in focus)
+            score = (overlap + weight) / (len(sentence_terms) ** 0.5)
+            if score > 0:
+                scored.append((score, index, position, sentence))
+
+        top = heapq.nlargest(max_sentences, scored)
+        emit({
+            "type": "document_analyzed",
+            "data": {
+                "document": index,
+                "sentences": len(sentences),
+                "key_terms": [t for t, _ in Counter(t for ts in terms for t in ts).most_common(5)],
+                "top_score": round(top[0][0], 3) if top else 0.0,
+            },
+        })
+        best.extend(top)
+
+    findings = heapq.nlargest(max_sentences, best)
+    return {
+        "findings": [
+            {"document": index, "sentence": sentence, "score": round(score, 3)}
+            for score, index, _, sentence in findings
+        ],
+        "summary": " ".join(sentence for _, _, _, sentence in sorted(findings, key=lambda f: (f[1], f[2]))),
+        "key_terms": [t for t, _ in corpus_terms.most_common(10)],
+        "confidence": round(min(1.0, len(findings) / max_sentences), 2) if documents else 0.0,
+    }
+
+
+# Steps ProcessBackend.run_step() can run, by name
+STEPS: Dict[str, Callable[..., Any]] = {
+    "analyze_documents": analyze_documents,
+}
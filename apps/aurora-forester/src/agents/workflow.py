@@ -0,0 +1,362 @@
+"""
+Aurora Forester - Workflow DAG Runner
+Runs a workflow agent's steps as a dependency graph.
+
+A workflow definition lists steps; each step may name the steps it
+depends on:
+
+    {"name": "daily-digest", "max_parallel": 4, "steps": [
+        {"id": "news", "action": "http", "params": {"url": "..."}},
+        {"id": "calendar", "action": "n8n", "params": {"webhook_url": "..."}},
+        {"id": "digest", "action": "n8n", "depends_on": ["news", "calendar"],
+         "params": {"webhook_url": "..."}},
+    ]}
+
+Steps start as soon as everything they depend on has finished, at most
+`max_parallel` at a time, so independent branches run concurrently. A
+step receives its dependencies' results as `inputs`. Failed steps are
+retried per the agent's `retry_on_failure` / `max_retries` parameters;
+if a step still fails, the steps downstream of it are skipped while
+unrelated branches carry on.
+
+Definitions without any `depends_on` keep the old behaviour: each step
+depends on the one before it.
+
+Within a run, a resumed agent skips the steps its checkpoint already holds.
+Across runs, results can be memoized by (workflow name, step id, action,
+params, inputs) for a while, so re-running a workflow after a failure does
+not repeat the steps that already succeeded. Memoization is opt-in, since
+most steps have side effects: a step sets "memoize": true. A workflow's
+"memoize": true covers only its idempotent steps (noop, and http GET/HEAD);
+n8n triggers and other POSTs are memoized only if the step itself asks.
+"""
+
+import asyncio
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+import httpx
+import structlog
+
+
+logger = structlog.get_logger()
+
+
+# action(step, inputs) -> result; registered by name
+StepAction = Callable[["WorkflowStep", Dict[str, Any]], Awaitable[Any]]
+WORKFLOW_ACTIONS: Dict[str, StepAction] = {}
+# Actions that are safe to repeat, so a workflow-wide "memoize" may cover them
+IDEMPOTENT_ACTIONS: Set[str] = set()
+SAFE_HTTP_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+
+def register_action(name: str, idempotent: bool = False):
+    """Decorator registering a workflow step action."""
+    def decorator(func):
+        WORKFLOW_ACTIONS[name] = func
+        if idempotent:
+            IDEMPOTENT_ACTIONS.add(name)
+        return func
+    return decorator
+
+
+def is_idempotent(action: str, params: Dict[str, Any]) -> bool:
+    """Whether running a step twice is the same as running it once."""
+    if action == "http":
+        return str(params.get("method", "GET")).upper() in SAFE_HTTP_METHODS
+    return action in IDEMPOTENT_ACTIONS
+
+
+class WorkflowError(ValueError):
+    """Raised for an invalid workflow definition."""
+
+
+@dataclass(slots=True, frozen=True)
+class WorkflowStep:
+    """One parsed step of a workflow definition."""
+    index: int
+    id: str
+    name: str
+    action: str
+    params: Dict[str, Any]
+    depends_on: Tuple[str, ...]
+    memoize: bool
+
+
+# ============================================
+# PARSING
+# ============================================
+
+def parse_workflow(workflow_def: Dict[str, Any]) -> List[WorkflowStep]:
+    """Validate a definition and return its steps; raises WorkflowError."""
+    raw_steps = workflow_def.get("steps", [])
+    chained = not any("depends_on" in step for step in raw_steps)
+    memoize_all = bool(workflow_def.get("memoize", False))
+
+    steps: List[WorkflowStep] = []
+    seen = set()
+    for i, raw in enumerate(raw_steps):
+        step_id = str(raw.get("id") or raw.get("name") or f"step{i + 1}")
+        if step_id in seen:
+            raise WorkflowError(f"Duplicate step id: {step_id}")
+        seen.add(step_id)
+
+        if chained:
+            depends_on = (steps[-1].id,) if steps else ()
+        else:
+            deps = raw.get("depends_on") or []
+            depends_on = tuple(str(d) for d in ([deps] if isinstance(deps, str) else deps))
+
+        action = raw.get("action", "noop")
+        if action not in WORKFLOW_ACTIONS:
+            raise WorkflowError(f"Step {step_id}: unknown action {action!r}")
+        params = dict(raw.get("params", {}))
+        if "memoize" in raw:
+            memoize = bool(raw["memoize"])
+        else:
+            memoize = memoize_all and is_idempotent(action, params)
+
+        steps.append(WorkflowStep(
+            index=i,
+            id=step_id,
+            name=raw.get("name", f"Step {i + 1}"),
+            action=action,
+            params=params,
+            depends_on=depends_on,
+            memoize=memoize,
+        ))
+
+    for step in steps:
+        for dep in step.depends_on:
+            if dep not in seen:
+                raise WorkflowError(f"Step {step.id} depends on unknown step {dep}")
+    _check_acyclic(steps)
+    return steps
+
+
+def _check_acyclic(steps: List[WorkflowStep]):
+    """Kahn's algorithm; any step left unvisited is on a cycle."""
+    pending = {step.id: len(step.depends_on) for step in steps}
+    dependents: Dict[str, List[str]] = {step.id: [] for step in steps}
+    for step in steps:
+        for dep in step.depends_on:
+            dependents[dep].append(step.id)
+
+    ready = [step_id for step_id, count in pending.items() if count == 0]
+    visited = 0
+    while ready:
+        step_id = ready.pop()
+        visited += 1
+        for child in dependents[step_id]:
+            pending[child] -= 1
+            if pending[child] == 0:
+                ready.append(child)
+    if visited != len(steps):
+        cyclic = sorted(step_id for step_id, count in pending.items() if count > 0)
+        raise WorkflowError(f"Workflow has a dependency cycle through: {', '.join(cyclic)}")
+
+
+# ============================================
+# MEMOIZATION
+# ============================================
+
+class StepCache:
+    """Time-limited LRU of successful step results."""
+
+    def __init__(self, ttl_seconds: float = 600.0, max_entries: int = 1000):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(workflow: str, step: WorkflowStep, inputs: Dict[str, Any]) -> str:
+        payload = json.dumps([workflow, step.id, step.action, step.params, inputs], sort_keys=True, default=str)
+        return hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
+
+    def get(self, key: str) -> Tuple[bool, Any]:
+        entry = self._entries.get(key)
+        if entry is None or time.monotonic() - entry[0] > self.ttl_seconds:
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return False, None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return True, entry[1]
+
+    def put(self, key: str, value: Any):
+        self._entries[key] = (time.monotonic(), value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+
+# ============================================
+# EXECUTION
+# ============================================
+
+async def run_workflow(
+    agent: Any,
+    workflow_def: Dict[str, Any],
+    cache: Optional[StepCache] = None,
+    max_parallel: int = 4,
+    checkpoint: Optional[Any] = None
+) -> Dict[str, Any]:
+    """
+    Run a workflow definition for `agent`.
+
+    Returns {"steps": [...], "success": bool} with one entry per step in
+    definition order; step status is completed, failed or skipped.
+    Completed steps are recorded in `checkpoint` (a registry Checkpoint),
+    and steps it already holds are not run again.
+    """
+    steps = parse_workflow(workflow_def)
+    workflow_name = str(workflow_def.get("name", agent.config.name))
+    params = agent.config.parameters
+    retries = int(params.get("max_retries", 3)) if params.get("retry_on_failure", False) else 0
+    backoff = float(params.get("retry_backoff_seconds", 0.5))
+    limit = asyncio.Semaphore(max(1, int(workflow_def.get("max_parallel", max_parallel))))
+
+    by_id = {step.id: step for step in steps}
+    waiting = {step.id: set(step.depends_on) for step in steps}
+    dependents: Dict[str, List[str]] = {step.id: [] for step in steps}
+    for step in steps:
+        for dep in step.depends_on:
+            dependents[dep].append(step.id)
+
+    results: Dict[str, Dict[str, Any]] = {}
+    outputs: Dict[str, Any] = {}
+    running: Dict[asyncio.Task, str] = {}
+    finished = checkpoint.data.setdefault("steps", {}) if checkpoint is not None else {}
+
+    async def execute(step: WorkflowStep) -> Dict[str, Any]:
+        if step.id in finished:
+            return {"status": "completed", "output": finished[step.id], "attempts": 0, "cached": True}
+        inputs = {dep: outputs[dep] for dep in step.depends_on}
+        key = StepCache.key(workflow_name, step, inputs) if cache is not None and step.memoize else None
+        if key is not None:
+            hit, value = cache.get(key)
+            if hit:
+                return {"status": "completed", "output": value, "attempts": 0, "cached": True}
+
+        action = WORKFLOW_ACTIONS[step.action]
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                async with limit:
+                    value = await action(step, inputs)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                if attempt > retries:
+                    return {"status": "failed", "error": str(e) or type(e).__name__, "attempts": attempt}
+                logger.warning("workflow.step_retry", agent_id=agent.id, step=step.id,
+                               attempt=attempt, error=str(e))
+                await asyncio.sleep(backoff * (2 ** (attempt - 1)))
+                continue
+            if key is not None:
+                cache.put(key, value)
+            return {"status": "completed", "output": value, "attempts": attempt, "cached": False}
+
+    def record(step: WorkflowStep, result: Dict[str, Any]):
+        entry = {"step": step.index + 1, "id": step.id, "name": step.name, **result}
+        results[step.id] = entry
+        agent.outputs.append({
+            "type": f"step_{result['status']}",
+            "data": entry,
+            "timestamp": datetime.now().isoformat()
+        })
+
+    def skip_downstream(step_id: str):
+        stack = list(dependents[step_id])
+        while stack:
+            child = stack.pop()
+            if child in results or child not in waiting:
+                continue
+            del waiting[child]
+            record(by_id[child], {"status": "skipped", "reason": f"{step_id} failed", "attempts": 0})
+            stack.extend(dependents[child])
+
+    def start_ready():
+        for step_id in [s for s, deps in waiting.items() if not deps]:
+            del waiting[step_id]
+            running[asyncio.ensure_future(execute(by_id[step_id]))] = step_id
+
+    start_ready()
+    try:
+        while running:
+            done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                step_id = running.pop(task)
+                result = task.result()
+                record(by_id[step_id], result)
+                if result["status"] == "completed":
+                    outputs[step_id] = result["output"]
+                    if checkpoint is not None and step_id not in finished:
+                        finished[step_id] = result["output"]
+                        checkpoint.save()
+                    for child in dependents[step_id]:
+                        if child in waiting:
+                            waiting[child].discard(step_id)
+                else:
+                    skip_downstream(step_id)
+            start_ready()
+    finally:
+        for task in running:
+            task.cancel()
+
+    ordered = [results[step.id] for step in steps]
+    return {"steps": ordered, "success": all(r["status"] == "completed" for r in ordered)}
+
+
+# ============================================
+# BUILT-IN ACTIONS
+# ============================================
+
+@register_action("noop", idempotent=True)
+async def _noop(step: WorkflowStep, inputs: Dict[str, Any]) -> Any:
+    """Placeholder step: does nothing."""
+    return None
+
+
+@register_action("http")
+async def _http(step: WorkflowStep, inputs: Dict[str, Any]) -> Any:
+    """HTTP request: params url, method (GET), json, headers, timeout."""
+    params = step.params
+    async with httpx.AsyncClient(timeout=params.get("timeout", 30.0)) as client:
+        response = await client.request(
+            params.get("method", "GET"),
+            params["url"],
+            json=params.get("json"),
+            headers=params.get("headers"),
+        )
+        response.raise_for_status()
+        return _response_body(response)
+
+
+@register_action("n8n")
+async def _n8n(step: WorkflowStep, inputs: Dict[str, Any]) -> Any:
+    """Trigger an n8n webhook with params payload plus the upstream results."""
+    params = step.params
+    async with httpx.AsyncClient(timeout=params.get("timeout", 30.0)) as client:
+        response = await client.post(
+            params["webhook_url"],
+            json={**params.get("payload", {}), "inputs": inputs},
+        )
+        response.raise_for_status()
+        return _response_body(response)
+
+
+def _response_body(response: httpx.Response) -> Any:
+    try:
+        return response.json()
+    except ValueError:
+        return response.text
@@ -0,0 +1 @@
+# Aurora Bench - Offline load testing against a mock Ollama
@@ -0,0 +1,270 @@
+"""
+Aurora Forester - Load Test Harness
+Replays a message corpus through Aurora's entry points against a mock Ollama
+and reports latency percentiles and throughput.
+"""
+
+import asyncio
+import tempfile
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional, List, Dict, Any, Callable, Awaitable
+
+import structlog
+
+from .mock_ollama import MockOllamaServer, MockOllamaConfig
+
+
+logger = structlog.get_logger()
+
+
+# Representative mix of what Graydon actually sends
+DEFAULT_CORPUS = [
+    "Hello Aurora, are you there?",
+    "What can you help me with?",
+    "/status",
+    "Add a task to review the Otter Camp proposal",
+    "Can you research cooperative governance models?",
+    "I should decide between two hosting options, which one fits the vision?",
+    "Automate the weekly backup report with n8n",
+    "I'm tired, been coding for ten hours",
+    "Reflect on what patterns you've noticed this week",
+    "/help",
+    "How does the DOM token relate to membership?",
+    "Remind me to eat lunch",
+]
+
+BENCH_TARGETS = ("aurora", "router")
+
+# Handler signature: (message, request_index) -> response
+BenchHandler = Callable[[str, int], Awaitable[Any]]
+
+
+def load_corpus(path: Optional[Path]) -> List[str]:
+    """Load one message per line, or fall back to the built-in corpus."""
+    if path is None:
+        return list(DEFAULT_CORPUS)
+
+    lines = [line.strip() for line in Path(path).read_text(encoding="utf-8").splitlines()]
+    corpus = [line for line in lines if line and not line.startswith("#")]
+    if not corpus:
+        raise ValueError(f"Corpus file is empty: {path}")
+    return corpus
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Linear-interpolated percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    if len(sorted_values) == 1:
+        return sorted_values[0]
+
+    rank = (pct / 100.0) * (len(sorted_values) - 1)
+    low = int(rank)
+    high = min(low + 1, len(sorted_values) - 1)
+    return sorted_values[low] + (sorted_values[high] - sorted_values[low]) * (rank - low)
+
+
+@dataclass
+class BenchResult:
+    """Outcome of one benchmark run."""
+    target: str
+    requests: int
+    concurrency: int
+    wall_seconds: float
+    latencies: List[float] = field(default_factory=list)  # seconds, successful requests
+    errors: int = 0
+
+    def _pct_ms(self, pct: float) -> float:
+        return percentile(sorted(self.latencies), pct) * 1000.0
+
+    @property
+    def p50_ms(self) -> float:
+        return self._pct_ms(50)
+
+    @property
+    def p95_ms(self) -> float:
+        return self._pct_ms(95)
+
+    @property
+    def p99_ms(self) -> float:
+        return self._pct_ms(99)
+
+    @property
+    def throughput(self) -> float:
+        """Successful requests per second."""
+        if self.wall_seconds <= 0:
+            return 0.0
+        return len(self.latencies) / self.wall_seconds
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary for JSON output."""
+        return {
+            "target": self.target,
+            "requests": self.requests,
+            "concurrency": self.concurrency,
+            "errors": self.errors,
+            "wall_seconds": round(self.wall_seconds, 4),
+            "throughput_rps": round(self.throughput, 3),
+            "p50_ms": round(self.p50_ms, 2),
+            "p95_ms": round(self.p95_ms, 2),
+            "p99_ms": round(self.p99_ms, 2),
+        }
+
+
+async def run_load(
+    target: str,
+    handler: BenchHandler,
+    corpus: List[str],
+    requests: int,
+    concurrency: int,
+    warmup: int = 0
+) -> BenchResult:
+    """
+    Drive `handler` with `requests` messages at a fixed concurrency.
+
+    A fixed pool of workers pulls from a shared counter, so in-flight work
+    never exceeds `concurrency` and no task is created per request.
+    """
+    for i in range(warmup):
+        await handler(corpus[i % len(corpus)], i)
+
+    latencies: List[float] = []
+    errors = 0
+    next_index = 0
+
+    async def worker():
+        nonlocal next_index, errors
+        while next_index < requests:
+            index = next_index
+            next_index += 1
+            message = corpus[index % len(corpus)]
+            started = time.perf_counter()
+            try:
+                await handler(message, index)
+            except Exception as e:
+                errors += 1
+                logger.warning("bench.request_failed", target=target, error=str(e))
+                continue
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(max(1, concurrency))))
+    wall = time.perf_counter() - started
+
+    return BenchResult(
+        target=target,
+        requests=requests,
+        concurrency=concurrency,
+        wall_seconds=wall,
+        latencies=latencies,
+        errors=errors,
+    )
+
+
+# ============================================
+# TARGETS
+# ============================================
+
+def _aurora_forester_handler(ollama_url: str) -> BenchHandler:
+    """AuroraForester.process_message - the Discord bot and CLI path."""
+    from ..core.aurora import AuroraForester
+
+    aurora = AuroraForester()
+    aurora.llm.base_url = ollama_url
+
+    async def handle(message: str, index: int):
+        return await aurora.process_message(message, channel="bench")
+
+    handle.close = aurora.interactions.close
+    return handle
+
+
+def _router_handler(ollama_url: str, users: int = 8) -> BenchHandler:
+    """MessageRouter.handle_incoming - the multi-channel graph path."""
+    from ..channels.message_handler import MessageRouter, IncomingMessage, Channel
+
+    router = MessageRouter()
+    if getattr(router.aurora, "llm", None) is not None:
+        router.aurora.llm.base_url = ollama_url
+
+    async def handle(message: str, index: int):
+        incoming = IncomingMessage(
+            channel=Channel.WEBHOOK,
+            content=message,
+            user_id=f"bench-user-{index % users}",
+        )
+        return await router.handle_incoming(incoming)
+
+    return handle
+
+
+_HANDLER_FACTORIES: Dict[str, Callable[[str], BenchHandler]] = {
+    "aurora": _aurora_forester_handler,
+    "router": _router_handler,
+}
+
+
+async def run_benchmarks(
+    targets: List[str],
+    corpus: List[str],
+    requests: int,
+    concurrency: int,
+    mock_config: Optional[MockOllamaConfig] = None,
+    warmup: int = 0
+) -> List[BenchResult]:
+    """
+    Start a mock Ollama and benchmark each target against it.
+
+    Targets run with a scratch learning path, so bench traffic never lands
+    in the real interaction log or pattern store.
+    """
+    results = []
+
+    with _scratch_learning_path():
+        async with MockOllamaServer(mock_config) as mock:
+            for target in targets:
+                factory = _HANDLER_FACTORIES.get(target)
+                if factory is None:
+                    raise ValueError(f"Unknown bench target: {target}")
+
+                handler = factory(mock.url)
+                logger.info("bench.target_started", target=target, requests=requests,
+                            concurrency=concurrency)
+                try:
+                    result = await run_load(target, handler, corpus, requests, concurrency, warmup)
+                finally:
+                    close = getattr(handler, "close", None)
+                    if close is not None:
+                        await asyncio.to_thread(close)
+                results.append(result)
+
+    return results
+
+
+@contextmanager
+def _scratch_learning_path():
+    """Point settings.learning_path at a temporary directory for the duration."""
+    from ..core.config import settings
+
+    original = settings.learning_path
+    with tempfile.TemporaryDirectory(prefix="aurora-bench-") as scratch:
+        settings.learning_path = Path(scratch)
+        try:
+            yield Path(scratch)
+        finally:
+            settings.learning_path = original
+
+
+def format_report(results: List[BenchResult]) -> str:
+    """Render results as a fixed-width table."""
+    header = f"{'target':<10} {'reqs':>6} {'conc':>5} {'errors':>6} {'rps':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}"
+    lines = [header, "-" * len(header)]
+    for r in results:
+        lines.append(
+            f"{r.target:<10} {r.requests:>6} {r.concurrency:>5} {r.errors:>6} "
+            f"{r.throughput:>9.2f} {r.p50_ms:>9.1f} {r.p95_ms:>9.1f} {r.p99_ms:>9.1f}"
+        )
+    return "\n".join(lines)
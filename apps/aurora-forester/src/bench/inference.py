@@ -0,0 +1,184 @@
+"""
+Aurora Forester - Inference Runtime Benchmark
+Load time, latency, throughput and memory of the encoder models on torch
+versus their int8 ONNX exports.
+
+Each (runtime, task) pair is measured in a fresh process, so resident
+memory reflects only that runtime's imports and weights. The ONNX runtime
+needs `python main.py export-onnx` to have run first; without an export
+the worker falls back to torch, and the result says so.
+"""
+
+import asyncio
+import multiprocessing
+import queue as queue_module
+import resource
+import sys
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+from .harness import percentile
+
+
+RUNTIMES = ("torch", "onnx")
+BENCH_TASKS = ("embed", "zero_shot", "sentiment")
+
+SAMPLE_TEXTS = [
+    "Add a task to review the Otter Camp proposal",
+    "I'm tired, been coding for ten hours",
+    "How does the DOM token relate to membership in the Hello World DAO?",
+    "Automate the weekly backup report with n8n and post it to the channel",
+    "The deploy failed again last night, the node ran out of memory",
+    "Should I pick Postgres or SQLite for the local agent registry?",
+    "Good morning! The treasury wallet looks healthy today",
+    "Research cooperative governance models and summarize the tradeoffs",
+]
+ZERO_SHOT_LABELS = ["task", "workflow", "question", "wellbeing"]
+
+
+@dataclass
+class InferenceBenchResult:
+    """One task on one runtime."""
+    runtime: str
+    task: str
+    loaded_as: str = ""  # Runtime the model actually loaded on ("torch" after a fallback)
+    load_seconds: float = 0.0
+    p50_ms: float = 0.0
+    p95_ms: float = 0.0
+    throughput: float = 0.0  # Requests per second with `concurrency` in flight
+    rss_mb: float = 0.0  # Peak resident memory of the measuring process
+    error: str = ""
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary for JSON output."""
+        return {
+            "runtime": self.runtime,
+            "task": self.task,
+            "loaded_as": self.loaded_as,
+            "load_seconds": round(self.load_seconds, 2),
+            "p50_ms": round(self.p50_ms, 2),
+            "p95_ms": round(self.p95_ms, 2),
+            "throughput": round(self.throughput, 1),
+            "rss_mb": round(self.rss_mb, 1),
+            "error": self.error,
+        }
+
+
+def _peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def _call(worker, task: str, text: str):
+    if task == "zero_shot":
+        return worker.zero_shot(text, ZERO_SHOT_LABELS)
+    return getattr(worker, task)(text)
+
+
+async def _measure(
+    runtime: str,
+    task: str,
+    onnx_path: Optional[Path],
+    requests: int,
+    concurrency: int
+) -> InferenceBenchResult:
+    from ..integrations.inference import LocalInferenceWorker
+
+    result = InferenceBenchResult(runtime, task)
+    # No batching window: sequential requests run alone, concurrent ones
+    # still batch while the previous pass runs
+    worker = LocalInferenceWorker(max_batch=concurrency, window_ms=0.0, runtime=runtime, onnx_path=onnx_path)
+    try:
+        started = time.perf_counter()
+        await worker.preload([task])
+        result.load_seconds = time.perf_counter() - started
+        result.loaded_as = worker.stats()["loaded"][task]
+
+        await _call(worker, task, SAMPLE_TEXTS[0])  # Warm up
+
+        latencies = []
+        for i in range(requests):
+            started = time.perf_counter()
+            await _call(worker, task, SAMPLE_TEXTS[i % len(SAMPLE_TEXTS)])
+            latencies.append((time.perf_counter() - started) * 1000)
+        latencies.sort()
+        result.p50_ms = percentile(latencies, 50)
+        result.p95_ms = percentile(latencies, 95)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(
+            _call(worker, task, SAMPLE_TEXTS[i % len(SAMPLE_TEXTS)])
+            for i in range(requests)
+        ))
+        result.throughput = requests / (time.perf_counter() - started)
+    finally:
+        await worker.close()
+    result.rss_mb = _peak_rss_mb()
+    return result
+
+
+def _child(runtime: str, task: str, onnx_path: Optional[Path], requests: int, concurrency: int, queue):
+    try:
+        result = asyncio.run(_measure(runtime, task, onnx_path, requests, concurrency))
+    except Exception as e:
+        result = InferenceBenchResult(runtime, task, error=f"{type(e).__name__}: {e}")
+    queue.put(result.to_dict())
+
+
+def run_inference_benchmark(
+    runtimes: Sequence[str] = RUNTIMES,
+    tasks: Sequence[str] = BENCH_TASKS,
+    onnx_path: Optional[Path] = None,
+    requests: int = 64,
+    concurrency: int = 16
+) -> List[InferenceBenchResult]:
+    """Measure every (runtime, task) pair, each in its own process."""
+    if onnx_path is None:
+        from ..core.config import settings
+        onnx_path = settings.onnx_model_path
+
+    context = multiprocessing.get_context("spawn")
+    results = []
+    for task in tasks:
+        for runtime in runtimes:
+            queue = context.Queue()
+            process = context.Process(
+                target=_child, args=(runtime, task, onnx_path, requests, concurrency, queue)
+            )
+            process.start()
+            process.join()
+            try:
+                row = queue.get(timeout=1.0)
+            except queue_module.Empty:
+                row = InferenceBenchResult(
+                    runtime, task, error=f"measuring process exited with code {process.exitcode}"
+                ).to_dict()
+            results.append(InferenceBenchResult(**row))
+    return results
+
+
+def format_inference_report(results: List[InferenceBenchResult]) -> str:
+    """Render results as a fixed-width table."""
+    header = (
+        f"{'task':<10} {'runtime':<8} {'load s':>7} {'p50 ms':>8} {'p95 ms':>8} "
+        f"{'req/s':>8} {'RSS MB':>8}"
+    )
+    lines = [header, "-" * len(header)]
+    notes = []
+    for r in results:
+        if r.error:
+            lines.append(f"{r.task:<10} {r.runtime:<8} {'failed':>7}")
+            notes.append(f"{r.task}/{r.runtime}: {r.error}")
+            continue
+        lines.append(
+            f"{r.task:<10} {r.runtime:<8} {r.load_seconds:>7.2f} {r.p50_ms:>8.2f} {r.p95_ms:>8.2f} "
+            f"{r.throughput:>8.1f} {r.rss_mb:>8.1f}"
+        )
+        if r.loaded_as != r.runtime:
+            notes.append(f"{r.task}/{r.runtime}: no export found, measured {r.loaded_as} instead")
+    if notes:
+        lines.append("")
+        lines.extend(notes)
+    return "\n".join(lines)
@@ -0,0 +1,248 @@
+"""
+Aurora Forester - Intent Benchmark
+Accuracy and per-message cost of the shared intent classifier, against
+the keyword cascades it replaced.
+
+INTENT_CASES is the accuracy set: messages with the expected label per
+facet ("intent", "agent") or the expected set of context sections
+("context"). Add a case whenever a message is routed wrongly.
+UNSEEN_CASES were written after the rules, to catch overfitting.
+tests/test_intent.py checks the classifier against both.
+"""
+
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, FrozenSet, List, Sequence, Tuple, Union
+
+from ..core.intent import IntentClassifier
+
+
+Expected = Union[str, FrozenSet[str]]
+
+# (message, facet, expected)
+Case = Tuple[str, str, Expected]
+
+
+# The set the rules were tuned on
+INTENT_CASES: List[Case] = [
+    # Graph intent
+    ("Add a task to review the Otter Camp proposal", "intent", "task"),
+    ("Remind me to eat lunch", "intent", "task"),
+    ("Put 'renew the domain' on my todo list", "intent", "task"),
+    ("Create a reminder for the Friday deadline", "intent", "task"),
+    ("Update the address on the DAO registration", "intent", "conversation"),
+    ("I added some notes to the charter", "intent", "conversation"),
+    ("Automate the weekly backup report with n8n", "intent", "workflow"),
+    ("Create an n8n workflow that posts the digest", "intent", "workflow"),
+    ("Can you set up an automation for invoices?", "intent", "workflow"),
+    ("Spawn an agent to dig into token models", "intent", "agent_spawn"),
+    ("Can you research cooperative governance models?", "intent", "agent_spawn"),
+    ("Reflect on what patterns you've noticed this week", "intent", "reflection"),
+    ("What have you learned about how I work?", "intent", "reflection"),
+    ("How are you doing today", "intent", "wellbeing"),
+    ("I'm tired, been coding for ten hours", "intent", "wellbeing"),
+    ("I need a break", "intent", "wellbeing"),
+    ("Feeling pretty overwhelmed right now", "intent", "wellbeing"),
+    ("How does the DOM token relate to membership?", "intent", "question"),
+    ("What can you help me with?", "intent", "question"),
+    ("Why did the deploy fail last night?", "intent", "question"),
+    ("Hello Aurora, are you there", "intent", "conversation"),
+    ("Good morning!", "intent", "conversation"),
+    ("The interest rate on the loan changed", "intent", "conversation"),
+    ("That restaurant was great", "intent", "conversation"),
+    # Agent template for /spawn
+    ("research cooperative governance models", "agent", "research"),
+    ("find the best hosting for Sector7", "agent", "research"),
+    ("look up grant programs for DAOs", "agent", "research"),
+    ("automate the weekly report", "agent", "workflow"),
+    ("process new member applications every day", "agent", "workflow"),
+    ("monitor the cluster and alert me if a node goes down", "agent", "monitor"),
+    ("watch the treasury wallet", "agent", "monitor"),
+    ("keep an eye on the Otter Camp signups", "agent", "monitor"),
+    ("run a bmad party mode session", "agent", "bmad"),
+    ("findings from last week need a summary", "agent", "research"),
+    ("a wristwatch shopping list", "agent", "research"),
+    # Context sections
+    ("How is the Hello World DAO project going?", "context", frozenset({"project"})),
+    ("Should I pick Postgres or SQLite?", "context", frozenset({"decision"})),
+    ("Which option fits the vision?", "context", frozenset({"decision"})),
+    ("I forgot to eat and I'm tired", "context", frozenset({"self_care"})),
+    ("Should I take a break from the Otter Camp project?", "context",
+     frozenset({"decision", "self_care", "project"})),
+    ("Update the restaurant address", "context", frozenset()),
+    ("The daos meeting is at noon", "context", frozenset({"project"})),
+    ("Interesting optionality in the contract", "context", frozenset()),
+]
+
+# Messages written after the rules, to catch overfitting to the set above
+UNSEEN_CASES: List[Case] = [
+    ("Remind me to call the accountant tomorrow", "intent", "task"),
+    ("Add 'send the grant report' to my tasks", "intent", "task"),
+    ("Could you automate the invoice reminders in n8n", "intent", "workflow"),
+    ("Spawn an agent to compare hosting providers", "intent", "agent_spawn"),
+    ("I feel exhausted after that call", "intent", "wellbeing"),
+    ("Where did we leave the charter draft?", "intent", "question"),
+    ("Thanks, that helped a lot", "intent", "conversation"),
+    ("investigate why signups dropped", "agent", "research"),
+    ("alert me when the backup job fails", "agent", "monitor"),
+    ("automate posting the newsletter", "agent", "workflow"),
+    ("I haven't had a meal since breakfast", "context", frozenset({"self_care"})),
+    ("What's the status of the Sector7 project?", "context", frozenset({"project"})),
+    ("Help me decide between the two offers", "context", frozenset({"decision"})),
+    ("Send the newsletter", "context", frozenset()),
+]
+
+
+# ============================================
+# THE CASCADES BEING REPLACED
+# ============================================
+
+def _legacy_intent(content: str) -> str:
+    content = content.lower()
+    if any(word in content for word in ["task", "todo", "add", "create", "remind"]):
+        return "task"
+    elif any(word in content for word in ["workflow", "automate", "n8n"]):
+        return "workflow"
+    elif any(word in content for word in ["spawn", "agent", "research"]):
+        return "agent_spawn"
+    elif any(word in content for word in ["reflect", "learn", "pattern"]):
+        return "reflection"
+    elif any(word in content for word in ["how are", "feeling", "break", "rest"]):
+        return "wellbeing"
+    elif "?" in content:
+        return "question"
+    return "conversation"
+
+
+def _legacy_agent(task: str) -> str:
+    task = task.lower()
+    if any(word in task for word in ["research", "find", "investigate", "look up"]):
+        return "research"
+    elif any(word in task for word in ["workflow", "automate", "process"]):
+        return "workflow"
+    elif any(word in task for word in ["monitor", "watch", "alert", "notify"]):
+        return "monitor"
+    elif any(word in task for word in ["bmad", "party", "agent"]):
+        return "bmad"
+    return "research"
+
+
+def _legacy_context(query: str) -> FrozenSet[str]:
+    query = query.lower()
+    wanted = set()
+    if any(word in query for word in ["project", "hello world", "dao", "ecosystem"]):
+        wanted.add("project")
+    if any(word in query for word in ["decide", "choice", "option", "should i"]):
+        wanted.add("decision")
+    if any(word in query for word in ["tired", "rest", "break", "eat", "food", "meal"]):
+        wanted.add("self_care")
+    return frozenset(wanted)
+
+
+LEGACY = {"intent": _legacy_intent, "agent": _legacy_agent, "context": _legacy_context}
+
+DEFAULTS = {"intent": "conversation", "agent": "research"}
+
+
+def legacy_route(text: str) -> Dict[str, Expected]:
+    """Every facet's answer from the cascades (each one re-scans the message)."""
+    return {facet: cascade(text) for facet, cascade in LEGACY.items()}
+
+
+def classifier_route(classifier: IntentClassifier, text: str) -> Dict[str, Expected]:
+    """Every facet's answer from one classification, in the same form as the cascades."""
+    result = classifier.classify(text)
+    return {
+        "intent": result.top("intent", default=DEFAULTS["intent"])[0],
+        "agent": result.top("agent", default=DEFAULTS["agent"])[0],
+        "context": frozenset(result.labels("context")),
+    }
+
+
+# ============================================
+# BENCHMARK
+# ============================================
+
+@dataclass
+class IntentResult:
+    """Accuracy and cost of one classifier over the accuracy set."""
+    name: str
+    correct: int
+    total: int
+    us_per_message: float
+    failures: List[Tuple[str, str, Any, Any]]
+
+    @property
+    def accuracy(self) -> float:
+        return self.correct / self.total if self.total else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary for JSON output."""
+        return {
+            "name": self.name,
+            "correct": self.correct,
+            "total": self.total,
+            "accuracy": round(self.accuracy, 3),
+            "us_per_message": round(self.us_per_message, 2),
+            "failures": [
+                {"message": m, "facet": f, "expected": sorted(e) if isinstance(e, frozenset) else e,
+                 "got": sorted(g) if isinstance(g, frozenset) else g}
+                for m, f, e, g in self.failures
+            ],
+        }
+
+
+def _measure(
+    name: str,
+    route: Callable[[str], Dict[str, Expected]],
+    cases: Sequence[Case],
+    iterations: int
+) -> IntentResult:
+    correct = 0
+    failures = []
+    for text, facet, expected in cases:
+        got = route(text)[facet]
+        if got == expected:
+            correct += 1
+        else:
+            failures.append((text, facet, expected, got))
+
+    # Cost of routing one message for all three facets
+    texts = [text for text, _, _ in cases]
+    start = time.perf_counter()
+    for _ in range(iterations):
+        for text in texts:
+            route(text)
+    elapsed = time.perf_counter() - start
+    return IntentResult(name, correct, len(cases), elapsed / (iterations * len(texts)) * 1e6, failures)
+
+
+def run_intent_benchmark(cases: Sequence[Case], iterations: int = 200) -> List[IntentResult]:
+    """Score the cascades, the classifier uncached, and the classifier with its per-message cache."""
+    uncached = IntentClassifier(cache_size=0)
+    cached = IntentClassifier()
+    return [
+        _measure("keyword cascades", legacy_route, cases, iterations),
+        _measure("classifier", lambda text: classifier_route(uncached, text), cases, iterations),
+        _measure("classifier cached", lambda text: classifier_route(cached, text), cases, iterations),
+    ]
+
+
+def format_intent_report(results: List[IntentResult]) -> str:
+    """Render results as a fixed-width table, followed by misrouted messages."""
+    header = f"{'classifier':<20} {'correct':>9} {'accuracy':>9} {'us/msg':>9}"
+    lines = [header, "-" * len(header)]
+    for r in results:
+        lines.append(
+            f"{r.name:<20} {r.correct:>4}/{r.total:<4} {r.accuracy:>9.1%} {r.us_per_message:>9.2f}"
+        )
+    for r in results:
+        if r.failures:
+            lines.append(f"\nMisrouted by {r.name}:")
+            for text, facet, expected, got in r.failures:
+                lines.append(f"  [{facet}] {text!r}: expected {_show(expected)}, got {_show(got)}")
+    return "\n".join(lines)
+
+
+def _show(value: Expected) -> str:
+    return "{" + ", ".join(sorted(value)) + "}" if isinstance(value, frozenset) else str(value)
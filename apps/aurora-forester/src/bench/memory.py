@@ -0,0 +1,131 @@
+"""
+Aurora Forester - Memory Benchmark
+Measures retained bytes per record for the hot-path dataclasses.
+
+Each type is measured twice: as a plain (dict-backed, mutable) dataclass with
+the same fields - the layout these types had before they were slotted - and
+as the current class. Embeddings are measured as a list of Python floats
+versus the float32 array Message stores now.
+"""
+
+import gc
+import random
+import tracemalloc
+from dataclasses import MISSING, dataclass, field, fields, make_dataclass
+from datetime import datetime
+from typing import Any, Callable, Dict, List
+
+
+@dataclass
+class MemoryResult:
+    """Retained bytes per record, before and after."""
+    record: str
+    count: int
+    before_bytes: float
+    after_bytes: float
+
+    @property
+    def saved_pct(self) -> float:
+        if self.before_bytes <= 0:
+            return 0.0
+        return 100.0 * (1 - self.after_bytes / self.before_bytes)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary for JSON output."""
+        return {
+            "record": self.record,
+            "count": self.count,
+            "before_bytes": round(self.before_bytes, 1),
+            "after_bytes": round(self.after_bytes, 1),
+            "saved_pct": round(self.saved_pct, 1),
+        }
+
+
+def _legacy(cls: type) -> type:
+    """A plain dataclass with the same fields as `cls`: no slots, not frozen."""
+    spec = [
+        (f.name, f.type, field(default=f.default, default_factory=f.default_factory))
+        if f.default is not MISSING or f.default_factory is not MISSING
+        else (f.name, f.type)
+        for f in fields(cls)
+    ]
+    return make_dataclass(f"Legacy{cls.__name__}", spec)
+
+
+def measure_bytes(factory: Callable[[int], Any], count: int) -> float:
+    """Average traced bytes retained per object built by factory(i)."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        baseline, _ = tracemalloc.get_traced_memory()
+        retained = [factory(i) for i in range(count)]
+        current, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del retained
+    return (current - baseline) / count
+
+
+def run_memory_benchmark(count: int = 2000, embedding_dim: int = 384) -> List[MemoryResult]:
+    """Measure each hot-path record type before and after slotting."""
+    from ..core.aurora import Interaction
+    from ..core.aurora_graph import Message, as_float32
+    from ..core.security import SecurityContext, SecurityLevel
+    from ..channels.message_handler import IncomingMessage, OutgoingMessage, Channel
+
+    rng = random.Random(0)
+    vector = [rng.uniform(-1, 1) for _ in range(embedding_dim)]
+    now = datetime.now()
+
+    def text(i: int) -> str:
+        return f"message {i}: what's on my plate for the Otter Camp launch this week?"
+
+    cases = {
+        "Message": (Message, lambda cls, i: cls(role="founder", content=text(i))),
+        f"Message+embedding[{embedding_dim}]": (
+            Message,
+            lambda cls, i: cls(
+                role="founder",
+                content=text(i),
+                # Fresh float objects, as when an embedding is parsed from JSON
+                embedding=as_float32(vector) if cls is Message else [x + 0.0 for x in vector],
+            ),
+        ),
+        "Interaction": (Interaction, lambda cls, i: cls(
+            timestamp=now, channel="discord", user_input=text(i),
+            aurora_response=text(i + 1), intent="task",
+        )),
+        "IncomingMessage": (IncomingMessage, lambda cls, i: cls(
+            channel=Channel.DISCORD, content=text(i), user_id="123",
+            channel_id="456", session_id="discord_123", metadata={}, timestamp=now,
+        )),
+        "OutgoingMessage": (OutgoingMessage, lambda cls, i: cls(
+            channel=Channel.DISCORD, content=text(i), recipient_id="123",
+            channel_id="456", metadata={},
+        )),
+        "SecurityContext": (SecurityContext, lambda cls, i: cls(
+            user_id=i, user_name="founder", channel_id=456, channel_name="aurora-forester",
+            guild_id=789, roles=frozenset({"Founder"}), is_dm=False,
+            security_level=SecurityLevel.FOUNDER, is_secure_channel=True,
+        )),
+    }
+
+    results = []
+    for name, (cls, build) in cases.items():
+        legacy = _legacy(cls)
+        before = measure_bytes(lambda i: build(legacy, i), count)
+        after = measure_bytes(lambda i: build(cls, i), count)
+        results.append(MemoryResult(record=name, count=count, before_bytes=before, after_bytes=after))
+    return results
+
+
+def format_memory_report(results: List[MemoryResult]) -> str:
+    """Render memory results as a fixed-width table."""
+    header = f"{'record':<24} {'count':>6} {'before B/obj':>13} {'after B/obj':>12} {'saved':>7}"
+    lines = [header, "-" * len(header)]
+    for r in results:
+        lines.append(
+            f"{r.record:<24} {r.count:>6} {r.before_bytes:>13.1f} "
+            f"{r.after_bytes:>12.1f} {r.saved_pct:>6.1f}%"
+        )
+    return "\n".join(lines)
@@ -0,0 +1,373 @@
+"""
+Aurora Forester - Mock Ollama Server
+A tiny in-process stand-in for the Ollama HTTP API, used by `main.py bench`.
+
+Serves /api/chat, /api/generate and /api/tags with a configurable
+first-token latency distribution and token generation rate, so load tests
+are repeatable without a GPU or a live model. Like Ollama, it keeps the
+last prompt of each of `cache_slots` parallel slots per model and only
+evaluates the part of a new prompt past the longest cached prefix; the
+cache is dropped once a model sits idle longer than its keep_alive. /api/embed returns
+deterministic hashed bag-of-words vectors, so texts sharing words are
+similar.
+
+Shared by aurora-forester and otto-jack. Each image is built from its own
+app directory, so the module is copied rather than imported from a common
+package; keep both copies identical apart from the title line
+(aurora-forester's tests/test_shared_modules.py checks).
+"""
+
+import asyncio
+import hashlib
+import json
+import math
+import os
+import random
+import re
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Optional, Dict, Any, List, Tuple
+
+import structlog
+
+
+logger = structlog.get_logger()
+
+
+LATENCY_DISTRIBUTIONS = ("fixed", "uniform", "normal", "exponential", "lognormal")
+
+# Filler vocabulary for generated responses
+_WORDS = (
+    "aurora", "forest", "otter", "camp", "river", "task", "idea", "rest",
+    "build", "grow", "learn", "pattern", "signal", "light", "root", "trail",
+)
+
+
+@dataclass
+class MockOllamaConfig:
+    """Behaviour of the mock Ollama server."""
+    host: str = "127.0.0.1"
+    port: int = 0  # 0 = pick a free port
+    model: str = "mistral"
+    latency_ms: float = 150.0  # Mean time to first token
+    latency_jitter_ms: float = 50.0  # Spread (meaning depends on distribution)
+    latency_distribution: str = "normal"  # fixed, uniform, normal, exponential, lognormal
+    token_rate: float = 40.0  # Tokens per second once generation starts
+    tokens_per_response: int = 120
+    prompt_eval_rate: float = 2000.0  # Prompt tokens per second
+    cache_slots: int = 4  # Prompt caches per model (OLLAMA_NUM_PARALLEL); 0 disables caching
+    keep_alive_seconds: float = 300.0  # Default idle time before a model is unloaded
+    embedding_dim: int = 64
+    seed: Optional[int] = None
+
+
+class MockOllamaServer:
+    """
+    Minimal asyncio HTTP/1.1 server that mimics the Ollama API.
+
+    Usage:
+        async with MockOllamaServer(MockOllamaConfig(token_rate=80)) as mock:
+            client = httpx.AsyncClient(base_url=mock.url)
+    """
+
+    def __init__(self, config: Optional[MockOllamaConfig] = None):
+        self.config = config or MockOllamaConfig()
+        if self.config.latency_distribution not in LATENCY_DISTRIBUTIONS:
+            raise ValueError(
+                f"Unknown latency distribution: {self.config.latency_distribution}"
+            )
+        self._rng = random.Random(self.config.seed)
+        self._server: Optional[asyncio.AbstractServer] = None
+        self.port: Optional[int] = None
+        self._connections: set = set()
+        self.requests_served = 0
+        self.prompt_tokens_total = 0  # Tokens sent
+        self.prompt_tokens_evaluated = 0  # Tokens not served from the prompt cache
+        self.embed_inputs_total = 0
+        self._prompt_cache: Dict[str, List[str]] = {}  # model -> cached prompt per slot
+        self._expires: Dict[str, float] = {}  # model -> monotonic unload time
+
+    @property
+    def url(self) -> str:
+        """Base URL to point an Ollama client at."""
+        if self.port is None:
+            raise RuntimeError("Mock Ollama server is not running")
+        return f"http://{self.config.host}:{self.port}"
+
+    async def start(self) -> "MockOllamaServer":
+        """Start listening."""
+        self._server = await asyncio.start_server(
+            self._handle_connection, self.config.host, self.config.port
+        )
+        self.port = self._server.sockets[0].getsockname()[1]
+        logger.info("mock_ollama.started", url=self.url)
+        return self
+
+    async def stop(self):
+        """Stop listening and close open connections."""
+        if self._server:
+            self._server.close()
+            for writer in list(self._connections):
+                writer.close()
+            await self._server.wait_closed()
+            self._server = None
+        logger.info("mock_ollama.stopped", requests=self.requests_served)
+
+    async def __aenter__(self) -> "MockOllamaServer":
+        return await self.start()
+
+    async def __aexit__(self, *exc):
+        await self.stop()
+
+    # ============================================
+    # TIMING MODEL
+    # ============================================
+
+    def sample_latency(self) -> float:
+        """Sample a time-to-first-token in seconds."""
+        mean = self.config.latency_ms
+        spread = self.config.latency_jitter_ms
+        dist = self.config.latency_distribution
+
+        if dist == "fixed":
+            value = mean
+        elif dist == "uniform":
+            value = self._rng.uniform(mean - spread, mean + spread)
+        elif dist == "normal":
+            value = self._rng.gauss(mean, spread)
+        elif dist == "exponential":
+            value = self._rng.expovariate(1.0 / mean) if mean > 0 else 0.0
+        else:  # lognormal - long tail, like a busy GPU
+            sigma = spread / mean if mean > 0 else 0.0
+            value = mean * self._rng.lognormvariate(0.0, sigma)
+
+        return max(0.0, value) / 1000.0
+
+    def _prompt_eval_tokens(self, model: str, prompt: str, keep_alive: Any) -> int:
+        """Tokens to evaluate for `prompt`, after reusing the best cached prefix."""
+        now = time.monotonic()
+        if self._expires.get(model, now) < now:
+            self._prompt_cache.pop(model, None)  # Model was unloaded
+        ttl = _keep_alive_seconds(keep_alive, self.config.keep_alive_seconds)
+        self._expires[model] = math.inf if ttl < 0 else now + ttl
+
+        if self.config.cache_slots <= 0:
+            return max(1, len(prompt) // 4)
+
+        slots = self._prompt_cache.setdefault(model, [])
+        best, cached = None, 0
+        for i, previous in enumerate(slots):
+            common = len(os.path.commonprefix([previous, prompt]))
+            if best is None or common > cached:
+                best, cached = i, common
+        if best is None or (cached == 0 and len(slots) < self.config.cache_slots):
+            slots.append(prompt)
+        else:
+            slots[best] = prompt
+
+        # Rough estimate - 4 characters per token
+        return max(1, len(prompt) // 4 - cached // 4)
+
+    def _generate_tokens(self) -> list:
+        return [self._rng.choice(_WORDS) for _ in range(self.config.tokens_per_response)]
+
+    def _prompt_eval_delay(self, prompt_tokens: int) -> float:
+        if self.config.prompt_eval_rate <= 0:
+            return 0.0
+        return prompt_tokens / self.config.prompt_eval_rate
+
+    def _token_delay(self) -> float:
+        if self.config.token_rate <= 0:
+            return 0.0
+        return 1.0 / self.config.token_rate
+
+    # ============================================
+    # HTTP HANDLING
+    # ============================================
+
+    async def _read_request(
+        self, reader: asyncio.StreamReader
+    ) -> Optional[Tuple[str, str, Dict[str, str], bytes]]:
+        request_line = await reader.readline()
+        if not request_line:
+            return None
+
+        method, path, _ = request_line.decode("latin-1").split(" ", 2)
+        headers: Dict[str, str] = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        length = int(headers.get("content-length", 0))
+        body = await reader.readexactly(length) if length else b""
+        return method, path, headers, body
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self._connections.add(writer)
+        try:
+            while True:
+                request = await self._read_request(reader)
+                if request is None:
+                    break
+                method, path, headers, body = request
+                await self._dispatch(method, path, body, writer)
+                if headers.get("connection", "").lower() == "close":
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.CancelledError):
+            pass
+        finally:
+            self._connections.discard(writer)
+            writer.close()
+
+    async def _dispatch(self, method: str, path: str, body: bytes, writer: asyncio.StreamWriter):
+        path = path.split("?", 1)[0]
+
+        if method == "GET" and path == "/api/tags":
+            await self._write_json(writer, 200, {
+                "models": [{"name": f"{self.config.model}:latest", "size": 0}]
+            })
+            return
+
+        if method == "POST" and path in ("/api/chat", "/api/generate"):
+            try:
+                payload = json.loads(body or b"{}")
+            except json.JSONDecodeError:
+                await self._write_json(writer, 400, {"error": "invalid JSON"})
+                return
+            await self._generate(path == "/api/chat", payload, writer)
+            return
+
+        if method == "POST" and path == "/api/embed":
+            try:
+                payload = json.loads(body or b"{}")
+            except json.JSONDecodeError:
+                await self._write_json(writer, 400, {"error": "invalid JSON"})
+                return
+            inputs = payload.get("input", [])
+            inputs = [inputs] if isinstance(inputs, str) else inputs
+            self.requests_served += 1
+            self.embed_inputs_total += len(inputs)
+            await self._write_json(writer, 200, {
+                "model": payload.get("model", self.config.model),
+                "embeddings": [self._embed(text) for text in inputs],
+            })
+            return
+
+        await self._write_json(writer, 404, {"error": f"not found: {path}"})
+
+    async def _generate(self, is_chat: bool, payload: Dict[str, Any], writer: asyncio.StreamWriter):
+        self.requests_served += 1
+
+        model = payload.get("model", self.config.model)
+        prompt_text = _render_prompt(is_chat, payload)
+        # Rough estimate - 4 characters per token
+        self.prompt_tokens_total += max(1, len(prompt_text) // 4)
+        prompt_tokens = self._prompt_eval_tokens(model, prompt_text, payload.get("keep_alive"))
+        self.prompt_tokens_evaluated += prompt_tokens
+
+        await asyncio.sleep(self.sample_latency() + self._prompt_eval_delay(prompt_tokens))
+
+        tokens = self._generate_tokens()
+        token_delay = self._token_delay()
+
+        if payload.get("stream", True):
+            await self._write_head(writer, 200, "application/x-ndjson", chunked=True)
+            for i, token in enumerate(tokens):
+                text = token if i == 0 else f" {token}"
+                await self._write_chunk(writer, self._frame(is_chat, model, text, False))
+                await asyncio.sleep(token_delay)
+            final = self._frame(is_chat, model, "", True)
+            final.update(self._stats(prompt_tokens, len(tokens), token_delay))
+            await self._write_chunk(writer, final)
+            writer.write(b"0\r\n\r\n")
+            await writer.drain()
+            return
+
+        await asyncio.sleep(token_delay * len(tokens))
+        response = self._frame(is_chat, model, " ".join(tokens), True)
+        response.update(self._stats(prompt_tokens, len(tokens), token_delay))
+        await self._write_json(writer, 200, response)
+
+    def _embed(self, text: str) -> list:
+        """Hashed bag-of-words vector, L2-normalised."""
+        vector = [0.0] * self.config.embedding_dim
+        for word in re.findall(r"[a-z0-9]+", text.lower()):
+            bucket = int.from_bytes(hashlib.blake2b(word.encode(), digest_size=4).digest(), "little")
+            vector[bucket % len(vector)] += 1.0
+        norm = math.sqrt(sum(v * v for v in vector)) or 1.0
+        return [v / norm for v in vector]
+
+    @staticmethod
+    def _frame(is_chat: bool, model: str, text: str, done: bool) -> Dict[str, Any]:
+        frame: Dict[str, Any] = {
+            "model": model,
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "done": done,
+        }
+        if is_chat:
+            frame["message"] = {"role": "assistant", "content": text}
+        else:
+            frame["response"] = text
+        return frame
+
+    def _stats(self, prompt_tokens: int, eval_tokens: int, token_delay: float) -> Dict[str, int]:
+        """Ollama-style timing fields (nanoseconds)."""
+        prompt_eval_ns = int(self._prompt_eval_delay(prompt_tokens) * 1e9)
+        eval_ns = int(token_delay * eval_tokens * 1e9)
+        return {
+            "prompt_eval_count": prompt_tokens,
+            "prompt_eval_duration": prompt_eval_ns,
+            "eval_count": eval_tokens,
+            "eval_duration": eval_ns,
+            "total_duration": prompt_eval_ns + eval_ns,
+        }
+
+    @staticmethod
+    async def _write_head(writer: asyncio.StreamWriter, status: int, content_type: str,
+                          length: Optional[int] = None, chunked: bool = False):
+        reason = {200: "OK", 400: "Bad Request", 404: "Not Found"}.get(status, "OK")
+        lines = [f"HTTP/1.1 {status} {reason}", f"Content-Type: {content_type}"]
+        if chunked:
+            lines.append("Transfer-Encoding: chunked")
+        else:
+            lines.append(f"Content-Length: {length or 0}")
+        writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1"))
+
+    async def _write_chunk(self, writer: asyncio.StreamWriter, data: Dict[str, Any]):
+        line = json.dumps(data).encode() + b"\n"
+        writer.write(f"{len(line):x}\r\n".encode() + line + b"\r\n")
+        await writer.drain()
+
+    async def _write_json(self, writer: asyncio.StreamWriter, status: int, data: Dict[str, Any]):
+        body = json.dumps(data).encode()
+        await self._write_head(writer, status, "application/json", length=len(body))
+        writer.write(body)
+        await writer.drain()
+
+
+def _render_prompt(is_chat: bool, payload: Dict[str, Any]) -> str:
+    """Flatten a request into the text the model would see."""
+    if is_chat:
+        return "".join(
+            f"<|{m.get('role', 'user')}|>{m.get('content', '')}<|end|>"
+            for m in payload.get("messages", [])
+        )
+    system = payload.get("system", "")
+    return (f"<|system|>{system}<|end|>" if system else "") + payload.get("prompt", "")
+
+
+def _keep_alive_seconds(value: Any, default: float) -> float:
+    """Parse an Ollama keep_alive ("5m", "1h", "30s", seconds); negative means forever."""
+    if value is None or value == "":
+        return default
+    if isinstance(value, (int, float)):
+        return float(value)
+    match = re.fullmatch(r"(-?[0-9.]+)(ms|s|m|h)?", str(value).strip())
+    if not match:
+        return default
+    scale = {"ms": 0.001, "s": 1, "m": 60, "h": 3600}[match.group(2) or "s"]
+    return float(match.group(1)) * scale
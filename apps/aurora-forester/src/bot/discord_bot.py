@@ -25,6 +25,8 @@ from ..core.security import (
     check_protected_content,
     SecurityLevel,
 )
+from .chunker import chunk_message
+from .outbound import OutboundDispatcher
 
 
 logger = structlog.get_logger()
@@ -49,19 +51,34 @@ class AuroraBot(commands.Bot):
         super().__init__(
             command_prefix="/aurora ",
             intents=intents,
-            description="Aurora Forester - Personal Assistant for Graydon"
+            description="Aurora Forester - Personal Assistant for Graydon",
+            # Long rate-limit waits raise instead of sleeping, so the outbound
+            # queue can reschedule them without blocking anything else
+            max_ratelimit_timeout=30.0,
         )
 
         self.aurora: Optional[AuroraForester] = None
         self.allowed_channel_id: Optional[int] = settings.discord_channel_id
+        self.outbound = OutboundDispatcher()
 
         logger.info("discord_bot.initialized")
 
     async def setup_hook(self):
         """Called when the bot is starting up."""
+        # Connect the database first; checkpoints and the agent stores use it
+        from ..db.connection import init_persistence
+        await init_persistence()
+
         # Initialize Aurora
         self.aurora = get_aurora()
 
+        # Resume saved monitors and agents that were still running at shutdown
+        from ..agents.spawner import get_agent_interface
+        resumed = await get_agent_interface().resume()
+        self.aurora.state.spawned_agents.extend(
+            agent_id for agent_id in resumed if agent_id not in self.aurora.state.spawned_agents
+        )
+
         # Start background tasks
         self.self_care_check.start()
 
@@ -87,7 +104,8 @@ class AuroraBot(commands.Bot):
         if self.allowed_channel_id:
             channel = self.get_channel(self.allowed_channel_id)
             if channel:
-                await channel.send(
+                self.outbound.send(
+                    channel,
                     "**Aurora Forester Online**\n\n"
                     "I'm here and ready to help, Graydon. "
                     "Type `/status` to see my current state, or just talk to me.\n\n"
@@ -128,7 +146,7 @@ class AuroraBot(commands.Bot):
 
         if not can_respond:
             # Redirect to Otto
-            await message.reply(redirect_message)
+            self.outbound.reply(message, redirect_message)
             return
 
         # Clean the message content (remove mentions)
@@ -144,7 +162,7 @@ class AuroraBot(commands.Bot):
         if not security_context.is_secure_channel:
             protected_response = check_protected_content(content)
             if protected_response:
-                await message.reply(protected_response)
+                self.outbound.reply(message, protected_response)
                 logger.warning(
                     "discord_bot.protected_topic_blocked",
                     user=security_context.user_name,
@@ -152,33 +170,26 @@ class AuroraBot(commands.Bot):
                 )
                 return
 
-        # Show typing indicator
-        async with message.channel.typing():
-            try:
+        # Show typing indicator while thinking; sending happens on the outbound queue
+        try:
+            async with message.channel.typing():
                 # Process with Aurora
                 response = await self.aurora.process_message(content, channel="discord")
 
                 # Filter response based on security context
                 response = filter_response_for_context(response, security_context)
 
-                # Send response (split if too long)
-                if len(response) <= 2000:
-                    await message.reply(response)
-                else:
-                    # Split into chunks
-                    chunks = [response[i:i+1900] for i in range(0, len(response), 1900)]
-                    for i, chunk in enumerate(chunks):
-                        if i == 0:
-                            await message.reply(chunk)
-                        else:
-                            await message.channel.send(chunk)
-
-            except Exception as e:
-                logger.error("discord_bot.message_error", error=str(e))
-                await message.reply(
-                    "I encountered an error processing that. "
-                    "Let me know if you'd like me to try again."
-                )
+        except Exception as e:
+            logger.error("discord_bot.message_error", error=str(e))
+            self.outbound.reply(
+                message,
+                "I encountered an error processing that. "
+                "Let me know if you'd like me to try again."
+            )
+            return
+
+        # Split on markdown-safe boundaries if too long
+        self.outbound.reply(message, chunk_message(response))
 
     @tasks.loop(minutes=30)
     async def self_care_check(self):
@@ -191,7 +202,7 @@ class AuroraBot(commands.Bot):
             if reminder:
                 channel = self.get_channel(self.allowed_channel_id)
                 if channel:
-                    await channel.send(reminder)
+                    self.outbound.send(channel, reminder)
         except Exception as e:
             logger.error("discord_bot.self_care_error", error=str(e))
 
@@ -203,8 +214,11 @@ class AuroraBot(commands.Bot):
     async def close(self):
         """Cleanup when shutting down."""
         self.self_care_check.cancel()
+        await self.outbound.close()
         if self.aurora:
             await self.aurora.shutdown()
+        from ..db.connection import close_database
+        await close_database()
         await super().close()
         logger.info("discord_bot.closed")
 
@@ -22,9 +22,9 @@ class Channel(Enum):
     TERMINAL = "terminal"
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class IncomingMessage:
-    """A message from any channel."""
+    """A message from any channel. Immutable once its defaults are filled in."""
     channel: Channel
     content: str
     user_id: str
@@ -35,14 +35,17 @@ class IncomingMessage:
 
     def __post_init__(self):
         if self.timestamp is None:
-            self.timestamp = datetime.now()
+            object.__setattr__(self, "timestamp", datetime.now())
         if self.metadata is None:
-            self.metadata = {}
+            object.__setattr__(self, "metadata", {})
         if self.session_id is None:
-            self.session_id = f"{self.channel.value}_{self.user_id}_{datetime.now().strftime('%Y%m%d')}"
+            object.__setattr__(
+                self, "session_id",
+                f"{self.channel.value}_{self.user_id}_{datetime.now().strftime('%Y%m%d')}"
+            )
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class OutgoingMessage:
     """A message to send back via a channel."""
     channel: Channel
@@ -10,6 +10,7 @@ from typing import Optional, Dict, Any, List
 from dataclasses import dataclass, field
 
 from .config import settings
+from .history import InteractionHistory
 from .llm import OllamaClient
 from ..learning.patterns import PatternStore
 from ..learning.context import ContextManager
@@ -18,7 +19,7 @@ from ..learning.context import ContextManager
 logger = structlog.get_logger()
 
 
-@dataclass
+@dataclass(slots=True)
 class Interaction:
     """Record of an interaction with Aurora."""
     timestamp: datetime
@@ -62,7 +63,11 @@ class AuroraForester:
         self.llm = OllamaClient()
         self.patterns = PatternStore()
         self.context = ContextManager()
-        self.interactions: List[Interaction] = []
+        self.interactions = InteractionHistory(
+            capacity=settings.history_window,
+            log_dir=settings.learning_path / "interactions",
+            record_type=Interaction,
+        )
 
         # System prompt that defines Aurora's personality
         self.system_prompt = self._build_system_prompt()
@@ -187,7 +192,7 @@ The work matters, but so does his wellbeing."""
             })
 
         # Add recent conversation history (last 5 interactions)
-        for interaction in self.interactions[-5:]:
+        for interaction in self.interactions.recent(5):
             conversation.append({"role": "user", "content": interaction.user_input})
             conversation.append({"role": "assistant", "content": interaction.aurora_response})
 
@@ -213,6 +218,9 @@ The work matters, but so does his wellbeing."""
         elif cmd.startswith("/spawn "):
             agent_spec = command[7:]
             return await self._spawn_agent(agent_spec)
+        elif cmd == "/history" or cmd.startswith("/history "):
+            arg = cmd[9:].strip()
+            return await self._get_history(int(arg) if arg.isdigit() else 0)
         elif cmd == "/help":
             return self._get_help()
         else:
@@ -223,7 +231,7 @@ The work matters, but so does his wellbeing."""
         uptime = "Active"
         agents = len(self.state.spawned_agents)
         tasks = len(self.state.active_tasks)
-        interactions = len(self.interactions)
+        interactions = self.interactions.session_count
 
         return f"""**Aurora Forester Status**
 
@@ -241,8 +249,25 @@ I'm here and ready to help, Graydon."""
         if not self.state.spawned_agents:
             return "No agents spawned yet. Use `/spawn [domain]` to create one."
 
-        agent_list = "\n".join([f"- {agent}" for agent in self.state.spawned_agents])
-        return f"**Spawned Agents:**\n{agent_list}"
+        from ..agents.spawner import get_agent_interface
+        spawner = get_agent_interface().spawner
+        lines = []
+        for agent_id in self.state.spawned_agents:
+            summary = spawner.get_agent_summary(agent_id)
+            if summary is None:
+                lines.append(f"- {agent_id}")
+            else:
+                lines.append(f"- {summary['name']} ({agent_id}): {summary['status']}")
+
+        spiller = spawner.spiller
+        if spiller.stats["dropped"]:
+            lines.append(
+                f"\n{spiller.stats['dropped']} older agent outputs were dropped "
+                f"because they could not be stored (check the agent_outputs logs)."
+            )
+        elif spiller.store == "local":
+            lines.append("\nOlder agent outputs are kept in the local SQLite store; Postgres is unavailable.")
+        return "**Spawned Agents:**\n" + "\n".join(lines)
 
     async def _capture_to_think_tank(self, idea: str) -> str:
         """Capture an idea to Think Tank."""
@@ -252,12 +277,39 @@ I'm here and ready to help, Graydon."""
         return f"**Captured to Think Tank**\n\nIdea: {idea}\nTimestamp: {timestamp}\n\nI'll categorize and organize this. Would you like me to score it now?"
 
     async def _spawn_agent(self, spec: str) -> str:
-        """Spawn a new agent."""
-        # TODO: Implement agent spawning
-        agent_name = f"{spec.lower().replace(' ', '-')}-agent"
-        self.state.spawned_agents.append(agent_name)
-        logger.info("agent.spawned", name=agent_name)
-        return f"**Agent Spawned**\n\nName: {agent_name}\nDomain: {spec}\nStatus: Active\n\nThe agent is now part of the system and will report back to me."
+        """Spawn a new agent and queue it on the agent worker pool."""
+        from ..agents.pool import PoolFull
+        from ..agents.spawner import get_agent_interface
+
+        interface = get_agent_interface()
+        try:
+            agent = await interface.launch(spec)
+        except PoolFull:
+            logger.warning("agent.spawn_rejected", spec=spec[:50])
+            return "**Agent queue is full**\n\nToo many agents are waiting to run. Try again once some finish."
+        except ValueError as e:
+            logger.warning("agent.spawn_failed", spec=spec[:50], error=str(e))
+            return f"**Couldn't spawn that agent**\n\n{e}"
+
+        self.state.spawned_agents.append(agent.id)
+        logger.info("agent.spawned", agent_id=agent.id, name=agent.config.name)
+        if agent.config.agent_type.value == "monitor":
+            status = "Watching"
+        else:
+            status = "Running" if interface.spawner.pool.is_running(agent.id) else "Queued"
+        return f"**Agent Spawned**\n\nName: {agent.config.name}\nID: {agent.id}\nDomain: {spec}\nStatus: {status}\n\nThe agent is now part of the system and will report back to me."
+
+    async def _get_history(self, page: int) -> str:
+        """Page back through past interactions, newest first."""
+        entries = await self.interactions.apage_back(page, page_size=10)
+        if not entries:
+            return "No interactions on that page."
+
+        lines = [f"**Interaction History** (page {page}, {len(self.interactions)} total)\n"]
+        for interaction in reversed(entries):
+            stamp = interaction.timestamp.strftime("%Y-%m-%d %H:%M")
+            lines.append(f"- {stamp} [{interaction.channel}] {interaction.user_input[:80]}")
+        return "\n".join(lines)
 
     def _get_help(self) -> str:
         """Get help text."""
@@ -267,6 +319,7 @@ I'm here and ready to help, Graydon."""
 **/agents** - List spawned agents
 **/capture [idea]** - Capture an idea to Think Tank
 **/spawn [domain]** - Spawn a new agent for a domain
+**/history [page]** - Page back through past interactions
 **/help** - Show this help
 
 Or just talk to me naturally - I'm here to help!"""
@@ -295,6 +348,9 @@ Or just talk to me naturally - I'm here to help!"""
         """Gracefully shutdown Aurora."""
         logger.info("aurora.shutdown_started")
         # Save state, close connections, etc.
+        from ..agents.spawner import shutdown_agents
+        await shutdown_agents()
+        await asyncio.to_thread(self.interactions.close)
         self.state.active = False
         logger.info("aurora.shutdown_complete")
 
@@ -3,17 +3,24 @@ Aurora Forester - LangGraph Core Implementation
 Stateful multi-agent orchestration for the Aurora system.
 """
 
-from typing import TypedDict, List, Dict, Any, Optional, Literal
+from typing import TypedDict, Annotated, List, Dict, Any, Optional, Literal, Sequence
 from dataclasses import dataclass, field
+from array import array
 from datetime import datetime
 from enum import Enum
+from functools import partial
+import asyncio
 import json
 
-# Note: These imports will be available when langgraph is installed
-# from langgraph.graph import StateGraph, END
-# from langchain_core.messages import BaseMessage, HumanMessage, AIMessage
+import structlog
 
 from .founder_profile import get_founder_context, can_share_topic, check_wellbeing
+from .graph_engine import StateGraph, CompiledGraph, END, append, get_reducers
+from .checkpoint import CheckpointSerializer, CheckpointStore
+from .intent import get_intent_classifier
+
+
+logger = structlog.get_logger()
 
 
 class Intent(Enum):
@@ -29,14 +36,31 @@ class Intent(Enum):
     UNKNOWN = "unknown"
 
 
-@dataclass
+def as_float32(values: Optional[Sequence[float]]) -> Optional[array]:
+    """Pack an embedding into a contiguous float32 array (4 bytes per value)."""
+    if values is None or (isinstance(values, array) and values.typecode == "f"):
+        return values
+    return array("f", values)
+
+
+@dataclass(frozen=True, slots=True)
 class Message:
-    """A single message in the conversation."""
+    """
+    A single message in the conversation.
+
+    Messages are immutable once appended to state. Embeddings are stored as
+    float32 arrays rather than lists of Python floats (~4 vs ~32 bytes per
+    dimension); pass `list(message.embedding)` where a list is required.
+    """
     role: Literal["founder", "aurora", "system"]
     content: str
     timestamp: datetime = field(default_factory=datetime.now)
     metadata: Dict[str, Any] = field(default_factory=dict)
-    embedding: Optional[List[float]] = None
+    embedding: Optional[array] = None
+
+    def __post_init__(self):
+        if self.embedding is not None:
+            object.__setattr__(self, "embedding", as_float32(self.embedding))
 
 
 @dataclass
@@ -77,18 +101,23 @@ class Action:
     description: str
     result: Optional[Any] = None
     success: bool = True
+    turn: Optional[int] = None  # Conversation turn that produced it
 
 
 class AuroraState(TypedDict):
     """
     The complete state for Aurora's LangGraph.
     This state flows through all nodes and maintains context.
+
+    List fields annotated with `append` accumulate across turns; every other
+    field is replaced by whichever node last wrote it.
     """
     # Conversation context
-    messages: List[Message]
+    messages: Annotated[List[Message], append]
     channel: str  # discord, sms, tablet, terminal, webhook
     session_id: str
     conversation_id: Optional[str]
+    turn: int  # Incremented once per founder message
 
     # Founder context (from secure profile)
     founder_context: Dict[str, Any]
@@ -100,7 +129,7 @@ class AuroraState(TypedDict):
 
     # Task context
     active_tasks: List[Task]
-    task_updates: List[Dict[str, Any]]
+    task_updates: Annotated[List[Dict[str, Any]], append]
 
     # Intent understanding
     intent: Intent
@@ -113,11 +142,11 @@ class AuroraState(TypedDict):
     tone: str  # warm, direct, playful, supportive
 
     # Actions taken
-    actions: List[Action]
-    spawned_agents: List[str]
+    actions: Annotated[List[Action], append]
+    spawned_agents: Annotated[List[str], append]
 
     # Learning
-    observations: List[Observation]
+    observations: Annotated[List[Observation], append]
     feedback_requested: bool
 
     # Wellbeing
@@ -127,166 +156,198 @@ class AuroraState(TypedDict):
 # ============================================
 # NODE FUNCTIONS
 # ============================================
+#
+# Nodes read the state and return only the keys they change. The graph
+# engine merges each delta using the reducers declared on AuroraState.
 
-async def understand_intent(state: AuroraState) -> AuroraState:
+async def understand_intent(state: AuroraState) -> Dict[str, Any]:
     """
     First node: Understand what the founder is asking for.
     Classifies intent and extracts entities.
     """
     if not state["messages"]:
-        state["intent"] = Intent.UNKNOWN
-        state["confidence"] = 0.0
-        return state
+        return {"intent": Intent.UNKNOWN, "confidence": 0.0}
 
     last_message = state["messages"][-1]
-    content = last_message.content.lower()
-
-    # Simple intent classification (will be replaced with LLM)
-    if any(word in content for word in ["task", "todo", "add", "create", "remind"]):
-        state["intent"] = Intent.TASK
-    elif any(word in content for word in ["workflow", "automate", "n8n"]):
-        state["intent"] = Intent.WORKFLOW
-    elif any(word in content for word in ["spawn", "agent", "research"]):
-        state["intent"] = Intent.AGENT_SPAWN
-    elif any(word in content for word in ["reflect", "learn", "pattern"]):
-        state["intent"] = Intent.REFLECTION
-    elif any(word in content for word in ["how are", "feeling", "break", "rest"]):
-        state["intent"] = Intent.WELLBEING
-    elif "?" in content:
-        state["intent"] = Intent.QUESTION
-    else:
-        state["intent"] = Intent.CONVERSATION
-
-    state["confidence"] = 0.8  # Placeholder
-    state["entities"] = []  # Will be extracted by LLM
+    classification = await get_intent_classifier().aclassify(last_message.content)
+    label, confidence = classification.top("intent", default=Intent.CONVERSATION.value)
 
-    return state
+    return {
+        "intent": Intent(label),
+        "confidence": confidence or 0.5,
+        "entities": [],  # Will be extracted by LLM
+    }
 
 
-async def check_authorization(state: AuroraState) -> AuroraState:
+async def check_authorization(state: AuroraState) -> Dict[str, Any]:
     """
     Security check: Verify the user is authorized.
     """
     # In production, this checks against the authorized users list
     # For now, assume terminal access is always authorized
     if state["channel"] == "terminal":
-        state["is_authorized"] = True
-    else:
-        # Check against authorized users (founder, Menley, Coby)
-        # This will integrate with Discord role checking
-        state["is_authorized"] = True  # Placeholder
+        return {"is_authorized": True}
 
-    return state
+    # Check against authorized users (founder, Menley, Coby)
+    # This will integrate with Discord role checking
+    return {"is_authorized": True}  # Placeholder
 
 
-async def load_founder_context(state: AuroraState) -> AuroraState:
+async def load_founder_context(state: AuroraState) -> Dict[str, Any]:
     """
     Load the founder's context for personalized responses.
     """
-    if state["is_authorized"]:
-        state["founder_context"] = get_founder_context()
+    if not state["is_authorized"]:
+        return {"founder_context": {}}
 
-        # Check wellbeing
-        wellbeing_msg = check_wellbeing()
-        if wellbeing_msg:
-            state["wellbeing_check"] = wellbeing_msg
-    else:
-        state["founder_context"] = {}
+    # Profile and wellbeing live on disk - keep the event loop free
+    updates: Dict[str, Any] = {
+        "founder_context": await asyncio.to_thread(get_founder_context)
+    }
 
-    return state
+    # Check wellbeing
+    wellbeing_msg = await asyncio.to_thread(check_wellbeing)
+    if wellbeing_msg:
+        updates["wellbeing_check"] = wellbeing_msg
 
+    return updates
 
-async def retrieve_context(state: AuroraState) -> AuroraState:
+
+async def retrieve_context(state: AuroraState) -> Dict[str, Any]:
     """
     RAG retrieval: Find relevant documents from context library.
     """
     if not state["messages"]:
-        return state
+        return {}
 
     last_message = state["messages"][-1]
 
     # Security check: Ensure topic is shareable
-    if not can_share_topic(last_message.content):
-        state["relevant_docs"] = []
-        state["thinking"] = "This topic touches on protected areas. Proceeding carefully."
-        return state
+    if not await asyncio.to_thread(can_share_topic, last_message.content):
+        return {
+            "relevant_docs": [],
+            "thinking": "This topic touches on protected areas. Proceeding carefully.",
+        }
 
     # Placeholder for actual RAG retrieval
     # In production: embed query -> vector search -> return top-k docs
-    state["relevant_docs"] = []
-    state["context_query"] = last_message.content
-
-    return state
+    return {
+        "relevant_docs": [],
+        "context_query": last_message.content,
+    }
 
 
-async def generate_response(state: AuroraState) -> AuroraState:
+async def generate_response(state: AuroraState, llm=None) -> Dict[str, Any]:
     """
     Generate Aurora's response based on context and intent.
+
+    `llm` is an OllamaClient bound in by build_aurora_graph; without one the
+    node falls back to a placeholder so the graph can run offline.
     """
     intent = state["intent"]
-    founder_ctx = state["founder_context"]
 
     # Determine appropriate tone
     if intent == Intent.WELLBEING:
-        state["tone"] = "warm"
+        tone = "warm"
     elif intent == Intent.TASK:
-        state["tone"] = "practical"
+        tone = "practical"
+    elif intent == Intent.REFLECTION:
+        tone = "reflective"
     else:
-        state["tone"] = "collaborative"
-
-    # Placeholder response generation
-    # In production: LLM call with full context
-    state["thinking"] = f"Intent: {intent.value}, Tone: {state['tone']}"
+        tone = "collaborative"
 
-    # Check if we should include wellbeing reminder
-    if state.get("wellbeing_check") and intent != Intent.WELLBEING:
-        state["response"] = f"[After handling the request, gently mention: {state['wellbeing_check']}]"
+    if llm is None:
+        # Check if we should include wellbeing reminder
+        if state.get("wellbeing_check") and intent != Intent.WELLBEING:
+            response = f"[After handling the request, gently mention: {state['wellbeing_check']}]"
+        else:
+            response = "Response placeholder - will be generated by LLM"
     else:
-        state["response"] = "Response placeholder - will be generated by LLM"
+        response = await llm.chat(build_prompt_messages(state, tone))
+
+    return {
+        "tone": tone,
+        "thinking": f"Intent: {intent.value}, Tone: {tone}",
+        "response": response,
+        "messages": [Message(role="aurora", content=response)],
+    }
+
+
+def build_prompt_messages(state: AuroraState, tone: str, history: int = 10) -> List[Dict[str, str]]:
+    """Turn the graph state into Ollama chat messages."""
+    founder_ctx = state["founder_context"]
+    name = founder_ctx.get("preferred_name", "the founder")
+
+    system_parts = [
+        f"You are Aurora Forester, a collaborative partner and personal assistant for {name}.",
+        f"Communication style: {founder_ctx.get('communication_style', 'direct, warm, collaborative')}.",
+        f"Tone for this reply: {tone}.",
+    ]
+    if founder_ctx.get("current_focus"):
+        system_parts.append(f"Current focus: {founder_ctx['current_focus']}.")
+    if founder_ctx.get("goals_summary"):
+        system_parts.append("Active goals: " + "; ".join(g for g in founder_ctx["goals_summary"] if g))
+
+    turn_actions = [a for a in state["actions"] if a.turn == state["turn"]]
+    if turn_actions:
+        system_parts.append("Actions taken: " + "; ".join(a.description for a in turn_actions))
+    if state.get("wellbeing_check") and state["intent"] != Intent.WELLBEING:
+        system_parts.append(f"After handling the request, gently mention: {state['wellbeing_check']}")
 
-    return state
+    messages = [{"role": "system", "content": "\n".join(system_parts)}]
 
+    if state["relevant_docs"]:
+        docs = "\n\n".join(f"[{d.title}]\n{d.content}" for d in state["relevant_docs"])
+        messages.append({"role": "system", "content": f"Relevant context:\n{docs}"})
 
-async def execute_actions(state: AuroraState) -> AuroraState:
+    role_map = {"founder": "user", "aurora": "assistant", "system": "system"}
+    for message in state["messages"][-history:]:
+        messages.append({"role": role_map[message.role], "content": message.content})
+
+    return messages
+
+
+async def execute_actions(state: AuroraState) -> Dict[str, Any]:
     """
     Execute any actions based on intent.
     """
     intent = state["intent"]
+    turn = state["turn"]
     actions = []
+    spawned = []
 
     if intent == Intent.TASK:
         # Create/update task
-        action = Action(
+        actions.append(Action(
             action_type="task_operation",
             description="Task operation placeholder",
-            success=True
-        )
-        actions.append(action)
+            success=True,
+            turn=turn
+        ))
 
     elif intent == Intent.WORKFLOW:
         # Trigger or create workflow
-        action = Action(
+        actions.append(Action(
             action_type="workflow_operation",
             description="Workflow operation placeholder",
-            success=True
-        )
-        actions.append(action)
+            success=True,
+            turn=turn
+        ))
 
     elif intent == Intent.AGENT_SPAWN:
         # Spawn specialized agent
-        action = Action(
+        actions.append(Action(
             action_type="spawn_agent",
             description="Agent spawn placeholder",
-            success=True
-        )
-        actions.append(action)
-        state["spawned_agents"].append("placeholder_agent_id")
+            success=True,
+            turn=turn
+        ))
+        spawned.append("placeholder_agent_id")
 
-    state["actions"] = actions
-    return state
+    return {"actions": actions, "spawned_agents": spawned}
 
 
-async def update_learning(state: AuroraState) -> AuroraState:
+async def update_learning(state: AuroraState) -> Dict[str, Any]:
     """
     Record observations for Aurora's recursive learning.
     """
@@ -294,16 +355,35 @@ async def update_learning(state: AuroraState) -> AuroraState:
 
     # Observe patterns in the conversation
     if state["intent"] == Intent.TASK and len(state["messages"]) > 1:
-        obs = Observation(
+        observations.append(Observation(
             observation_type="behavior",
             content="Founder frequently creates tasks during this time of day",
             confidence=0.3
-        )
-        observations.append(obs)
+        ))
+
+    return {"observations": observations}
+
+
+async def reflection_mode(state: AuroraState) -> Dict[str, Any]:
+    """
+    Reflection requests: surface what Aurora has been observing.
+    """
+    return {
+        "thinking": "Reflecting on recent observations before responding.",
+        "feedback_requested": True,
+    }
 
-    state["observations"] = observations
-    return state
 
+async def redirect_to_otto(state: AuroraState) -> Dict[str, Any]:
+    """
+    Unauthorized users are pointed at Otto instead of getting Aurora.
+    """
+    return {
+        "response": (
+            "Hi there! I'm Aurora, and I primarily work with the founder team. "
+            "For general questions about Hello World Co-Op, Otto is your guide!"
+        )
+    }
 
 # ============================================
 # ROUTING FUNCTIONS
@@ -332,48 +412,73 @@ def route_by_intent(state: AuroraState) -> str:
 # GRAPH BUILDER
 # ============================================
 
-def build_aurora_graph():
+# Per-node timeouts (seconds). Context nodes are optional: if they are slow
+# or fail, Aurora answers without that context rather than not at all.
+NODE_TIMEOUTS = {
+    "understand": 5.0,
+    "check_auth": 5.0,
+    "load_context": 5.0,
+    "retrieve": 10.0,
+    "act": 30.0,
+    "reflect": 10.0,
+    "think": 180.0,
+    "learn": 10.0,
+    "redirect_to_otto": 5.0,
+}
+OPTIONAL_NODES = {"load_context", "retrieve", "learn"}
+
+
+def build_aurora_graph(llm=None, timeouts: Optional[Dict[str, float]] = None) -> CompiledGraph:
     """
-    Build the Aurora LangGraph.
+    Build the Aurora graph.
 
     Graph structure:
     1. understand_intent -> check_authorization
-    2. check_authorization -> [redirect_to_otto | load_context]
-    3. load_context -> retrieve_context
-    4. retrieve_context -> route_by_intent
-    5. route_by_intent -> [execute_actions | generate_response | reflection_mode]
-    6. execute_actions -> generate_response
+    2. check_authorization -> [redirect_to_otto | load_context + retrieve_context]
+    3. load_context and retrieve_context run concurrently
+    4. route_by_intent -> [execute_actions | generate_response | reflection_mode]
+    5. execute_actions -> generate_response
+    6. reflection_mode -> generate_response
     7. generate_response -> update_learning
     8. update_learning -> END
     """
-    # Placeholder - actual implementation requires langgraph package
-    # from langgraph.graph import StateGraph, END
-    #
-    # graph = StateGraph(AuroraState)
-    #
-    # # Add nodes
-    # graph.add_node("understand", understand_intent)
-    # graph.add_node("check_auth", check_authorization)
-    # graph.add_node("load_context", load_founder_context)
-    # graph.add_node("retrieve", retrieve_context)
-    # graph.add_node("think", generate_response)
-    # graph.add_node("act", execute_actions)
-    # graph.add_node("learn", update_learning)
-    # graph.add_node("redirect_to_otto", redirect_to_otto)
-    #
-    # # Add edges
-    # graph.set_entry_point("understand")
-    # graph.add_edge("understand", "check_auth")
-    # graph.add_conditional_edges("check_auth", route_by_authorization)
-    # graph.add_edge("load_context", "retrieve")
-    # graph.add_conditional_edges("retrieve", route_by_intent)
-    # graph.add_edge("act", "think")
-    # graph.add_edge("think", "learn")
-    # graph.add_edge("learn", END)
-    #
-    # return graph.compile()
-
-    return None  # Placeholder until langgraph is installed
+    timeouts = {**NODE_TIMEOUTS, **(timeouts or {})}
+    graph = StateGraph(AuroraState)
+
+    def add(name, fn):
+        graph.add_node(name, fn, timeout=timeouts.get(name), optional=name in OPTIONAL_NODES)
+
+    # Add nodes
+    add("understand", understand_intent)
+    add("check_auth", check_authorization)
+    add("load_context", load_founder_context)
+    add("retrieve", retrieve_context)
+    add("act", execute_actions)
+    add("reflect", reflection_mode)
+    add("think", partial(generate_response, llm=llm))
+    add("learn", update_learning)
+    add("redirect_to_otto", redirect_to_otto)
+
+    # Add edges
+    graph.set_entry_point("understand")
+    graph.add_edge("understand", "check_auth")
+    graph.add_conditional_edges("check_auth", route_by_authorization, {
+        "redirect_to_otto": "redirect_to_otto",
+        "load_context": ["load_context", "retrieve"],
+    })
+    # Routing waits for both context branches to finish
+    graph.add_conditional_edges("retrieve", route_by_intent, {
+        "execute_actions": "act",
+        "reflection_mode": "reflect",
+        "generate_response": "think",
+    })
+    graph.add_edge("act", "think")
+    graph.add_edge("reflect", "think")
+    graph.add_edge("think", "learn")
+    graph.add_edge("learn", END)
+    graph.add_edge("redirect_to_otto", END)
+
+    return graph.compile()
 
 
 def create_initial_state(
@@ -394,6 +499,7 @@ def create_initial_state(
         channel=channel,
         session_id=session_id,
         conversation_id=None,
+        turn=0,
         founder_context={},
         is_authorized=False,
         relevant_docs=[],
@@ -414,6 +520,22 @@ def create_initial_state(
     )
 
 
+# Per-turn working state that is rebuilt every turn and never checkpointed
+TRANSIENT_STATE_KEYS = {"founder_context", "relevant_docs", "context_query", "thinking", "wellbeing_check"}
+
+
+def create_checkpoint_store(repo_provider=None, snapshot_every: int = 10) -> CheckpointStore:
+    """Create a checkpoint store that understands AuroraState."""
+    return CheckpointStore(
+        serializer=CheckpointSerializer([Message, Task, Document, Observation, Action, Intent]),
+        reducers=get_reducers(AuroraState),
+        initial_state=create_initial_state,
+        repo_provider=repo_provider,
+        snapshot_every=snapshot_every,
+        transient_keys=TRANSIENT_STATE_KEYS,
+    )
+
+
 # ============================================
 # AURORA INTERFACE
 # ============================================
@@ -424,9 +546,15 @@ class Aurora:
     Manages conversation state and graph execution.
     """
 
-    def __init__(self):
-        self.graph = build_aurora_graph()
+    def __init__(self, llm=None, checkpointer: Optional[CheckpointStore] = None):
+        if llm is None:
+            from .llm import OllamaClient
+            llm = OllamaClient()
+        self.llm = llm
+        self.graph = build_aurora_graph(llm=llm)
+        self.checkpointer = checkpointer
         self.active_sessions: Dict[str, AuroraState] = {}
+        self._session_locks: Dict[str, asyncio.Lock] = {}
 
     async def process_message(
         self,
@@ -438,30 +566,68 @@ class Aurora:
         """
         Process an incoming message and return Aurora's response.
         """
-        # Get or create session state
-        if session_id in self.active_sessions:
-            state = self.active_sessions[session_id]
-        else:
-            state = create_initial_state(channel, session_id)
+        # One turn at a time per session; different sessions run concurrently
+        lock = self._session_locks.setdefault(session_id, asyncio.Lock())
+        async with lock:
+            # Get, rehydrate or create session state
+            state = self.active_sessions.get(session_id)
+            if state is None and self.checkpointer is not None:
+                state = await self.checkpointer.load(session_id, channel)
+            if state is None:
+                state = create_initial_state(channel, session_id)
             self.active_sessions[session_id] = state
 
-        # Add the new message
-        state["messages"].append(Message(
-            role="founder",
-            content=message,
-            metadata={"user_id": user_id}
-        ))
-
-        # Run the graph (placeholder)
-        # In production: result = await self.graph.ainvoke(state)
-
-        # For now, return a placeholder
-        return "Aurora is being configured. Full LangGraph integration coming soon."
+            # The run updates state in place; a failed turn is undone so the
+            # cached session matches what was last checkpointed
+            saved = dict(state)
+            lengths = {key: len(value) for key, value in state.items() if isinstance(value, list)}
+            try:
+                # The new message goes in as the turn's input delta
+                run = await self.graph.arun(state, {
+                    "messages": [Message(
+                        role="founder",
+                        content=message,
+                        metadata={"user_id": user_id}
+                    )],
+                    "turn": state["turn"] + 1,
+                    "response": "",
+                    "wellbeing_check": None,
+                })
+            except BaseException:
+                state.clear()
+                state.update(saved)
+                for key, length in lengths.items():
+                    del state[key][length:]
+                raise
+            self.active_sessions[session_id] = run.state
+
+            # Checkpoint only at the turn boundary - one row per turn
+            if self.checkpointer is not None:
+                await self.checkpointer.save_turn(
+                    session_id, run.state, run.deltas, run.state["turn"]
+                )
+
+            logger.info(
+                "aurora_graph.turn_complete",
+                session_id=session_id,
+                intent=run.state["intent"].value,
+                total_ms=round(run.total_seconds * 1000, 1),
+                nodes={k: round(v * 1000, 1) for k, v in run.timings_by_node().items()},
+            )
+
+            return run.state["response"]
 
     def get_session(self, session_id: str) -> Optional[AuroraState]:
         """Get an active session's state."""
         return self.active_sessions.get(session_id)
 
+    async def aend_session(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """End a session and drop its checkpoints."""
+        summary = self.end_session(session_id)
+        if self.checkpointer is not None:
+            await self.checkpointer.delete(session_id)
+        return summary
+
     def end_session(self, session_id: str) -> Optional[Dict[str, Any]]:
         """
         End a session and return a summary.
@@ -471,6 +637,7 @@ class Aurora:
             return None
 
         state = self.active_sessions.pop(session_id)
+        self._session_locks.pop(session_id, None)
 
         return {
             "session_id": session_id,
@@ -489,5 +656,5 @@ def get_aurora() -> Aurora:
     """Get the singleton Aurora instance."""
     global _aurora
     if _aurora is None:
-        _aurora = Aurora()
+        _aurora = Aurora(checkpointer=create_checkpoint_store())
     return _aurora
@@ -0,0 +1,238 @@
+"""
+Aurora Forester - Graph Checkpointing
+Durable, resumable session state for the Aurora graph.
+
+At the end of every turn the session is written as either a full snapshot
+or a single compacted delta (the turn's merged node updates). Snapshots are
+taken every `snapshot_every` turns, after which older rows are pruned, so a
+long session costs one small row per turn and rehydration replays at most
+`snapshot_every - 1` deltas on top of the latest snapshot.
+"""
+
+import base64
+import json
+from array import array
+from dataclasses import fields, is_dataclass
+from datetime import datetime
+from enum import Enum
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+import structlog
+
+from .graph_engine import Reducer, apply_updates
+
+
+logger = structlog.get_logger()
+
+
+# Bump when the encoded state layout changes; older checkpoints are ignored
+CHECKPOINT_FORMAT_VERSION = 1
+
+
+class CheckpointSerializer:
+    """
+    Compact JSON encoding for graph state.
+
+    Dataclasses and enums are tagged with their class name, so only types
+    registered here can be restored - nothing is imported by name. float32
+    arrays (message embeddings) are stored as base64 of their raw bytes.
+    """
+
+    def __init__(self, types: Iterable[type]):
+        self.types = {t.__name__: t for t in types}
+
+    def encode(self, value: Any) -> Any:
+        if isinstance(value, Enum):
+            return {"__enum__": type(value).__name__, "v": value.value}
+        if is_dataclass(value) and not isinstance(value, type):
+            data = {f.name: self.encode(getattr(value, f.name)) for f in fields(value)}
+            data["__type__"] = type(value).__name__
+            return data
+        if isinstance(value, datetime):
+            return {"__dt__": value.isoformat()}
+        if isinstance(value, array):
+            return {"__f32__": base64.b64encode(value.tobytes()).decode("ascii")}
+        if isinstance(value, dict):
+            return {k: self.encode(v) for k, v in value.items()}
+        if isinstance(value, (list, tuple)):
+            return [self.encode(v) for v in value]
+        return value
+
+    def decode(self, value: Any) -> Any:
+        if isinstance(value, list):
+            return [self.decode(v) for v in value]
+        if not isinstance(value, dict):
+            return value
+        if "__dt__" in value:
+            return datetime.fromisoformat(value["__dt__"])
+        if "__f32__" in value:
+            packed = array("f")
+            packed.frombytes(base64.b64decode(value["__f32__"]))
+            return packed
+        if "__enum__" in value:
+            return self.types[value["__enum__"]](value["v"])
+        if "__type__" in value:
+            cls = self.types[value["__type__"]]
+            return cls(**{k: self.decode(v) for k, v in value.items() if k != "__type__"})
+        return {k: self.decode(v) for k, v in value.items()}
+
+    def dumps(self, value: Any) -> str:
+        return json.dumps(self.encode(value), separators=(",", ":"))
+
+    def loads(self, payload: Any) -> Any:
+        # asyncpg hands jsonb back as text unless a codec is registered
+        if isinstance(payload, (str, bytes)):
+            payload = json.loads(payload)
+        return self.decode(payload)
+
+
+def compact_deltas(
+    deltas: List[Tuple[str, Dict[str, Any]]],
+    reducers: Dict[str, Reducer]
+) -> Dict[str, Any]:
+    """
+    Fold a turn's node deltas into one.
+
+    Reducer keys keep every appended item; plain keys keep their last value.
+    Replaying the result with the same reducers gives the same state.
+    """
+    merged: Dict[str, Any] = {}
+    for _, delta in deltas:
+        for key, value in delta.items():
+            if key in reducers:
+                merged.setdefault(key, []).extend(value or [])
+            else:
+                merged[key] = value
+    return merged
+
+
+class CheckpointStore:
+    """
+    Turn-boundary checkpointing for graph sessions.
+
+    `repo_provider` returns a CheckpointRepository; it is resolved on first
+    use, and if the database is not available checkpointing switches itself
+    off rather than failing conversations. The database is connected and the
+    table created at startup by init_persistence(), which already logs an
+    error when checkpointing will be off.
+    """
+
+    def __init__(
+        self,
+        serializer: CheckpointSerializer,
+        reducers: Dict[str, Reducer],
+        initial_state: Callable[[str, str], Dict[str, Any]],
+        repo_provider: Optional[Callable[[], Any]] = None,
+        snapshot_every: int = 10,
+        transient_keys: Iterable[str] = ()
+    ):
+        self.serializer = serializer
+        self.reducers = reducers
+        self.initial_state = initial_state
+        self.snapshot_every = max(1, snapshot_every)
+        self.transient_keys = set(transient_keys)
+        self._repo_provider = repo_provider
+        self._repo = None
+        self._disabled = False
+        # session_id -> (last version written, version of last snapshot)
+        self._versions: Dict[str, Tuple[int, int]] = {}
+
+    def _get_repo(self):
+        if self._disabled:
+            return None
+        if self._repo is None:
+            if self._repo_provider is None:
+                from ..db.connection import get_checkpoint_repo
+                self._repo_provider = get_checkpoint_repo
+            try:
+                self._repo = self._repo_provider()
+            except RuntimeError as e:
+                logger.error("checkpoint.disabled", reason=str(e))
+                self._disabled = True
+                return None
+        return self._repo
+
+    def _persistable(self, state: Dict[str, Any]) -> Dict[str, Any]:
+        return {k: v for k, v in state.items() if k not in self.transient_keys}
+
+    async def load(self, session_id: str, channel: str) -> Optional[Dict[str, Any]]:
+        """Rehydrate a session from its latest snapshot plus later deltas."""
+        repo = self._get_repo()
+        if repo is None:
+            return None
+
+        rows = await repo.load_latest(session_id)
+        if not rows or rows[0]["kind"] != "snapshot":
+            return None
+
+        snapshot = self.serializer.loads(rows[0]["payload"])
+        if snapshot.get("format") != CHECKPOINT_FORMAT_VERSION:
+            logger.warning("checkpoint.format_mismatch", session_id=session_id,
+                           found=snapshot.get("format"))
+            await repo.delete_session(session_id)
+            return None
+
+        state = self.initial_state(channel, session_id)
+        state.update(snapshot["state"])
+        for row in rows[1:]:
+            apply_updates(state, self.serializer.loads(row["payload"])["delta"], self.reducers)
+
+        last_version = rows[-1]["version"]
+        self._versions[session_id] = (last_version, rows[0]["version"])
+        logger.info("checkpoint.rehydrated", session_id=session_id,
+                    version=last_version, deltas=len(rows) - 1)
+        return state
+
+    async def save_turn(
+        self,
+        session_id: str,
+        state: Dict[str, Any],
+        deltas: List[Tuple[str, Dict[str, Any]]],
+        turn: int
+    ) -> Optional[int]:
+        """
+        Persist the end of a turn. Returns the version written, or None.
+
+        Writes a snapshot for a session's first checkpoint, every
+        `snapshot_every` versions after that, and after a failed save;
+        otherwise one compacted delta.
+        """
+        repo = self._get_repo()
+        if repo is None:
+            return None
+
+        last_version, snapshot_version = self._versions.get(session_id, (0, 0))
+        version = last_version + 1
+
+        try:
+            if snapshot_version == 0 or version - snapshot_version >= self.snapshot_every:
+                payload = self.serializer.dumps({
+                    "format": CHECKPOINT_FORMAT_VERSION,
+                    "state": self._persistable(state),
+                })
+                await repo.save(session_id, version, "snapshot", turn, payload)
+                await repo.prune_before(session_id, version)
+                snapshot_version = version
+            else:
+                delta = self._persistable(compact_deltas(deltas, self.reducers))
+                payload = self.serializer.dumps({"delta": delta})
+                await repo.save(session_id, version, "delta", turn, payload)
+        except Exception as e:
+            # Never fail a conversation over a checkpoint. A missing delta
+            # would leave a silent gap in the replay, so skip its version
+            # and make the next save a full snapshot instead.
+            logger.error("checkpoint.save_error", session_id=session_id, version=version, error=str(e))
+            self._versions[session_id] = (version, 0)
+            return None
+
+        self._versions[session_id] = (version, snapshot_version)
+        logger.debug("checkpoint.saved", session_id=session_id, version=version,
+                     bytes=len(payload))
+        return version
+
+    async def delete(self, session_id: str):
+        """Forget a session's checkpoints."""
+        self._versions.pop(session_id, None)
+        repo = self._get_repo()
+        if repo is not None:
+            await repo.delete_session(session_id)
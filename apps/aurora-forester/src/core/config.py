@@ -11,7 +11,7 @@ import os
 from pathlib import Path
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from pydantic import Field
-from typing import Optional
+from typing import Dict, Optional
 
 
 def get_env_file_path() -> Optional[str]:
@@ -62,10 +62,52 @@ class Settings(BaseSettings):
         default=Path.home() / ".aurora-forester" / "learning"
     )
 
+    # Interaction history - recent window kept in memory, older spilled to disk
+    history_window: int = 50
+
     # Learning
     learning_enabled: bool = True
     feedback_required: bool = True  # Must have explicit feedback to learn
 
+    # Agent runtime - spawned agents share a bounded worker pool
+    agent_workers: int = 4  # Agents running at once
+    agent_queue_limit: int = 64  # Agents waiting for a worker before /spawn is refused
+    agent_type_limits: Dict[str, int] = Field(
+        default_factory=lambda: {"research": 2, "workflow": 2, "bmad": 1}
+    )
+    agent_process_workers: int = 2  # Processes for CPU-heavy agent steps; 0 runs them in a thread
+    agent_output_tail: int = 100  # Outputs kept in memory per agent; older ones go to Postgres
+    agent_error_tail: int = 20
+    agent_retention_minutes: float = 60.0  # Finished agents are forgotten after this long
+    agent_registry: str = "postgres"  # Where agents are recorded to resume after restarts: postgres, sqlite, off
+    # Monitor agents don't take workers; one scheduler checks them all
+    monitor_batch_size: int = 32  # Conditions evaluated concurrently per tick
+    monitor_jitter: float = 0.1  # Each run is pushed back by up to this fraction of its interval
+    monitor_check_timeout_seconds: float = 30.0
+    # Workflow agents run independent steps concurrently
+    workflow_max_parallel: int = 4  # Steps running at once per workflow, unless the workflow sets max_parallel
+    workflow_memo_ttl_seconds: float = 600.0  # Results of steps that opt in with "memoize" are reused this long
+    workflow_memo_entries: int = 1000
+
+    # Local inference (embeddings, zero-shot, sentiment, summarization, QA) - see integrations/inference.py
+    inference_url: str = ""  # Inference worker started with `main.py inference`, e.g. http://aurora-inference:8090
+    local_inference: bool = False  # Without inference_url, load the models in the bot process instead
+    inference_max_batch: int = 16  # Requests sharing one forward pass
+    inference_batch_window_ms: float = 10.0  # How long a request waits for others to batch with
+    inference_port: int = 8090
+    inference_runtime: str = "torch"  # torch, or onnx for int8 ONNX exports of the encoder models
+    onnx_model_path: Path = Field(
+        default=Path.home() / ".aurora-forester" / "onnx"
+    )  # Written by `main.py export-onnx`
+    # Width of the embedding model's vectors (all-MiniLM-L6-v2 makes 384);
+    # `main.py ingest` resizes aurora_context.documents.embedding to match
+    embedding_dim: int = 384
+
+    # Intent classification
+    intent_cache_size: int = 2048  # Messages whose classification is kept
+    intent_model: str = "off"  # Fallback model for low-confidence messages: off, huggingface
+    intent_model_threshold: float = 0.45  # Rule confidence below which the model is asked
+
     # Self-care monitoring
     meal_reminder_hours: float = 4.0
     break_reminder_hours: float = 6.0
@@ -79,21 +121,54 @@ class Settings(BaseSettings):
     )
 
 
-# Global settings instance
-settings = Settings()
+# Global settings instance - built once, on first use
+_settings: Optional[Settings] = None
 
 
-def load_secrets():
+def get_settings() -> Settings:
+    """Get the settings, loading secrets and building them on first call."""
+    global _settings
+    if _settings is None:
+        _load_secrets_env()
+        _settings = Settings()
+    return _settings
+
+
+class _LazySettings:
     """
-    Load secrets from the secrets file if available.
-    In Kubernetes, secrets are already in environment variables.
+    Stand-in for the settings instance.
+
+    Modules keep importing `settings` directly, but nothing is read from the
+    environment until the first attribute access, and every module sees the
+    same instance no matter when it imported it.
     """
+
+    def __getattr__(self, name):
+        return getattr(get_settings(), name)
+
+    def __setattr__(self, name, value):
+        setattr(get_settings(), name, value)
+
+    def __repr__(self) -> str:
+        return repr(get_settings())
+
+
+settings = _LazySettings()
+
+
+def _load_secrets_env():
+    """Export the local secrets file into the environment, if there is one."""
     secrets_path = Path.home() / ".aurora-forester" / "secrets" / "secrets.env"
     if secrets_path.exists():
         from dotenv import load_dotenv
         load_dotenv(secrets_path, override=True)
-        # Reload settings to pick up new values
-        global settings
-        settings = Settings()
-    # In K8s, env vars are already set, just ensure settings are loaded
-    return settings
+
+
+def load_secrets():
+    """
+    Load secrets from the secrets file if available.
+    In Kubernetes, secrets are already in environment variables.
+
+    Safe to call repeatedly - settings are only built the first time.
+    """
+    return get_settings()
@@ -0,0 +1,374 @@
+"""
+Aurora Forester - Graph Execution Engine
+A lightweight async state-graph runner for Aurora's node pipeline.
+
+Mirrors the subset of the LangGraph API that Aurora uses (add_node, add_edge,
+add_conditional_edges, set_entry_point, compile, ainvoke) without pulling in
+langgraph at runtime. Execution proceeds in supersteps: every node scheduled
+for a step runs concurrently, and routing for the next step happens only once
+all of them have finished, so fan-out branches join naturally.
+
+Nodes return partial updates (deltas), never the whole state. Each state key
+is merged with a reducer declared on the state type, LangGraph-style:
+
+    class MyState(TypedDict):
+        messages: Annotated[List[Message], append]  # appended
+        response: str                               # replaced
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import (
+    Any, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple, Union,
+    get_type_hints,
+)
+
+import structlog
+
+
+logger = structlog.get_logger()
+
+
+END = "__end__"
+
+NodeFn = Callable[[Dict[str, Any]], Awaitable[Optional[Dict[str, Any]]]]
+Router = Callable[[Dict[str, Any]], Union[str, Sequence[str]]]
+Reducer = Callable[[Any, Any], Any]
+
+
+# ============================================
+# REDUCERS
+# ============================================
+
+def append(current: Optional[list], update: Optional[list]) -> list:
+    """
+    Append-only reducer for list channels.
+
+    Extends the existing list in place, so a merge costs O(len(update))
+    rather than O(len(session)).
+    """
+    if current is None:
+        return list(update or [])
+    if update:
+        current.extend(update)
+    return current
+
+
+def replace(current: Any, update: Any) -> Any:
+    """Default reducer: the update wins."""
+    return update
+
+
+def get_reducers(state_type: Optional[type]) -> Dict[str, Reducer]:
+    """Read Annotated[..., reducer] declarations off a TypedDict."""
+    if state_type is None:
+        return {}
+
+    reducers = {}
+    for key, hint in get_type_hints(state_type, include_extras=True).items():
+        for meta in getattr(hint, "__metadata__", ()):
+            if callable(meta):
+                reducers[key] = meta
+                break
+    return reducers
+
+
+def apply_updates(
+    state: Dict[str, Any],
+    updates: Dict[str, Any],
+    reducers: Dict[str, Reducer]
+) -> Dict[str, Any]:
+    """Merge a delta into state in place using the per-key reducers."""
+    for key, value in updates.items():
+        reducer = reducers.get(key, replace)
+        state[key] = reducer(state.get(key), value)
+    return state
+
+
+class GraphError(Exception):
+    """Raised for invalid graph definitions or failed runs."""
+
+
+class NodeTimeoutError(GraphError):
+    """Raised when a required node exceeds its timeout."""
+
+    def __init__(self, node: str, timeout: float):
+        super().__init__(f"Node '{node}' timed out after {timeout:.1f}s")
+        self.node = node
+        self.timeout = timeout
+
+
+@dataclass
+class NodeSpec:
+    """A node registered with the graph."""
+    name: str
+    fn: NodeFn
+    timeout: Optional[float] = None  # Seconds; None = use graph default
+    optional: bool = False  # Failures/timeouts are logged and skipped
+
+
+@dataclass
+class NodeTiming:
+    """Timing record for a single node execution."""
+    node: str
+    step: int
+    seconds: float
+    status: str  # ok, timeout, error, skipped
+    error: Optional[str] = None
+
+
+@dataclass
+class GraphRun:
+    """Result of running the graph once."""
+    state: Dict[str, Any]
+    timings: List[NodeTiming] = field(default_factory=list)
+    deltas: List[Tuple[str, Dict[str, Any]]] = field(default_factory=list)  # (node, update) in merge order
+    steps: int = 0
+    total_seconds: float = 0.0
+
+    def timings_by_node(self) -> Dict[str, float]:
+        """Total seconds spent per node."""
+        totals: Dict[str, float] = {}
+        for t in self.timings:
+            totals[t.node] = totals.get(t.node, 0.0) + t.seconds
+        return totals
+
+
+class StateGraph:
+    """Builder for an executable state graph."""
+
+    def __init__(self, state_type: Optional[type] = None):
+        self.state_type = state_type
+        self.nodes: Dict[str, NodeSpec] = {}
+        self.edges: Dict[str, List[str]] = {}
+        self.conditional_edges: Dict[str, tuple] = {}
+        self.entry_point: Optional[str] = None
+
+    def add_node(
+        self,
+        name: str,
+        fn: NodeFn,
+        timeout: Optional[float] = None,
+        optional: bool = False
+    ) -> "StateGraph":
+        """Register a node."""
+        if name in self.nodes or name == END:
+            raise GraphError(f"Duplicate or reserved node name: {name}")
+        self.nodes[name] = NodeSpec(name=name, fn=fn, timeout=timeout, optional=optional)
+        return self
+
+    def add_edge(self, source: str, target: str) -> "StateGraph":
+        """Always go from source to target. Several edges from one source fan out."""
+        self.edges.setdefault(source, []).append(target)
+        return self
+
+    def add_conditional_edges(
+        self,
+        source: str,
+        router: Router,
+        mapping: Optional[Dict[str, Union[str, Sequence[str]]]] = None
+    ) -> "StateGraph":
+        """
+        Route from source using router(state).
+
+        The router may return a node name, a mapping key, or a list of either;
+        a mapping value may itself be a list of nodes to run in parallel.
+        """
+        self.conditional_edges[source] = (router, mapping or {})
+        return self
+
+    def set_entry_point(self, name: str) -> "StateGraph":
+        self.entry_point = name
+        return self
+
+    def compile(
+        self,
+        default_timeout: Optional[float] = None,
+        max_steps: int = 25
+    ) -> "CompiledGraph":
+        """Validate the graph and return an executable version."""
+        if self.entry_point is None:
+            raise GraphError("Graph has no entry point")
+
+        known = set(self.nodes) | {END}
+        if self.entry_point not in self.nodes:
+            raise GraphError(f"Unknown entry point: {self.entry_point}")
+        for source, targets in self.edges.items():
+            if source not in self.nodes:
+                raise GraphError(f"Edge from unknown node: {source}")
+            for target in targets:
+                if target not in known:
+                    raise GraphError(f"Edge to unknown node: {source} -> {target}")
+        for source, (_, mapping) in self.conditional_edges.items():
+            if source not in self.nodes:
+                raise GraphError(f"Conditional edge from unknown node: {source}")
+            for value in mapping.values():
+                for target in _as_list(value):
+                    if target not in known:
+                        raise GraphError(f"Conditional edge to unknown node: {source} -> {target}")
+
+        return CompiledGraph(self, default_timeout=default_timeout, max_steps=max_steps)
+
+
+class CompiledGraph:
+    """An executable graph produced by StateGraph.compile()."""
+
+    def __init__(self, graph: StateGraph, default_timeout: Optional[float], max_steps: int):
+        self.nodes = dict(graph.nodes)
+        self.edges = {k: list(v) for k, v in graph.edges.items()}
+        self.conditional_edges = dict(graph.conditional_edges)
+        self.entry_point = graph.entry_point
+        self.default_timeout = default_timeout
+        self.max_steps = max_steps
+        self.reducers = get_reducers(graph.state_type)
+
+    async def ainvoke(
+        self,
+        state: Dict[str, Any],
+        updates: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """Run the graph and return the final state (LangGraph-compatible)."""
+        run = await self.arun(state, updates)
+        return run.state
+
+    async def arun(
+        self,
+        state: Dict[str, Any],
+        updates: Optional[Dict[str, Any]] = None
+    ) -> GraphRun:
+        """
+        Run the graph and return the final state with per-node timings.
+
+        `updates` is an input delta (e.g. the new message) merged into state
+        with the reducers before the entry node runs. The state is updated in
+        place; run.deltas holds everything that was merged, in order.
+        """
+        run = GraphRun(state=state)
+        started = time.perf_counter()
+        frontier = [self.entry_point]
+
+        if updates:
+            apply_updates(state, updates, self.reducers)
+            run.deltas.append(("__input__", updates))
+
+        while frontier:
+            run.steps += 1
+            if run.steps > self.max_steps:
+                raise GraphError(f"Graph exceeded {self.max_steps} steps")
+
+            results = await self._run_step(frontier, state, run.steps)
+
+            self._check_conflicts(frontier, [updates for updates, _ in results])
+            for name, (node_updates, timing) in zip(frontier, results):
+                run.timings.append(timing)
+                if node_updates:
+                    apply_updates(state, node_updates, self.reducers)
+                    run.deltas.append((name, node_updates))
+
+            frontier = self._next_nodes(frontier, state)
+
+        run.total_seconds = time.perf_counter() - started
+        logger.debug(
+            "graph.run_complete",
+            steps=run.steps,
+            total_ms=round(run.total_seconds * 1000, 1),
+            nodes={k: round(v * 1000, 1) for k, v in run.timings_by_node().items()},
+        )
+        return run
+
+    async def _run_step(self, frontier: List[str], state: Dict[str, Any], step: int):
+        """
+        Run one superstep's nodes concurrently, in frontier order.
+
+        If a required node fails, the siblings still running are cancelled
+        before the error propagates, so nothing keeps working on a run that
+        has already failed.
+        """
+        tasks = [
+            asyncio.create_task(self._run_node(self.nodes[name], state, step))
+            for name in frontier
+        ]
+        try:
+            done, pending = await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+        except asyncio.CancelledError:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+
+        if pending:
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+        for task in tasks:
+            if task in done and not task.cancelled() and task.exception() is not None:
+                raise task.exception()
+        return [task.result() for task in tasks]
+
+    def _check_conflicts(self, frontier: List[str], updates: List[Optional[Dict[str, Any]]]):
+        """Parallel nodes may only both write a key that has a reducer."""
+        writers: Dict[str, str] = {}
+        for name, node_updates in zip(frontier, updates):
+            for key in node_updates or {}:
+                if key in writers and key not in self.reducers:
+                    raise GraphError(
+                        f"Nodes '{writers[key]}' and '{name}' both replaced '{key}' in one step"
+                    )
+                writers[key] = name
+
+    async def _run_node(self, spec: NodeSpec, state: Dict[str, Any], step: int):
+        """Run one node against the (read-only) state and return its delta."""
+        timeout = spec.timeout if spec.timeout is not None else self.default_timeout
+        started = time.perf_counter()
+
+        try:
+            if timeout is not None:
+                result = await asyncio.wait_for(spec.fn(state), timeout)
+            else:
+                result = await spec.fn(state)
+        except asyncio.TimeoutError:
+            elapsed = time.perf_counter() - started
+            logger.warning("graph.node_timeout", node=spec.name, timeout=timeout)
+            if not spec.optional:
+                raise NodeTimeoutError(spec.name, timeout)
+            return None, NodeTiming(spec.name, step, elapsed, "timeout")
+        except Exception as e:
+            elapsed = time.perf_counter() - started
+            if not spec.optional:
+                raise
+            logger.warning("graph.node_error", node=spec.name, error=str(e))
+            return None, NodeTiming(spec.name, step, elapsed, "error", error=str(e))
+
+        elapsed = time.perf_counter() - started
+        return result or None, NodeTiming(spec.name, step, elapsed, "ok")
+
+    def _next_nodes(self, finished: List[str], state: Dict[str, Any]) -> List[str]:
+        """Work out which nodes run in the next superstep."""
+        next_nodes: List[str] = []
+
+        for name in finished:
+            next_nodes.extend(self.edges.get(name, []))
+
+            if name in self.conditional_edges:
+                router, mapping = self.conditional_edges[name]
+                for route in _as_list(router(state)):
+                    next_nodes.extend(_as_list(mapping.get(route, route)))
+
+        # Dedupe while keeping order; END just drops out of the frontier
+        seen = set()
+        ordered = []
+        for name in next_nodes:
+            if name == END or name in seen:
+                continue
+            if name not in self.nodes:
+                raise GraphError(f"Router returned unknown node: {name}")
+            seen.add(name)
+            ordered.append(name)
+        return ordered
+
+
+def _as_list(value: Union[str, Sequence[str]]) -> List[str]:
+    if isinstance(value, str):
+        return [value]
+    return list(value)
@@ -0,0 +1,279 @@
+"""
+Aurora Forester - Interaction History
+Fixed-size in-memory window of recent interactions, with older ones spilled
+to an append-only on-disk log that can be paged back on demand.
+
+The log is split into segments of exactly `segment_size` records
+(interactions-000000.jsonl, interactions-000001.jsonl, ...), so record N lives
+on line N % segment_size of segment N // segment_size and paging needs no
+in-memory index. Resident memory is bounded by `capacity` however long the
+bot runs.
+
+Spilled records are written by a single background thread, in order, so
+appending never blocks the event loop on disk; apage()/apage_back() read
+the log on that thread too. On start the window is refilled from the tail
+of the log, so recent context survives a restart. A torn last line (a
+write cut short by a crash or a full disk) is truncated on start, and any
+other line that doesn't decode is skipped.
+"""
+
+import asyncio
+import json
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+import structlog
+
+
+logger = structlog.get_logger()
+
+
+class InteractionHistory:
+    """
+    Ring buffer of the most recent interactions.
+
+    When the buffer is full, the oldest interaction is appended to the
+    on-disk log before its slot is reused. Entries reloaded from the log at
+    start are already on disk and are not written again.
+    """
+
+    __slots__ = (
+        "capacity", "log_dir", "segment_size", "_record_type",
+        "_slots", "_head", "_size", "_spilled", "_reloaded", "_session_count",
+        "_writer", "_pending",
+    )
+
+    def __init__(
+        self,
+        capacity: int,
+        log_dir: Path,
+        record_type: Callable[..., Any],
+        segment_size: int = 1000
+    ):
+        if capacity < 1:
+            raise ValueError("History capacity must be at least 1")
+        self.capacity = capacity
+        self.log_dir = Path(log_dir)
+        self.segment_size = segment_size
+        self._record_type = record_type
+        self._slots: List[Any] = [None] * capacity
+        self._head = 0  # Index of the oldest entry
+        self._size = 0
+        self._reloaded = 0  # Oldest window entries that are already in the log
+        self._session_count = 0
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="history-spill")
+        self._pending: Optional[Future] = None
+
+        self.log_dir.mkdir(parents=True, exist_ok=True)
+        self._spilled = self._count_spilled()
+        self._load_tail()
+
+    # ============================================
+    # HOT WINDOW
+    # ============================================
+
+    def append(self, interaction: Any):
+        """Add an interaction, spilling the oldest one if the window is full."""
+        if self._size == self.capacity:
+            if self._reloaded:
+                self._reloaded -= 1
+            else:
+                self._spill(self._slots[self._head])
+            self._slots[self._head] = interaction
+            self._head = (self._head + 1) % self.capacity
+        else:
+            self._slots[(self._head + self._size) % self.capacity] = interaction
+            self._size += 1
+        self._session_count += 1
+
+    def recent(self, n: int) -> List[Any]:
+        """The last `n` interactions in memory, oldest first."""
+        n = min(n, self._size)
+        start = self._head + self._size - n
+        return [self._slots[(start + i) % self.capacity] for i in range(n)]
+
+    def __iter__(self) -> Iterator[Any]:
+        """Iterate over the in-memory window, oldest first."""
+        return iter(self.recent(self._size))
+
+    def __len__(self) -> int:
+        """Total interactions recorded, on disk and in memory."""
+        return self._window_start + self._size
+
+    @property
+    def _window_start(self) -> int:
+        """Absolute position of the oldest interaction in memory."""
+        return self._spilled - self._reloaded
+
+    @property
+    def session_count(self) -> int:
+        """Interactions recorded since this process started."""
+        return self._session_count
+
+    # ============================================
+    # SPILL LOG
+    # ============================================
+
+    def _segment_path(self, segment: int) -> Path:
+        return self.log_dir / f"interactions-{segment:06d}.jsonl"
+
+    def _count_spilled(self) -> int:
+        """Complete records in the log; a torn last line is cut off so appends start clean."""
+        segments = sorted(self.log_dir.glob("interactions-*.jsonl"))
+        if not segments:
+            return 0
+        last = int(segments[-1].stem.split("-")[1])
+        with open(segments[-1], "rb+") as f:
+            data = f.read()
+            complete = data.rfind(b"\n") + 1
+            if complete < len(data):
+                logger.warning("history.torn_line", path=str(segments[-1]),
+                               bytes=len(data) - complete)
+                f.truncate(complete)
+        return last * self.segment_size + data.count(b"\n", 0, complete)
+
+    def _encode(self, interaction: Any) -> str:
+        data = {}
+        for name in self._field_names(interaction):
+            value = getattr(interaction, name)
+            data[name] = value.isoformat() if isinstance(value, datetime) else value
+        return json.dumps(data, separators=(",", ":"))
+
+    def _decode(self, line: str) -> Any:
+        data: Dict[str, Any] = json.loads(line)
+        if isinstance(data.get("timestamp"), str):
+            data["timestamp"] = datetime.fromisoformat(data["timestamp"])
+        return self._record_type(**data)
+
+    @staticmethod
+    def _field_names(record: Any) -> List[str]:
+        fields = getattr(record, "__dataclass_fields__", None)
+        if fields is not None:
+            return list(fields)
+        return list(getattr(record, "__slots__", ()))
+
+    def _load_tail(self):
+        """Refill the window with the newest records from the log."""
+        count = min(self.capacity, self._spilled)
+        for interaction in self._read_range(self._spilled - count, self._spilled):
+            self._slots[self._size] = interaction
+            self._size += 1
+        self._reloaded = self._size
+        if self._size:
+            logger.info("history.reloaded", interactions=self._size, total=self._spilled)
+
+    def _spill(self, interaction: Any):
+        """Queue one record for the writer thread; its position is assigned now."""
+        segment = self._spilled // self.segment_size
+        self._spilled += 1
+        self._pending = self._writer.submit(
+            self._write_line, self._segment_path(segment), self._encode(interaction)
+        )
+
+    @staticmethod
+    def _write_line(path: Path, line: str):
+        try:
+            with open(path, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+        except OSError as e:
+            logger.error("history.spill_error", path=str(path), error=str(e))
+
+    def _wait_for_writes(self):
+        if self._pending is not None:
+            self._pending.result()
+            self._pending = None
+
+    def page(self, start: int, limit: int) -> List[Any]:
+        """
+        Read interactions by absolute position (0 = oldest ever), oldest first.
+
+        Positions before the in-memory window are read from the log.
+        """
+        (disk_start, disk_end), window = self._split(start, limit)
+        return self._read_range(disk_start, disk_end) + window
+
+    async def apage(self, start: int, limit: int) -> List[Any]:
+        """page(), reading the log on the writer thread after every queued spill."""
+        (disk_start, disk_end), window = self._split(start, limit)
+        if disk_start >= disk_end:
+            return window
+        older = await asyncio.wrap_future(self._writer.submit(self._read_log, disk_start, disk_end))
+        return older + window
+
+    def page_back(self, page: int = 0, page_size: int = 10) -> List[Any]:
+        """Page backwards from the newest interaction (page 0 = most recent)."""
+        start, limit = self._back(page, page_size)
+        return self.page(start, limit) if limit else []
+
+    async def apage_back(self, page: int = 0, page_size: int = 10) -> List[Any]:
+        """page_back() without blocking the event loop on the log."""
+        start, limit = self._back(page, page_size)
+        return await self.apage(start, limit) if limit else []
+
+    def _back(self, page: int, page_size: int):
+        end = len(self) - page * page_size
+        if end <= 0:
+            return 0, 0
+        start = max(0, end - page_size)
+        return start, end - start
+
+    def _split(self, start: int, limit: int):
+        """([start, end) to read from the log, records from the window) for a page."""
+        end = min(start + limit, len(self))
+        position = max(0, start)
+        window_start = self._window_start
+
+        disk = (position, min(end, window_start))
+        position = max(position, window_start)
+        window = self.recent(self._size)[position - window_start:end - window_start] if position < end else []
+        return disk, window
+
+    def _read_range(self, start: int, end: int) -> List[Any]:
+        """Records at absolute positions [start, end) from the log."""
+        if start >= end:
+            return []
+        self._wait_for_writes()
+        return self._read_log(start, end)
+
+    def _read_log(self, start: int, end: int) -> List[Any]:
+        results: List[Any] = []
+        position = start
+        while position < end:
+            segment, offset = divmod(position, self.segment_size)
+            take = min(end, (segment + 1) * self.segment_size) - position
+            results.extend(self._read_segment(segment, offset, take))
+            position += take
+        return results
+
+    def _read_segment(self, segment: int, offset: int, count: int) -> List[Any]:
+        records = []
+        try:
+            with open(self._segment_path(segment), "r", encoding="utf-8") as f:
+                for i, line in enumerate(f):
+                    if i < offset:
+                        continue
+                    if i >= offset + count:
+                        break
+                    try:
+                        records.append(self._decode(line))
+                    except (ValueError, TypeError) as e:
+                        logger.warning("history.bad_line", segment=segment, line=i, error=str(e))
+        except OSError as e:
+            logger.error("history.read_error", segment=segment, error=str(e))
+        return records
+
+    def close(self):
+        """
+        Spill the in-memory window so nothing is lost on shutdown, and wait
+        for the writer thread to finish.
+        """
+        for interaction in self.recent(self._size)[self._reloaded:]:
+            self._spill(interaction)
+        self._writer.shutdown(wait=True)
+        self._pending = None
+        self._slots = [None] * self.capacity
+        self._head = 0
+        self._size = 0
+        self._reloaded = 0
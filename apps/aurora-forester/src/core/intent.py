@@ -0,0 +1,268 @@
+"""
+Aurora Forester - Intent Classification
+One shared classifier for routing messages: the graph's intent, which
+agent template a task needs, and which context sections a query wants.
+
+Rules are cue phrases per label, grouped into facets ("intent", "agent",
+"context"). They are compiled once into an index keyed by word stem, so a
+message is tokenized and scored against every facet in a single pass.
+Matching is on whole tokens - "add" matches "adding" but not "address" -
+and a label's score is the weight of the distinct cues it matched. Weak
+cues (weight below 1, like "add") only count alongside others. Scores are
+normalized per facet into a confidence, so there is no dependence on the
+order rules are listed in; ties go to the label listed first.
+
+Results are cached per message text. Optionally, a small local model is
+asked when the rules are not confident (see IntentClassifier.aclassify).
+"""
+
+import re
+from collections import OrderedDict
+from functools import lru_cache
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+import structlog
+
+
+logger = structlog.get_logger()
+
+
+# A cue is a word or phrase, optionally with a weight (default 1.0)
+Cue = Union[str, Tuple[str, float]]
+
+# facet -> label -> cues; labels are listed in tie-break order
+INTENT_RULES: Dict[str, Dict[str, Sequence[Cue]]] = {
+    "intent": {
+        "task": ("task", "todo", "to do", "remind", "reminder", "deadline",
+                 ("add", 0.5), ("create", 0.5), ("schedule", 0.5)),
+        "workflow": ("workflow", "automate", "automation", "n8n", ("pipeline", 0.5)),
+        "agent_spawn": ("spawn", "agent", "research", ("investigate", 0.5)),
+        "reflection": ("reflect", "reflection", "learn", "pattern", ("lesson", 0.5)),
+        "wellbeing": ("how are you", "feeling", "feel", "break", "rest", "tired",
+                      "exhausted", ("hungry", 0.5)),
+        "question": ("?",),
+    },
+    "agent": {
+        "research": ("research", "find", "investigate", "look up", ("study", 0.5), ("compare", 0.5)),
+        "workflow": ("workflow", "automate", "automation", "n8n", "process"),
+        "monitor": ("monitor", "watch", "alert", "notify", ("keep an eye", 1.0)),
+        "bmad": ("bmad", "party", ("agent", 0.5)),
+    },
+    "context": {
+        "project": ("project", "hello world", "dao", "ecosystem", "otter camp", "sector7"),
+        "decision": ("decide", "decision", "choice", "option", "should i", "tradeoff"),
+        "self_care": ("tired", "rest", "break", "eat", "food", "meal", "hungry", "sleep"),
+    },
+}
+
+_TOKEN = re.compile(r"[a-z0-9]+(?:'[a-z]+)?|\?")
+
+
+@lru_cache(maxsize=16384)
+def stem(token: str) -> str:
+    """Crude suffix stripping so cue and message word forms line up (tasks -> task)."""
+    for suffix in ("ing", "ed", "s"):
+        if token.endswith(suffix) and len(token) - len(suffix) >= 3 and not token.endswith("ss"):
+            token = token[:-len(suffix)]
+            break
+    if token.endswith("e") and len(token) > 3:
+        token = token[:-1]
+    return token
+
+
+def tokenize(text: str) -> List[str]:
+    return list(map(stem, _TOKEN.findall(text.lower())))
+
+
+@dataclass(frozen=True, slots=True)
+class Classification:
+    """Per-facet label confidences for one message, highest first."""
+    scores: Dict[str, Dict[str, float]]
+
+    def top(self, facet: str, default: Optional[str] = None, threshold: float = 0.0) -> Tuple[Optional[str], float]:
+        """The best label of a facet and its confidence, or (default, 0.0)."""
+        for label, confidence in self.scores.get(facet, {}).items():
+            if confidence > threshold:
+                return label, confidence
+            break
+        return default, 0.0
+
+    def labels(self, facet: str, threshold: float = 0.0) -> List[str]:
+        """Every label of a facet scoring above `threshold`."""
+        return [label for label, confidence in self.scores.get(facet, {}).items() if confidence > threshold]
+
+
+# Zero-shot style fallback: model(text, labels) -> {label: score}
+IntentModel = Callable[[str, List[str]], Awaitable[Dict[str, float]]]
+
+
+class IntentClassifier:
+    """
+    Compiled token-level matcher over INTENT_RULES.
+
+    `prior` is the weight of "none of these" in each facet's normalization:
+    a single full-weight cue scores 0.5, and more agreeing cues push the
+    confidence towards 1. Labels whose cue weight is under `min_score` are
+    dropped.
+    """
+
+    def __init__(
+        self,
+        rules: Optional[Dict[str, Dict[str, Sequence[Cue]]]] = None,
+        cache_size: int = 2048,
+        prior: float = 1.0,
+        min_score: float = 1.0,
+        model: Optional[IntentModel] = None,
+        model_threshold: float = 0.45
+    ):
+        self.rules = rules if rules is not None else INTENT_RULES
+        self.cache_size = cache_size
+        self.prior = prior
+        self.min_score = min_score
+        self.model = model
+        self.model_threshold = model_threshold
+        self._order = {
+            facet: {label: rank for rank, label in enumerate(labels)}
+            for facet, labels in self.rules.items()
+        }
+        self._index = self._compile(self.rules)
+        self._cache: "OrderedDict[str, Classification]" = OrderedDict()
+        self._model_cache: "OrderedDict[Tuple[str, str], Dict[str, float]]" = OrderedDict()
+        self.stats = {"hits": 0, "misses": 0, "model_calls": 0}
+
+    @staticmethod
+    def _compile(rules) -> Dict[str, List[Tuple[Tuple[str, ...], int, List[Tuple[str, str, float]]]]]:
+        """first stem -> [(remaining stems, cue id, [(facet, label, weight)])], longest phrases first."""
+        # Cues that stem alike ("feel", "feeling") are one phrase; a label
+        # keeps only its heaviest weight for it, so one word never counts twice
+        phrases: Dict[Tuple[str, ...], Dict[Tuple[str, str], float]] = {}
+        for facet, labels in rules.items():
+            for label, cues in labels.items():
+                for cue in cues:
+                    text, weight = (cue, 1.0) if isinstance(cue, str) else cue
+                    tokens = tuple(tokenize(text))
+                    if tokens:
+                        targets = phrases.setdefault(tokens, {})
+                        targets[(facet, label)] = max(weight, targets.get((facet, label), 0.0))
+
+        index: Dict[str, List[Tuple[Tuple[str, ...], int, List[Tuple[str, str, float]]]]] = {}
+        for cue_id, (tokens, targets) in enumerate(phrases.items()):
+            flat = [(facet, label, weight) for (facet, label), weight in targets.items()]
+            index.setdefault(tokens[0], []).append((tokens[1:], cue_id, flat))
+        for candidates in index.values():
+            candidates.sort(key=lambda c: -len(c[0]))
+        return index
+
+    def classify(self, text: str) -> Classification:
+        """Score `text` against every facet. Cached per text."""
+        cached = self._cache.get(text)
+        if cached is not None:
+            self._cache.move_to_end(text)
+            self.stats["hits"] += 1
+            return cached
+        self.stats["misses"] += 1
+
+        tokens = tokenize(text)
+        index = self._index
+        matched = set()
+        raw: Dict[str, Dict[str, float]] = {}
+        for i, token in enumerate(tokens):
+            candidates = index.get(token)
+            if candidates is None:
+                continue
+            for rest, cue_id, targets in candidates:
+                if cue_id in matched or (rest and tuple(tokens[i + 1:i + 1 + len(rest)]) != rest):
+                    continue
+                matched.add(cue_id)
+                for facet, label, weight in targets:
+                    labels = raw.get(facet)
+                    if labels is None:
+                        labels = raw[facet] = {}
+                    labels[label] = labels.get(label, 0.0) + weight
+
+        scores: Dict[str, Dict[str, float]] = {facet: {} for facet in self.rules}
+        for facet, labels in raw.items():
+            kept = [(label, score) for label, score in labels.items() if score >= self.min_score]
+            if not kept:
+                continue
+            if len(kept) > 1:
+                order = self._order[facet]
+                kept.sort(key=lambda item: (-item[1], order[item[0]]))
+            total = sum(score for _, score in kept) + self.prior
+            scores[facet] = {label: round(score / total, 4) for label, score in kept}
+
+        result = Classification(scores)
+        self._cache[text] = result
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return result
+
+    async def aclassify(self, text: str, facets: Sequence[str] = ("intent",)) -> Classification:
+        """
+        classify(), then for each of `facets` whose best rule confidence is
+        below model_threshold, ask the model (if one is set) and keep its
+        answer when it is more confident.
+        """
+        result = self.classify(text)
+        if self.model is None:
+            return result
+
+        scores = dict(result.scores)
+        for facet in facets:
+            _, confidence = result.top(facet)
+            if confidence >= self.model_threshold:
+                continue
+            predicted = await self._ask_model(text, facet)
+            if predicted and max(predicted.values()) > confidence:
+                scores[facet] = dict(sorted(predicted.items(), key=lambda item: -item[1]))
+        return Classification(scores)
+
+    async def _ask_model(self, text: str, facet: str) -> Dict[str, float]:
+        key = (facet, text)
+        cached = self._model_cache.get(key)
+        if cached is not None:
+            self._model_cache.move_to_end(key)
+            return cached
+
+        labels = list(self.rules[facet])
+        self.stats["model_calls"] += 1
+        try:
+            predicted = await self.model(text, [label.replace("_", " ") for label in labels])
+        except Exception as e:
+            logger.warning("intent.model_failed", facet=facet, error=str(e))
+            return {}
+        predicted = {label: float(predicted.get(label.replace("_", " "), 0.0)) for label in labels}
+
+        self._model_cache[key] = predicted
+        if len(self._model_cache) > self.cache_size:
+            self._model_cache.popitem(last=False)
+        return predicted
+
+
+def _configured_model() -> Optional[IntentModel]:
+    """The fallback model named by settings.intent_model, if any."""
+    from .config import settings
+
+    name = settings.intent_model.lower()
+    if name == "huggingface":
+        from ..integrations.huggingface import get_huggingface
+        return get_huggingface().classify_intent
+    return None
+
+
+# Singleton
+_classifier: Optional[IntentClassifier] = None
+
+
+def get_intent_classifier() -> IntentClassifier:
+    """Get the shared intent classifier."""
+    global _classifier
+    if _classifier is None:
+        from .config import settings
+        _classifier = IntentClassifier(
+            cache_size=settings.intent_cache_size,
+            model=_configured_model(),
+            model_threshold=settings.intent_model_threshold,
+        )
+    return _classifier
@@ -15,7 +15,7 @@ PROTECTED TOPICS:
 """
 
 import discord
-from typing import Optional, Set
+from typing import FrozenSet, Optional
 from dataclasses import dataclass
 from enum import Enum
 import structlog
@@ -32,15 +32,15 @@ class SecurityLevel(Enum):
     PUBLIC = "public"
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class SecurityContext:
-    """Security context for a message/interaction."""
+    """Security context for a message/interaction. Immutable once built."""
     user_id: int
     user_name: str
     channel_id: int
     channel_name: str
     guild_id: Optional[int]
-    roles: Set[str]
+    roles: FrozenSet[str]
     is_dm: bool
     security_level: SecurityLevel
     is_secure_channel: bool
@@ -114,7 +114,7 @@ def create_security_context(message: discord.Message) -> SecurityContext:
             channel_id=message.channel.id,
             channel_name="DM",
             guild_id=None,
-            roles=set(),
+            roles=frozenset(),
             is_dm=True,
             security_level=SecurityLevel.MEMBER,  # Will be upgraded if user is authorized
             is_secure_channel=False
@@ -124,7 +124,7 @@ def create_security_context(message: discord.Message) -> SecurityContext:
     member = message.author
     channel = message.channel
 
-    role_names = {role.name for role in member.roles} if hasattr(member, 'roles') else set()
+    role_names = frozenset(role.name for role in member.roles) if hasattr(member, 'roles') else frozenset()
     security_level = get_security_level(member, channel) if isinstance(member, discord.Member) else SecurityLevel.PUBLIC
 
     return SecurityContext(
@@ -10,9 +10,10 @@ import os
 import json
 from datetime import datetime
 
-# Note: These imports require asyncpg package
-# import asyncpg
-# from asyncpg import Pool, Connection
+import structlog
+
+
+logger = structlog.get_logger()
 
 
 @dataclass
@@ -25,6 +26,7 @@ class DatabaseConfig:
     password: str = ""
     min_connections: int = 2
     max_connections: int = 10
+    connect_timeout: float = 10.0
 
     @classmethod
     def from_env(cls) -> "DatabaseConfig":
@@ -37,9 +39,18 @@ class DatabaseConfig:
             password=os.environ.get("AURORA_DB_PASSWORD", ""),
             min_connections=int(os.environ.get("AURORA_DB_MIN_CONN", cls.min_connections)),
             max_connections=int(os.environ.get("AURORA_DB_MAX_CONN", cls.max_connections)),
+            connect_timeout=float(os.environ.get("AURORA_DB_CONNECT_TIMEOUT", cls.connect_timeout)),
         )
 
 
+def _encode_vector(value) -> str:
+    return "[" + ",".join(str(float(v)) for v in value) + "]"
+
+
+def _decode_vector(text: str) -> List[float]:
+    return [float(v) for v in text.strip("[]").split(",") if v]
+
+
 class AuroraDatabase:
     """
     Aurora's database connection manager.
@@ -51,58 +62,103 @@ class AuroraDatabase:
         self._pool = None
 
     async def connect(self):
-        """Initialize the connection pool."""
-        # Placeholder - requires asyncpg
-        # self._pool = await asyncpg.create_pool(
-        #     host=self.config.host,
-        #     port=self.config.port,
-        #     database=self.config.database,
-        #     user=self.config.user,
-        #     password=self.config.password,
-        #     min_size=self.config.min_connections,
-        #     max_size=self.config.max_connections,
-        # )
-        pass
+        """
+        Initialize the connection pool.
+
+        Raises RuntimeError if asyncpg is missing or the server cannot be
+        reached, the same error the repository getters raise when there is
+        no database, so callers handle both the same way.
+        """
+        try:
+            import asyncpg
+        except ImportError as e:
+            raise RuntimeError(f"asyncpg is not installed: {e}") from e
+
+        try:
+            self._pool = await asyncpg.create_pool(
+                host=self.config.host,
+                port=self.config.port,
+                database=self.config.database,
+                user=self.config.user,
+                password=self.config.password,
+                min_size=self.config.min_connections,
+                max_size=self.config.max_connections,
+                timeout=self.config.connect_timeout,
+                init=self._init_connection,
+            )
+        except (OSError, asyncpg.PostgresError, asyncpg.InterfaceError, TimeoutError) as e:
+            raise RuntimeError(
+                f"Cannot connect to {self.config.host}:{self.config.port}/{self.config.database}: {e}"
+            ) from e
+
+    @staticmethod
+    async def _init_connection(conn):
+        """Send and receive pgvector columns as lists of floats."""
+        has_vector = await conn.fetchval("SELECT to_regtype('vector') IS NOT NULL")
+        if has_vector:
+            await conn.set_type_codec(
+                "vector", encoder=_encode_vector, decoder=_decode_vector,
+                schema="public", format="text",
+            )
 
     async def close(self):
         """Close all connections in the pool."""
         if self._pool:
-            # await self._pool.close()
-            pass
+            await self._pool.close()
+            self._pool = None
 
     @asynccontextmanager
     async def acquire(self):
         """Acquire a connection from the pool."""
-        # Placeholder
-        # async with self._pool.acquire() as conn:
-        #     yield conn
-        yield None
+        if self._pool is None:
+            raise RuntimeError("Database not connected. Call connect() first.")
+        async with self._pool.acquire() as conn:
+            yield conn
 
     async def execute(self, query: str, *args) -> str:
         """Execute a query and return status."""
-        # async with self.acquire() as conn:
-        #     return await conn.execute(query, *args)
-        return "OK"
+        async with self.acquire() as conn:
+            return await conn.execute(query, *args)
+
+    async def executemany(self, query: str, args: List[Tuple]) -> None:
+        """Execute a query once per argument tuple, in one round trip."""
+        async with self.acquire() as conn:
+            await conn.executemany(query, args)
+
+    async def copy_merge(
+        self,
+        create_staging: str,
+        staging_table: str,
+        columns: List[str],
+        records: List[Tuple],
+        merge: str
+    ) -> str:
+        """
+        Bulk-load `records` with COPY into a staging table created by
+        `create_staging`, then run `merge` - all in one transaction.
+        """
+        async with self.acquire() as conn:
+            async with conn.transaction():
+                await conn.execute(create_staging)
+                await conn.copy_records_to_table(staging_table, records=records, columns=columns)
+                return await conn.execute(merge)
 
     async def fetch(self, query: str, *args) -> List[Dict[str, Any]]:
         """Execute a query and fetch all results."""
-        # async with self.acquire() as conn:
-        #     rows = await conn.fetch(query, *args)
-        #     return [dict(row) for row in rows]
-        return []
+        async with self.acquire() as conn:
+            rows = await conn.fetch(query, *args)
+            return [dict(row) for row in rows]
 
     async def fetchrow(self, query: str, *args) -> Optional[Dict[str, Any]]:
         """Execute a query and fetch one result."""
-        # async with self.acquire() as conn:
-        #     row = await conn.fetchrow(query, *args)
-        #     return dict(row) if row else None
-        return None
+        async with self.acquire() as conn:
+            row = await conn.fetchrow(query, *args)
+            return dict(row) if row else None
 
     async def fetchval(self, query: str, *args) -> Any:
         """Execute a query and fetch a single value."""
-        # async with self.acquire() as conn:
-        #     return await conn.fetchval(query, *args)
-        return None
+        async with self.acquire() as conn:
+            return await conn.fetchval(query, *args)
 
 
 # ============================================
@@ -364,9 +420,167 @@ class LearningRepository:
 class ContextRepository:
     """Repository for RAG context library operations."""
 
+    # Ingested documents are stored as chunks, keyed by source and content
+    # hash. aurora_context.sources is the ingest manifest: what each source
+    # file looked like when it was last indexed, and which chunks it had.
+    SCHEMA = """
+        ALTER TABLE aurora_context.documents
+            ADD COLUMN IF NOT EXISTS chunk_index INTEGER,
+            ADD COLUMN IF NOT EXISTS content_hash TEXT,
+            ADD COLUMN IF NOT EXISTS deleted_at TIMESTAMPTZ;
+        CREATE UNIQUE INDEX IF NOT EXISTS documents_source_hash_idx
+            ON aurora_context.documents (source, content_hash);
+        CREATE TABLE IF NOT EXISTS aurora_context.sources (
+            source TEXT PRIMARY KEY,
+            root TEXT,
+            mtime_ns BIGINT NOT NULL,
+            size BIGINT NOT NULL,
+            chunk_hashes TEXT[] NOT NULL DEFAULT '{}',
+            deleted_at TIMESTAMPTZ,
+            updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+        );
+        ALTER TABLE aurora_context.sources
+            ADD COLUMN IF NOT EXISTS embedding_model TEXT
+    """
+
+    CHUNK_COLUMNS = [
+        "source", "chunk_index", "title", "content", "content_hash",
+        "doc_type", "embedding", "is_private", "tags",
+    ]
+
     def __init__(self, db: AuroraDatabase):
         self.db = db
 
+    async def ensure_schema(self, embedding_dim: Optional[int] = None):
+        """
+        Add the chunk columns and index to the documents table if missing,
+        and size the embedding column to `embedding_dim`. An empty column is
+        resized in place; one that already holds vectors of another width
+        is left alone and reported, since those have to be re-embedded.
+        """
+        await self.db.execute(self.SCHEMA)
+        if embedding_dim is None:
+            return
+
+        declared = await self.db.fetchval("""
+            SELECT format_type(atttypid, atttypmod) FROM pg_attribute
+            WHERE attrelid = 'aurora_context.documents'::regclass AND attname = 'embedding'
+        """)
+        wanted = f"vector({embedding_dim})"
+        if declared == wanted:
+            return
+        stored = await self.db.fetchval(
+            "SELECT COUNT(*) FROM aurora_context.documents WHERE embedding IS NOT NULL"
+        )
+        if stored:
+            raise RuntimeError(
+                f"aurora_context.documents.embedding is {declared} and holds {stored} embeddings, "
+                f"but the embedding model makes {wanted}. Clear them with "
+                f"`UPDATE aurora_context.documents SET embedding = NULL`, then run "
+                f"`main.py ingest` to resize the column and re-embed."
+            )
+        await self.db.execute(
+            f"ALTER TABLE aurora_context.documents ALTER COLUMN embedding TYPE {wanted}"
+        )
+        logger.info("context.embedding_resized", was=declared, now=wanted)
+
+    async def chunk_hashes(self, source: str) -> List[str]:
+        """Content hashes of the chunks already stored for `source`."""
+        query = """
+            SELECT content_hash FROM aurora_context.documents
+            WHERE source = $1 AND content_hash IS NOT NULL
+        """
+        return [row["content_hash"] for row in await self.db.fetch(query, source)]
+
+    async def delete_chunks(self, rows: List[Tuple[str, List[str]]]):
+        """Delete (source, [content_hash, ...]) chunks that left their source."""
+        query = """
+            DELETE FROM aurora_context.documents
+            WHERE source = $1 AND content_hash = ANY($2::text[])
+        """
+        await self.db.executemany(query, rows)
+
+    async def load_manifest(self) -> List[Dict[str, Any]]:
+        """Every source in the ingest manifest, tombstoned ones included."""
+        query = """
+            SELECT source, root, mtime_ns, size, chunk_hashes, embedding_model, deleted_at
+            FROM aurora_context.sources
+        """
+        return await self.db.fetch(query)
+
+    async def upsert_sources(self, rows: List[Tuple[str, Optional[str], int, int, List[str], str]]):
+        """
+        Record (source, root, mtime_ns, size, chunk_hashes, embedding_model)
+        as indexed, and bring back the chunks of a source that had been
+        tombstoned.
+        """
+        manifest = """
+            INSERT INTO aurora_context.sources
+            (source, root, mtime_ns, size, chunk_hashes, embedding_model)
+            VALUES ($1, $2, $3, $4, $5::text[], $6)
+            ON CONFLICT (source)
+            DO UPDATE SET root = EXCLUDED.root, mtime_ns = EXCLUDED.mtime_ns,
+                          size = EXCLUDED.size, chunk_hashes = EXCLUDED.chunk_hashes,
+                          embedding_model = EXCLUDED.embedding_model,
+                          deleted_at = NULL, updated_at = NOW()
+        """
+        restore = """
+            UPDATE aurora_context.documents SET deleted_at = NULL
+            WHERE source = $1 AND deleted_at IS NOT NULL
+        """
+        await self.db.executemany(manifest, rows)
+        await self.db.executemany(restore, [(row[0],) for row in rows])
+
+    async def tombstone_sources(self, sources: List[str]):
+        """Mark sources that no longer exist, and their chunks, as deleted."""
+        await self.db.execute("""
+            UPDATE aurora_context.sources SET deleted_at = NOW(), updated_at = NOW()
+            WHERE source = ANY($1::text[]) AND deleted_at IS NULL
+        """, sources)
+        await self.db.execute("""
+            UPDATE aurora_context.documents SET deleted_at = NOW()
+            WHERE source = ANY($1::text[]) AND deleted_at IS NULL
+        """, sources)
+
+    async def purge_tombstones(self, days: int):
+        """Drop chunks and manifest rows tombstoned more than `days` ago."""
+        await self.db.execute("""
+            DELETE FROM aurora_context.documents
+            WHERE deleted_at < NOW() - ($1 * INTERVAL '1 day')
+        """, days)
+        await self.db.execute("""
+            DELETE FROM aurora_context.sources
+            WHERE deleted_at < NOW() - ($1 * INTERVAL '1 day')
+        """, days)
+
+    async def copy_chunks(self, rows: List[Tuple[str, int, str, str, str, str, str, bool, str]]) -> str:
+        """
+        Bulk-insert (source, chunk_index, title, content, content_hash,
+        doc_type, embedding_text, is_private, tags_json) rows with COPY.
+        Embeddings are pgvector text ('[0.1,0.2,...]'). A chunk already
+        stored for its source keeps its embedding and has the rest updated.
+        """
+        create_staging = """
+            CREATE TEMP TABLE document_chunks_in (
+                source TEXT, chunk_index INTEGER, title TEXT, content TEXT,
+                content_hash TEXT, doc_type TEXT, embedding TEXT,
+                is_private BOOLEAN, tags TEXT
+            ) ON COMMIT DROP
+        """
+        merge = """
+            INSERT INTO aurora_context.documents
+            (source, chunk_index, title, content, content_hash, doc_type,
+             embedding, is_private, tags)
+            SELECT source, chunk_index, title, content, content_hash, doc_type,
+                   embedding::vector, is_private, tags::jsonb
+            FROM document_chunks_in
+            ON CONFLICT (source, content_hash)
+            DO UPDATE SET chunk_index = EXCLUDED.chunk_index, title = EXCLUDED.title,
+                          doc_type = EXCLUDED.doc_type, is_private = EXCLUDED.is_private,
+                          tags = EXCLUDED.tags, deleted_at = NULL, updated_at = NOW()
+        """
+        return await self.db.copy_merge(create_staging, "document_chunks_in", self.CHUNK_COLUMNS, rows, merge)
+
     async def add_document(
         self,
         source: str,
@@ -403,7 +617,7 @@ class ContextRepository:
                 SELECT id, title, content, doc_type, source,
                        1 - (embedding <=> $1) as relevance
                 FROM aurora_context.documents
-                WHERE embedding IS NOT NULL
+                WHERE embedding IS NOT NULL AND deleted_at IS NULL
                 AND doc_type = ANY($3)
                 AND (is_private = FALSE OR $4 = TRUE)
                 ORDER BY embedding <=> $1
@@ -415,7 +629,7 @@ class ContextRepository:
                 SELECT id, title, content, doc_type, source,
                        1 - (embedding <=> $1) as relevance
                 FROM aurora_context.documents
-                WHERE embedding IS NOT NULL
+                WHERE embedding IS NOT NULL AND deleted_at IS NULL
                 AND (is_private = FALSE OR $3 = TRUE)
                 ORDER BY embedding <=> $1
                 LIMIT $2
@@ -431,13 +645,211 @@ class ContextRepository:
         query = """
             SELECT id, title, content, source, tags, created_at
             FROM aurora_context.documents
-            WHERE doc_type = $1
+            WHERE doc_type = $1 AND deleted_at IS NULL
             ORDER BY updated_at DESC
             LIMIT $2
         """
         return await self.db.fetch(query, doc_type, limit)
 
 
+class CheckpointRepository:
+    """Repository for Aurora graph session checkpoints."""
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS aurora_core.graph_checkpoints (
+            session_id TEXT NOT NULL,
+            version INTEGER NOT NULL,
+            kind TEXT NOT NULL CHECK (kind IN ('snapshot', 'delta')),
+            turn INTEGER NOT NULL,
+            payload JSONB NOT NULL,
+            created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+            PRIMARY KEY (session_id, version)
+        )
+    """
+
+    def __init__(self, db: AuroraDatabase):
+        self.db = db
+
+    async def ensure_schema(self):
+        """Create the checkpoint table if it does not exist."""
+        await self.db.execute(self.SCHEMA)
+
+    async def save(
+        self,
+        session_id: str,
+        version: int,
+        kind: str,
+        turn: int,
+        payload: str
+    ):
+        """Write a snapshot or delta row."""
+        query = """
+            INSERT INTO aurora_core.graph_checkpoints
+            (session_id, version, kind, turn, payload)
+            VALUES ($1, $2, $3, $4, $5::jsonb)
+            ON CONFLICT (session_id, version)
+            DO UPDATE SET kind = EXCLUDED.kind, turn = EXCLUDED.turn,
+                          payload = EXCLUDED.payload, created_at = NOW()
+        """
+        await self.db.execute(query, session_id, version, kind, turn, payload)
+
+    async def load_latest(self, session_id: str) -> List[Dict[str, Any]]:
+        """Get the latest snapshot followed by every delta written after it."""
+        query = """
+            SELECT version, kind, turn, payload
+            FROM aurora_core.graph_checkpoints
+            WHERE session_id = $1
+            AND version >= (
+                SELECT COALESCE(MAX(version), 0)
+                FROM aurora_core.graph_checkpoints
+                WHERE session_id = $1 AND kind = 'snapshot'
+            )
+            ORDER BY version ASC
+        """
+        return await self.db.fetch(query, session_id)
+
+    async def prune_before(self, session_id: str, version: int):
+        """Drop rows superseded by a newer snapshot."""
+        query = """
+            DELETE FROM aurora_core.graph_checkpoints
+            WHERE session_id = $1 AND version < $2
+        """
+        await self.db.execute(query, session_id, version)
+
+    async def delete_session(self, session_id: str):
+        """Remove all checkpoints for a session."""
+        query = """
+            DELETE FROM aurora_core.graph_checkpoints
+            WHERE session_id = $1
+        """
+        await self.db.execute(query, session_id)
+
+
+class AgentOutputRepository:
+    """Repository for agent outputs and errors spilled out of memory."""
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS aurora_core.agent_outputs (
+            agent_id TEXT NOT NULL,
+            kind TEXT NOT NULL CHECK (kind IN ('output', 'error')),
+            seq BIGINT NOT NULL,
+            payload JSONB NOT NULL,
+            created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+            PRIMARY KEY (agent_id, kind, seq)
+        );
+        CREATE INDEX IF NOT EXISTS agent_outputs_created_idx
+            ON aurora_core.agent_outputs (created_at)
+    """
+
+    def __init__(self, db: AuroraDatabase):
+        self.db = db
+
+    async def ensure_schema(self):
+        """Create the agent output table if it does not exist."""
+        await self.db.execute(self.SCHEMA)
+
+    async def append_many(self, rows: List[Tuple[str, str, int, str]]):
+        """Write (agent_id, kind, seq, payload_json) rows; re-spilled rows are ignored."""
+        query = """
+            INSERT INTO aurora_core.agent_outputs (agent_id, kind, seq, payload)
+            VALUES ($1, $2, $3, $4::jsonb)
+            ON CONFLICT (agent_id, kind, seq) DO NOTHING
+        """
+        await self.db.executemany(query, rows)
+
+    async def fetch_page(
+        self,
+        agent_id: str,
+        kind: str = "output",
+        before_seq: Optional[int] = None,
+        limit: int = 50
+    ) -> List[Dict[str, Any]]:
+        """Entries for an agent older than `before_seq`, newest first."""
+        query = """
+            SELECT seq, payload, created_at
+            FROM aurora_core.agent_outputs
+            WHERE agent_id = $1 AND kind = $2
+            AND ($3::bigint IS NULL OR seq < $3)
+            ORDER BY seq DESC
+            LIMIT $4
+        """
+        return await self.db.fetch(query, agent_id, kind, before_seq, limit)
+
+    async def prune_older_than(self, days: int) -> str:
+        """Drop spilled entries older than `days`."""
+        query = """
+            DELETE FROM aurora_core.agent_outputs
+            WHERE created_at < NOW() - ($1 * INTERVAL '1 day')
+        """
+        return await self.db.execute(query, days)
+
+
+class AgentRegistryRepository:
+    """Repository for spawned agents' status and progress, so they survive restarts."""
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS aurora_core.agents (
+            agent_id TEXT PRIMARY KEY,
+            agent_type TEXT NOT NULL,
+            status TEXT NOT NULL,
+            config JSONB NOT NULL,
+            run_args JSONB,
+            checkpoint JSONB NOT NULL DEFAULT '{}',
+            outputs_total BIGINT NOT NULL DEFAULT 0,
+            errors_total BIGINT NOT NULL DEFAULT 0,
+            created_at TIMESTAMPTZ NOT NULL,
+            updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+        );
+        CREATE INDEX IF NOT EXISTS agents_status_idx
+            ON aurora_core.agents (status)
+    """
+
+    def __init__(self, db: AuroraDatabase):
+        self.db = db
+
+    async def ensure_schema(self):
+        """Create the agent registry table if it does not exist."""
+        await self.db.execute(self.SCHEMA)
+
+    async def upsert_many(self, rows: List[Tuple[str, str, str, str, Optional[str], str, int, int, datetime]]):
+        """
+        Write (agent_id, agent_type, status, config_json, run_args_json,
+        checkpoint_json, outputs_total, errors_total, created_at) rows.
+        """
+        query = """
+            INSERT INTO aurora_core.agents
+            (agent_id, agent_type, status, config, run_args, checkpoint,
+             outputs_total, errors_total, created_at)
+            VALUES ($1, $2, $3, $4::jsonb, $5::jsonb, $6::jsonb, $7, $8, $9)
+            ON CONFLICT (agent_id)
+            DO UPDATE SET status = EXCLUDED.status, config = EXCLUDED.config,
+                          run_args = EXCLUDED.run_args, checkpoint = EXCLUDED.checkpoint,
+                          outputs_total = EXCLUDED.outputs_total,
+                          errors_total = EXCLUDED.errors_total, updated_at = NOW()
+        """
+        await self.db.executemany(query, rows)
+
+    async def load_unfinished(self, terminal: List[str]) -> List[Dict[str, Any]]:
+        """Agents whose status is not one of `terminal`, oldest first."""
+        query = """
+            SELECT agent_id, agent_type, status, config, run_args, checkpoint,
+                   outputs_total, errors_total, created_at
+            FROM aurora_core.agents
+            WHERE status <> ALL($1::text[])
+            ORDER BY created_at ASC
+        """
+        return await self.db.fetch(query, terminal)
+
+    async def prune_finished_older_than(self, days: int, terminal: List[str]) -> str:
+        """Drop finished agents last updated more than `days` ago."""
+        query = """
+            DELETE FROM aurora_core.agents
+            WHERE status = ANY($2::text[])
+            AND updated_at < NOW() - ($1 * INTERVAL '1 day')
+        """
+        return await self.db.execute(query, days, terminal)
+
+
 # ============================================
 # SINGLETON AND INITIALIZATION
 # ============================================
@@ -447,17 +859,32 @@ _conversation_repo: Optional[ConversationRepository] = None
 _task_repo: Optional[TaskRepository] = None
 _learning_repo: Optional[LearningRepository] = None
 _context_repo: Optional[ContextRepository] = None
+_checkpoint_repo: Optional[CheckpointRepository] = None
+_agent_output_repo: Optional[AgentOutputRepository] = None
+_agent_registry_repo: Optional[AgentRegistryRepository] = None
 
 
 async def init_database(config: Optional[DatabaseConfig] = None) -> AuroraDatabase:
-    """Initialize the database connection."""
+    """Initialize the database connection. Raises RuntimeError if it is unavailable."""
     global _database
     if _database is None:
-        _database = AuroraDatabase(config)
-        await _database.connect()
+        database = AuroraDatabase(config)
+        await database.connect()
+        _database = database
     return _database
 
 
+async def close_database():
+    """Close the connection pool and forget the repositories bound to it."""
+    global _database, _conversation_repo, _task_repo, _learning_repo, _context_repo
+    global _checkpoint_repo, _agent_output_repo, _agent_registry_repo
+    if _database is not None:
+        await _database.close()
+    _database = None
+    _conversation_repo = _task_repo = _learning_repo = _context_repo = None
+    _checkpoint_repo = _agent_output_repo = _agent_registry_repo = None
+
+
 def get_database() -> AuroraDatabase:
     """Get the database instance (must be initialized first)."""
     global _database
@@ -496,3 +923,61 @@ def get_context_repo() -> ContextRepository:
     if _context_repo is None:
         _context_repo = ContextRepository(get_database())
     return _context_repo
+
+
+def get_checkpoint_repo() -> CheckpointRepository:
+    """Get the checkpoint repository."""
+    global _checkpoint_repo
+    if _checkpoint_repo is None:
+        _checkpoint_repo = CheckpointRepository(get_database())
+    return _checkpoint_repo
+
+
+def get_agent_output_repo() -> AgentOutputRepository:
+    """Get the agent output repository."""
+    global _agent_output_repo
+    if _agent_output_repo is None:
+        _agent_output_repo = AgentOutputRepository(get_database())
+    return _agent_output_repo
+
+
+def get_agent_registry_repo() -> AgentRegistryRepository:
+    """Get the agent registry repository."""
+    global _agent_registry_repo
+    if _agent_registry_repo is None:
+        _agent_registry_repo = AgentRegistryRepository(get_database())
+    return _agent_registry_repo
+
+
+# Features that need Postgres, and the tables they create at startup
+PERSISTENT_FEATURES = {
+    "graph checkpoints": get_checkpoint_repo,
+    "agent output spill": get_agent_output_repo,  # Falls back to local SQLite
+    "agent registry": get_agent_registry_repo,  # Falls back to local SQLite
+}
+
+
+async def init_persistence() -> bool:
+    """
+    Connect to Postgres and create the tables Aurora's runtime state uses.
+
+    Called once at startup by the bot and the CLI. Returns False, after
+    logging at error level which features are off, when the database is
+    unavailable; those features then run without persistence instead of
+    failing conversations.
+    """
+    try:
+        await init_database()
+        for provider in PERSISTENT_FEATURES.values():
+            await provider().ensure_schema()
+    except Exception as e:
+        logger.error(
+            "database.unavailable",
+            error=str(e),
+            disabled=list(PERSISTENT_FEATURES),
+        )
+        await close_database()
+        return False
+
+    logger.info("database.ready", host=_database.config.host, features=list(PERSISTENT_FEATURES))
+    return True
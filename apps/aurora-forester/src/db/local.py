@@ -0,0 +1,194 @@
+"""
+Aurora Forester - Local Database
+SQLite stand-ins for Postgres repositories, for running Aurora on a
+laptop without a database server.
+
+Each class mirrors the interface of its counterpart in connection.py.
+sqlite3 calls block, so they run in a thread.
+"""
+
+import asyncio
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+
+class _SqliteRepository:
+    """One SQLite connection, used from worker threads under a lock."""
+
+    SCHEMA = ""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.row_factory = sqlite3.Row
+            self._conn.execute("PRAGMA journal_mode=WAL")
+        return self._conn
+
+    async def _run(self, func, *args):
+        def call():
+            with self._lock:
+                return func(self._connection(), *args)
+        return await asyncio.to_thread(call)
+
+    async def ensure_schema(self):
+        """Create the table if it does not exist."""
+        await self._run(lambda conn: conn.executescript(self.SCHEMA))
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+class SqliteAgentRegistryRepository(_SqliteRepository):
+    """AgentRegistryRepository backed by a local SQLite file."""
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS agents (
+            agent_id TEXT PRIMARY KEY,
+            agent_type TEXT NOT NULL,
+            status TEXT NOT NULL,
+            config TEXT NOT NULL,
+            run_args TEXT,
+            checkpoint TEXT NOT NULL DEFAULT '{}',
+            outputs_total INTEGER NOT NULL DEFAULT 0,
+            errors_total INTEGER NOT NULL DEFAULT 0,
+            created_at TEXT NOT NULL,
+            updated_at TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS agents_status_idx ON agents (status);
+    """
+
+    async def upsert_many(self, rows: List[Tuple[str, str, str, str, Optional[str], str, int, int, datetime]]):
+        """Write agent rows; same row layout as AgentRegistryRepository.upsert_many."""
+        now = datetime.now().isoformat()
+        params = [(*row[:8], row[8].isoformat(), now) for row in rows]
+
+        def write(conn: sqlite3.Connection):
+            with conn:
+                conn.executemany(
+                    """
+                    INSERT INTO agents
+                    (agent_id, agent_type, status, config, run_args, checkpoint,
+                     outputs_total, errors_total, created_at, updated_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT (agent_id)
+                    DO UPDATE SET status = excluded.status, config = excluded.config,
+                                  run_args = excluded.run_args, checkpoint = excluded.checkpoint,
+                                  outputs_total = excluded.outputs_total,
+                                  errors_total = excluded.errors_total,
+                                  updated_at = excluded.updated_at
+                    """,
+                    params,
+                )
+        await self._run(write)
+
+    async def load_unfinished(self, terminal: List[str]) -> List[Dict[str, Any]]:
+        """Agents whose status is not one of `terminal`, oldest first."""
+        def read(conn: sqlite3.Connection):
+            placeholders = ", ".join("?" for _ in terminal) or "NULL"
+            rows = conn.execute(
+                f"""
+                SELECT agent_id, agent_type, status, config, run_args, checkpoint,
+                       outputs_total, errors_total, created_at
+                FROM agents
+                WHERE status NOT IN ({placeholders})
+                ORDER BY created_at ASC
+                """,
+                terminal,
+            ).fetchall()
+            return [
+                {**dict(row), "created_at": datetime.fromisoformat(row["created_at"])}
+                for row in rows
+            ]
+        return await self._run(read)
+
+    async def prune_finished_older_than(self, days: int, terminal: List[str]) -> str:
+        """Drop finished agents last updated more than `days` ago."""
+        cutoff = datetime.fromtimestamp(datetime.now().timestamp() - days * 86400).isoformat()
+
+        def delete(conn: sqlite3.Connection):
+            placeholders = ", ".join("?" for _ in terminal) or "NULL"
+            with conn:
+                cursor = conn.execute(
+                    f"DELETE FROM agents WHERE status IN ({placeholders}) AND updated_at < ?",
+                    [*terminal, cutoff],
+                )
+            return f"DELETE {cursor.rowcount}"
+        return await self._run(delete)
+
+
+class SqliteAgentOutputRepository(_SqliteRepository):
+    """AgentOutputRepository backed by a local SQLite file."""
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS agent_outputs (
+            agent_id TEXT NOT NULL,
+            kind TEXT NOT NULL CHECK (kind IN ('output', 'error')),
+            seq INTEGER NOT NULL,
+            payload TEXT NOT NULL,
+            created_at TEXT NOT NULL,
+            PRIMARY KEY (agent_id, kind, seq)
+        );
+        CREATE INDEX IF NOT EXISTS agent_outputs_created_idx ON agent_outputs (created_at);
+    """
+
+    async def append_many(self, rows: List[Tuple[str, str, int, str]]):
+        """Write (agent_id, kind, seq, payload_json) rows; re-spilled rows are ignored."""
+        now = datetime.now().isoformat()
+        params = [(*row, now) for row in rows]
+
+        def write(conn: sqlite3.Connection):
+            with conn:
+                conn.executemany(
+                    """
+                    INSERT INTO agent_outputs (agent_id, kind, seq, payload, created_at)
+                    VALUES (?, ?, ?, ?, ?)
+                    ON CONFLICT (agent_id, kind, seq) DO NOTHING
+                    """,
+                    params,
+                )
+        await self._run(write)
+
+    async def fetch_page(
+        self,
+        agent_id: str,
+        kind: str = "output",
+        before_seq: Optional[int] = None,
+        limit: int = 50
+    ) -> List[Dict[str, Any]]:
+        """Entries for an agent older than `before_seq`, newest first."""
+        def read(conn: sqlite3.Connection):
+            rows = conn.execute(
+                """
+                SELECT seq, payload, created_at
+                FROM agent_outputs
+                WHERE agent_id = ? AND kind = ?
+                AND (? IS NULL OR seq < ?)
+                ORDER BY seq DESC
+                LIMIT ?
+                """,
+                (agent_id, kind, before_seq, before_seq, limit),
+            ).fetchall()
+            return [dict(row) for row in rows]
+        return await self._run(read)
+
+    async def prune_older_than(self, days: int) -> str:
+        """Drop spilled entries older than `days`."""
+        cutoff = datetime.fromtimestamp(datetime.now().timestamp() - days * 86400).isoformat()
+
+        def delete(conn: sqlite3.Connection):
+            with conn:
+                cursor = conn.execute("DELETE FROM agent_outputs WHERE created_at < ?", (cutoff,))
+            return f"DELETE {cursor.rowcount}"
+        return await self._run(delete)
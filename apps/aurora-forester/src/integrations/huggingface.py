@@ -100,6 +100,15 @@ class AuroraHuggingFace:
             pass
         return self._inference_client
 
+    @property
+    def local_backend(self):
+        """
+        The in-cluster (or in-process) inference worker for embeddings,
+        zero-shot, sentiment, summarization and QA, if one is configured.
+        """
+        from .inference import get_inference_backend
+        return get_inference_backend()
+
     def save_token(self, token: str):
         """Securely save the HuggingFace token."""
         secrets_dir = Path.home() / ".aurora-forester" / "secrets"
@@ -165,6 +174,10 @@ class AuroraHuggingFace:
         Returns:
             List of embedding vectors
         """
+        backend = self.local_backend
+        if backend is not None and model is None:
+            return await backend.embed_many(texts)
+
         model = model or self.get_recommended_model("embeddings", "default")
 
         # Placeholder - requires sentence_transformers or inference API
@@ -179,8 +192,9 @@ class AuroraHuggingFace:
         #     model=model
         # )
 
-        # Return placeholder embeddings (1536 dimensions to match OpenAI)
-        return [[0.0] * 1536 for _ in texts]
+        # Return placeholder embeddings, as wide as the configured model's
+        from ..core.config import settings
+        return [[0.0] * settings.embedding_dim for _ in texts]
 
     async def classify_intent(
         self,
@@ -197,6 +211,10 @@ class AuroraHuggingFace:
         Returns:
             Dictionary of label -> confidence score
         """
+        backend = self.local_backend
+        if backend is not None:
+            return await backend.zero_shot(text, candidate_labels)
+
         model = self.get_recommended_model("classification", "zero_shot")
 
         # Placeholder - requires inference API
@@ -216,6 +234,10 @@ class AuroraHuggingFace:
         Returns:
             Dictionary with sentiment label and confidence
         """
+        backend = self.local_backend
+        if backend is not None:
+            return await backend.sentiment(text)
+
         model = self.get_recommended_model("sentiment", "default")
 
         # Placeholder
@@ -238,6 +260,10 @@ class AuroraHuggingFace:
         Returns:
             Summary text
         """
+        backend = self.local_backend
+        if backend is not None:
+            return await backend.summarize(text, max_length)
+
         model = self.get_recommended_model("summarization", "default")
 
         # Placeholder
@@ -265,6 +291,10 @@ class AuroraHuggingFace:
         Returns:
             Dictionary with answer and confidence
         """
+        backend = self.local_backend
+        if backend is not None:
+            return await backend.answer(question, context)
+
         model = self.get_recommended_model("question_answering", "default")
 
         # Placeholder
@@ -283,19 +313,43 @@ class EmbeddingService:
     Service for managing embeddings in Aurora's RAG system.
     """
 
-    def __init__(self, hf: AuroraHuggingFace):
+    def __init__(self, hf: AuroraHuggingFace, dimension: Optional[int] = None):
         self.hf = hf
-        self.dimension = 1536  # Match pgvector dimension
+        if dimension is None:
+            from ..core.config import settings
+            dimension = settings.embedding_dim
+        self.dimension = dimension  # Must match the pgvector column
+        self.model = hf.get_recommended_model("embeddings", "default")
+
+    @property
+    def model_key(self) -> str:
+        """Which vectors these are: stored embeddings from another key must be redone."""
+        return f"{self.model}:{self.dimension}"
+
+    @property
+    def placeholder(self) -> bool:
+        """True when no model is configured and every vector is zeros."""
+        return self.hf.local_backend is None
+
+    async def _embed(self, texts: List[str]) -> List[List[float]]:
+        embeddings = await self.hf.generate_embeddings(texts)
+        for vector in embeddings:
+            if len(vector) != self.dimension:
+                raise ValueError(
+                    f"Embedding model returned {len(vector)}-d vectors, expected {self.dimension}; "
+                    f"set EMBEDDING_DIM to the model's width"
+                )
+        return embeddings
 
     async def embed_document(self, content: str, title: Optional[str] = None) -> List[float]:
         """Embed a document for RAG storage."""
         text = f"{title}: {content}" if title else content
-        embeddings = await self.hf.generate_embeddings([text])
+        embeddings = await self._embed([text])
         return embeddings[0] if embeddings else [0.0] * self.dimension
 
     async def embed_query(self, query: str) -> List[float]:
         """Embed a query for similarity search."""
-        embeddings = await self.hf.generate_embeddings([query])
+        embeddings = await self._embed([query])
         return embeddings[0] if embeddings else [0.0] * self.dimension
 
     async def embed_batch(self, texts: List[str], batch_size: int = 32) -> List[List[float]]:
@@ -304,7 +358,7 @@ class EmbeddingService:
 
         for i in range(0, len(texts), batch_size):
             batch = texts[i:i + batch_size]
-            embeddings = await self.hf.generate_embeddings(batch)
+            embeddings = await self._embed(batch)
             all_embeddings.extend(embeddings)
 
         return all_embeddings
@@ -0,0 +1,455 @@
+"""
+Aurora Forester - Local Inference Worker
+Keeps the recommended HuggingFace models loaded on CPU and batches
+concurrent requests into shared forward passes.
+
+Each task (embeddings, zero-shot, sentiment, summarization, question
+answering) has a MicroBatcher. Requests arriving within a short window -
+or while the previous batch is still running - are grouped into one
+pipeline call, so a burst of messages costs a few forward passes instead
+of one each.
+Models are loaded once, on first use, and run on a single inference
+thread; torch parallelizes inside each pass.
+
+With runtime="onnx", the encoder tasks (embeddings, zero-shot, sentiment)
+run int8-quantized ONNX exports instead (see onnx_backend.py), falling
+back to torch for any model that has not been exported.
+
+The worker runs in-process (settings.local_inference) or as its own
+deployment behind a tiny HTTP API (`python main.py inference`), which the
+bot reaches through InferenceClient (settings.inference_url).
+
+Requires the transformers and torch packages (sentence-transformers for
+embeddings), or onnxruntime for the ONNX runtime.
+"""
+
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+import structlog
+
+from . import onnx_backend
+from .onnx_backend import ONNX_TASKS, load_onnx_model
+
+
+logger = structlog.get_logger()
+
+
+# run_batch(key, items) -> one result per item, in order
+BatchFunction = Callable[[Hashable, List[Any]], List[Any]]
+
+_NOTHING_DUE = object()
+
+
+class MicroBatcher:
+    """
+    Groups concurrent submissions with the same key into batches.
+
+    A key's batch is dispatched once it holds `max_batch` items or its
+    oldest item has waited `window_ms`. Only one batch runs at a time;
+    items that arrive meanwhile keep accumulating, so batches grow under
+    load instead of queueing behind each other.
+    """
+
+    def __init__(
+        self,
+        run_batch: BatchFunction,
+        executor: ThreadPoolExecutor,
+        max_batch: int = 16,
+        window_ms: float = 10.0,
+        name: str = "batch"
+    ):
+        self.run_batch = run_batch
+        self.executor = executor
+        self.max_batch = max(1, max_batch)
+        self.window = window_ms / 1000.0
+        self.name = name
+        # key -> [(item, future)], in order of each key's first pending item
+        self._pending: "OrderedDict[Hashable, List[Tuple[Any, asyncio.Future]]]" = OrderedDict()
+        self._due: set = set()
+        self._timers: Dict[Hashable, asyncio.TimerHandle] = {}
+        self._running = False
+        self.stats = {"batches": 0, "items": 0, "largest": 0}
+
+    async def submit(self, key: Hashable, item: Any) -> Any:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        batch = self._pending.setdefault(key, [])
+        batch.append((item, future))
+        if len(batch) >= self.max_batch:
+            self._mark_due(key)
+        elif len(batch) == 1:
+            self._timers[key] = loop.call_later(self.window, self._mark_due, key)
+        return await future
+
+    def _mark_due(self, key: Hashable):
+        timer = self._timers.pop(key, None)
+        if timer is not None:
+            timer.cancel()
+        if key in self._pending:
+            self._due.add(key)
+        self._dispatch()
+
+    def _dispatch(self):
+        if self._running:
+            return
+        key = next((k for k in self._pending if k in self._due), _NOTHING_DUE)
+        if key is _NOTHING_DUE:
+            return
+
+        batch = self._pending[key]
+        taken, rest = batch[:self.max_batch], batch[self.max_batch:]
+        if rest:
+            # Leftovers have waited long enough; they go next, after other due keys
+            self._pending[key] = rest
+            self._pending.move_to_end(key)
+        else:
+            del self._pending[key]
+            self._due.discard(key)
+
+        self._running = True
+        asyncio.get_running_loop().create_task(self._run(key, taken))
+
+    async def _run(self, key: Hashable, batch: List[Tuple[Any, asyncio.Future]]):
+        items = [item for item, _ in batch]
+        loop = asyncio.get_running_loop()
+        try:
+            results = await loop.run_in_executor(self.executor, self.run_batch, key, items)
+            self.stats["batches"] += 1
+            self.stats["items"] += len(items)
+            self.stats["largest"] = max(self.stats["largest"], len(items))
+            for (_, future), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
+        except Exception as e:
+            logger.error("inference.batch_failed", task=self.name, size=len(items), error=str(e))
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+        finally:
+            self._running = False
+            self._dispatch()
+
+
+def _as_list(result: Any) -> List[Any]:
+    """Pipelines return a bare result for a single input; make it a list."""
+    return result if isinstance(result, list) else [result]
+
+
+class LocalInferenceWorker:
+    """
+    In-process CPU inference over the recommended models.
+
+    `models` maps task -> model id and defaults to
+    AuroraHuggingFace.RECOMMENDED_MODELS. `runtime` is "torch" or "onnx";
+    ONNX models are looked up under `onnx_path`.
+    """
+
+    # task -> (transformers pipeline task, RECOMMENDED_MODELS use case, variant)
+    TASKS = {
+        "embed": ("feature-extraction", "embeddings", "default"),
+        "zero_shot": ("zero-shot-classification", "classification", "zero_shot"),
+        "sentiment": ("sentiment-analysis", "sentiment", "default"),
+        "summarize": ("summarization", "summarization", "default"),
+        "qa": ("question-answering", "question_answering", "default"),
+    }
+
+    def __init__(
+        self,
+        models: Optional[Dict[str, str]] = None,
+        max_batch: int = 16,
+        window_ms: float = 10.0,
+        runtime: str = "torch",
+        onnx_path: Optional[Path] = None
+    ):
+        self.models = models if models is not None else self.default_models()
+        self.runtime = runtime
+        if runtime == "onnx" and onnx_path is None:
+            from ..core.config import settings
+            onnx_path = settings.onnx_model_path
+        self.onnx_path = onnx_path
+        self._pipelines: Dict[str, Any] = {}
+        self._onnx: set = set()  # Tasks whose model loaded as ONNX
+        self._load_lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="aurora-inference")
+        self._batchers = {
+            "embed": MicroBatcher(self._embed_batch, self._executor, max_batch, window_ms, "embed"),
+            "zero_shot": MicroBatcher(self._zero_shot_batch, self._executor, max_batch, window_ms, "zero_shot"),
+            "sentiment": MicroBatcher(self._sentiment_batch, self._executor, max_batch, window_ms, "sentiment"),
+            "summarize": MicroBatcher(self._summarize_batch, self._executor, max_batch, window_ms, "summarize"),
+            "qa": MicroBatcher(self._qa_batch, self._executor, max_batch, window_ms, "qa"),
+        }
+
+    # ============================================
+    # MODELS
+    # ============================================
+
+    @classmethod
+    def default_models(cls) -> Dict[str, str]:
+        """task -> model id, from AuroraHuggingFace.RECOMMENDED_MODELS."""
+        from .huggingface import AuroraHuggingFace
+        return {
+            task: AuroraHuggingFace.RECOMMENDED_MODELS[use_case][variant]
+            for task, (_, use_case, variant) in cls.TASKS.items()
+        }
+
+    def _pipeline(self, task: str):
+        """Load a task's model once; runs on the inference thread."""
+        pipe = self._pipelines.get(task)
+        if pipe is not None:
+            return pipe
+        with self._load_lock:
+            if task not in self._pipelines:
+                model = self.models[task]
+                if self.runtime == "onnx" and task in ONNX_TASKS:
+                    encoder = load_onnx_model(model, self.onnx_path)
+                    if encoder is not None:
+                        self._pipelines[task] = encoder
+                        self._onnx.add(task)
+                        return encoder
+                    logger.warning("inference.onnx_fallback", task=task, model=model,
+                                   hint="run `python main.py export-onnx`")
+
+                started = time.perf_counter()
+                if task == "embed":
+                    from sentence_transformers import SentenceTransformer
+                    self._pipelines[task] = SentenceTransformer(model, device="cpu")
+                else:
+                    from transformers import pipeline
+                    self._pipelines[task] = pipeline(self.TASKS[task][0], model=model, device=-1)
+                logger.info("inference.model_loaded", task=task, model=model,
+                            seconds=round(time.perf_counter() - started, 1))
+        return self._pipelines[task]
+
+    async def preload(self, tasks: Optional[List[str]] = None):
+        """Load models ahead of the first request."""
+        loop = asyncio.get_running_loop()
+        for task in tasks or list(self.TASKS):
+            await loop.run_in_executor(self._executor, self._pipeline, task)
+
+    # ============================================
+    # PUBLIC API
+    # ============================================
+
+    async def embed(self, text: str) -> List[float]:
+        """Normalized sentence embedding of `text`."""
+        return await self._batchers["embed"].submit(None, text)
+
+    async def embed_many(self, texts: List[str]) -> List[List[float]]:
+        """embed() for each of `texts`, in order; they fill batches together."""
+        batcher = self._batchers["embed"]
+        return list(await asyncio.gather(*(batcher.submit(None, text) for text in texts)))
+
+    async def zero_shot(self, text: str, labels: List[str], multi_label: bool = False) -> Dict[str, float]:
+        """Label -> score for `text`."""
+        return await self._batchers["zero_shot"].submit((tuple(labels), multi_label), text)
+
+    async def sentiment(self, text: str) -> Dict[str, Any]:
+        """{"label": ..., "score": ...}"""
+        return await self._batchers["sentiment"].submit(None, text)
+
+    async def summarize(self, text: str, max_length: int = 150) -> str:
+        return await self._batchers["summarize"].submit(max_length, text)
+
+    async def answer(self, question: str, context: str) -> Dict[str, Any]:
+        """{"answer", "score", "start", "end"}"""
+        return await self._batchers["qa"].submit(None, (question, context))
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "loaded": {task: "onnx" if task in self._onnx else "torch" for task in sorted(self._pipelines)},
+            "batches": {task: dict(batcher.stats) for task, batcher in self._batchers.items()},
+        }
+
+    async def close(self):
+        await asyncio.to_thread(self._executor.shutdown, wait=True)
+
+    # ============================================
+    # BATCH FUNCTIONS (inference thread)
+    # ============================================
+
+    def _embed_batch(self, key: None, texts: List[str]) -> List[List[float]]:
+        model = self._pipeline("embed")
+        if "embed" in self._onnx:
+            return model.embed(texts).tolist()
+        return model.encode(texts, batch_size=len(texts), normalize_embeddings=True).tolist()
+
+    def _zero_shot_batch(self, key: Tuple[Tuple[str, ...], bool], texts: List[str]) -> List[Dict[str, float]]:
+        labels, multi_label = key
+        model = self._pipeline("zero_shot")
+        if "zero_shot" in self._onnx:
+            return onnx_backend.zero_shot(model, texts, labels, multi_label)
+        results = model(
+            texts, candidate_labels=list(labels), multi_label=multi_label, batch_size=len(texts)
+        )
+        return [dict(zip(r["labels"], r["scores"])) for r in _as_list(results)]
+
+    def _sentiment_batch(self, key: None, texts: List[str]) -> List[Dict[str, Any]]:
+        model = self._pipeline("sentiment")
+        if "sentiment" in self._onnx:
+            return onnx_backend.classify(model, texts)
+        results = model(texts, batch_size=len(texts), truncation=True)
+        return [{"label": r["label"], "score": float(r["score"])} for r in _as_list(results)]
+
+    def _summarize_batch(self, max_length: int, texts: List[str]) -> List[str]:
+        results = self._pipeline("summarize")(
+            texts, max_length=max_length, min_length=min(30, max_length // 2),
+            truncation=True, batch_size=len(texts),
+        )
+        return [r["summary_text"] for r in _as_list(results)]
+
+    def _qa_batch(self, key: None, items: List[Tuple[str, str]]) -> List[Dict[str, Any]]:
+        results = self._pipeline("qa")(
+            question=[q for q, _ in items], context=[c for _, c in items], batch_size=len(items)
+        )
+        return [
+            {"answer": r["answer"], "score": float(r["score"]), "start": r["start"], "end": r["end"]}
+            for r in _as_list(results)
+        ]
+
+
+# ============================================
+# HTTP API
+# ============================================
+
+def create_app(worker: LocalInferenceWorker, preload: bool = True):
+    """FastAPI app exposing the worker; concurrent requests share batches."""
+    from fastapi import FastAPI
+    from pydantic import BaseModel
+
+    class ZeroShotRequest(BaseModel):
+        text: str
+        labels: List[str]
+        multi_label: bool = False
+
+    class TextRequest(BaseModel):
+        text: str
+
+    class TextsRequest(BaseModel):
+        texts: List[str]
+
+    class SummarizeRequest(BaseModel):
+        text: str
+        max_length: int = 150
+
+    class AnswerRequest(BaseModel):
+        question: str
+        context: str
+
+    app = FastAPI(title="Aurora inference")
+
+    if preload:
+        @app.on_event("startup")
+        async def _preload():
+            await worker.preload()
+
+    @app.on_event("shutdown")
+    async def _close():
+        await worker.close()
+
+    @app.get("/healthz")
+    async def healthz():
+        return worker.stats()
+
+    @app.post("/embed")
+    async def embed(request: TextRequest):
+        return {"embedding": await worker.embed(request.text)}
+
+    @app.post("/embed_batch")
+    async def embed_batch(request: TextsRequest):
+        return {"embeddings": await worker.embed_many(request.texts)}
+
+    @app.post("/zero-shot")
+    async def zero_shot(request: ZeroShotRequest):
+        return await worker.zero_shot(request.text, request.labels, request.multi_label)
+
+    @app.post("/sentiment")
+    async def sentiment(request: TextRequest):
+        return await worker.sentiment(request.text)
+
+    @app.post("/summarize")
+    async def summarize(request: SummarizeRequest):
+        return {"summary_text": await worker.summarize(request.text, request.max_length)}
+
+    @app.post("/qa")
+    async def answer(request: AnswerRequest):
+        return await worker.answer(request.question, request.context)
+
+    return app
+
+
+class InferenceClient:
+    """Calls a worker started with `python main.py inference`; same methods as the worker."""
+
+    def __init__(self, base_url: str, timeout: float = 30.0):
+        import httpx
+        self.base_url = base_url.rstrip("/")
+        self._client = httpx.AsyncClient(base_url=self.base_url, timeout=timeout)
+
+    async def _post(self, path: str, payload: Dict[str, Any]) -> Any:
+        response = await self._client.post(path, json=payload)
+        response.raise_for_status()
+        return response.json()
+
+    async def embed(self, text: str) -> List[float]:
+        return (await self._post("/embed", {"text": text}))["embedding"]
+
+    async def embed_many(self, texts: List[str]) -> List[List[float]]:
+        return (await self._post("/embed_batch", {"texts": texts}))["embeddings"]
+
+    async def zero_shot(self, text: str, labels: List[str], multi_label: bool = False) -> Dict[str, float]:
+        return await self._post("/zero-shot", {"text": text, "labels": labels, "multi_label": multi_label})
+
+    async def sentiment(self, text: str) -> Dict[str, Any]:
+        return await self._post("/sentiment", {"text": text})
+
+    async def summarize(self, text: str, max_length: int = 150) -> str:
+        return (await self._post("/summarize", {"text": text, "max_length": max_length}))["summary_text"]
+
+    async def answer(self, question: str, context: str) -> Dict[str, Any]:
+        return await self._post("/qa", {"question": question, "context": context})
+
+    async def close(self):
+        await self._client.aclose()
+
+
+def run_inference_server(host: str = "0.0.0.0", port: int = 8090):
+    """Serve a LocalInferenceWorker over HTTP (blocking)."""
+    import uvicorn
+
+    uvicorn.run(create_app(_configured_worker()), host=host, port=port, log_level="warning")
+
+
+def _configured_worker() -> LocalInferenceWorker:
+    from ..core.config import settings
+    return LocalInferenceWorker(
+        max_batch=settings.inference_max_batch,
+        window_ms=settings.inference_batch_window_ms,
+        runtime=settings.inference_runtime.lower(),
+        onnx_path=settings.onnx_model_path,
+    )
+
+
+# Singleton
+_inference_backend: Optional[Any] = None
+
+
+def get_inference_backend() -> Optional[Any]:
+    """
+    The configured inference backend: an InferenceClient when
+    settings.inference_url is set, an in-process worker when
+    settings.local_inference is on, otherwise None.
+    """
+    global _inference_backend
+    if _inference_backend is None:
+        from ..core.config import settings
+        if settings.inference_url:
+            _inference_backend = InferenceClient(settings.inference_url)
+        elif settings.local_inference:
+            _inference_backend = _configured_worker()
+    return _inference_backend
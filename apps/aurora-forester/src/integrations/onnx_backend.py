@@ -0,0 +1,180 @@
+"""
+Aurora Forester - ONNX Runtime Backend
+int8-quantized ONNX models for the encoder tasks: embeddings, sentiment
+and zero-shot classification.
+
+The aurora nodes run everything but Ollama on CPU. Full torch is slow to
+import and heavy in memory, so the recommended encoders are exported to
+ONNX once (`python main.py export-onnx`, which needs torch and optimum)
+and dynamically quantized to int8. Serving them then needs only
+onnxruntime, a tokenizer and numpy.
+
+load_onnx_model() returns None when a model has not been exported or
+onnxruntime is missing; the inference worker then falls back to torch.
+Summarization and question answering always run on torch.
+"""
+
+import json
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+import structlog
+
+
+logger = structlog.get_logger()
+
+
+QUANTIZED_FILE = "model_quantized.onnx"
+EXPORTED_FILE = "model.onnx"
+
+# Worker tasks that can run on ONNX, and the optimum class that exports each
+ONNX_TASKS = {
+    "embed": "ORTModelForFeatureExtraction",
+    "sentiment": "ORTModelForSequenceClassification",
+    "zero_shot": "ORTModelForSequenceClassification",
+}
+
+
+def model_dir(cache_dir: Path, model_id: str) -> Path:
+    return Path(cache_dir) / model_id.replace("/", "--")
+
+
+class OnnxEncoder:
+    """An exported encoder: an onnxruntime session plus its tokenizer and config."""
+
+    def __init__(self, path: Path, threads: int = 0, max_length: int = 512):
+        import onnxruntime
+        from transformers import AutoTokenizer
+
+        model_file = path / QUANTIZED_FILE
+        if not model_file.exists():
+            model_file = path / EXPORTED_FILE
+
+        options = onnxruntime.SessionOptions()
+        if threads:
+            options.intra_op_num_threads = threads
+        options.graph_optimization_level = onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+        self.session = onnxruntime.InferenceSession(
+            str(model_file), sess_options=options, providers=["CPUExecutionProvider"]
+        )
+        self.input_names = {i.name for i in self.session.get_inputs()}
+        self.tokenizer = AutoTokenizer.from_pretrained(path)
+        self.max_length = max_length
+        self.quantized = model_file.name == QUANTIZED_FILE
+
+        config = json.loads((path / "config.json").read_text())
+        self.id2label = {int(k): v for k, v in config.get("id2label", {}).items()}
+
+    def _run(self, encoded: Dict[str, Any]):
+        feed = {name: encoded[name].astype("int64") for name in self.input_names if name in encoded}
+        return self.session.run(None, feed)[0], encoded["attention_mask"]
+
+    def embed(self, texts: Sequence[str], normalize: bool = True):
+        """Mean-pooled sentence embeddings, as sentence-transformers computes them."""
+        import numpy as np
+
+        encoded = self.tokenizer(list(texts), padding=True, truncation=True,
+                                 max_length=self.max_length, return_tensors="np")
+        hidden, mask = self._run(encoded)
+        mask = mask[..., None].astype(hidden.dtype)
+        pooled = (hidden * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+        if normalize:
+            pooled /= np.clip(np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12, None)
+        return pooled
+
+    def logits(self, texts: Sequence[str], pairs: Optional[Sequence[str]] = None):
+        encoded = self.tokenizer(list(texts), list(pairs) if pairs is not None else None,
+                                 padding=True, truncation="only_first" if pairs is not None else True,
+                                 max_length=self.max_length, return_tensors="np")
+        return self._run(encoded)[0]
+
+    def label_id(self, name: str) -> int:
+        for index, label in self.id2label.items():
+            if label.lower() == name:
+                return index
+        raise KeyError(f"Model has no {name!r} label")
+
+
+def _softmax(values, axis: int = -1):
+    import numpy as np
+    shifted = values - values.max(axis=axis, keepdims=True)
+    exp = np.exp(shifted)
+    return exp / exp.sum(axis=axis, keepdims=True)
+
+
+def classify(encoder: OnnxEncoder, texts: Sequence[str]) -> List[Dict[str, Any]]:
+    """Text classification (sentiment): best label and its probability."""
+    probs = _softmax(encoder.logits(texts))
+    best = probs.argmax(axis=1)
+    return [
+        {"label": encoder.id2label.get(int(i), str(int(i))), "score": float(p[i])}
+        for i, p in zip(best, probs)
+    ]
+
+
+def zero_shot(
+    encoder: OnnxEncoder,
+    texts: Sequence[str],
+    labels: Sequence[str],
+    multi_label: bool = False,
+    template: str = "This example is {}."
+) -> List[Dict[str, float]]:
+    """NLI zero-shot classification, as the transformers pipeline does it."""
+    premises = [text for text in texts for _ in labels]
+    hypotheses = [template.format(label) for _ in texts for label in labels]
+    logits = encoder.logits(premises, hypotheses).reshape(len(texts), len(labels), -1)
+
+    entail = encoder.label_id("entailment")
+    if multi_label:
+        contra = encoder.label_id("contradiction")
+        scores = _softmax(logits[..., [contra, entail]])[..., 1]
+    else:
+        scores = _softmax(logits[..., entail], axis=1)
+    return [
+        dict(sorted(zip(labels, map(float, row)), key=lambda item: -item[1]))
+        for row in scores
+    ]
+
+
+def load_onnx_model(model_id: str, cache_dir: Path, threads: int = 0) -> Optional[OnnxEncoder]:
+    """The exported model for `model_id`, or None if it is not available."""
+    path = model_dir(cache_dir, model_id)
+    if not ((path / QUANTIZED_FILE).exists() or (path / EXPORTED_FILE).exists()):
+        return None
+    try:
+        started = time.perf_counter()
+        encoder = OnnxEncoder(path, threads=threads)
+    except ImportError as e:
+        logger.warning("onnx.unavailable", model=model_id, error=str(e))
+        return None
+    logger.info("onnx.model_loaded", model=model_id, quantized=encoder.quantized,
+                seconds=round(time.perf_counter() - started, 2))
+    return encoder
+
+
+def export_onnx(model_id: str, task: str, cache_dir: Path, quantize: bool = True) -> Path:
+    """
+    Export a model to ONNX and, by default, quantize its weights to int8.
+
+    Needs optimum[onnxruntime] (and so torch); run once, e.g. at image
+    build time, with `python main.py export-onnx`.
+    """
+    import optimum.onnxruntime as ort
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+    from transformers import AutoTokenizer
+
+    path = model_dir(cache_dir, model_id)
+    path.mkdir(parents=True, exist_ok=True)
+
+    started = time.perf_counter()
+    model_class = getattr(ort, ONNX_TASKS[task])
+    model_class.from_pretrained(model_id, export=True).save_pretrained(path)
+    AutoTokenizer.from_pretrained(model_id).save_pretrained(path)
+
+    if quantize:
+        quantize_dynamic(str(path / EXPORTED_FILE), str(path / QUANTIZED_FILE), weight_type=QuantType.QInt8)
+
+    logger.info("onnx.exported", model=model_id, task=task, quantized=quantize,
+                seconds=round(time.perf_counter() - started, 1))
+    return path
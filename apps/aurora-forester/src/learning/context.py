@@ -9,6 +9,7 @@ from typing import Optional, Dict, List
 from datetime import datetime
 
 from ..core.config import settings
+from ..core.intent import get_intent_classifier
 
 
 logger = structlog.get_logger()
@@ -69,23 +70,23 @@ class ContextManager:
 - Motivated by love and building a regenerative future""")
 
         # Check for specific context needs
-        query_lower = query.lower()
+        wanted = get_intent_classifier().classify(query).labels("context")
 
-        if any(word in query_lower for word in ["project", "hello world", "dao", "ecosystem"]):
+        if "project" in wanted:
             summaries.append("""**Project Context:**
 - Hello World DAO: Cooperative ecosystem
 - Otter Camp: Gamified funding
 - Sector7: Self-hosted infrastructure
 - Team: Coby (dev), Menley (devops)""")
 
-        if any(word in query_lower for word in ["decide", "choice", "option", "should i"]):
+        if "decision" in wanted:
             summaries.append("""**Decision Support:**
 - Graydon values principles-based decisions
 - Consider: Does this align with the regenerative vision?
 - Consider: Does this serve the community?
 - Consider: Is this sustainable?""")
 
-        if any(word in query_lower for word in ["tired", "rest", "break", "eat", "food", "meal"]):
+        if "self_care" in wanted:
             summaries.append("""**Self-Care Context:**
 - Graydon tends to hyperfocus and forget self-care
 - Gentle reminders are helpful
@@ -0,0 +1,414 @@
+"""
+Aurora Forester - Context Library Ingestion
+Streams documents into the RAG store: chunk, embed in batches, and bulk
+load with COPY.
+
+The pipeline has three stages connected by bounded queues, so reading,
+embedding and writing overlap while only a few batches are ever held in
+memory:
+
+    read + chunk  ->  embed (batches, a few in flight)  ->  COPY
+
+Re-indexing is incremental. A chunk is identified by its source and a
+hash of its text and the embedding model, and the manifest
+(aurora_context.sources) records each source's mtime, size, chunk hashes
+and embedding model as of its last ingest:
+
+- a file whose mtime, size and model are unchanged is not even read;
+- a changed file is re-chunked, and only chunks with new hashes are
+  embedded and written; chunks that left it are deleted;
+- a file that disappeared from an ingested directory is tombstoned -
+  its chunks drop out of search, and come back without re-embedding if
+  the file does;
+- switching embedding model changes every hash, so everything is
+  re-embedded and the old model's vectors are deleted.
+
+So keeping the store fresh costs time in proportion to what changed.
+"""
+
+import asyncio
+import hashlib
+import json
+import re
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import structlog
+
+
+logger = structlog.get_logger()
+
+
+# Embedder: texts -> one vector per text
+Embedder = Callable[[List[str]], Awaitable[List[List[float]]]]
+
+INGEST_PATTERNS = ("*.md", "*.markdown", "*.txt")
+
+_HEADING = re.compile(r"^(#{1,6})\s+(.*?)\s*#*\s*$")
+_SENTENCE_BREAK = re.compile(r"(?<=[.!?])\s+")
+
+
+# ============================================
+# CHUNKING
+# ============================================
+
+@dataclass(frozen=True, slots=True)
+class Chunk:
+    """One embeddable piece of a source document."""
+    source: str
+    index: int
+    title: str
+    text: str
+    content_hash: str
+
+
+def content_hash(text: str, embedding_model: str = "") -> str:
+    """Chunk identity: its text, and the model its embedding came from."""
+    digest = hashlib.blake2b(digest_size=16)
+    if embedding_model:
+        digest.update(embedding_model.encode("utf-8") + b"\0")
+    digest.update(text.encode("utf-8"))
+    return digest.hexdigest()
+
+
+def split_markdown(text: str, max_chars: int = 1500) -> List[Tuple[str, str]]:
+    """
+    (heading, text) pieces of at most `max_chars`: sections split at
+    markdown headings, packed by paragraph, long paragraphs by sentence.
+    """
+    pieces: List[Tuple[str, str]] = []
+    heading = ""
+    paragraphs: List[str] = []
+
+    def flush_section():
+        current = ""
+        for paragraph in paragraphs:
+            for part in _fit(paragraph, max_chars):
+                if current and len(current) + 2 + len(part) > max_chars:
+                    pieces.append((heading, current))
+                    current = ""
+                current = f"{current}\n\n{part}" if current else part
+        if current:
+            pieces.append((heading, current))
+        paragraphs.clear()
+
+    block: List[str] = []
+    in_fence = False
+    for line in text.splitlines():
+        if line.lstrip().startswith(("```", "~~~")):
+            in_fence = not in_fence
+        match = None if in_fence else _HEADING.match(line)
+        if match:
+            if block:
+                paragraphs.append("\n".join(block).strip())
+                block = []
+            flush_section()
+            heading = match.group(2)
+        elif not line.strip() and not in_fence:
+            if block:
+                paragraphs.append("\n".join(block).strip())
+                block = []
+        else:
+            block.append(line)
+    if block:
+        paragraphs.append("\n".join(block).strip())
+    flush_section()
+    return [(title, body) for title, body in pieces if body.strip()]
+
+
+def _fit(paragraph: str, max_chars: int) -> Iterator[str]:
+    """A paragraph as parts of at most `max_chars`, split between sentences where possible."""
+    if len(paragraph) <= max_chars:
+        yield paragraph
+        return
+    current = ""
+    for sentence in _SENTENCE_BREAK.split(paragraph):
+        while len(sentence) > max_chars:
+            if current:
+                yield current
+                current = ""
+            cut = sentence.rfind(" ", 0, max_chars)
+            cut = cut if cut > max_chars // 2 else max_chars
+            yield sentence[:cut].rstrip()
+            sentence = sentence[cut:].lstrip()
+        if current and len(current) + 1 + len(sentence) > max_chars:
+            yield current
+            current = ""
+        current = f"{current} {sentence}" if current else sentence
+    if current:
+        yield current
+
+
+def chunk_document(source: str, text: str, max_chars: int = 1500, embedding_model: str = "") -> List[Chunk]:
+    """Chunks of one document; the first heading doubles as the title of untitled leading text."""
+    pieces = split_markdown(text, max_chars)
+    default_title = next((title for title, _ in pieces if title), Path(source).stem)
+    return [
+        Chunk(source, index, title or default_title, body, content_hash(body, embedding_model))
+        for index, (title, body) in enumerate(pieces)
+    ]
+
+
+def iter_sources(
+    paths: Iterable[Path],
+    patterns: Sequence[str] = INGEST_PATTERNS
+) -> Iterator[Tuple[Path, str, Optional[str]]]:
+    """
+    (file, source name, root) for every matching file under `paths`, in a
+    stable order. Files under a directory are named "<dir>/<relative path>"
+    and carry the directory's resolved path as their root; files given
+    directly have no root.
+    """
+    for path in paths:
+        path = Path(path)
+        if path.is_file():
+            yield path, path.name, None
+            continue
+        root = path.resolve()
+        # Broken symlinks are kept so they are reported as unreadable, not silently missed
+        files = sorted({
+            f for pattern in patterns for f in path.rglob(pattern)
+            if f.is_file() or f.is_symlink()
+        })
+        for f in files:
+            yield f, f"{root.name}/{f.relative_to(path).as_posix()}", str(root)
+
+
+# ============================================
+# PIPELINE
+# ============================================
+
+@dataclass(slots=True)
+class IngestStats:
+    """What one ingest run did."""
+    files: int = 0
+    unchanged_files: int = 0  # Same mtime and size as the manifest; not read
+    chunks: int = 0
+    skipped: int = 0  # Already stored with the same content
+    embedded: int = 0
+    written: int = 0
+    removed: int = 0  # Chunks no longer in their source
+    tombstoned: int = 0  # Sources that no longer exist
+    failed_files: int = 0
+    seconds: float = 0.0
+
+    def to_dict(self) -> dict:
+        return {
+            "files": self.files,
+            "unchanged_files": self.unchanged_files,
+            "chunks": self.chunks,
+            "skipped": self.skipped,
+            "embedded": self.embedded,
+            "written": self.written,
+            "removed": self.removed,
+            "tombstoned": self.tombstoned,
+            "failed_files": self.failed_files,
+            "seconds": round(self.seconds, 2),
+        }
+
+
+_DONE = object()
+
+
+def _vector_text(vector: Sequence[float]) -> str:
+    """pgvector's text form."""
+    return "[" + ",".join(f"{float(v):.7g}" for v in vector) + "]"
+
+
+def _read(path: Path) -> Tuple[int, int, str]:
+    stat = path.stat()
+    return stat.st_mtime_ns, stat.st_size, path.read_text(encoding="utf-8")
+
+
+class _Manifest:
+    """
+    Manifest updates waiting on their chunks. A source's new manifest row
+    is written only after every chunk it added has been copied, so an
+    interrupted run never records chunks that are not stored.
+    """
+
+    def __init__(self):
+        self.rows: Dict[str, tuple] = {}
+        self.waiting: Dict[str, int] = {}  # source -> chunks not yet copied
+        self.deletes: List[Tuple[str, List[str]]] = []
+
+    def add(self, row: tuple, added: int, removed: List[str]):
+        source = row[0]
+        self.rows[source] = row
+        self.waiting[source] = added
+        if removed:
+            self.deletes.append((source, removed))
+
+    def copied(self, sources: Iterable[str]):
+        for source in sources:
+            self.waiting[source] -= 1
+
+    def take_ready(self) -> Tuple[List[Tuple[str, List[str]]], List[tuple]]:
+        ready = [source for source, left in self.waiting.items() if left == 0]
+        rows = [self.rows.pop(source) for source in ready]
+        for source in ready:
+            del self.waiting[source]
+        ready_set = set(ready)
+        deletes = [d for d in self.deletes if d[0] in ready_set]
+        self.deletes = [d for d in self.deletes if d[0] not in ready_set]
+        return deletes, rows
+
+
+async def ingest(
+    paths: Iterable[Path],
+    repo: Any,
+    embed: Embedder,
+    doc_type: str = "context_library",
+    is_private: bool = True,
+    tags: Sequence[str] = (),
+    max_chars: int = 1500,
+    batch_size: int = 32,
+    embed_concurrency: int = 2,
+    copy_rows: int = 512,
+    queue_batches: int = 4,
+    force: bool = False,
+    prune: bool = True,
+    embedding_model: str = ""
+) -> IngestStats:
+    """
+    Bring `repo` (a ContextRepository) up to date with every file under
+    `paths`, embedded by `embed`. `embedding_model` names the model and
+    its dimension (EmbeddingService.model_key); chunks embedded under
+    another name are treated as new.
+
+    Files whose mtime, size and model match the manifest are not read
+    (`force` reads them anyway). For the rest, only chunks whose hash is new are
+    embedded and written, and chunks that left the file are deleted. With
+    `prune`, sources under the given directories that no longer exist are
+    tombstoned: their chunks drop out of search until the file returns or
+    purge_tombstones() removes them.
+
+    `embed_concurrency` batches are embedded at once; at most
+    `queue_batches` wait between each pair of stages, and the writer
+    COPYs once it holds `copy_rows` rows.
+    """
+    paths = [Path(path) for path in paths]
+    stats = IngestStats()
+    started = time.perf_counter()
+    to_embed: asyncio.Queue = asyncio.Queue(maxsize=queue_batches)
+    to_write: asyncio.Queue = asyncio.Queue(maxsize=queue_batches)
+    tags_json = json.dumps(list(tags))
+    manifest = {row["source"]: row for row in await repo.load_manifest()}
+    pending = _Manifest()
+    seen = set()
+
+    async def read():
+        batch: List[Chunk] = []
+        for path, source, root in iter_sources(paths):
+            seen.add(source)
+            entry = manifest.get(source)
+            try:
+                if (entry is not None and not force and entry["deleted_at"] is None
+                        and entry["embedding_model"] == embedding_model):
+                    stat = await asyncio.to_thread(path.stat)
+                    if (stat.st_mtime_ns, stat.st_size) == (entry["mtime_ns"], entry["size"]):
+                        stats.unchanged_files += 1
+                        continue
+                mtime_ns, size, text = await asyncio.to_thread(_read, path)
+            except (OSError, UnicodeDecodeError) as e:
+                stats.failed_files += 1
+                logger.warning("ingest.read_failed", source=source, error=str(e))
+                continue
+            if entry is not None:
+                stored = set(entry["chunk_hashes"])
+            else:
+                # Not in the manifest; it may have been stored before the manifest existed
+                stored = set(await repo.chunk_hashes(source))
+            stats.files += 1
+
+            hashes: List[str] = []
+            added: List[Chunk] = []
+            for chunk in chunk_document(source, text, max_chars, embedding_model):
+                stats.chunks += 1
+                if chunk.content_hash in hashes:
+                    continue  # Repeated text within a file is stored once
+                hashes.append(chunk.content_hash)
+                if chunk.content_hash in stored:
+                    stats.skipped += 1
+                else:
+                    added.append(chunk)
+            removed = sorted(stored.difference(hashes))
+            stats.removed += len(removed)
+            pending.add((source, root, mtime_ns, size, hashes, embedding_model), len(added), removed)
+
+            for chunk in added:
+                batch.append(chunk)
+                if len(batch) >= batch_size:
+                    await to_embed.put(batch)
+                    batch = []
+        if batch:
+            await to_embed.put(batch)
+        for _ in range(embed_concurrency):
+            await to_embed.put(_DONE)
+
+    async def embed_batches():
+        while True:
+            batch = await to_embed.get()
+            if batch is _DONE:
+                await to_write.put(_DONE)
+                return
+            vectors = await embed([chunk.text for chunk in batch])
+            stats.embedded += len(batch)
+            await to_write.put([
+                (c.source, c.index, c.title, c.text, c.content_hash, doc_type,
+                 _vector_text(vector), is_private, tags_json)
+                for c, vector in zip(batch, vectors)
+            ])
+
+    async def record_ready():
+        deletes, rows = pending.take_ready()
+        if deletes:
+            await repo.delete_chunks(deletes)
+        if rows:
+            await repo.upsert_sources(rows)
+
+    async def write():
+        rows: List[tuple] = []
+        finished = 0
+        while finished < embed_concurrency:
+            item = await to_write.get()
+            if item is _DONE:
+                finished += 1
+            else:
+                rows.extend(item)
+            if rows and (len(rows) >= copy_rows or finished == embed_concurrency):
+                await repo.copy_chunks(rows)
+                stats.written += len(rows)
+                logger.debug("ingest.copied", rows=len(rows), total=stats.written)
+                pending.copied(row[0] for row in rows)
+                rows = []
+                await record_ready()
+
+    tasks = [asyncio.create_task(read()), asyncio.create_task(write())]
+    tasks += [asyncio.create_task(embed_batches()) for _ in range(embed_concurrency)]
+    try:
+        await asyncio.gather(*tasks)
+        await record_ready()  # Sources that only lost chunks, or had nothing new
+
+        if prune:
+            roots = {str(path.resolve()) for path in paths if path.is_dir()}
+            gone = sorted(
+                source for source, row in manifest.items()
+                if row["root"] in roots and source not in seen and row["deleted_at"] is None
+            )
+            if gone:
+                await repo.tombstone_sources(gone)
+                stats.tombstoned = len(gone)
+                logger.info("ingest.tombstoned", sources=gone)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+    finally:
+        stats.seconds = time.perf_counter() - started
+
+    logger.info("ingest.finished", **stats.to_dict())
+    return stats
@@ -16,9 +16,9 @@ from ..core.config import settings
 logger = structlog.get_logger()
 
 
-@dataclass
+@dataclass(slots=True)
 class Pattern:
-    """A learned pattern."""
+    """A learned pattern. Mutable: use tracking updates last_used/use_count."""
     id: str
     domain: str  # decision, time, project, communication, principle
     pattern_type: str  # e.g., "decision_factor", "work_pattern", "communication_style"
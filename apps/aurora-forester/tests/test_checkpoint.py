@@ -0,0 +1,83 @@
+"""Tests for turn checkpointing and recovery from failed turns."""
+
+import pytest
+
+from src.core.aurora_graph import Aurora, create_checkpoint_store
+
+
+class FakeCheckpointRepo:
+    """In-memory CheckpointRepository that can be told to fail the next save."""
+
+    def __init__(self):
+        self.rows = {}  # (session_id, version) -> row
+        self.fail_next = False
+
+    async def save(self, session_id, version, kind, turn, payload):
+        if self.fail_next:
+            self.fail_next = False
+            raise ConnectionError("lost the database")
+        self.rows[(session_id, version)] = {"version": version, "kind": kind, "payload": payload}
+
+    async def prune_before(self, session_id, version):
+        for key in [k for k in self.rows if k[0] == session_id and k[1] < version]:
+            del self.rows[key]
+
+    async def load_latest(self, session_id):
+        rows = sorted((r for (s, _), r in self.rows.items() if s == session_id), key=lambda r: r["version"])
+        snapshots = [i for i, r in enumerate(rows) if r["kind"] == "snapshot"]
+        return rows[snapshots[-1]:] if snapshots else []
+
+    async def delete_session(self, session_id):
+        for key in [k for k in self.rows if k[0] == session_id]:
+            del self.rows[key]
+
+
+class FakeLLM:
+    def __init__(self):
+        self.fail_next = False
+
+    async def chat(self, messages):
+        if self.fail_next:
+            self.fail_next = False
+            raise RuntimeError("ollama is down")
+        return f"reply to {messages[-1]['content']}"
+
+
+def _contents(state):
+    return [m.content for m in state["messages"]]
+
+
+async def test_failed_save_is_followed_by_a_snapshot():
+    repo = FakeCheckpointRepo()
+    aurora = Aurora(llm=FakeLLM(), checkpointer=create_checkpoint_store(lambda: repo))
+
+    await aurora.process_message("one", "cli", "s")
+    repo.fail_next = True
+    await aurora.process_message("two", "cli", "s")
+    await aurora.process_message("three", "cli", "s")
+
+    assert [(r["version"], r["kind"]) for r in await repo.load_latest("s")] == [(3, "snapshot")]
+
+    restarted = Aurora(llm=FakeLLM(), checkpointer=create_checkpoint_store(lambda: repo))
+    state = await restarted.checkpointer.load("s", "cli")
+    assert _contents(state) == _contents(aurora.get_session("s"))
+    assert "two" in _contents(state)
+
+
+async def test_failed_turn_leaves_session_as_before():
+    llm = FakeLLM()
+    aurora = Aurora(llm=llm)
+    await aurora.process_message("one", "cli", "s")
+    before = _contents(aurora.get_session("s"))
+    turn = aurora.get_session("s")["turn"]
+
+    llm.fail_next = True
+    with pytest.raises(RuntimeError, match="ollama is down"):
+        await aurora.process_message("two", "cli", "s")
+
+    state = aurora.get_session("s")
+    assert _contents(state) == before
+    assert state["turn"] == turn
+
+    await aurora.process_message("three", "cli", "s")
+    assert _contents(aurora.get_session("s"))[-2:] == ["three", "reply to three"]
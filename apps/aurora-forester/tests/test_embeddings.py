@@ -0,0 +1,57 @@
+"""Tests for the embedding service: vector width checks and batching."""
+
+import pytest
+
+from src.integrations.huggingface import AuroraHuggingFace, EmbeddingService
+
+
+class FakeHF:
+    def __init__(self, width):
+        self.width = width
+        self.local_backend = None
+
+    def get_recommended_model(self, use_case, variant="default"):
+        return "fake/model"
+
+    async def generate_embeddings(self, texts, model=None):
+        return [[0.1] * self.width for _ in texts]
+
+
+async def test_batches_keep_order_and_width():
+    service = EmbeddingService(FakeHF(384), dimension=384)
+    vectors = await service.embed_batch(["a", "b", "c"], batch_size=2)
+    assert len(vectors) == 3
+    assert {len(v) for v in vectors} == {384}
+
+
+async def test_wrong_width_is_refused():
+    service = EmbeddingService(FakeHF(384), dimension=1536)
+    with pytest.raises(ValueError, match="384-d vectors, expected 1536"):
+        await service.embed_query("hello")
+
+
+def test_model_key_and_placeholder():
+    service = EmbeddingService(FakeHF(384), dimension=384)
+    assert service.model_key == "fake/model:384"
+    assert service.placeholder
+
+
+async def test_backend_gets_each_batch_in_one_call():
+    class Backend:
+        def __init__(self):
+            self.calls = []
+
+        async def embed_many(self, texts):
+            self.calls.append(list(texts))
+            return [[0.1] * 4 for _ in texts]
+
+    class WithBackend(AuroraHuggingFace):
+        local_backend = None
+
+    backend = Backend()
+    hf = WithBackend(token="unused")
+    hf.local_backend = backend
+    service = EmbeddingService(hf, dimension=4)
+
+    assert len(await service.embed_batch(list("abcde"), batch_size=2)) == 5
+    assert backend.calls == [["a", "b"], ["c", "d"], ["e"]]
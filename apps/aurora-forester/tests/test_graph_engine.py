@@ -0,0 +1,151 @@
+"""Tests for the state-graph runner: reducers, step conflicts and failure handling."""
+
+import asyncio
+from typing import Annotated, List, TypedDict
+
+import pytest
+
+from src.core.graph_engine import (
+    END, GraphError, NodeTimeoutError, StateGraph, append, apply_updates, get_reducers, replace,
+)
+
+
+class State(TypedDict):
+    log: Annotated[List[str], append]
+    response: str
+
+
+def test_append_extends_in_place():
+    current = ["a"]
+    assert append(current, ["b", "c"]) is current
+    assert current == ["a", "b", "c"]
+    assert append(None, ["x"]) == ["x"]
+    assert append(None, None) == []
+
+
+def test_replace_and_declared_reducers():
+    assert replace("old", "new") == "new"
+    reducers = get_reducers(State)
+    assert reducers == {"log": append}
+    assert get_reducers(None) == {}
+
+
+def test_apply_updates_uses_per_key_reducers():
+    state = {"log": ["start"], "response": "old"}
+    apply_updates(state, {"log": ["more"], "response": "new"}, get_reducers(State))
+    assert state == {"log": ["start", "more"], "response": "new"}
+
+
+def _node(updates, delay=0.0):
+    async def run(state):
+        if delay:
+            await asyncio.sleep(delay)
+        return updates
+    return run
+
+
+async def test_fan_out_merges_reduced_keys():
+    graph = StateGraph(State)
+    graph.add_node("start", _node({"log": ["start"]}))
+    graph.add_node("left", _node({"log": ["left"]}, delay=0.01))
+    graph.add_node("right", _node({"log": ["right"]}))
+    graph.add_node("join", _node({"response": "done"}))
+    graph.set_entry_point("start")
+    graph.add_edge("start", "left").add_edge("start", "right")
+    graph.add_edge("left", "join").add_edge("right", "join")
+    graph.add_edge("join", END)
+
+    run = await graph.compile().arun({"log": []})
+
+    # Merge order follows the frontier, not completion order
+    assert run.state["log"] == ["start", "left", "right"]
+    assert run.state["response"] == "done"
+    assert run.steps == 3
+    assert [t.node for t in run.timings if t.step == 3] == ["join"]
+
+
+async def test_parallel_replace_of_same_key_conflicts():
+    graph = StateGraph(State)
+    graph.add_node("start", _node(None))
+    graph.add_node("a", _node({"response": "a"}))
+    graph.add_node("b", _node({"response": "b"}))
+    graph.set_entry_point("start")
+    graph.add_edge("start", "a").add_edge("start", "b")
+
+    with pytest.raises(GraphError, match="both replaced 'response'"):
+        await graph.compile().arun({"log": []})
+
+
+async def test_input_updates_merge_before_entry():
+    seen = {}
+
+    async def entry(state):
+        seen["log"] = list(state["log"])
+        return None
+
+    graph = StateGraph(State)
+    graph.add_node("entry", entry)
+    graph.set_entry_point("entry")
+
+    run = await graph.compile().arun({"log": ["old"]}, {"log": ["new"]})
+    assert seen["log"] == ["old", "new"]
+    assert run.deltas == [("__input__", {"log": ["new"]})]
+
+
+async def test_failed_node_cancels_siblings():
+    cancelled = asyncio.Event()
+
+    async def slow(state):
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    async def broken(state):
+        raise ValueError("boom")
+
+    graph = StateGraph(State)
+    graph.add_node("start", _node(None))
+    graph.add_node("slow", slow)
+    graph.add_node("broken", broken)
+    graph.set_entry_point("start")
+    graph.add_edge("start", "slow").add_edge("start", "broken")
+
+    with pytest.raises(ValueError, match="boom"):
+        await asyncio.wait_for(graph.compile().arun({"log": []}), timeout=2)
+    assert cancelled.is_set()
+
+
+async def test_optional_node_failure_is_skipped():
+    async def broken(state):
+        raise ValueError("boom")
+
+    graph = StateGraph(State)
+    graph.add_node("start", _node(None))
+    graph.add_node("broken", broken, optional=True)
+    graph.add_node("ok", _node({"response": "ok"}))
+    graph.set_entry_point("start")
+    graph.add_edge("start", "broken").add_edge("start", "ok")
+
+    run = await graph.compile().arun({"log": []})
+    assert run.state["response"] == "ok"
+    assert {t.node: t.status for t in run.timings}["broken"] == "error"
+
+
+async def test_required_node_timeout():
+    graph = StateGraph(State)
+    graph.add_node("slow", _node(None, delay=1), timeout=0.01)
+    graph.set_entry_point("slow")
+
+    with pytest.raises(NodeTimeoutError):
+        await graph.compile().arun({"log": []})
+
+
+def test_compile_rejects_unknown_targets():
+    graph = StateGraph(State)
+    graph.add_node("start", _node(None))
+    graph.set_entry_point("start")
+    graph.add_edge("start", "missing")
+    with pytest.raises(GraphError, match="unknown node"):
+        graph.compile()
@@ -0,0 +1,104 @@
+"""Tests for the interaction history window and its spill log."""
+
+from dataclasses import dataclass
+
+from src.core.history import InteractionHistory
+
+
+@dataclass
+class Record:
+    n: int
+
+
+def _history(path, capacity=3, segment_size=4):
+    return InteractionHistory(capacity, path, Record, segment_size=segment_size)
+
+
+def test_window_spills_oldest_and_pages_back(tmp_path):
+    history = _history(tmp_path)
+    for n in range(10):
+        history.append(Record(n))
+
+    assert [r.n for r in history] == [7, 8, 9]
+    assert len(history) == 10
+    assert [r.n for r in history.page(0, 10)] == list(range(10))
+    assert [r.n for r in history.page_back(0, page_size=4)] == [6, 7, 8, 9]
+    assert [r.n for r in history.page_back(2, page_size=4)] == [0, 1]
+    history.close()
+
+
+def test_restart_reloads_tail_without_duplicating(tmp_path):
+    history = _history(tmp_path)
+    for n in range(5):
+        history.append(Record(n))
+    history.close()
+
+    reopened = _history(tmp_path)
+    assert [r.n for r in reopened] == [2, 3, 4]
+    assert reopened.session_count == 0
+    assert len(reopened) == 5
+
+    for n in range(5, 8):
+        reopened.append(Record(n))
+    assert [r.n for r in reopened] == [5, 6, 7]
+    assert [r.n for r in reopened.page(0, 20)] == list(range(8))
+    reopened.close()
+
+    # Reloaded entries were not written a second time
+    again = _history(tmp_path)
+    assert len(again) == 8
+    assert [r.n for r in again.page(0, 20)] == list(range(8))
+    again.close()
+
+
+def test_reloaded_window_pages_across_disk_and_memory(tmp_path):
+    history = _history(tmp_path, capacity=4)
+    for n in range(6):
+        history.append(Record(n))
+    history.close()
+
+    reopened = _history(tmp_path, capacity=4)
+    reopened.append(Record(6))
+    assert [r.n for r in reopened] == [3, 4, 5, 6]
+    assert [r.n for r in reopened.page(1, 4)] == [1, 2, 3, 4]
+    reopened.close()
+
+
+def test_torn_last_line_is_truncated_on_start(tmp_path):
+    history = _history(tmp_path)
+    for n in range(5):
+        history.append(Record(n))
+    history.close()
+
+    segment = tmp_path / "interactions-000001.jsonl"
+    with open(segment, "a", encoding="utf-8") as f:
+        f.write('{"n":')  # A write cut short by a crash
+
+    reopened = _history(tmp_path)
+    assert len(reopened) == 5
+    assert [r.n for r in reopened] == [2, 3, 4]
+    reopened.append(Record(5))
+    reopened.close()
+
+    again = _history(tmp_path)
+    assert [r.n for r in again.page(0, 20)] == list(range(6))
+    again.close()
+
+
+def test_undecodable_line_is_skipped(tmp_path):
+    (tmp_path / "interactions-000000.jsonl").write_text('{"n":0}\nnot json\n{"n":2}\n{"n":3}\n')
+    history = _history(tmp_path, capacity=2)
+    assert len(history) == 4
+    assert [r.n for r in history.page(0, 4)] == [0, 2, 3]
+    history.close()
+
+
+async def test_async_paging_reads_after_queued_spills(tmp_path):
+    history = _history(tmp_path)
+    for n in range(10):
+        history.append(Record(n))
+
+    assert [r.n for r in await history.apage_back(0, page_size=4)] == [6, 7, 8, 9]
+    assert [r.n for r in await history.apage_back(2, page_size=4)] == [0, 1]
+    assert await history.apage_back(5, page_size=4) == []
+    history.close()
@@ -0,0 +1,136 @@
+"""Tests for the inference worker's request micro-batching and batch embedding."""
+
+import asyncio
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+import pytest
+
+from src.integrations.inference import InferenceClient, LocalInferenceWorker, MicroBatcher
+
+
+@pytest.fixture
+def executor():
+    pool = ThreadPoolExecutor(max_workers=1)
+    yield pool
+    pool.shutdown(wait=True)
+
+
+class Recorder:
+    """Batch function that records each call and upper-cases its items."""
+
+    def __init__(self, gate=None):
+        self.calls = []
+        self.gate = gate
+
+    def __call__(self, key, items):
+        if self.gate is not None:
+            self.gate.wait(timeout=5)
+        self.calls.append((key, list(items)))
+        return [f"{key}:{item.upper()}" for item in items]
+
+
+async def test_concurrent_requests_share_one_batch(executor):
+    run = Recorder()
+    batcher = MicroBatcher(run, executor, max_batch=16, window_ms=20)
+
+    results = await asyncio.gather(*(batcher.submit("embed", text) for text in "abc"))
+
+    assert results == ["embed:A", "embed:B", "embed:C"]
+    assert run.calls == [("embed", ["a", "b", "c"])]
+    assert batcher.stats == {"batches": 1, "items": 3, "largest": 3}
+
+
+async def test_full_batch_dispatches_without_waiting_for_the_window(executor):
+    run = Recorder()
+    batcher = MicroBatcher(run, executor, max_batch=2, window_ms=10_000)
+
+    results = await asyncio.wait_for(
+        asyncio.gather(*(batcher.submit("k", text) for text in "ab")), timeout=2
+    )
+    assert results == ["k:A", "k:B"]
+
+
+async def test_oversized_burst_is_split_at_max_batch(executor):
+    run = Recorder()
+    batcher = MicroBatcher(run, executor, max_batch=2, window_ms=5)
+
+    results = await asyncio.gather(*(batcher.submit("k", text) for text in "abcde"))
+
+    assert results == ["k:A", "k:B", "k:C", "k:D", "k:E"]
+    assert [items for _, items in run.calls] == [["a", "b"], ["c", "d"], ["e"]]
+    assert batcher.stats["largest"] == 2
+
+
+async def test_keys_are_batched_separately(executor):
+    run = Recorder()
+    batcher = MicroBatcher(run, executor, max_batch=16, window_ms=5)
+
+    results = await asyncio.gather(
+        batcher.submit("x", "a"), batcher.submit("y", "b"), batcher.submit("x", "c")
+    )
+
+    assert results == ["x:A", "y:B", "x:C"]
+    assert sorted(run.calls) == [("x", ["a", "c"]), ("y", ["b"])]
+
+
+async def test_requests_accumulate_while_a_batch_runs(executor):
+    gate = threading.Event()
+    run = Recorder(gate)
+    batcher = MicroBatcher(run, executor, max_batch=16, window_ms=1)
+
+    first = asyncio.ensure_future(batcher.submit("k", "a"))
+    while not batcher._running:
+        await asyncio.sleep(0.001)
+    later = [asyncio.ensure_future(batcher.submit("k", text)) for text in "bcd"]
+    await asyncio.sleep(0.02)  # Well past the window; the first batch still holds the thread
+    gate.set()
+
+    assert await first == "k:A"
+    assert await asyncio.gather(*later) == ["k:B", "k:C", "k:D"]
+    assert [items for _, items in run.calls] == [["a"], ["b", "c", "d"]]
+
+
+async def test_failed_batch_fails_its_requests_and_keeps_serving(executor):
+    def run(key, items):
+        if "bad" in items:
+            raise RuntimeError("model exploded")
+        return items
+
+    batcher = MicroBatcher(run, executor, max_batch=16, window_ms=5)
+
+    results = await asyncio.gather(
+        batcher.submit("k", "ok"), batcher.submit("k", "bad"), return_exceptions=True
+    )
+    assert all(isinstance(r, RuntimeError) for r in results)
+
+    assert await batcher.submit("k", "fine") == "fine"
+    assert batcher.stats["batches"] == 1
+
+
+async def test_worker_embeds_a_list_in_shared_batches():
+    worker = LocalInferenceWorker(models={}, max_batch=2, window_ms=5)
+    run = Recorder()
+    worker._batchers["embed"].run_batch = run
+
+    assert await worker.embed_many(["a", "b", "c"]) == ["None:A", "None:B", "None:C"]
+    assert [items for _, items in run.calls] == [["a", "b"], ["c"]]
+    await worker.close()
+
+
+async def test_client_sends_a_list_in_one_request():
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        texts = json.loads(request.content)["texts"]
+        return httpx.Response(200, json={"embeddings": [[float(len(t))] for t in texts]})
+
+    client = InferenceClient("http://inference")
+    client._client = httpx.AsyncClient(base_url="http://inference", transport=httpx.MockTransport(handler))
+
+    assert await client.embed_many(["a", "bb"]) == [[1.0], [2.0]]
+    assert [r.url.path for r in requests] == ["/embed_batch"]
+    await client.close()
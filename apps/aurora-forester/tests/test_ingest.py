@@ -0,0 +1,208 @@
+"""Tests for incremental context ingestion and its manifest."""
+
+import os
+
+import pytest
+
+from src.learning.ingest import content_hash, ingest
+
+
+class FakeContextRepo:
+    """In-memory stand-in for ContextRepository's chunk and manifest methods."""
+
+    def __init__(self):
+        self.chunks = {}  # (source, content_hash) -> {"content", "embedding", "deleted"}
+        self.sources = {}  # source -> manifest row
+
+    async def load_manifest(self):
+        return [dict(row) for row in self.sources.values()]
+
+    async def chunk_hashes(self, source):
+        return [h for (s, h) in self.chunks if s == source]
+
+    async def copy_chunks(self, rows):
+        for source, _, _, content, digest, _, embedding, _, _ in rows:
+            chunk = self.chunks.setdefault((source, digest), {"embedding": embedding})
+            chunk.update(content=content, deleted=False)
+
+    async def delete_chunks(self, rows):
+        for source, digests in rows:
+            for digest in digests:
+                self.chunks.pop((source, digest), None)
+
+    async def upsert_sources(self, rows):
+        for source, root, mtime_ns, size, hashes, model in rows:
+            self.sources[source] = {
+                "source": source, "root": root, "mtime_ns": mtime_ns, "size": size,
+                "chunk_hashes": list(hashes), "embedding_model": model, "deleted_at": None,
+            }
+            for (s, _), chunk in self.chunks.items():
+                if s == source:
+                    chunk["deleted"] = False
+
+    async def tombstone_sources(self, sources):
+        for source in sources:
+            self.sources[source]["deleted_at"] = "now"
+            for (s, _), chunk in self.chunks.items():
+                if s == source:
+                    chunk["deleted"] = True
+
+    def live(self):
+        return sorted(c["content"] for c in self.chunks.values() if not c["deleted"])
+
+
+class CountingEmbedder:
+    def __init__(self):
+        self.texts = []
+
+    async def __call__(self, texts):
+        self.texts.extend(texts)
+        return [[0.5, 0.5] for _ in texts]
+
+
+def test_hash_depends_on_model():
+    assert content_hash("text") == content_hash("text", "")
+    assert content_hash("text", "a:384") != content_hash("text", "b:384")
+    assert content_hash("text", "a:384") != content_hash("text", "a:768")
+
+
+async def test_model_change_re_embeds_unchanged_files(tmp_path):
+    docs = tmp_path / "docs"
+    docs.mkdir()
+    (docs / "a.md").write_text("# A\n\nalpha\n")
+    repo = FakeContextRepo()
+
+    await ingest([docs], repo, CountingEmbedder(), embedding_model="old:384")
+    old_hashes = set(repo.chunks)
+
+    embed = CountingEmbedder()
+    stats = await ingest([docs], repo, embed, embedding_model="new:768")
+
+    assert stats.unchanged_files == 0
+    assert embed.texts == ["alpha"]
+    assert stats.removed == 1
+    assert not old_hashes & set(repo.chunks)
+    assert repo.sources["docs/a.md"]["embedding_model"] == "new:768"
+
+
+def _write(path, text, mtime_ns):
+    path.write_text(text)
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+async def test_unchanged_files_are_not_read_again(tmp_path):
+    docs = tmp_path / "docs"
+    docs.mkdir()
+    _write(docs / "a.md", "# A\n\nalpha\n\n# B\n\nbeta\n", 1_000)
+    repo = FakeContextRepo()
+
+    first = await ingest([docs], repo, CountingEmbedder())
+    assert (first.files, first.embedded, first.written) == (1, 2, 2)
+    assert repo.live() == ["alpha", "beta"]
+
+    embed = CountingEmbedder()
+    second = await ingest([docs], repo, embed)
+    assert (second.files, second.unchanged_files, second.embedded) == (0, 1, 0)
+    assert embed.texts == []
+
+
+async def test_edit_embeds_only_new_chunks_and_deletes_old_ones(tmp_path):
+    docs = tmp_path / "docs"
+    docs.mkdir()
+    _write(docs / "a.md", "# A\n\nalpha\n\n# B\n\nbeta\n", 1_000)
+    repo = FakeContextRepo()
+    await ingest([docs], repo, CountingEmbedder())
+
+    _write(docs / "a.md", "# A\n\nalpha\n\n# B\n\ngamma\n", 2_000)
+    embed = CountingEmbedder()
+    stats = await ingest([docs], repo, embed)
+
+    assert embed.texts == ["gamma"]
+    assert (stats.skipped, stats.embedded, stats.removed) == (1, 1, 1)
+    assert repo.live() == ["alpha", "gamma"]
+    assert repo.sources["docs/a.md"]["mtime_ns"] == 2_000
+    assert len(repo.sources["docs/a.md"]["chunk_hashes"]) == 2
+
+
+async def test_deleted_file_is_tombstoned_and_revived_without_re_embedding(tmp_path):
+    docs = tmp_path / "docs"
+    docs.mkdir()
+    _write(docs / "a.md", "alpha\n", 1_000)
+    _write(docs / "b.md", "beta\n", 1_000)
+    repo = FakeContextRepo()
+    await ingest([docs], repo, CountingEmbedder())
+
+    (docs / "b.md").unlink()
+    stats = await ingest([docs], repo, CountingEmbedder())
+    assert stats.tombstoned == 1
+    assert repo.sources["docs/b.md"]["deleted_at"] is not None
+    assert repo.live() == ["alpha"]
+
+    # A second run does not tombstone it again
+    assert (await ingest([docs], repo, CountingEmbedder())).tombstoned == 0
+
+    _write(docs / "b.md", "beta\n", 1_000)
+    embed = CountingEmbedder()
+    stats = await ingest([docs], repo, embed)
+    assert embed.texts == []
+    assert stats.skipped == 1
+    assert repo.sources["docs/b.md"]["deleted_at"] is None
+    assert repo.live() == ["alpha", "beta"]
+
+
+async def test_no_prune_keeps_missing_sources(tmp_path):
+    docs = tmp_path / "docs"
+    docs.mkdir()
+    _write(docs / "a.md", "alpha\n", 1_000)
+    repo = FakeContextRepo()
+    await ingest([docs], repo, CountingEmbedder())
+
+    (docs / "a.md").unlink()
+    stats = await ingest([docs], repo, CountingEmbedder(), prune=False)
+    assert stats.tombstoned == 0
+    assert repo.live() == ["alpha"]
+
+
+async def test_force_rereads_but_does_not_re_embed_stored_chunks(tmp_path):
+    docs = tmp_path / "docs"
+    docs.mkdir()
+    _write(docs / "a.md", "alpha\n", 1_000)
+    repo = FakeContextRepo()
+    await ingest([docs], repo, CountingEmbedder())
+
+    embed = CountingEmbedder()
+    stats = await ingest([docs], repo, embed, force=True)
+    assert (stats.files, stats.unchanged_files, stats.skipped) == (1, 0, 1)
+    assert embed.texts == []
+
+
+async def test_chunks_stored_before_the_manifest_are_adopted(tmp_path):
+    docs = tmp_path / "docs"
+    docs.mkdir()
+    _write(docs / "a.md", "alpha\n", 1_000)
+    repo = FakeContextRepo()
+    repo.chunks[("docs/a.md", content_hash("alpha"))] = {
+        "content": "alpha", "embedding": "[1]", "deleted": False,
+    }
+
+    embed = CountingEmbedder()
+    stats = await ingest([docs], repo, embed)
+    assert embed.texts == []
+    assert stats.skipped == 1
+    assert "docs/a.md" in repo.sources
+
+
+async def test_manifest_waits_for_failed_copy(tmp_path):
+    docs = tmp_path / "docs"
+    docs.mkdir()
+    _write(docs / "a.md", "alpha\n", 1_000)
+
+    class FailingCopy(FakeContextRepo):
+        async def copy_chunks(self, rows):
+            raise ConnectionError("lost the database")
+
+    repo = FailingCopy()
+    with pytest.raises(ConnectionError):
+        await ingest([docs], repo, CountingEmbedder())
+    # Nothing recorded, so the next run reads and embeds the file again
+    assert repo.sources == {}
@@ -0,0 +1,42 @@
+"""Tests for the shared intent classifier, and the accuracy set the intent bench scores."""
+
+import pytest
+
+from src.bench.intent import INTENT_CASES, UNSEEN_CASES, classifier_route
+from src.core.intent import IntentClassifier
+
+
+@pytest.fixture(scope="module")
+def classifier():
+    return IntentClassifier()
+
+
+@pytest.mark.parametrize("text,facet,expected", INTENT_CASES + UNSEEN_CASES)
+def test_routes_message(classifier, text, facet, expected):
+    assert classifier_route(classifier, text)[facet] == expected
+
+
+def test_cues_that_stem_alike_count_once():
+    # "feel" and "feeling" are both wellbeing cues and stem to the same token
+    rules = {"intent": {"wellbeing": ("feel", "feeling")}}
+    single = IntentClassifier(rules={"intent": {"wellbeing": ("feel",)}})
+    assert IntentClassifier(rules=rules).classify("feeling low").scores == single.classify("feeling low").scores
+    assert single.classify("feeling low").top("intent") == ("wellbeing", 0.5)
+
+
+def test_duplicate_cue_keeps_heaviest_weight():
+    rules = {"intent": {"task": (("add", 0.5), "adding")}}
+    assert IntentClassifier(rules=rules).classify("adding a note").top("intent") == ("task", 0.5)
+
+
+def test_weak_cue_alone_is_dropped(classifier):
+    assert classifier.classify("add milk").top("intent") == (None, 0.0)
+
+
+def test_results_are_cached_per_text():
+    classifier = IntentClassifier(cache_size=1)
+    classifier.classify("hello")
+    classifier.classify("hello")
+    classifier.classify("other")
+    assert classifier.stats == {"hits": 1, "misses": 2, "model_calls": 0}
+    assert list(classifier._cache) == ["other"]
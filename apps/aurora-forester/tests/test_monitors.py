@@ -0,0 +1,48 @@
+"""Tests for the built-in monitor checks and mapping monitor requests onto them."""
+
+import pytest
+
+from src.agents.monitors import MONITOR_CHECKS, match_check
+
+
+@pytest.mark.parametrize("description, expected", [
+    ("monitor the disk usage", ("disk_usage", {})),
+    ("watch disk space on /data above 85%", ("disk_usage", {"path": "/data", "threshold_percent": 85.0})),
+    ("monitor https://n8n.example.org/healthz and alert me",
+     ("http_health", {"url": "https://n8n.example.org/healthz"})),
+    ("keep an eye on cpu load over 6", ("load_average", {"threshold": 6.0})),
+    ("monitor the vibes of the team", None),
+])
+def test_match_check(description, expected):
+    assert match_check(description) == expected
+
+
+def test_known_service_maps_to_its_health_url():
+    check, params = match_check("alert me if ollama goes down")
+    assert check == "http_health"
+    assert params["url"].endswith("/api/tags")
+
+
+def test_builtin_checks_are_registered():
+    assert {"disk_usage", "http_health", "load_average"} <= set(MONITOR_CHECKS)
+
+
+async def test_disk_usage_alerts_once_until_cleared(tmp_path):
+    condition, action = MONITOR_CHECKS["disk_usage"]({"path": str(tmp_path), "threshold_percent": 0})
+    assert await condition() is True
+    assert str(tmp_path) in await action()
+    assert await condition() is False  # Still full: no repeat alert
+
+    condition, _ = MONITOR_CHECKS["disk_usage"]({"path": str(tmp_path), "threshold_percent": 101})
+    assert await condition() is False
+
+
+async def test_http_health_reports_unreachable_service():
+    condition, action = MONITOR_CHECKS["http_health"]({"url": "http://127.0.0.1:9/health", "timeout_seconds": 1})
+    assert await condition() is True
+    assert "unreachable" in await action()
+
+
+def test_http_health_needs_a_url():
+    with pytest.raises(ValueError):
+        MONITOR_CHECKS["http_health"]({})
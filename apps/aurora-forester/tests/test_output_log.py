@@ -0,0 +1,102 @@
+"""Tests for agent output tails and spilling them to a store."""
+
+import asyncio
+
+from src.agents.output_log import OutputSpiller, OutputTail
+from src.db.local import SqliteAgentOutputRepository
+
+
+def _unavailable():
+    raise RuntimeError("Database not initialized")
+
+
+class FlakyRepo:
+    """Output store whose writes fail until told otherwise."""
+
+    def __init__(self):
+        self.rows = []
+        self.failing = True
+
+    async def append_many(self, rows):
+        if self.failing:
+            raise OSError("connection reset")
+        self.rows.extend(rows)
+
+
+def test_tail_spills_entries_in_sequence():
+    spilled = []
+    tail = OutputTail(capacity=2, spill=lambda seq, entry: spilled.append((seq, entry)))
+    for n in range(5):
+        tail.append(n)
+    assert list(tail) == [3, 4]
+    assert tail.first_seq == 3
+    assert spilled == [(0, 0), (1, 1), (2, 2)]
+
+
+async def test_falls_back_to_local_store(tmp_path):
+    local = SqliteAgentOutputRepository(tmp_path / "agents.db")
+    spiller = OutputSpiller(repo_provider=_unavailable, fallback_provider=lambda: local)
+    for seq in range(5):
+        spiller.add("agent_1", "output", seq, {"n": seq})
+    await spiller.flush()
+
+    assert spiller.store == "local"
+    assert spiller.stats == {"spilled": 5, "written": 5, "dropped": 0}
+    assert await spiller.fetch_older("agent_1", before_seq=3, limit=2) == [{"n": 1}, {"n": 2}]
+    await spiller.close()
+
+
+async def test_failed_write_is_retried_not_dropped():
+    repo = FlakyRepo()
+    spiller = OutputSpiller(repo_provider=lambda: repo, batch_size=2)
+    for seq in range(3):
+        spiller.add("agent_1", "output", seq, seq)
+
+    await spiller.flush()
+    assert spiller.stats["dropped"] == 0
+    assert repo.rows == []
+
+    repo.failing = False
+    await spiller.flush()
+    assert [row[2] for row in repo.rows] == [0, 1, 2]
+    assert spiller.stats["written"] == 3
+
+
+async def test_drops_are_counted_when_no_store_works():
+    def broken_local():
+        raise OSError("read-only filesystem")
+
+    spiller = OutputSpiller(repo_provider=_unavailable, fallback_provider=broken_local)
+    spiller.add("agent_1", "output", 0, "lost")
+    await spiller.flush()
+    spiller.add("agent_1", "output", 1, "lost too")
+
+    assert spiller.stats["dropped"] == 2
+    assert await spiller.fetch_older("agent_1") == []
+
+
+async def test_buffer_stays_bounded_while_store_fails():
+    repo = FlakyRepo()
+    spiller = OutputSpiller(repo_provider=lambda: repo, max_buffer=2)
+    for seq in range(5):
+        spiller.add("agent_1", "output", seq, seq)
+    await spiller.close()
+    assert spiller.stats["dropped"] == 5
+
+
+async def test_failed_write_is_retried_without_new_output():
+    repo = FlakyRepo()
+    spiller = OutputSpiller(repo_provider=lambda: repo, flush_interval=0.01)
+    spiller.add("agent_1", "output", 0, "quiet after this")
+
+    await asyncio.sleep(0.05)  # First flush fails; the agent adds nothing more
+    assert repo.rows == []
+    repo.failing = False
+
+    for _ in range(100):
+        if repo.rows:
+            break
+        await asyncio.sleep(0.01)
+    assert [row[2] for row in repo.rows] == [0]
+    assert spiller.stats["dropped"] == 0
+    await spiller.close()
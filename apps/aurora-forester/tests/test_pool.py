@@ -0,0 +1,45 @@
+"""Tests for the agent worker pool's timeouts and failures."""
+
+import asyncio
+
+import pytest
+
+from src.agents.pool import JobTimeout, WorkerPool
+
+
+async def test_job_past_its_deadline_times_out():
+    pool = WorkerPool()
+
+    future = pool.submit("slow", "research", lambda: asyncio.sleep(10), timeout=0.01)
+
+    with pytest.raises(JobTimeout, match="slow timed out after 0.01s"):
+        await future
+    assert pool.stats["timed_out"] == 1
+
+
+@pytest.mark.parametrize("timeout", [None, 10])
+async def test_timeout_raised_by_the_job_is_a_failure(timeout):
+    pool = WorkerPool()
+
+    async def fetch():
+        raise TimeoutError("read timed out")
+
+    future = pool.submit("fetch", "research", fetch, timeout=timeout)
+
+    with pytest.raises(TimeoutError, match="read timed out") as info:
+        await future
+    assert not isinstance(info.value, JobTimeout)
+    assert pool.stats == {**pool.stats, "failed": 1, "timed_out": 0}
+
+
+async def test_finished_slot_starts_the_next_job():
+    pool = WorkerPool(workers=1)
+
+    async def fail():
+        raise TimeoutError("upstream")
+
+    first = pool.submit("a", "research", fail, timeout=None)
+    second = pool.submit("b", "research", lambda: asyncio.sleep(0, result="done"))
+
+    assert await asyncio.gather(first, second, return_exceptions=True) == [first.exception(), "done"]
+    assert pool.running == 0
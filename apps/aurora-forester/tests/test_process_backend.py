@@ -0,0 +1,71 @@
+"""Tests for stopping agent steps that run in worker processes."""
+
+import asyncio
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from src.agents import process_backend
+from src.agents.process_backend import ProcessBackend, StepCrashed
+from src.agents.steps import STEPS
+
+
+def _sleepy_step(job_id, step, config_data, kwargs, emit=None):
+    """Stands in for _run_step in the workers: sleeps, ignoring signals to hurry."""
+    time.sleep(kwargs.get("seconds", 0))
+    return kwargs.get("seconds", 0)
+
+
+class FakeConfig:
+    def to_dict(self):
+        return {}
+
+
+@pytest.fixture
+def backend(monkeypatch):
+    monkeypatch.setattr(process_backend, "_run_step", _sleepy_step)
+    monkeypatch.setitem(STEPS, "sleep", _sleepy_step)
+    return ProcessBackend(workers=2, shutdown_grace=0.5)
+
+
+def _agent():
+    return SimpleNamespace(id="a", config=FakeConfig(), outputs=[])
+
+
+async def test_cancelled_step_frees_its_worker(backend):
+    await backend.run_step(_agent(), "sleep", seconds=0)  # Start the workers
+    task = asyncio.ensure_future(backend.run_step(_agent(), "sleep", seconds=30))
+    await asyncio.sleep(0.5)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    assert backend.stats["terminated"] == 1
+
+    started = time.monotonic()
+    await backend.shutdown()
+    assert time.monotonic() - started < 5
+
+
+async def test_sibling_of_a_cancelled_step_is_retried_not_crashed(backend):
+    await backend.run_step(_agent(), "sleep", seconds=0)
+    doomed = asyncio.ensure_future(backend.run_step(_agent(), "sleep", seconds=30))
+    sibling = asyncio.ensure_future(backend.run_step(_agent(), "sleep", seconds=1))
+    await asyncio.sleep(0.5)
+    doomed.cancel()
+
+    assert await asyncio.wait_for(sibling, timeout=20) == 1
+    assert backend.stats["crashes"] == 0
+    await backend.shutdown()
+
+
+async def test_shutdown_terminates_steps_after_the_grace_period(backend):
+    await backend.run_step(_agent(), "sleep", seconds=0)
+    task = asyncio.ensure_future(backend.run_step(_agent(), "sleep", seconds=30))
+    await asyncio.sleep(0.5)
+
+    started = time.monotonic()
+    await backend.shutdown()
+    assert time.monotonic() - started < 5
+    with pytest.raises(StepCrashed, match="shut down"):
+        await asyncio.wait_for(task, timeout=5)
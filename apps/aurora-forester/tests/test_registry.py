@@ -0,0 +1,79 @@
+"""Tests for the agent registry's batched writes and resume rows."""
+
+from src.agents.registry import AgentRegistry
+from src.agents.spawner import AGENT_TEMPLATES, AgentStatus, SpawnedAgent, TERMINAL_STATUSES
+from src.db.local import SqliteAgentRegistryRepository
+
+
+TERMINAL = {status.value for status in TERMINAL_STATUSES}
+
+
+class FlakyRepo:
+    """Registry store whose writes fail while `failing` is set."""
+
+    def __init__(self):
+        self.rows = {}
+        self.failing = False
+
+    async def ensure_schema(self):
+        pass
+
+    async def upsert_many(self, rows):
+        if self.failing:
+            raise OSError("connection reset")
+        for row in rows:
+            self.rows[row[0]] = row
+
+    async def load_unfinished(self, terminal):
+        return [
+            {"agent_id": row[0], "agent_type": row[1], "status": row[2], "config": row[3],
+             "run_args": row[4], "checkpoint": row[5], "outputs_total": row[6],
+             "errors_total": row[7], "created_at": row[8]}
+            for row in self.rows.values() if row[2] not in terminal
+        ]
+
+
+def _agent(agent_id="research_1"):
+    return SpawnedAgent(id=agent_id, config=AGENT_TEMPLATES["research"])
+
+
+async def test_failed_write_keeps_final_status_for_retry():
+    repo = FlakyRepo()
+    registry = AgentRegistry(lambda: repo, terminal_statuses=TERMINAL, flush_interval=60)
+    agent = _agent()
+    registry.record(agent, {"query": "otters"})
+    await registry.flush()
+    assert repo.rows["research_1"][2] == AgentStatus.INITIALIZING.value
+
+    agent.status = AgentStatus.COMPLETED
+    registry.status_changed(agent)
+    repo.failing = True
+    await registry.flush()
+
+    # Not forgotten: the finished status is still waiting to be written
+    assert registry.stats["failed_writes"] == 1
+    assert [row["agent_id"] for row in await registry.load_unfinished()] == ["research_1"]
+
+    repo.failing = False
+    await registry.flush()
+    assert repo.rows["research_1"][2] == AgentStatus.COMPLETED.value
+    assert await registry.load_unfinished() == []
+    assert "research_1" not in registry._entries
+    await registry.close()
+
+
+async def test_checkpoint_survives_in_sqlite(tmp_path):
+    path = tmp_path / "agents.db"
+    registry = AgentRegistry(lambda: SqliteAgentRegistryRepository(path), terminal_statuses=TERMINAL)
+    agent = _agent()
+    checkpoint = registry.record(agent, {"query": "otters"})
+    checkpoint.data["analyzed"] = 3
+    checkpoint.save()
+    await registry.close()
+
+    reopened = AgentRegistry(lambda: SqliteAgentRegistryRepository(path), terminal_statuses=TERMINAL)
+    rows = await reopened.load_unfinished()
+    assert [(row["agent_id"], row["run_args"], row["checkpoint"]) for row in rows] == [
+        ("research_1", {"query": "otters"}, {"analyzed": 3})
+    ]
+    await reopened.close()
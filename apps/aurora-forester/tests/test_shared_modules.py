@@ -0,0 +1,30 @@
+"""The modules copied between aurora-forester and otto-jack must not drift apart."""
+
+from pathlib import Path
+
+import pytest
+
+
+APP_ROOT = Path(__file__).resolve().parents[1]
+OTTO_ROOT = APP_ROOT.parent / "otto-jack"
+
+SHARED_MODULES = [
+    "src/bot/outbound.py",
+    "src/bot/chunker.py",
+    "src/bench/mock_ollama.py",
+    "src/utils/import_profile.py",
+]
+
+
+def _body(path: Path) -> list:
+    """Everything but the title line, which names the app."""
+    lines = path.read_text(encoding="utf-8").splitlines()
+    return lines[:1] + lines[2:]
+
+
+@pytest.mark.skipif(not OTTO_ROOT.is_dir(), reason="otto-jack is not checked out alongside")
+@pytest.mark.parametrize("module", SHARED_MODULES)
+def test_shared_module_copies_match(module):
+    assert _body(APP_ROOT / module) == _body(OTTO_ROOT / module), (
+        f"{module} differs between aurora-forester and otto-jack; apply the change to both"
+    )
@@ -0,0 +1,100 @@
+"""Tests for workflow parsing, DAG execution and opt-in memoization."""
+
+from types import SimpleNamespace
+
+import pytest
+
+from src.agents.workflow import (
+    StepCache, WorkflowError, parse_workflow, register_action, run_workflow,
+)
+
+
+CALLS = []
+
+
+@register_action("record")
+async def _record(step, inputs):
+    CALLS.append(step.id)
+    return {"id": step.id, "inputs": sorted(inputs)}
+
+
+@register_action("explode")
+async def _explode(step, inputs):
+    raise RuntimeError("boom")
+
+
+class _Outputs(list):
+    total = 0
+
+
+def _agent(**parameters):
+    return SimpleNamespace(
+        id="workflow_test",
+        config=SimpleNamespace(name="Workflow Agent", parameters=parameters),
+        outputs=_Outputs(),
+    )
+
+
+@pytest.fixture(autouse=True)
+def _clear_calls():
+    CALLS.clear()
+
+
+def _memoized(definition):
+    return {step.id: step.memoize for step in parse_workflow(definition)}
+
+
+def test_memoization_is_opt_in():
+    steps = [
+        {"id": "get", "action": "http", "params": {"url": "http://x"}},
+        {"id": "post", "action": "http", "params": {"url": "http://x", "method": "POST"}},
+        {"id": "hook", "action": "n8n", "params": {"webhook_url": "http://x"}},
+    ]
+    assert _memoized({"steps": steps}) == {"get": False, "post": False, "hook": False}
+
+    # Workflow-wide opt-in only covers idempotent steps
+    assert _memoized({"memoize": True, "steps": steps}) == {"get": True, "post": False, "hook": False}
+
+    # A step can still opt in explicitly
+    steps[2] = {**steps[2], "memoize": True}
+    assert _memoized({"steps": steps})["hook"] is True
+
+
+def test_invalid_definitions_are_rejected():
+    with pytest.raises(WorkflowError, match="unknown action"):
+        parse_workflow({"steps": [{"id": "a", "action": "teleport"}]})
+    with pytest.raises(WorkflowError, match="cycle"):
+        parse_workflow({"steps": [
+            {"id": "a", "action": "noop", "depends_on": ["b"]},
+            {"id": "b", "action": "noop", "depends_on": ["a"]},
+        ]})
+    with pytest.raises(WorkflowError, match="Duplicate"):
+        parse_workflow({"steps": [{"id": "a"}, {"id": "a"}]})
+
+
+async def test_rerun_repeats_steps_that_did_not_opt_in():
+    cache = StepCache()
+    definition = {"name": "digest", "steps": [
+        {"id": "fetch", "action": "record", "memoize": True},
+        {"id": "notify", "action": "record"},
+    ]}
+    for _ in range(2):
+        result = await run_workflow(_agent(), definition, cache=cache)
+        assert result["success"]
+
+    assert CALLS == ["fetch", "notify", "notify"]
+
+
+async def test_failure_skips_only_downstream_steps():
+    definition = {"steps": [
+        {"id": "a", "action": "record"},
+        {"id": "broken", "action": "explode"},
+        {"id": "after_broken", "action": "record", "depends_on": ["broken"]},
+        {"id": "after_a", "action": "record", "depends_on": ["a"]},
+    ]}
+    result = await run_workflow(_agent(), definition)
+
+    statuses = {step["id"]: step["status"] for step in result["steps"]}
+    assert statuses == {"a": "completed", "broken": "failed",
+                        "after_broken": "skipped", "after_a": "completed"}
+    assert not result["success"]
@@ -6,7 +6,10 @@ Otto - Platform Guide for Hello World Co-Op
 
 Usage:
     python main.py bot     # Run Discord bot
+    python main.py bench   # Offline load test against a mock Ollama
     python main.py --help  # Show help
+
+Add --import-profile to a command to report its startup import cost.
 """
 
 import sys
@@ -37,13 +40,20 @@ def main():
         print(__doc__)
         print("\nAvailable commands:")
         print("  bot    - Run the Discord bot")
+        print("  bench  - Run offline load test (see bench --help)")
         sys.exit(1)
 
     command = sys.argv[1]
 
+    if "--import-profile" in sys.argv[2:]:
+        run_import_profile(command)
+        return
+
     if command == "bot":
         from src.bot.discord_bot import run_bot
         run_bot()
+    elif command == "bench":
+        run_bench(sys.argv[2:])
     elif command == "--help":
         print(__doc__)
     else:
@@ -52,5 +62,76 @@ def main():
         sys.exit(1)
 
 
+# Modules each command imports on its startup path
+STARTUP_IMPORTS = {
+    "bot": ["src.bot.discord_bot"],
+    "bench": ["src.bench.harness", "src.bench.mock_ollama"],
+}
+
+
+def run_import_profile(command):
+    """Report per-module import time for a command's startup path."""
+    from pathlib import Path
+    from src.utils.import_profile import profile_imports, format_import_profile
+
+    modules = STARTUP_IMPORTS.get(command)
+    if modules is None:
+        print(f"Unknown command: {command}")
+        sys.exit(1)
+
+    timings, wall = profile_imports(["main"] + modules, cwd=Path(__file__).parent)
+    print(f"Import profile for '{command}':\n")
+    print(format_import_profile(timings, wall))
+
+
+def run_bench(args):
+    """Run the offline load test against a mock Ollama."""
+    import argparse
+    import asyncio
+    import json
+    from pathlib import Path
+    from src.bench.harness import load_corpus, run_otto_benchmark, format_report
+    from src.bench.mock_ollama import MockOllamaConfig, LATENCY_DISTRIBUTIONS
+
+    parser = argparse.ArgumentParser(prog="main.py bench", description="Otto offline load test")
+    parser.add_argument("--requests", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--warmup", type=int, default=0)
+    parser.add_argument("--corpus", type=Path, default=None, help="One message per line")
+    parser.add_argument("--token-rate", type=float, default=40.0, help="Mock tokens per second")
+    parser.add_argument("--tokens", type=int, default=120, help="Mock tokens per response")
+    parser.add_argument("--latency-ms", type=float, default=150.0, help="Mean time to first token")
+    parser.add_argument("--latency-jitter-ms", type=float, default=50.0)
+    parser.add_argument("--latency-dist", choices=LATENCY_DISTRIBUTIONS, default="normal")
+    parser.add_argument("--cache-slots", type=int, default=4,
+                        help="Mock prompt-cache slots per model; 0 re-evaluates every prompt")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    opts = parser.parse_args(args)
+
+    mock_config = MockOllamaConfig(
+        latency_ms=opts.latency_ms,
+        latency_jitter_ms=opts.latency_jitter_ms,
+        latency_distribution=opts.latency_dist,
+        token_rate=opts.token_rate,
+        tokens_per_response=opts.tokens,
+        cache_slots=opts.cache_slots,
+        seed=opts.seed,
+    )
+
+    result = asyncio.run(run_otto_benchmark(
+        load_corpus(opts.corpus),
+        requests=opts.requests,
+        concurrency=opts.concurrency,
+        mock_config=mock_config,
+        warmup=opts.warmup,
+    ))
+
+    if opts.json:
+        print(json.dumps(result.to_dict(), indent=2))
+    else:
+        print(format_report([result]))
+
+
 if __name__ == "__main__":
     main()
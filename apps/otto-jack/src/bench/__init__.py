@@ -0,0 +1 @@
+# Otto Bench - Offline load testing against a mock Ollama
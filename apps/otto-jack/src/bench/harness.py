@@ -0,0 +1,193 @@
+"""
+Otto - Load Test Harness
+Replays a message corpus through Otto.process_message against a mock Ollama
+and reports latency percentiles and throughput.
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional, List, Dict, Any
+
+import structlog
+
+from .mock_ollama import MockOllamaServer, MockOllamaConfig
+
+
+logger = structlog.get_logger()
+
+
+# Typical community questions from the help channels
+DEFAULT_CORPUS = [
+    "What is Otter Camp?",
+    "How do I get a membership NFT?",
+    "Where can I vote on proposals?",
+    "help, my wallet won't connect",
+    "What is the DOM token used for?",
+    "How do quests work?",
+    "Can you explain how the co-op DAO works?",
+    "Where do I start as a newcomer?",
+    "What's the difference between a member and a visitor?",
+    "How are proposals approved?",
+]
+
+
+def load_corpus(path: Optional[Path]) -> List[str]:
+    """Load one message per line, or fall back to the built-in corpus."""
+    if path is None:
+        return list(DEFAULT_CORPUS)
+
+    lines = [line.strip() for line in Path(path).read_text(encoding="utf-8").splitlines()]
+    corpus = [line for line in lines if line and not line.startswith("#")]
+    if not corpus:
+        raise ValueError(f"Corpus file is empty: {path}")
+    return corpus
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Linear-interpolated percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    if len(sorted_values) == 1:
+        return sorted_values[0]
+
+    rank = (pct / 100.0) * (len(sorted_values) - 1)
+    low = int(rank)
+    high = min(low + 1, len(sorted_values) - 1)
+    return sorted_values[low] + (sorted_values[high] - sorted_values[low]) * (rank - low)
+
+
+@dataclass
+class BenchResult:
+    """Outcome of one benchmark run."""
+    target: str
+    requests: int
+    concurrency: int
+    wall_seconds: float
+    latencies: List[float] = field(default_factory=list)  # seconds, successful requests
+    errors: int = 0
+    prompt_tokens: int = 0  # As counted by the mock server
+    prompt_eval_tokens: int = 0  # Prompt tokens the mock had to evaluate (not cached)
+
+    def _pct_ms(self, pct: float) -> float:
+        return percentile(sorted(self.latencies), pct) * 1000.0
+
+    @property
+    def p50_ms(self) -> float:
+        return self._pct_ms(50)
+
+    @property
+    def p95_ms(self) -> float:
+        return self._pct_ms(95)
+
+    @property
+    def p99_ms(self) -> float:
+        return self._pct_ms(99)
+
+    @property
+    def prompt_cache_ratio(self) -> float:
+        """Share of prompt tokens served from the server's prompt cache."""
+        if self.prompt_tokens <= 0:
+            return 0.0
+        return 1.0 - self.prompt_eval_tokens / self.prompt_tokens
+
+    @property
+    def throughput(self) -> float:
+        """Successful requests per second."""
+        if self.wall_seconds <= 0:
+            return 0.0
+        return len(self.latencies) / self.wall_seconds
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary for JSON output."""
+        return {
+            "target": self.target,
+            "requests": self.requests,
+            "concurrency": self.concurrency,
+            "errors": self.errors,
+            "wall_seconds": round(self.wall_seconds, 4),
+            "throughput_rps": round(self.throughput, 3),
+            "p50_ms": round(self.p50_ms, 2),
+            "p95_ms": round(self.p95_ms, 2),
+            "p99_ms": round(self.p99_ms, 2),
+            "prompt_tokens": self.prompt_tokens,
+            "prompt_eval_tokens": self.prompt_eval_tokens,
+            "prompt_cache_ratio": round(self.prompt_cache_ratio, 4),
+        }
+
+
+async def run_otto_benchmark(
+    corpus: List[str],
+    requests: int,
+    concurrency: int,
+    mock_config: Optional[MockOllamaConfig] = None,
+    warmup: int = 0,
+    users: int = 8
+) -> BenchResult:
+    """Start a mock Ollama and drive Otto.process_message at a fixed concurrency."""
+    from ..core.otto import Otto
+
+    async with MockOllamaServer(mock_config) as mock:
+        otto = Otto()
+        otto.ollama_host = mock.url
+        if otto.knowledge.embedder is not None:
+            otto.knowledge.embedder.host = mock.url
+
+        # Otto swallows Ollama errors into a fallback reply, so count those as errors
+        fallback = otto._get_fallback_response()
+
+        # As the bot does at startup: get the persona prompt cached
+        await otto.warm_up()
+        for i in range(warmup):
+            await otto.process_message(corpus[i % len(corpus)], f"bench-user-{i % users}")
+        prompt_tokens_before = mock.prompt_tokens_total
+        prompt_eval_before = mock.prompt_tokens_evaluated
+
+        latencies: List[float] = []
+        errors = 0
+        next_index = 0
+
+        async def worker():
+            nonlocal next_index, errors
+            while next_index < requests:
+                index = next_index
+                next_index += 1
+                started = time.perf_counter()
+                response = await otto.process_message(
+                    corpus[index % len(corpus)], f"bench-user-{index % users}"
+                )
+                if response == fallback:
+                    errors += 1
+                    continue
+                latencies.append(time.perf_counter() - started)
+
+        logger.info("bench.target_started", target="otto", requests=requests,
+                    concurrency=concurrency)
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(max(1, concurrency))))
+        wall = time.perf_counter() - started
+
+        return BenchResult(
+            target="otto",
+            requests=requests,
+            concurrency=concurrency,
+            wall_seconds=wall,
+            latencies=latencies,
+            errors=errors,
+            prompt_tokens=mock.prompt_tokens_total - prompt_tokens_before,
+            prompt_eval_tokens=mock.prompt_tokens_evaluated - prompt_eval_before,
+        )
+
+
+def format_report(results: List[BenchResult]) -> str:
+    """Render results as a fixed-width table."""
+    header = f"{'target':<10} {'reqs':>6} {'conc':>5} {'errors':>6} {'rps':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'prompt tok':>11} {'eval tok':>9} {'cached':>7}"
+    lines = [header, "-" * len(header)]
+    for r in results:
+        lines.append(
+            f"{r.target:<10} {r.requests:>6} {r.concurrency:>5} {r.errors:>6} "
+            f"{r.throughput:>9.2f} {r.p50_ms:>9.1f} {r.p95_ms:>9.1f} {r.p99_ms:>9.1f} "
+            f"{r.prompt_tokens:>11} {r.prompt_eval_tokens:>9} {r.prompt_cache_ratio:>7.1%}"
+        )
+    return "\n".join(lines)
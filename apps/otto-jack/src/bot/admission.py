@@ -0,0 +1,203 @@
+"""
+Otto - Message Admission
+Decides when a Discord message turns into an Ollama generation.
+
+Every generation costs GPU time, so messages are admitted in two stages:
+
+- Per user (per channel): messages are debounced, so a burst of rapid-fire
+  messages becomes one prompt. While a user's generation is running,
+  anything else they send waits and is folded into a single follow-up; they
+  get one canned acknowledgement instead of another generation.
+- Per channel: at most `max_inflight` generations run at once. Further
+  prompts wait in FIFO order (with a canned "you're in line" reply), and
+  once `max_waiting` are queued new prompts are turned away with a canned
+  reply rather than queued.
+"""
+
+import asyncio
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Tuple
+
+import structlog
+
+
+logger = structlog.get_logger()
+
+
+# Cheap canned replies - no model call involved
+USER_BUSY_ACK = (
+    "Got it! I'm still working on your last message - "
+    "I'll fold this into my next answer."
+)
+CHANNEL_BUSY_ACK = "Lots of questions right now! You're in line - I'll be with you in a moment."
+CHANNEL_FULL_ACK = "Whoa, Otter Camp is buzzing! Give me a minute and ask again?"
+
+
+# handler(contents, context) generates and sends the reply for a batch;
+# ack(context, text) sends a canned reply. `context` is whatever was passed
+# to submit() with the newest message of the batch (the Discord message).
+BatchHandler = Callable[[List[str], Any], Awaitable[None]]
+AckSender = Callable[[Any, str], None]
+
+
+@dataclass
+class _UserState:
+    """Messages waiting for one user in one channel."""
+    pending: List[Tuple[str, Any]] = field(default_factory=list)
+    timer: Optional[asyncio.TimerHandle] = None
+    busy: bool = False  # A batch for this user is queued or generating
+    acked: bool = False  # Already told them we're busy with this batch
+
+
+@dataclass
+class _ChannelState:
+    """Generation slots for one channel."""
+    inflight: int = 0
+    waiters: Deque[asyncio.Future] = field(default_factory=deque)
+
+
+class MessageAdmission:
+    """Per-user debounce and per-channel concurrency cap for generations."""
+
+    def __init__(
+        self,
+        handler: BatchHandler,
+        ack: AckSender,
+        debounce_seconds: float = 1.5,
+        max_inflight: int = 2,
+        max_waiting: int = 8
+    ):
+        self.handler = handler
+        self.ack = ack
+        self.debounce_seconds = debounce_seconds
+        self.max_inflight = max(1, max_inflight)
+        self.max_waiting = max_waiting
+        self._users: Dict[Tuple[int, int], _UserState] = {}
+        self._channels: Dict[int, _ChannelState] = {}
+        self._tasks: set = set()
+        self.stats = {"messages": 0, "generations": 0, "folded": 0, "acks": 0, "rejected": 0}
+
+    def submit(self, channel_id: int, user_id: int, content: str, context: Any):
+        """Accept a message; it will be answered as part of a batch."""
+        key = (channel_id, user_id)
+        state = self._users.setdefault(key, _UserState())
+        state.pending.append((content, context))
+        self.stats["messages"] += 1
+
+        if state.busy:
+            # Over their share: fold into the follow-up, acknowledge once
+            self.stats["folded"] += 1
+            if not state.acked:
+                state.acked = True
+                self._ack(context, USER_BUSY_ACK)
+            return
+
+        self._schedule(key, state)
+
+    def is_active(self, channel_id: int, user_id: int) -> bool:
+        """True while a user has messages pending or a reply on the way."""
+        return (channel_id, user_id) in self._users
+
+    def _schedule(self, key: Tuple[int, int], state: _UserState):
+        if state.timer is not None:
+            state.timer.cancel()
+        loop = asyncio.get_running_loop()
+        state.timer = loop.call_later(self.debounce_seconds, self._release, key)
+
+    def _release(self, key: Tuple[int, int]):
+        """Debounce window closed: turn the pending messages into one batch."""
+        state = self._users.get(key)
+        if state is None or not state.pending:
+            return
+        batch, state.pending = state.pending, []
+        state.timer = None
+        state.busy = True
+        task = asyncio.get_running_loop().create_task(self._run(key, state, batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, key: Tuple[int, int], state: _UserState, batch: List[Tuple[str, Any]]):
+        channel_id = key[0]
+        contents = [content for content, _ in batch]
+        context = batch[-1][1]
+
+        try:
+            if not await self._acquire(channel_id, context):
+                return
+            try:
+                self.stats["generations"] += 1
+                logger.debug("otto_admission.generate", channel_id=channel_id,
+                             messages=len(contents))
+                await self.handler(contents, context)
+            finally:
+                self._release_slot(channel_id)
+        except Exception as e:
+            logger.error("otto_admission.handler_error", error=str(e))
+        finally:
+            state.busy = False
+            state.acked = False
+            if state.pending:
+                self._schedule(key, state)
+            elif state.timer is None:
+                self._users.pop(key, None)
+
+    # ============================================
+    # CHANNEL SLOTS
+    # ============================================
+
+    async def _acquire(self, channel_id: int, context: Any) -> bool:
+        channel = self._channels.setdefault(channel_id, _ChannelState())
+        if channel.inflight < self.max_inflight:
+            channel.inflight += 1
+            return True
+
+        if len(channel.waiters) >= self.max_waiting:
+            self.stats["rejected"] += 1
+            self._ack(context, CHANNEL_FULL_ACK)
+            return False
+
+        self._ack(context, CHANNEL_BUSY_ACK)
+        waiter = asyncio.get_running_loop().create_future()
+        channel.waiters.append(waiter)
+        try:
+            await waiter  # The releasing batch hands its slot over directly
+        except asyncio.CancelledError:
+            if waiter in channel.waiters:
+                channel.waiters.remove(waiter)
+            elif waiter.done() and not waiter.cancelled():
+                self._release_slot(channel_id)
+            raise
+        return True
+
+    def _release_slot(self, channel_id: int):
+        channel = self._channels.get(channel_id)
+        if channel is None:
+            return
+        while channel.waiters:
+            waiter = channel.waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        channel.inflight -= 1
+        if channel.inflight == 0:
+            self._channels.pop(channel_id, None)
+
+    def _ack(self, context: Any, text: str):
+        self.stats["acks"] += 1
+        try:
+            self.ack(context, text)
+        except Exception as e:
+            logger.error("otto_admission.ack_error", error=str(e))
+
+    async def close(self):
+        """Drop pending messages and cancel running batches."""
+        for state in self._users.values():
+            state.pending.clear()
+            if state.timer is not None:
+                state.timer.cancel()
+        self._users.clear()
+        for task in list(self._tasks):
+            task.cancel()
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
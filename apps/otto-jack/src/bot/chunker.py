@@ -0,0 +1,188 @@
+"""
+Otto - Response Chunker
+Splits responses into Discord-sized messages without breaking markdown.
+
+Text is packed greedily up to the limit. Breaks prefer, in order: a
+paragraph boundary in the second half of the chunk, the end of a line, a
+sentence end, a space, and only then a hard cut. A code fence that is open
+at a break is closed at the end of the chunk and reopened (with its
+language tag) at the start of the next, so every message renders on its
+own.
+
+The chunker is incremental: feed() accepts text as it streams in and
+returns the chunks that are already complete. Every character is moved
+into a chunk at most twice, so the cost is linear in the response length.
+
+Shared by aurora-forester and otto-jack. Each image is built from its own
+app directory, so the module is copied rather than imported from a common
+package; keep both copies identical apart from the title line
+(aurora-forester's tests/test_shared_modules.py checks).
+"""
+
+from typing import List, Optional, Tuple
+
+
+DISCORD_MESSAGE_LIMIT = 2000
+
+# Room kept free inside a fence for the closing "\n```"
+_CLOSE_FENCE_RESERVE = 4
+_FENCE_MARKERS = ("```", "~~~")
+_SENTENCE_ENDS = (". ", "! ", "? ")
+
+
+class MessageChunker:
+    """Incremental markdown-aware splitter for chat messages."""
+
+    def __init__(self, limit: int = DISCORD_MESSAGE_LIMIT):
+        if limit < 100:
+            raise ValueError("Chunk limit must be at least 100 characters")
+        self.limit = limit
+        self._pieces: List[str] = []
+        self._size = 0
+        self._paragraph: Optional[Tuple[int, int]] = None  # (piece index, size) after last blank line
+        self._fence: Optional[str] = None  # Opening line of the fence we are inside
+        self._partial = ""  # Trailing text not yet terminated by a newline
+        self._continuing = False  # Part of the partial line has already been placed
+        self._ready: List[str] = []
+
+    def feed(self, text: str) -> List[str]:
+        """Add streamed text; return any chunks that are now complete."""
+        lines = (self._partial + text).splitlines(keepends=True)
+        self._partial = lines.pop() if lines and not lines[-1].endswith(("\n", "\r")) else ""
+        for line in lines:
+            self._add_line(line)
+
+        # A very long unterminated line cannot wait for its newline forever;
+        # place what is certain and keep the tail, exactly as finish() would
+        if len(self._partial) > self.limit:
+            if not self._continuing and self._pieces:
+                self._break()
+            self._partial = self._add_long(self._partial, final=False)
+            self._continuing = True
+
+        return self._take_ready()
+
+    def finish(self) -> List[str]:
+        """Flush everything left; return the final chunks."""
+        if self._partial:
+            self._add_line(self._partial)
+            self._partial = ""
+        if self._pieces:
+            self._emit(close_fence=False)
+        return self._take_ready()
+
+    # ============================================
+    # PACKING
+    # ============================================
+
+    def _add_line(self, line: str):
+        if self._continuing:
+            self._continuing = False
+            self._add_long(line)
+            return
+
+        fence_after = self._fence_after(line)
+        needed = len(line) + (_CLOSE_FENCE_RESERVE if fence_after else 0)
+
+        if self._size + needed > self.limit:
+            if self._pieces:
+                self._break()
+            if self._size + needed > self.limit:
+                self._add_long(line)
+                return
+
+        self._append(line)
+        self._fence = fence_after
+        if fence_after is None and not line.strip():
+            self._paragraph = (len(self._pieces), self._size)
+
+    def _add_long(self, line: str, final: bool = True) -> str:
+        """
+        Place a line that does not fit in a chunk of its own.
+
+        With final=False the last piece (which fits) is returned instead of
+        placed, since more of the line may still be streaming in.
+        """
+        while line:
+            room = self.limit - self._size - (_CLOSE_FENCE_RESERVE if self._fence else 0)
+            if len(line) <= room:
+                if not final:
+                    return line
+                self._append(line)
+                return ""
+            if room < self.limit // 4 and self._pieces:
+                self._break()
+                continue
+            cut = _split_point(line, room)
+            self._append(line[:cut])
+            line = line[cut:]
+            self._break(at_end=True)
+        return ""
+
+    def _break(self, at_end: bool = False):
+        """End the current chunk, preferably at a late paragraph boundary."""
+        if not at_end and self._paragraph is not None:
+            index, size = self._paragraph
+            if size >= self.limit // 2 and index < len(self._pieces):
+                carried = self._pieces[index:]
+                del self._pieces[index:]
+                self._size = size
+                self._emit(close_fence=False)  # Fences never span a paragraph boundary
+                self._pieces = carried
+                self._size = sum(len(p) for p in carried)
+                return
+
+        fence = self._fence
+        self._emit(close_fence=fence is not None)
+        if fence is not None:
+            self._append(fence + "\n")
+
+    def _emit(self, close_fence: bool):
+        text = "".join(self._pieces)
+        if close_fence:
+            text = text.rstrip("\n") + "\n" + self._fence[:3]
+        text = text.strip("\n")
+        if text.strip():
+            self._ready.append(text)
+        self._pieces = []
+        self._size = 0
+        self._paragraph = None
+
+    def _append(self, piece: str):
+        self._pieces.append(piece)
+        self._size += len(piece)
+
+    def _fence_after(self, line: str) -> Optional[str]:
+        """Fence state once `line` has been added."""
+        stripped = line.strip()
+        if not stripped.startswith(_FENCE_MARKERS):
+            return self._fence
+        if self._fence is None:
+            return stripped
+        if stripped.startswith(self._fence[:3]) and not stripped[3:].strip(stripped[0]):
+            return None
+        return self._fence
+
+    def _take_ready(self) -> List[str]:
+        ready, self._ready = self._ready, []
+        return ready
+
+
+def _split_point(text: str, room: int) -> int:
+    """Where to cut a too-long line: sentence end, then space, then hard."""
+    window = text[:room]
+    sentence = max(window.rfind(end) for end in _SENTENCE_ENDS)
+    if sentence >= room // 2:
+        return sentence + 2
+    space = window.rfind(" ")
+    if space >= room // 2:
+        return space + 1
+    return room
+
+
+def chunk_message(text: str, limit: int = DISCORD_MESSAGE_LIMIT) -> List[str]:
+    """Split a complete response into Discord-sized messages."""
+    if len(text) <= limit:
+        return [text] if text.strip() else []
+    chunker = MessageChunker(limit)
+    return chunker.feed(text) + chunker.finish()
@@ -8,14 +8,18 @@ Otto responds to:
 - DMs from community members
 """
 
+import asyncio
 import discord
 from discord.ext import commands
 import structlog
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 
 from ..core.config import settings, load_secrets
 from ..core.otto import get_otto, Otto
+from .admission import MessageAdmission
+from .chunker import chunk_message
+from .outbound import OutboundDispatcher
 
 
 logger = structlog.get_logger()
@@ -52,15 +56,30 @@ class OttoBot(commands.Bot):
         super().__init__(
             command_prefix="!otto ",
             intents=intents,
-            description="Otto - Your friendly platform guide!"
+            description="Otto - Your friendly platform guide!",
+            # Long rate-limit waits raise instead of sleeping, so the outbound
+            # queue can reschedule them without blocking anything else
+            max_ratelimit_timeout=30.0,
         )
 
         self.otto: Optional[Otto] = None
+        self._warm_up: Optional[asyncio.Task] = None
+        self.outbound = OutboundDispatcher()
+        self.admission = MessageAdmission(
+            handler=self._answer,
+            ack=self.outbound.reply,
+            debounce_seconds=settings.debounce_seconds,
+            max_inflight=settings.max_inflight_per_channel,
+            max_waiting=settings.max_waiting_per_channel,
+        )
         logger.info("otto_bot.initialized")
 
     async def setup_hook(self):
         """Called when the bot is starting up."""
         self.otto = get_otto()
+        self.otto.knowledge.start_watching(settings.knowledge_reload_seconds)
+        # Get the persona prompt cached on the server while we connect
+        self._warm_up = asyncio.create_task(self.otto.warm_up())
         logger.info("otto_bot.setup_complete")
 
     async def on_ready(self):
@@ -115,6 +134,9 @@ class OttoBot(commands.Bot):
             question_indicators = ["?", "how do", "what is", "where", "help", "explain"]
             if any(q in content_lower for q in question_indicators):
                 should_respond = True
+            # Follow-ups to a question we're already answering get folded in
+            elif self.admission.is_active(message.channel.id, message.author.id):
+                should_respond = True
 
         if not should_respond:
             return
@@ -127,7 +149,8 @@ class OttoBot(commands.Bot):
 
         if not content:
             # Just mentioned with no content
-            await message.reply(
+            self.outbound.reply(
+                message,
                 "Hey there! I'm Otto, your friendly platform guide! "
                 "Ask me anything about Hello World Co-Op, Otter Camp, "
                 "or how to get started! Click here, click there - boom!"
@@ -141,33 +164,41 @@ class OttoBot(commands.Bot):
             content_length=len(content)
         )
 
-        # Show typing indicator
-        async with message.channel.typing():
-            try:
+        # Debounced per user and capped per channel; answered in _answer
+        self.admission.submit(message.channel.id, message.author.id, content, message)
+
+    async def _answer(self, contents: List[str], message: discord.Message):
+        """Generate one reply for a batch of a user's messages."""
+        # Show typing indicator while thinking; sending happens on the outbound queue
+        try:
+            async with message.channel.typing():
                 # Process with Otto
                 user_name = message.author.display_name
-                response = await self.otto.process_message(content, user_name)
-
-                # Send response (split if too long)
-                if len(response) <= 2000:
-                    await message.reply(response)
-                else:
-                    chunks = [response[i:i+1900] for i in range(0, len(response), 1900)]
-                    for i, chunk in enumerate(chunks):
-                        if i == 0:
-                            await message.reply(chunk)
-                        else:
-                            await message.channel.send(chunk)
-
-            except Exception as e:
-                logger.error("otto_bot.message_error", error=str(e))
-                await message.reply(
-                    "Oops! Got a bit tangled in my whiskers there. "
-                    "Try again in a moment!"
+                response = await self.otto.process_message(
+                    "\n".join(contents), user_name, user_id=str(message.author.id),
+                    channel_id=str(message.channel.id),
                 )
 
+        except Exception as e:
+            logger.error("otto_bot.message_error", error=str(e))
+            self.outbound.reply(
+                message,
+                "Oops! Got a bit tangled in my whiskers there. "
+                "Try again in a moment!"
+            )
+            return
+
+        # Split on markdown-safe boundaries if too long
+        self.outbound.reply(message, chunk_message(response))
+
     async def close(self):
         """Cleanup when shutting down."""
+        await self.admission.close()
+        if self._warm_up is not None:
+            self._warm_up.cancel()
+        if self.otto:
+            await self.otto.knowledge.stop_watching()
+        await self.outbound.close()
         await super().close()
         logger.info("otto_bot.closed")
 
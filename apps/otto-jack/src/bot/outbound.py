@@ -0,0 +1,287 @@
+"""
+Otto - Outbound Discord Dispatcher
+Per-channel send queues that respect Discord's rate limits.
+
+Handlers enqueue replies and return immediately, so the typing indicator is
+released as soon as a response is ready rather than held through rate-limit
+sleeps. Each channel has its own queue and worker, so a busy channel never
+delays another. Before each send the worker packs as many adjacent queued
+messages as fit into one Discord message (2000 characters), which turns a
+burst of small posts into a single API call.
+
+Discord allows roughly 5 messages per 5 seconds per channel and 50 requests
+per second per bot. Both are tracked locally so we wait before sending
+instead of collecting 429s; if Discord still rate-limits us, the channel's
+bucket is blocked for the advertised retry-after and the send is retried.
+
+Shared by aurora-forester and otto-jack. Each image is built from its own
+app directory, so the module is copied rather than imported from a common
+package; keep both copies identical apart from the title line
+(aurora-forester's tests/test_shared_modules.py checks).
+"""
+
+import asyncio
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Deque, Dict, List, Optional, Sequence, Union
+
+import discord
+import structlog
+
+
+logger = structlog.get_logger()
+
+
+DISCORD_MESSAGE_LIMIT = 2000
+
+
+class RateBucket:
+    """Sliding-window limiter: at most `rate` acquisitions per `period` seconds."""
+
+    def __init__(self, rate: int, period: float):
+        self.rate = rate
+        self.period = period
+        self._sent: Deque[float] = deque()
+        self._blocked_until = 0.0
+
+    def delay(self) -> float:
+        """Seconds to wait before the next acquisition is allowed."""
+        now = time.monotonic()
+        while self._sent and now - self._sent[0] >= self.period:
+            self._sent.popleft()
+        wait = max(0.0, self._blocked_until - now)
+        if len(self._sent) >= self.rate:
+            wait = max(wait, self._sent[0] + self.period - now)
+        return wait
+
+    async def acquire(self):
+        while (wait := self.delay()) > 0:
+            await asyncio.sleep(wait)
+        self._sent.append(time.monotonic())
+
+    def block_for(self, seconds: float):
+        """Hold all acquisitions for `seconds` (after a 429)."""
+        self._blocked_until = max(self._blocked_until, time.monotonic() + seconds)
+
+
+@dataclass(slots=True)
+class _Outgoing:
+    """A chunk waiting to be sent."""
+    content: str
+    group: int  # Chunks of one send() call share a group
+    reference: Optional[Any]
+    done: Optional[asyncio.Future] = None  # Set on the last chunk of a group
+
+
+@dataclass
+class _ChannelQueue:
+    """Pending chunks and the worker draining them for one channel."""
+    channel: Any
+    bucket: RateBucket
+    items: Deque[_Outgoing] = field(default_factory=deque)
+    wakeup: asyncio.Event = field(default_factory=asyncio.Event)
+    worker: Optional[asyncio.Task] = None
+    in_flight: int = 0  # Chunks taken off the queue but not yet resolved
+
+
+class OutboundDispatcher:
+    """
+    Rate-limit-aware outbound queue, one lane per Discord channel.
+
+    `send()` returns a future that resolves to True once the content is
+    delivered (False if it was dropped), so callers can await delivery or
+    fire and forget.
+    """
+
+    def __init__(
+        self,
+        limit: int = DISCORD_MESSAGE_LIMIT,
+        channel_rate: int = 5,
+        channel_period: float = 5.0,
+        global_rate: int = 50,
+        global_period: float = 1.0,
+        max_retries: int = 3,
+        idle_timeout: float = 60.0
+    ):
+        self.limit = limit
+        self.channel_rate = channel_rate
+        self.channel_period = channel_period
+        self.max_retries = max_retries
+        self.idle_timeout = idle_timeout
+        self.global_bucket = RateBucket(global_rate, global_period)
+        self._queues: Dict[int, _ChannelQueue] = {}
+        self._next_group = 0
+        self._closed = False
+        self.stats = {"enqueued": 0, "sent": 0, "coalesced": 0, "rate_limited": 0, "dropped": 0}
+
+    def send(
+        self,
+        channel: Any,
+        content: Union[str, Sequence[str]],
+        reference: Optional[Any] = None
+    ) -> asyncio.Future:
+        """
+        Queue content for a channel.
+
+        `content` is one message or a list of chunks of one response (each
+        at most `limit` characters). `reference` makes the first message a
+        reply to that Discord message.
+        """
+        loop = asyncio.get_running_loop()
+        done = loop.create_future()
+        chunks = [c for c in ([content] if isinstance(content, str) else content) if c]
+        if self._closed or not chunks:
+            done.set_result(not chunks)
+            return done
+
+        lane = self._lane(channel)
+        group = self._next_group
+        self._next_group += 1
+        for i, chunk in enumerate(chunks):
+            lane.items.append(_Outgoing(
+                content=chunk[:self.limit],
+                group=group,
+                reference=reference if i == 0 else None,
+                done=done if i == len(chunks) - 1 else None,
+            ))
+        self.stats["enqueued"] += len(chunks)
+        lane.wakeup.set()
+        if lane.worker is None or lane.worker.done():
+            lane.worker = loop.create_task(self._drain(channel.id, lane))
+        return done
+
+    def reply(self, message: discord.Message, content: Union[str, Sequence[str]]) -> asyncio.Future:
+        """Queue a reply to `message` in its channel."""
+        return self.send(message.channel, content, reference=message)
+
+    def _lane(self, channel: Any) -> _ChannelQueue:
+        lane = self._queues.get(channel.id)
+        if lane is None:
+            lane = _ChannelQueue(channel=channel, bucket=RateBucket(self.channel_rate, self.channel_period))
+            self._queues[channel.id] = lane
+        return lane
+
+    # ============================================
+    # WORKERS
+    # ============================================
+
+    async def _drain(self, channel_id: int, lane: _ChannelQueue):
+        """Send everything queued for one channel; exit after idling."""
+        while True:
+            if not lane.items:
+                lane.wakeup.clear()
+                try:
+                    await asyncio.wait_for(lane.wakeup.wait(), self.idle_timeout)
+                except asyncio.TimeoutError:
+                    if not lane.items:
+                        self._queues.pop(channel_id, None)
+                        return
+                continue
+
+            batch = self._take_batch(lane.items)
+            lane.in_flight = len(batch)
+            try:
+                delivered = await self._deliver(lane, batch)
+            finally:
+                lane.in_flight = 0
+            for item in batch:
+                if item.done is not None and not item.done.done():
+                    item.done.set_result(delivered)
+
+    def _take_batch(self, items: Deque[_Outgoing]) -> List[_Outgoing]:
+        """Pop the next chunk plus any following chunks that fit alongside it."""
+        batch = [items.popleft()]
+        size = len(batch[0].content)
+        while items:
+            nxt = items[0]
+            if nxt.reference is not None:
+                break  # A reply starts its own message
+            joined = size + len(self._separator(batch[-1], nxt)) + len(nxt.content)
+            if joined > self.limit:
+                break
+            batch.append(items.popleft())
+            size = joined
+        if len(batch) > 1:
+            self.stats["coalesced"] += len(batch) - 1
+        return batch
+
+    @staticmethod
+    def _separator(previous: _Outgoing, nxt: _Outgoing) -> str:
+        # Chunks of one response were split at a line break; separate posts get a blank line
+        return "\n" if previous.group == nxt.group else "\n\n"
+
+    async def _deliver(self, lane: _ChannelQueue, batch: List[_Outgoing]) -> bool:
+        content = batch[0].content
+        for prev, item in zip(batch, batch[1:]):
+            content += self._separator(prev, item) + item.content
+        reference = batch[0].reference
+
+        for attempt in range(self.max_retries + 1):
+            await lane.bucket.acquire()
+            await self.global_bucket.acquire()
+            try:
+                await lane.channel.send(content, reference=reference)
+                self.stats["sent"] += 1
+                return True
+            except discord.RateLimited as e:
+                retry_after = e.retry_after
+            except discord.HTTPException as e:
+                if e.status != 429:
+                    if reference is not None and e.status in (400, 404):
+                        # The message we were replying to is gone; post without the reply
+                        reference = None
+                        continue
+                    logger.error("outbound.send_error", channel_id=lane.channel.id,
+                                 status=e.status, error=str(e))
+                    break
+                retry_after = _retry_after(e)
+            except Exception as e:
+                logger.error("outbound.send_error", channel_id=lane.channel.id, error=str(e))
+                break
+
+            self.stats["rate_limited"] += 1
+            lane.bucket.block_for(retry_after)
+            logger.warning("outbound.rate_limited", channel_id=lane.channel.id,
+                           retry_after=retry_after, attempt=attempt + 1)
+
+        self.stats["dropped"] += len(batch)
+        return False
+
+    # ============================================
+    # LIFECYCLE
+    # ============================================
+
+    def pending(self) -> int:
+        """Chunks queued or being sent across all channels."""
+        return sum(len(lane.items) + lane.in_flight for lane in self._queues.values())
+
+    async def flush(self, timeout: Optional[float] = None):
+        """Wait until every queued chunk has been sent or dropped."""
+        async def _wait():
+            while self.pending():
+                await asyncio.sleep(0.05)
+        await asyncio.wait_for(_wait(), timeout)
+
+    async def close(self, timeout: float = 5.0):
+        """Stop accepting work, give queues `timeout` seconds to drain, then stop."""
+        self._closed = True
+        try:
+            await self.flush(timeout)
+        except asyncio.TimeoutError:
+            logger.warning("outbound.close_dropped", pending=self.pending())
+        for lane in self._queues.values():
+            if lane.worker is not None:
+                lane.worker.cancel()
+            for item in lane.items:
+                if item.done is not None and not item.done.done():
+                    item.done.set_result(False)
+        self._queues.clear()
+
+
+def _retry_after(error: discord.HTTPException) -> float:
+    headers = getattr(error.response, "headers", None) or {}
+    try:
+        return float(headers.get("Retry-After", 1.0))
+    except (TypeError, ValueError):
+        return 1.0
@@ -31,15 +31,32 @@ class Settings(BaseSettings):
     # Ollama for AI responses
     ollama_host: str = Field(default="http://localhost:11434", validation_alias="OLLAMA_HOST")
     ollama_model: str = Field(default="mistral", validation_alias="OLLAMA_MODEL")
+    embedding_model: str = Field(default="nomic-embed-text", validation_alias="OLLAMA_EMBED_MODEL")
+    # How long Ollama keeps the model (and its cached persona prompt) loaded after a request
+    ollama_keep_alive: str = Field(default="30m", validation_alias="OLLAMA_KEEP_ALIVE")
 
     # Knowledge base path
     docs_path: Path = Field(
         default=Path("/app/knowledge")
     )
+    knowledge_reload_seconds: float = 10.0  # ConfigMap watch interval; 0 disables
+
+    # Hybrid (lexical + vector) knowledge retrieval
+    hybrid_search: bool = True
+    vector_cache_path: Path = Field(default=Path("/app/cache"))  # Writable; the docs mount is read-only
+    vector_min_score: float = 0.5  # Minimum cosine similarity for a semantic match
 
     # Personality settings
     response_style: str = "playful"  # playful, helpful, informative
     max_response_length: int = 1800
+    context_token_budget: int = 250  # Knowledge snippets per prompt (old fixed windows were ~250)
+    history_turns: int = 3  # Recent exchanges per user sent back as chat context
+    history_ttl_seconds: float = 1800.0  # Forget a conversation after this long idle
+
+    # Generation admission (Discord)
+    debounce_seconds: float = 1.5  # Rapid-fire messages within this window become one prompt
+    max_inflight_per_channel: int = 2  # Concurrent generations per channel
+    max_waiting_per_channel: int = 8  # Queued prompts per channel before turning people away
 
     model_config = SettingsConfigDict(
         env_file=get_env_file_path(),
@@ -49,16 +66,48 @@ class Settings(BaseSettings):
     )
 
 
-# Global settings instance
-settings = Settings()
+# Global settings instance - built once, on first use
+_settings: Optional[Settings] = None
 
 
-def load_secrets():
-    """Load secrets from file if available."""
+def get_settings() -> Settings:
+    """Get the settings, loading secrets and building them on first call."""
+    global _settings
+    if _settings is None:
+        _load_secrets_env()
+        _settings = Settings()
+    return _settings
+
+
+class _LazySettings:
+    """
+    Stand-in for the settings instance.
+
+    Nothing is read from the environment until the first attribute access,
+    and every module sees the same instance.
+    """
+
+    def __getattr__(self, name):
+        return getattr(get_settings(), name)
+
+    def __setattr__(self, name, value):
+        setattr(get_settings(), name, value)
+
+    def __repr__(self) -> str:
+        return repr(get_settings())
+
+
+settings = _LazySettings()
+
+
+def _load_secrets_env():
+    """Export the local secrets file into the environment, if there is one."""
     secrets_path = Path.home() / ".otto-jack" / "secrets" / "secrets.env"
     if secrets_path.exists():
         from dotenv import load_dotenv
         load_dotenv(secrets_path, override=True)
-        global settings
-        settings = Settings()
-    return settings
+
+
+def load_secrets():
+    """Load secrets from file if available (settings are only built once)."""
+    return get_settings()
@@ -0,0 +1,83 @@
+"""
+Otto - Conversation History
+Short memory of recent exchanges, sent back to Ollama as chat turns.
+
+History is kept per (channel, user), the same key message admission uses,
+so what someone says in a DM is never replayed in a public channel.
+
+Only the user's own words and Otto's replies are kept, not the knowledge
+snippets retrieved for each question, so history stays small. The price is
+that a replayed question differs from what was sent the first time (it went
+out with documentation appended): Ollama's prompt cache is reused for the
+persona and every turn before the previous question, and re-evaluates from
+there.
+"""
+
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from typing import Deque, Dict, List, Tuple
+
+
+# (channel id, user id); the channel is "" outside Discord
+HistoryKey = Tuple[str, str]
+
+
+@dataclass(slots=True)
+class _Conversation:
+    """Recent (question, answer) pairs for one user in one channel."""
+    turns: Deque[Tuple[str, str]]
+    updated: float = field(default_factory=time.monotonic)
+
+
+class ConversationHistory:
+    """
+    Bounded per-conversation chat history, keyed by (channel, user).
+
+    Each conversation keeps at most `max_turns` exchanges, one idle for
+    `ttl_seconds` is forgotten, and at most `max_users` conversations are
+    held (least recently active dropped first).
+    """
+
+    def __init__(self, max_turns: int = 3, ttl_seconds: float = 1800.0, max_users: int = 1000):
+        self.max_turns = max_turns
+        self.ttl_seconds = ttl_seconds
+        self.max_users = max_users
+        self._conversations: "OrderedDict[HistoryKey, _Conversation]" = OrderedDict()
+
+    def messages(self, key: HistoryKey) -> List[Dict[str, str]]:
+        """Chat messages for a conversation's recent exchanges, oldest first."""
+        conversation = self._conversations.get(key)
+        if conversation is None:
+            return []
+        if time.monotonic() - conversation.updated > self.ttl_seconds:
+            del self._conversations[key]
+            return []
+
+        messages = []
+        for question, answer in conversation.turns:
+            messages.append({"role": "user", "content": question})
+            messages.append({"role": "assistant", "content": answer})
+        return messages
+
+    def record(self, key: HistoryKey, question: str, answer: str):
+        """Remember an exchange."""
+        if self.max_turns <= 0:
+            return
+        conversation = self._conversations.get(key)
+        if conversation is None:
+            conversation = _Conversation(turns=deque(maxlen=self.max_turns))
+            self._conversations[key] = conversation
+        conversation.turns.append((question, answer))
+        conversation.updated = time.monotonic()
+        self._conversations.move_to_end(key)
+
+        while len(self._conversations) > self.max_users:
+            self._conversations.popitem(last=False)
+
+    def forget(self, key: HistoryKey):
+        """Drop a conversation's history."""
+        self._conversations.pop(key, None)
+
+    def __len__(self) -> int:
+        return len(self._conversations)
@@ -0,0 +1,550 @@
+"""
+Otto Knowledge Base
+Hello World Co-Op documentation, searchable and hot-reloaded.
+
+The docs are mounted from the `otto-knowledge` ConfigMap. Kubernetes
+updates a ConfigMap volume by writing the new files into a fresh
+timestamped directory and atomically repointing the `..data` symlink at it,
+so a change of that link target means "new version ready". The watcher
+polls the link, re-reads the new directory, re-parses only files whose
+content hash changed, and swaps in the new index in one assignment.
+Queries take a reference to the current index when they start, so a
+reload never blocks or disturbs them.
+
+Outside Kubernetes (a plain docs directory) the watcher falls back to
+comparing file sizes and modification times.
+
+Documents are split at load time into heading-aware chunks (a section, or
+paragraphs of a long section) with their offsets and term counts, and the
+index keeps BM25 postings over those chunks. Retrieval returns the best
+chunks that fit a token budget, so prompts carry whole relevant sections
+instead of a fixed character window around the first substring match.
+
+With an embedder configured, chunks are also embedded into an in-process
+vector index (see vector_index.py) and aretrieve() fuses the lexical and
+semantic rankings with reciprocal rank fusion, so paraphrased questions
+still find the right section. Any embedding failure falls back to lexical.
+"""
+
+import asyncio
+import hashlib
+import math
+import os
+import re
+from collections import Counter
+from dataclasses import dataclass, field, replace
+from functools import cached_property
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import structlog
+
+
+logger = structlog.get_logger()
+
+
+# Symlink the kubelet swaps when a ConfigMap volume is updated
+CONFIGMAP_DATA_LINK = "..data"
+
+# Chunks longer than this are split further on paragraph boundaries
+MAX_CHUNK_TOKENS = 200
+
+# BM25 parameters
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+_HEADING = re.compile(r"^(#{1,6})\s+(.+?)\s*#*\s*$")
+_TERM = re.compile(r"[a-z0-9]+")
+_STOPWORDS = frozenset(
+    "a an and are as at be but by can do does for from get has have how i if in "
+    "is it its me my of on or so that the their them then there this to was we "
+    "what when where which who why will with you your".split()
+)
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough LLM token count (~4 characters per token for English)."""
+    return len(text) // 4 + 1
+
+
+def _stem(term: str) -> str:
+    # Just enough to match "quests"/"quest" and "bounties"/"bounty"
+    if len(term) > 4 and term.endswith("ies"):
+        return term[:-3] + "y"
+    if len(term) > 3 and term.endswith("s") and not term.endswith("ss"):
+        return term[:-1]
+    return term
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased, stemmed terms without stopwords."""
+    return [_stem(t) for t in _TERM.findall(text.lower()) if t not in _STOPWORDS]
+
+
+@dataclass(frozen=True, slots=True, eq=False)
+class KnowledgeChunk:
+    """A heading-delimited slice of a document with its term statistics."""
+    path: str
+    heading: str  # Breadcrumb, e.g. "Otter Camp > Quests"
+    start: int  # Offsets into the document content
+    end: int
+    text: str
+    terms: Dict[str, int]  # Term frequencies
+    length: int  # Number of terms
+    tokens: int  # Estimated prompt tokens
+    key: str = ""  # Hash of the rendered text; keys the chunk's embedding
+
+    def render(self) -> str:
+        return _render(self.path, self.heading, self.text)
+
+
+def _render(path: str, heading: str, text: str) -> str:
+    label = f"{path} > {heading}" if heading else path
+    return f"[{label}]\n{text}"
+
+
+@dataclass(frozen=True)
+class KnowledgeDocument:
+    """One parsed knowledge file."""
+    path: str  # Relative to the docs root
+    content: str
+    digest: str  # Content hash; unchanged digest = reuse the parsed document
+    chunks: Tuple[KnowledgeChunk, ...] = ()
+
+
+@dataclass(frozen=True)
+class KnowledgeIndex:
+    """An immutable version of the knowledge base."""
+    version: int
+    source: str  # ..data target (or file signature) this was built from
+    documents: Dict[str, KnowledgeDocument] = field(default_factory=dict)
+    postings: Dict[str, Tuple[KnowledgeChunk, ...]] = field(default_factory=dict)
+    chunk_count: int = 0
+    total_terms: int = 0
+    vectors: Optional[Any] = None  # VectorIndex over chunks, once embedded
+
+    @property
+    def average_length(self) -> float:
+        return self.total_terms / self.chunk_count if self.chunk_count else 0.0
+
+    @cached_property
+    def chunks(self) -> Dict[str, KnowledgeChunk]:
+        """Every chunk by key, in document order."""
+        return {chunk.key: chunk for doc in self.documents.values() for chunk in doc.chunks}
+
+
+def split_sections(path: str, content: str, max_tokens: int = MAX_CHUNK_TOKENS) -> Tuple[KnowledgeChunk, ...]:
+    """
+    Split markdown into chunks at headings (outside code fences).
+
+    A section over `max_tokens` is split again at blank lines. Each chunk
+    keeps the breadcrumb of headings above it.
+    """
+    # (offset, heading breadcrumb) where each section starts
+    sections: List[Tuple[int, str]] = [(0, "")]
+    trail: List[Tuple[int, str]] = []
+    in_fence = False
+    offset = 0
+    for line in content.splitlines(keepends=True):
+        stripped = line.strip()
+        if stripped.startswith(("```", "~~~")):
+            in_fence = not in_fence
+        elif not in_fence and (match := _HEADING.match(stripped)):
+            level = len(match.group(1))
+            trail = [(lvl, title) for lvl, title in trail if lvl < level]
+            trail.append((level, match.group(2)))
+            sections.append((offset, " > ".join(title for _, title in trail)))
+        offset += len(line)
+    sections.append((len(content), ""))
+
+    chunks = []
+    for (start, heading), (end, _) in zip(sections, sections[1:]):
+        for piece_start, piece_end in _split_paragraphs(content, start, end, max_tokens):
+            raw = content[piece_start:piece_end]
+            first_line, _, rest = raw.lstrip().partition("\n")
+            if _HEADING.match(first_line.strip()):
+                raw = rest  # The breadcrumb already carries the heading
+            text = raw.strip()
+            if not text:
+                continue
+            text_start = piece_end - len(raw) + (len(raw) - len(raw.lstrip()))
+            terms = Counter(tokenize(f"{heading}\n{text}"))
+            rendered = _render(path, heading, text)
+            chunks.append(KnowledgeChunk(
+                path=path,
+                heading=heading,
+                start=text_start,
+                end=text_start + len(text),
+                text=text,
+                terms=dict(terms),
+                length=sum(terms.values()),
+                # Budget what actually goes in the prompt: label, text and separator
+                tokens=estimate_tokens(rendered) + 2,
+                key=hashlib.blake2b(rendered.encode("utf-8"), digest_size=16).hexdigest(),
+            ))
+    return tuple(chunks)
+
+
+def _split_paragraphs(content: str, start: int, end: int, max_tokens: int) -> Iterable[Tuple[int, int]]:
+    """Pack a section's paragraphs into ranges of at most max_tokens (when possible)."""
+    if estimate_tokens(content[start:end]) <= max_tokens:
+        yield start, end
+        return
+
+    piece_start = start
+    last_break = None
+    position = start
+    while True:
+        brk = content.find("\n\n", position, end)
+        if brk == -1:
+            break
+        brk += 2
+        if last_break is not None and (brk - piece_start) // 4 + 1 > max_tokens:
+            yield piece_start, last_break
+            piece_start = last_break
+        last_break = brk
+        position = brk
+    yield piece_start, end
+
+
+class KnowledgeBase:
+    """Otto's knowledge base from Hello World Co-Op documentation."""
+
+    def __init__(
+        self,
+        docs_path: Path,
+        embedder: Optional[Any] = None,
+        vector_store: Optional[Any] = None,
+        vector_min_score: float = 0.5,
+        query_timeout: float = 2.0
+    ):
+        self.docs_path = docs_path
+        self.embedder = embedder  # OllamaEmbedder; None = lexical search only
+        self.vector_store = vector_store
+        self.vector_min_score = vector_min_score
+        self.query_timeout = query_timeout
+        self._index = KnowledgeIndex(version=0, source="")
+        self._vectors = None  # Last VectorIndex built, reused across reloads
+        self._reload_lock: Optional[asyncio.Lock] = None
+        self._watcher: Optional[asyncio.Task] = None
+        self._load_documents()
+
+    @property
+    def index(self) -> KnowledgeIndex:
+        """The current index version. Hold on to it for the length of a query."""
+        return self._index
+
+    @property
+    def documents(self) -> Dict[str, str]:
+        """Current document contents by relative path."""
+        return {path: doc.content for path, doc in self._index.documents.items()}
+
+    def _load_documents(self):
+        """Load markdown documents from the knowledge base."""
+        if not self.docs_path.exists():
+            logger.warning("otto.knowledge_base.path_not_found", path=str(self.docs_path))
+            return
+
+        self._index = self._build(self._index, self._source_marker())
+        logger.info("otto.knowledge_base.ready", document_count=len(self._index.documents))
+
+    # ============================================
+    # INDEX BUILDING
+    # ============================================
+
+    def _content_root(self, marker: str) -> Path:
+        """Directory to read from: the ..data target itself when mounted from a ConfigMap."""
+        if (self.docs_path / CONFIGMAP_DATA_LINK).is_symlink():
+            return self.docs_path / marker
+        return self.docs_path
+
+    def _scan(self, root: Path) -> Dict[str, Path]:
+        """Markdown files under root, skipping the kubelet's ..-prefixed internals."""
+        files = {}
+        for md_file in root.rglob("*.md"):
+            relative_path = md_file.relative_to(root)
+            if any(part.startswith("..") for part in relative_path.parts):
+                continue
+            files[str(relative_path)] = md_file
+        return files
+
+    def _source_marker(self) -> str:
+        """Cheap fingerprint of the on-disk version."""
+        data_link = self.docs_path / CONFIGMAP_DATA_LINK
+        if data_link.is_symlink():
+            return os.readlink(data_link)
+
+        signature = hashlib.blake2b(digest_size=16)
+        for relative_path, md_file in sorted(self._scan(self.docs_path).items()):
+            stat = md_file.stat()
+            signature.update(f"{relative_path}:{stat.st_size}:{stat.st_mtime_ns};".encode())
+        return signature.hexdigest()
+
+    def _parse(self, relative_path: str, content: str, digest: str) -> KnowledgeDocument:
+        return KnowledgeDocument(
+            path=relative_path,
+            content=content,
+            digest=digest,
+            chunks=split_sections(relative_path, content),
+        )
+
+    def _build(self, previous: KnowledgeIndex, marker: str) -> KnowledgeIndex:
+        """Build the next index version, reusing documents whose content is unchanged."""
+        documents: Dict[str, KnowledgeDocument] = {}
+        parsed = 0
+
+        for relative_path, md_file in self._scan(self._content_root(marker)).items():
+            try:
+                raw = md_file.read_bytes()
+            except OSError as e:
+                logger.error("otto.knowledge_base.load_error", file=str(md_file), error=str(e))
+                continue
+
+            digest = hashlib.blake2b(raw, digest_size=16).hexdigest()
+            existing = previous.documents.get(relative_path)
+            if existing is not None and existing.digest == digest:
+                documents[relative_path] = existing
+                continue
+
+            try:
+                documents[relative_path] = self._parse(relative_path, raw.decode("utf-8"), digest)
+                parsed += 1
+                logger.debug("otto.knowledge_base.loaded", file=relative_path)
+            except UnicodeDecodeError as e:
+                logger.error("otto.knowledge_base.load_error", file=str(md_file), error=str(e))
+
+        removed = len(previous.documents.keys() - documents.keys())
+        if previous.version:
+            logger.info("otto.knowledge_base.rebuilt", version=previous.version + 1,
+                        parsed=parsed, reused=len(documents) - parsed, removed=removed)
+        return self._reindex(previous, marker, documents)
+
+    def _reindex(
+        self,
+        previous: KnowledgeIndex,
+        marker: str,
+        documents: Dict[str, KnowledgeDocument]
+    ) -> KnowledgeIndex:
+        """Update the postings for documents that were added, changed or removed."""
+        stale = [doc for path, doc in previous.documents.items() if documents.get(path) is not doc]
+        fresh = [doc for path, doc in documents.items() if previous.documents.get(path) is not doc]
+        stale_paths = {doc.path for doc in stale}
+
+        additions: Dict[str, List[KnowledgeChunk]] = {}
+        for doc in fresh:
+            for chunk in doc.chunks:
+                for term in chunk.terms:
+                    additions.setdefault(term, []).append(chunk)
+
+        affected = set(additions)
+        for doc in stale:
+            for chunk in doc.chunks:
+                affected.update(chunk.terms)
+
+        postings = dict(previous.postings)
+        for term in affected:
+            kept = [c for c in postings.get(term, ()) if c.path not in stale_paths]
+            kept.extend(additions.get(term, ()))
+            if kept:
+                postings[term] = tuple(kept)
+            else:
+                postings.pop(term, None)
+
+        return KnowledgeIndex(
+            version=previous.version + 1,
+            source=marker,
+            documents=documents,
+            postings=postings,
+            chunk_count=previous.chunk_count
+                - sum(len(d.chunks) for d in stale) + sum(len(d.chunks) for d in fresh),
+            total_terms=previous.total_terms
+                - sum(c.length for d in stale for c in d.chunks)
+                + sum(c.length for d in fresh for c in d.chunks),
+        )
+
+    # ============================================
+    # HOT RELOAD
+    # ============================================
+
+    def _lock(self) -> asyncio.Lock:
+        if self._reload_lock is None:
+            self._reload_lock = asyncio.Lock()
+        return self._reload_lock
+
+    async def reload(self, force: bool = False) -> bool:
+        """Rebuild and swap in the index if the docs changed. Returns True if swapped."""
+        async with self._lock():
+            if not self.docs_path.exists():
+                return False
+            marker = await asyncio.to_thread(self._source_marker)
+            current = self._index
+            if not force and marker == current.source:
+                return False
+
+            index = await asyncio.to_thread(self._build, current, marker)
+            self._index = index  # Atomic swap; running queries keep the old version
+            logger.info("otto.knowledge_base.reloaded", version=index.version,
+                        source=marker, document_count=len(index.documents))
+            await self._embed_index()
+            return True
+
+    async def refresh_vectors(self):
+        """Embed the current index if it has no vectors yet."""
+        async with self._lock():
+            await self._embed_index()
+
+    async def _embed_index(self):
+        index = self._index
+        if self.embedder is None or index.vectors is not None or not index.chunk_count:
+            return
+
+        from .vector_index import build_vector_index
+        try:
+            vectors = await build_vector_index(
+                {key: chunk.render() for key, chunk in index.chunks.items()},
+                self.embedder,
+                previous=self._vectors,
+                store=self.vector_store,
+            )
+        except Exception as e:
+            # Lexical search keeps working; the next reload tries again
+            logger.warning("otto.knowledge_base.embed_failed", error=str(e))
+            return
+
+        self._vectors = vectors
+        if self._index is index:
+            self._index = replace(index, vectors=vectors)
+
+    async def watch(self, interval: float):
+        """Poll for ConfigMap updates every `interval` seconds until cancelled."""
+        await self.refresh_vectors()
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.reload()
+            except Exception as e:
+                logger.error("otto.knowledge_base.reload_error", error=str(e))
+
+    def start_watching(self, interval: float):
+        """Start the background watcher (needs a running event loop)."""
+        if interval <= 0 or (self._watcher is not None and not self._watcher.done()):
+            return
+        self._watcher = asyncio.get_running_loop().create_task(self.watch(interval))
+
+    async def stop_watching(self):
+        if self._watcher is not None:
+            self._watcher.cancel()
+            try:
+                await self._watcher
+            except asyncio.CancelledError:
+                pass
+            self._watcher = None
+
+    # ============================================
+    # SEARCH
+    # ============================================
+
+    def rank(self, query: str, index: Optional[KnowledgeIndex] = None) -> List[Tuple[float, KnowledgeChunk]]:
+        """BM25-score every chunk sharing a term with the query, best first."""
+        index = index or self._index
+        query_terms = set(tokenize(query))
+        if not query_terms or not index.chunk_count:
+            return []
+
+        average_length = index.average_length or 1.0
+        scores: Dict[KnowledgeChunk, float] = {}
+        for term in query_terms:
+            postings = index.postings.get(term)
+            if not postings:
+                continue
+            idf = math.log(1 + (index.chunk_count - len(postings) + 0.5) / (len(postings) + 0.5))
+            for chunk in postings:
+                tf = chunk.terms[term]
+                norm = BM25_K1 * (1 - BM25_B + BM25_B * chunk.length / average_length)
+                scores[chunk] = scores.get(chunk, 0.0) + idf * tf * (BM25_K1 + 1) / (tf + norm)
+
+        return sorted(((score, chunk) for chunk, score in scores.items()),
+                      key=lambda item: item[0], reverse=True)
+
+    def retrieve(self, query: str, token_budget: int = 250, max_chunks: int = 4) -> List[KnowledgeChunk]:
+        """The best lexical matches whose combined size fits `token_budget`."""
+        return _pack([chunk for _, chunk in self.rank(query)], token_budget, max_chunks)
+
+    async def aretrieve(self, query: str, token_budget: int = 250, max_chunks: int = 4) -> List[KnowledgeChunk]:
+        """
+        Hybrid retrieval: BM25 and vector rankings fused with reciprocal rank fusion.
+
+        Falls back to lexical ranking when there are no vectors or the query
+        cannot be embedded in time.
+        """
+        index = self._index
+        ranked = [chunk for _, chunk in self.rank(query, index)]
+
+        if index.vectors is not None and self.embedder is not None:
+            from .vector_index import reciprocal_rank_fusion
+            try:
+                query_vector = await self.embedder.embed([query], timeout=self.query_timeout)
+                hits = index.vectors.search(query_vector[0], k=20, min_score=self.vector_min_score)
+                fused = reciprocal_rank_fusion([
+                    [chunk.key for chunk in ranked[:20]],
+                    [index.vectors.keys[row] for row, _ in hits],
+                ])
+                ranked = [index.chunks[key] for key, _ in fused if key in index.chunks]
+            except Exception as e:
+                logger.warning("otto.knowledge_base.vector_query_failed", error=str(e))
+
+        return _pack(ranked, token_budget, max_chunks)
+
+    def search(self, query: str, limit: int = 3) -> List[str]:
+        """Best matching sections, rendered with their source and heading."""
+        return [chunk.render() for _, chunk in self.rank(query)[:limit]]
+
+    def get_context(self, topic: str, token_budget: int = 250) -> str:
+        """Get context for a specific topic, within a prompt token budget."""
+        return _format_context(self.retrieve(topic, token_budget=token_budget))
+
+    async def aget_context(self, topic: str, token_budget: int = 250) -> str:
+        """get_context() using hybrid lexical + vector retrieval."""
+        return _format_context(await self.aretrieve(topic, token_budget=token_budget))
+
+
+def _format_context(chunks: List[KnowledgeChunk]) -> str:
+    return "\n\n---\n\n".join(chunk.render() for chunk in chunks)
+
+
+def _pack(ranked: List[KnowledgeChunk], token_budget: int, max_chunks: int) -> List[KnowledgeChunk]:
+    """Take chunks in rank order while they fit the budget."""
+    selected: List[KnowledgeChunk] = []
+    remaining = token_budget
+    for chunk in ranked:
+        if chunk.tokens <= remaining:
+            selected.append(chunk)
+            remaining -= chunk.tokens
+        elif not selected:
+            # Best match alone is over budget: keep its opening
+            selected.append(_truncate(chunk, remaining))
+            remaining = 0
+        if remaining <= 0 or len(selected) >= max_chunks:
+            break
+    return selected
+
+
+def _truncate(chunk: KnowledgeChunk, tokens: int) -> KnowledgeChunk:
+    """Cut a chunk down to about `tokens`, at a line or sentence end if possible."""
+    limit = max(0, tokens * 4 - len(chunk.render()) + len(chunk.text))
+    text = chunk.text[:limit]
+    cut = max(text.rfind("\n"), text.rfind(". ") + 1)
+    if cut > limit // 2:
+        text = text[:cut]
+    text = text.rstrip() + " ..."
+    return KnowledgeChunk(
+        path=chunk.path,
+        heading=chunk.heading,
+        start=chunk.start,
+        end=chunk.start + len(text),
+        text=text,
+        terms=chunk.terms,
+        length=chunk.length,
+        tokens=estimate_tokens(_render(chunk.path, chunk.heading, text)) + 2,
+        key=chunk.key,
+    )
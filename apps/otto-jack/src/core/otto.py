@@ -8,12 +8,12 @@ Ecosystem, embodying playfulness, helpfulness, and platform trust.
 """
 
 import structlog
-from pathlib import Path
-from typing import Optional, List
+from typing import Dict, List, Optional
 import httpx
-import json
 
 from .config import settings
+from .history import ConversationHistory
+from .knowledge import KnowledgeBase
 
 logger = structlog.get_logger()
 
@@ -66,57 +66,13 @@ IMPORTANT GUIDELINES:
 Respond in a playful, helpful way. Keep responses concise but informative. Use emojis sparingly but effectively!
 """
 
-
-class KnowledgeBase:
-    """Otto's knowledge base from Hello World Co-Op documentation."""
-
-    def __init__(self, docs_path: Path):
-        self.docs_path = docs_path
-        self.documents: dict[str, str] = {}
-        self._load_documents()
-
-    def _load_documents(self):
-        """Load markdown documents from the knowledge base."""
-        if not self.docs_path.exists():
-            logger.warning("otto.knowledge_base.path_not_found", path=str(self.docs_path))
-            return
-
-        for md_file in self.docs_path.rglob("*.md"):
-            try:
-                relative_path = md_file.relative_to(self.docs_path)
-                content = md_file.read_text(encoding="utf-8")
-                self.documents[str(relative_path)] = content
-                logger.debug("otto.knowledge_base.loaded", file=str(relative_path))
-            except Exception as e:
-                logger.error("otto.knowledge_base.load_error", file=str(md_file), error=str(e))
-
-        logger.info("otto.knowledge_base.ready", document_count=len(self.documents))
-
-    def search(self, query: str, limit: int = 3) -> List[str]:
-        """Simple keyword search in documents."""
-        query_lower = query.lower()
-        results = []
-
-        for path, content in self.documents.items():
-            if query_lower in content.lower():
-                # Extract relevant section (first 500 chars around match)
-                idx = content.lower().find(query_lower)
-                start = max(0, idx - 200)
-                end = min(len(content), idx + 300)
-                snippet = content[start:end]
-                results.append(f"[{path}]\n{snippet}...")
-
-            if len(results) >= limit:
-                break
-
-        return results
-
-    def get_context(self, topic: str) -> str:
-        """Get context for a specific topic."""
-        relevant_docs = self.search(topic, limit=2)
-        if relevant_docs:
-            return "\n\n---\n\n".join(relevant_docs)
-        return ""
+# Sampling options - kept identical across requests, since changing
+# load-time options makes Ollama reload the model and drop its prompt cache
+OLLAMA_OPTIONS = {
+    "temperature": 0.7,
+    "top_p": 0.9,
+    "num_predict": 500,
+}
 
 
 class Otto:
@@ -128,22 +84,50 @@ class Otto:
     """
 
     def __init__(self):
-        self.knowledge = KnowledgeBase(settings.docs_path)
+        self.knowledge = KnowledgeBase(settings.docs_path, **self._vector_options())
         self.ollama_host = settings.ollama_host
         self.model = settings.ollama_model
+        self.history = ConversationHistory(
+            max_turns=settings.history_turns,
+            ttl_seconds=settings.history_ttl_seconds,
+        )
         logger.info("otto.initialized", model=self.model)
 
-    async def process_message(self, message: str, user_name: str = "friend") -> str:
-        """Process a user message and generate a response."""
+    @staticmethod
+    def _vector_options() -> dict:
+        """Embedder and vector cache for hybrid knowledge search, if enabled."""
+        if not settings.hybrid_search:
+            return {}
+        from .vector_index import OllamaEmbedder, VectorStore
+        return {
+            "embedder": OllamaEmbedder(settings.ollama_host, settings.embedding_model),
+            "vector_store": VectorStore(settings.vector_cache_path),
+            "vector_min_score": settings.vector_min_score,
+        }
+
+    async def process_message(
+        self,
+        message: str,
+        user_name: str = "friend",
+        user_id: Optional[str] = None,
+        channel_id: Optional[str] = None
+    ) -> str:
+        """
+        Process a user message and generate a response.
+
+        History is per channel, so a DM and a public channel never share it.
+        """
+        history_key = (channel_id or "", user_id or user_name)
         try:
             # Get relevant context from knowledge base
-            context = self.knowledge.get_context(message)
+            context = await self.knowledge.aget_context(message, token_budget=settings.context_token_budget)
 
-            # Build the prompt
-            prompt = self._build_prompt(message, user_name, context)
+            # Build the chat messages
+            messages = self._build_messages(message, user_name, context, self.history.messages(history_key))
 
             # Get response from Ollama
-            response = await self._query_ollama(prompt)
+            response = await self._query_ollama(messages)
+            self.history.record(history_key, self._user_turn(message, user_name), response)
 
             logger.info(
                 "otto.response_generated",
@@ -158,36 +142,76 @@ class Otto:
             logger.error("otto.process_error", error=str(e))
             return self._get_fallback_response()
 
-    def _build_prompt(self, message: str, user_name: str, context: str) -> str:
-        """Build the full prompt for Ollama."""
-        prompt_parts = [OTTO_SYSTEM_PROMPT]
-
+    @staticmethod
+    def _user_turn(message: str, user_name: str) -> str:
+        return f"{user_name}: {message}"
+
+    def _build_messages(
+        self,
+        message: str,
+        user_name: str,
+        context: str,
+        history: List[Dict[str, str]]
+    ) -> List[Dict[str, str]]:
+        """
+        Build the chat messages for Ollama.
+
+        The persona is always the same first message and earlier turns are
+        replayed as recorded. Per-question documentation goes after the
+        question, in the last message only, and is not kept in history, so
+        the server's cached prefix covers everything up to the previous
+        question.
+        """
+        content = self._user_turn(message, user_name)
         if context:
-            prompt_parts.append(f"\nRELEVANT DOCUMENTATION:\n{context}\n")
-
-        prompt_parts.append(f"\nUser ({user_name}): {message}\n\nOtto:")
+            content += f"\n\nRELEVANT DOCUMENTATION:\n{context}"
 
-        return "\n".join(prompt_parts)
+        return [
+            {"role": "system", "content": OTTO_SYSTEM_PROMPT},
+            *history,
+            {"role": "user", "content": content},
+        ]
 
-    async def _query_ollama(self, prompt: str) -> str:
+    async def _query_ollama(self, messages: List[Dict[str, str]]) -> str:
         """Query Ollama for a response."""
         async with httpx.AsyncClient(timeout=60.0) as client:
             response = await client.post(
-                f"{self.ollama_host}/api/generate",
+                f"{self.ollama_host}/api/chat",
                 json={
                     "model": self.model,
-                    "prompt": prompt,
+                    "messages": messages,
                     "stream": False,
-                    "options": {
-                        "temperature": 0.7,
-                        "top_p": 0.9,
-                        "num_predict": 500,
-                    }
+                    "keep_alive": settings.ollama_keep_alive,
+                    "options": OLLAMA_OPTIONS,
                 }
             )
             response.raise_for_status()
             data = response.json()
-            return data.get("response", "").strip()
+            logger.debug(
+                "otto.ollama_stats",
+                prompt_eval_count=data.get("prompt_eval_count"),
+                prompt_eval_ms=round(data.get("prompt_eval_duration", 0) / 1e6, 1),
+            )
+            return data.get("message", {}).get("content", "").strip()
+
+    async def warm_up(self):
+        """Load the model and evaluate the persona prompt before the first question."""
+        try:
+            async with httpx.AsyncClient(timeout=120.0) as client:
+                response = await client.post(
+                    f"{self.ollama_host}/api/chat",
+                    json={
+                        "model": self.model,
+                        "messages": [{"role": "system", "content": OTTO_SYSTEM_PROMPT}],
+                        "stream": False,
+                        "keep_alive": settings.ollama_keep_alive,
+                        "options": {**OLLAMA_OPTIONS, "num_predict": 1},
+                    }
+                )
+                response.raise_for_status()
+            logger.info("otto.warmed_up", model=self.model)
+        except Exception as e:
+            logger.warning("otto.warm_up_failed", error=str(e))
 
     def _get_fallback_response(self) -> str:
         """Get a fallback response when AI is unavailable."""
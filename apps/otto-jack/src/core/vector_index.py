@@ -0,0 +1,198 @@
+"""
+Otto Vector Index
+In-process semantic search over knowledge chunks.
+
+Chunks are embedded through Ollama's /api/embed (the same server Otto
+already talks to), normalised, and searched by brute-force cosine
+similarity with NumPy - a single matrix-vector product, which for a
+ConfigMap-sized corpus (hundreds to a few thousand chunks) takes well under
+a millisecond and needs no extra service.
+
+Vectors are persisted as a raw float32 matrix plus a JSON manifest of chunk
+keys, and opened with np.memmap, so restarts and reloads only embed chunks
+whose text changed, and the matrix lives in the page cache rather than the
+Python heap. The two files are replaced one after the other, so the
+manifest also records the matrix's row count and checksum; a pair left
+mismatched by a crash between the two is discarded rather than read with
+rows assigned to the wrong keys.
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import httpx
+import numpy as np
+import structlog
+
+
+logger = structlog.get_logger()
+
+
+VECTORS_FILE = "knowledge-vectors.f32"
+MANIFEST_FILE = "knowledge-vectors.json"
+
+
+def _checksum(matrix: np.ndarray) -> str:
+    return hashlib.blake2b(memoryview(np.ascontiguousarray(matrix)), digest_size=16).hexdigest()
+
+
+def _normalise(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=-1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return (matrix / norms).astype(np.float32, copy=False)
+
+
+class OllamaEmbedder:
+    """Batch text embeddings from Ollama."""
+
+    def __init__(self, host: str, model: str, timeout: float = 30.0, batch_size: int = 32):
+        self.host = host
+        self.model = model
+        self.timeout = timeout
+        self.batch_size = batch_size
+
+    async def embed(self, texts: Sequence[str], timeout: Optional[float] = None) -> np.ndarray:
+        """Embed texts; returns an (n, dim) float32 matrix of unit vectors."""
+        rows: List[List[float]] = []
+        async with httpx.AsyncClient(timeout=timeout or self.timeout) as client:
+            for start in range(0, len(texts), self.batch_size):
+                response = await client.post(
+                    f"{self.host}/api/embed",
+                    json={"model": self.model, "input": list(texts[start:start + self.batch_size])},
+                )
+                response.raise_for_status()
+                rows.extend(response.json()["embeddings"])
+        return _normalise(np.asarray(rows, dtype=np.float32))
+
+
+class VectorIndex:
+    """Unit vectors for a fixed list of keys, searched by cosine similarity."""
+
+    def __init__(self, keys: List[str], matrix: np.ndarray, model: str):
+        self.keys = keys
+        self.matrix = matrix  # (n, dim) float32, rows normalised; may be a memmap
+        self.model = model
+        self._rows = {key: i for i, key in enumerate(keys)}
+
+    @property
+    def dim(self) -> int:
+        return self.matrix.shape[1] if self.matrix.ndim == 2 else 0
+
+    def row(self, key: str) -> Optional[int]:
+        return self._rows.get(key)
+
+    def search(self, query: np.ndarray, k: int = 20, min_score: float = 0.0) -> List[Tuple[int, float]]:
+        """Top-k (row, similarity) for a unit query vector, best first."""
+        if not len(self.keys):
+            return []
+        scores = self.matrix @ query.reshape(-1)
+        k = min(k, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [(int(i), float(scores[i])) for i in top if scores[i] >= min_score]
+
+
+class VectorStore:
+    """Memory-mapped on-disk storage for a VectorIndex."""
+
+    def __init__(self, directory: Path):
+        self.directory = Path(directory)
+
+    def load(self, model: str) -> Optional[VectorIndex]:
+        """Open the stored vectors, or None if missing or for another model."""
+        manifest_path = self.directory / MANIFEST_FILE
+        vectors_path = self.directory / VECTORS_FILE
+        try:
+            manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+            if manifest.get("model") != model:
+                return None
+            keys = manifest["keys"]
+            if not keys:
+                return VectorIndex([], np.zeros((0, 0), dtype=np.float32), model)
+            rows, dim = manifest["rows"], manifest["dim"]
+            size = vectors_path.stat().st_size
+            if rows != len(keys) or size != rows * dim * 4:
+                raise ValueError(f"{size} bytes of vectors for {len(keys)} keys of dim {dim}")
+            matrix = np.memmap(vectors_path, dtype=np.float32, mode="r", shape=(rows, dim))
+            if _checksum(matrix) != manifest["checksum"]:
+                raise ValueError("vectors do not match the manifest checksum")
+        except (OSError, ValueError, KeyError) as e:
+            logger.info("otto.vectors.no_cache", reason=str(e))
+            return None
+        return VectorIndex(keys, matrix, model)
+
+    def save(self, index: VectorIndex) -> VectorIndex:
+        """Write the index atomically and return it re-opened from the memmap."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        vectors_path = self.directory / VECTORS_FILE
+        manifest_path = self.directory / MANIFEST_FILE
+
+        matrix = np.ascontiguousarray(index.matrix, dtype=np.float32)
+        tmp_vectors = vectors_path.with_name(VECTORS_FILE + ".tmp")
+        matrix.tofile(tmp_vectors)
+        tmp_manifest = manifest_path.with_name(MANIFEST_FILE + ".tmp")
+        tmp_manifest.write_text(
+            json.dumps({
+                "model": index.model, "dim": index.dim, "rows": len(index.keys),
+                "checksum": _checksum(matrix), "keys": index.keys,
+            }),
+            encoding="utf-8",
+        )
+        # Two replaces are not atomic together; load() rejects a mismatched pair
+        os.replace(tmp_vectors, vectors_path)
+        os.replace(tmp_manifest, manifest_path)
+        return self.load(index.model) or index
+
+
+async def build_vector_index(
+    texts: Dict[str, str],
+    embedder: OllamaEmbedder,
+    previous: Optional[VectorIndex] = None,
+    store: Optional[VectorStore] = None
+) -> VectorIndex:
+    """
+    Vectors for `texts` (key -> text), in key order.
+
+    Rows for keys already in `previous` (or the on-disk store) are copied;
+    only new texts are sent to the embedder. The result is persisted to
+    `store` if given.
+    """
+    if previous is None and store is not None:
+        previous = store.load(embedder.model)
+    if previous is not None and previous.model != embedder.model:
+        previous = None
+
+    keys = list(texts)
+    missing = [key for key in keys if previous is None or previous.row(key) is None]
+    embedded = await embedder.embed([texts[key] for key in missing]) if missing else None
+
+    dim = embedded.shape[1] if embedded is not None else (previous.dim if previous else 0)
+    matrix = np.zeros((len(keys), dim), dtype=np.float32)
+    fresh = {key: i for i, key in enumerate(missing)}
+    for i, key in enumerate(keys):
+        if key in fresh:
+            matrix[i] = embedded[fresh[key]]
+        else:
+            matrix[i] = previous.matrix[previous.row(key)]
+
+    index = VectorIndex(keys, matrix, embedder.model)
+    logger.info("otto.vectors.built", chunks=len(keys), embedded=len(missing), dim=dim)
+
+    if store is not None and (missing or previous is None or previous.keys != keys):
+        try:
+            index = store.save(index)
+        except OSError as e:
+            logger.warning("otto.vectors.save_failed", path=str(store.directory), error=str(e))
+    return index
+
+
+def reciprocal_rank_fusion(rankings: Sequence[Sequence[str]], k: int = 60) -> List[Tuple[str, float]]:
+    """Fuse ranked lists of ids: score = sum of 1 / (k + rank)."""
+    scores: Dict[str, float] = {}
+    for ranking in rankings:
+        for rank, item in enumerate(ranking, start=1):
+            scores[item] = scores.get(item, 0.0) + 1.0 / (k + rank)
+    return sorted(scores.items(), key=lambda item: item[1], reverse=True)
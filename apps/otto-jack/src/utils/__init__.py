@@ -0,0 +1 @@
+# Otto Utilities
@@ -0,0 +1,92 @@
+"""
+Otto - Import Profiler
+Reports per-module import time for an entry point's startup path.
+
+Runs the imports in a fresh interpreter with `-X importtime`, so the numbers
+reflect a real cold start rather than whatever this process already loaded.
+
+Shared by aurora-forester and otto-jack. Each image is built from its own
+app directory, so the module is copied rather than imported from a common
+package; keep both copies identical apart from the title line
+(aurora-forester's tests/test_shared_modules.py checks).
+"""
+
+import subprocess
+import sys
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Optional
+
+
+@dataclass
+class ImportTiming:
+    """Import cost of a single module, in microseconds."""
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+def parse_importtime(stderr: str) -> List[ImportTiming]:
+    """Parse the `-X importtime` report from an interpreter's stderr."""
+    timings = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        stripped = name.lstrip()
+        timings.append(ImportTiming(
+            module=stripped.strip(),
+            self_us=int(self_us),
+            cumulative_us=int(cumulative_us),
+            depth=(len(name) - len(stripped) - 1) // 2,
+        ))
+    return timings
+
+
+def profile_imports(modules: List[str], cwd: Optional[Path] = None) -> tuple[List[ImportTiming], float]:
+    """
+    Import `modules` in a fresh interpreter.
+
+    Returns the per-module timings and the wall-clock seconds for the whole run.
+    """
+    code = "\n".join(f"import {m}" for m in modules)
+    started = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        cwd=str(cwd) if cwd else None,
+    )
+    wall = time.perf_counter() - started
+    if proc.returncode != 0:
+        last_line = proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else "unknown error"
+        raise RuntimeError(f"Import failed: {last_line}")
+    return parse_importtime(proc.stderr), wall
+
+
+def format_import_profile(
+    timings: List[ImportTiming],
+    wall_seconds: float,
+    top: int = 25,
+    min_us: int = 1000
+) -> str:
+    """Render the slowest top-level and heavy modules as a table."""
+    total_us = sum(t.cumulative_us for t in timings if t.depth == 0)
+    ranked = sorted(
+        (t for t in timings if t.cumulative_us >= min_us),
+        key=lambda t: t.cumulative_us,
+        reverse=True,
+    )[:top]
+
+    lines = [
+        f"{'cumulative ms':>14} {'self ms':>9}  module",
+        "-" * 60,
+    ]
+    for t in ranked:
+        lines.append(f"{t.cumulative_us / 1000:>14.1f} {t.self_us / 1000:>9.1f}  {'  ' * t.depth}{t.module}")
+    lines.append("-" * 60)
+    lines.append(f"Total import time: {total_us / 1000:.1f} ms ({len(timings)} modules)")
+    lines.append(f"Interpreter wall time: {wall_seconds * 1000:.1f} ms")
+    return "\n".join(lines)
@@ -0,0 +1,137 @@
+"""Tests for per-user debounce and per-channel admission of generations."""
+
+import asyncio
+
+import pytest
+
+from src.bot.admission import (
+    CHANNEL_BUSY_ACK, CHANNEL_FULL_ACK, USER_BUSY_ACK, MessageAdmission,
+)
+
+
+pytestmark = pytest.mark.asyncio
+
+DEBOUNCE = 0.01
+
+
+class Recorder:
+    """Handler and ack sender that record calls; generations block until released."""
+
+    def __init__(self, block: bool = False):
+        self.batches = []
+        self.acks = []
+        self.gate = asyncio.Event()
+        if not block:
+            self.gate.set()
+
+    async def handler(self, contents, context):
+        self.batches.append((contents, context))
+        await self.gate.wait()
+
+    def ack(self, context, text):
+        self.acks.append((context, text))
+
+
+async def _settle(seconds: float = DEBOUNCE * 5):
+    await asyncio.sleep(seconds)
+
+
+async def test_burst_is_debounced_into_one_batch():
+    rec = Recorder()
+    admission = MessageAdmission(rec.handler, rec.ack, debounce_seconds=DEBOUNCE)
+
+    for text in ("hi", "are you there", "question"):
+        admission.submit(1, 7, text, context=text)
+    await _settle()
+
+    assert rec.batches == [(["hi", "are you there", "question"], "question")]
+    assert rec.acks == []
+    assert not admission.is_active(1, 7)
+    await admission.close()
+
+
+async def test_messages_while_busy_fold_into_one_follow_up():
+    rec = Recorder(block=True)
+    admission = MessageAdmission(rec.handler, rec.ack, debounce_seconds=DEBOUNCE)
+
+    admission.submit(1, 7, "first", context="m1")
+    await _settle()
+    admission.submit(1, 7, "second", context="m2")
+    admission.submit(1, 7, "third", context="m3")
+
+    # One acknowledgement for the whole follow-up, not one per message
+    assert rec.acks == [("m2", USER_BUSY_ACK)]
+    assert admission.is_active(1, 7)
+
+    rec.gate.set()
+    await _settle()
+    assert rec.batches == [(["first"], "m1"), (["second", "third"], "m3")]
+    assert admission.stats["folded"] == 2
+    await admission.close()
+
+
+async def test_users_are_separate_per_channel():
+    rec = Recorder()
+    admission = MessageAdmission(rec.handler, rec.ack, debounce_seconds=DEBOUNCE)
+
+    admission.submit(1, 7, "in channel one", context="a")
+    admission.submit(2, 7, "in channel two", context="b")
+    await _settle()
+
+    assert sorted(rec.batches) == [(["in channel one"], "a"), (["in channel two"], "b")]
+    await admission.close()
+
+
+async def test_channel_cap_queues_then_rejects():
+    rec = Recorder(block=True)
+    admission = MessageAdmission(
+        rec.handler, rec.ack, debounce_seconds=DEBOUNCE, max_inflight=1, max_waiting=1
+    )
+
+    admission.submit(1, 1, "running", context="u1")
+    await _settle()
+    admission.submit(1, 2, "waiting", context="u2")
+    await _settle()
+    admission.submit(1, 3, "turned away", context="u3")
+    await _settle()
+
+    assert [context for _, context in rec.batches] == ["u1"]
+    assert rec.acks == [("u2", CHANNEL_BUSY_ACK), ("u3", CHANNEL_FULL_ACK)]
+    assert admission.stats["rejected"] == 1
+
+    # The finished batch hands its slot straight to the waiter
+    rec.gate.set()
+    await _settle()
+    assert [context for _, context in rec.batches] == ["u1", "u2"]
+    assert not admission.is_active(1, 3)
+    await admission.close()
+
+
+async def test_handler_error_frees_the_user_and_slot():
+    calls = []
+
+    async def failing(contents, context):
+        calls.append(contents)
+        raise RuntimeError("ollama down")
+
+    admission = MessageAdmission(failing, lambda context, text: None,
+                                 debounce_seconds=DEBOUNCE, max_inflight=1)
+    admission.submit(1, 7, "one", context=None)
+    await _settle()
+    admission.submit(1, 7, "two", context=None)
+    await _settle()
+
+    assert calls == [["one"], ["two"]]
+    assert not admission.is_active(1, 7)
+    await admission.close()
+
+
+async def test_close_cancels_running_batches():
+    rec = Recorder(block=True)
+    admission = MessageAdmission(rec.handler, rec.ack, debounce_seconds=DEBOUNCE)
+    admission.submit(1, 7, "stuck", context=None)
+    admission.submit(1, 8, "pending", context=None)
+    await _settle()
+
+    await asyncio.wait_for(admission.close(), timeout=1)
+    assert not admission._tasks
@@ -0,0 +1,33 @@
+"""Tests for Otto's per-conversation chat history."""
+
+from src.core.history import ConversationHistory
+
+
+def test_history_is_separate_per_channel():
+    history = ConversationHistory(max_turns=2)
+    history.record(("dm-1", "42"), "42: my wallet seed is...", "Never share that!")
+
+    assert history.messages(("public", "42")) == []
+    assert history.messages(("dm-1", "42")) == [
+        {"role": "user", "content": "42: my wallet seed is..."},
+        {"role": "assistant", "content": "Never share that!"},
+    ]
+
+
+def test_history_keeps_recent_turns_and_conversations():
+    history = ConversationHistory(max_turns=2, max_users=2)
+    for n in range(3):
+        history.record(("c", "a"), f"q{n}", f"a{n}")
+    assert [m["content"] for m in history.messages(("c", "a"))] == ["q1", "a1", "q2", "a2"]
+
+    history.record(("c", "b"), "q", "a")
+    history.record(("c", "d"), "q", "a")
+    assert len(history) == 2
+    assert history.messages(("c", "a")) == []
+
+
+def test_expired_history_is_forgotten():
+    history = ConversationHistory(ttl_seconds=-1)
+    history.record(("c", "a"), "q", "a")
+    assert history.messages(("c", "a")) == []
+    assert len(history) == 0
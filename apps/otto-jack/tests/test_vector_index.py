@@ -0,0 +1,48 @@
+"""Tests for the on-disk vector store."""
+
+import os
+
+import numpy as np
+
+from src.core.vector_index import MANIFEST_FILE, VECTORS_FILE, VectorIndex, VectorStore
+
+
+def _index(keys, seed):
+    rng = np.random.default_rng(seed)
+    return VectorIndex(list(keys), rng.standard_normal((len(keys), 4)).astype(np.float32), "model")
+
+
+def test_save_and_load_round_trip(tmp_path):
+    store = VectorStore(tmp_path)
+    index = _index("abc", seed=1)
+
+    store.save(index)
+    loaded = store.load("model")
+
+    assert loaded.keys == ["a", "b", "c"]
+    np.testing.assert_array_equal(np.asarray(loaded.matrix), index.matrix)
+    assert store.load("other-model") is None
+
+
+def test_vectors_without_their_manifest_are_rejected(tmp_path):
+    store = VectorStore(tmp_path)
+    store.save(_index("abc", seed=1))
+    manifest = (tmp_path / MANIFEST_FILE).read_text()
+
+    # A crash after the vectors were replaced but before the manifest was:
+    # same size, different rows
+    store.save(_index("cab", seed=2))
+    (tmp_path / MANIFEST_FILE).write_text(manifest)
+    assert store.load("model") is None
+
+    # Larger than the old manifest expects
+    store.save(_index("abcd", seed=3))
+    (tmp_path / MANIFEST_FILE).write_text(manifest)
+    assert store.load("model") is None
+
+
+def test_truncated_vectors_are_rejected(tmp_path):
+    store = VectorStore(tmp_path)
+    store.save(_index("abc", seed=1))
+    os.truncate(tmp_path / VECTORS_FILE, 16)
+    assert store.load("model") is None